@@ -2402,6 +2402,8 @@
       // Enable streaming if configured
       if (CONFIG.streamingEnabled) {
         body.stream = true;
+        // Only tool names are shown, so skip tool output in the stream
+        body.tool_output = 'none';
       }
 
       if (!isValidCommunityId(CONFIG.communityId)) {
@@ -14,10 +14,12 @@ from langchain_core.messages import (
     ToolMessage,
 )
 from langchain_core.messages.utils import count_tokens_approximately, trim_messages
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_core.tools import BaseTool
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode
+from pydantic import SecretStr
 
 from src.agents.state import BaseAgentState
 
@@ -58,6 +60,7 @@ class BaseAgent(ABC):
         self.tools = list(tools) if tools else []
         self.system_prompt = system_prompt
         self.max_conversation_tokens = max_conversation_tokens
+        self._graph: CompiledStateGraph | None = None
 
         # Bind tools to model if supported
         if self.tools:
@@ -83,8 +86,11 @@ class BaseAgent(ABC):
         """
         graph = StateGraph(BaseAgentState)
 
-        # Add nodes
-        graph.add_node("agent", self._agent_node)
+        # Add nodes. The agent node has sync and async implementations so
+        # astream_events/ainvoke await the model instead of occupying a thread.
+        graph.add_node(
+            "agent", RunnableLambda(self._agent_node, afunc=self._aagent_node, name="agent")
+        )
         if self.tools:
             graph.add_node("tools", ToolNode(self.tools))
 
@@ -107,11 +113,57 @@ class BaseAgent(ABC):
 
         return graph.compile()
 
-    def _agent_node(self, state: BaseAgentState) -> dict[str, Any]:
+    def get_graph(self) -> CompiledStateGraph:
+        """Return the compiled workflow, compiling it on first use.
+
+        The graph only depends on the agent's tools and nodes, so one compiled
+        instance is reused across invocations. Per-request values travel in
+        the runnable config instead (see ``_model_call_kwargs``).
+        """
+        if self._graph is None:
+            self._graph = self.build_graph()
+        return self._graph
+
+    def _model_call_kwargs(self, config: RunnableConfig | None) -> dict[str, Any]:
+        """Extract per-request model call options from ``config["configurable"]``.
+
+        Recognized keys:
+            api_key: API key for this request (str or SecretStr).
+            user_id: User identifier forwarded as the provider ``user`` field.
+        """
+        configurable = (config or {}).get("configurable") or {}
+        kwargs: dict[str, Any] = {}
+
+        api_key = configurable.get("api_key")
+        if isinstance(api_key, SecretStr):
+            api_key = api_key.get_secret_value()
+        if api_key:
+            kwargs["api_key"] = api_key
+
+        user_id = configurable.get("user_id")
+        if user_id:
+            kwargs["user"] = user_id
+
+        return kwargs
+
+    def _agent_node(
+        self, state: BaseAgentState, config: RunnableConfig | None = None
+    ) -> dict[str, Any]:
         """Main agent node that processes messages and generates responses."""
-        messages = self._prepare_messages(state)
-        response = self.model_with_tools.invoke(messages)
+        messages = self._prepare_messages(state, config)
+        response = self.model_with_tools.invoke(messages, **self._model_call_kwargs(config))
+        return self._agent_update(state, response)
 
+    async def _aagent_node(
+        self, state: BaseAgentState, config: RunnableConfig | None = None
+    ) -> dict[str, Any]:
+        """Async agent node; awaits the model so no worker thread is held."""
+        messages = self._prepare_messages(state, config)
+        response = await self.model_with_tools.ainvoke(messages, **self._model_call_kwargs(config))
+        return self._agent_update(state, response)
+
+    def _agent_update(self, state: BaseAgentState, response: BaseMessage) -> dict[str, Any]:
+        """Build the state update for a model response."""
         # Track tool calls if any
         tool_calls = state.get("tool_calls", [])
         if hasattr(response, "tool_calls") and response.tool_calls:
@@ -128,7 +180,28 @@ class BaseAgent(ABC):
             "tool_calls": tool_calls,
         }
 
-    def _prepare_messages(self, state: BaseAgentState) -> list[BaseMessage]:
+    def _resolve_system_prompt(self, config: RunnableConfig | None = None) -> str:  # noqa: ARG002
+        """Return the system prompt for a run.
+
+        Subclasses may override this to adapt the prompt to per-request values
+        carried in ``config["configurable"]``.
+        """
+        return self.system_prompt or self.get_system_prompt()
+
+    def _resolve_context_messages(
+        self,
+        config: RunnableConfig | None = None,  # noqa: ARG002
+    ) -> list[BaseMessage]:
+        """Return per-request messages to send right after the system prompt.
+
+        Subclasses may override this to keep request-specific context out of
+        the system prompt, so the system prompt stays a stable cache prefix.
+        """
+        return []
+
+    def _prepare_messages(
+        self, state: BaseAgentState, config: RunnableConfig | None = None
+    ) -> list[BaseMessage]:
         """Prepare messages for the model, including system prompt.
 
         Uses token-aware trimming to prevent unbounded context growth.
@@ -138,9 +211,10 @@ class BaseAgent(ABC):
         messages: list[BaseMessage] = []
 
         # Add system prompt (always included in full)
-        system_prompt = self.system_prompt or self.get_system_prompt()
+        system_prompt = self._resolve_system_prompt(config)
         if system_prompt:
             messages.append(SystemMessage(content=system_prompt))
+        messages.extend(self._resolve_context_messages(config))
 
         # Include conversation history, trimming only when over budget.
         # Passing all messages through when under budget enables Anthropic prompt
@@ -216,9 +290,7 @@ class BaseAgent(ABC):
             "tool_calls": [],
         }
 
-        # Compile and invoke
-        graph = self.build_graph()
-        return await graph.ainvoke(initial_state, config=config)
+        return await self.get_graph().ainvoke(initial_state, config=config)
 
     def invoke(
         self,
@@ -245,9 +317,7 @@ class BaseAgent(ABC):
             "tool_calls": [],
         }
 
-        # Compile and invoke
-        graph = self.build_graph()
-        return graph.invoke(initial_state, config=config)
+        return self.get_graph().invoke(initial_state, config=config)
 
 
 class SimpleAgent(BaseAgent):
@@ -0,0 +1,235 @@
+"""Admission control for agent runs (/ask and /chat).
+
+Rate limiting happens only in the Cloudflare worker, and BYOK/CLI traffic
+bypasses it, so a burst could start any number of agent runs at once. Each
+run here needs a slot from a global limit and from its community's limit,
+held for the whole run (for streams, until the last event is sent).
+
+Requests that cannot start wait in a per-community FIFO queue. When the
+queue is full, or a request has waited ``queue_timeout_seconds``, it is
+rejected with ``AdmissionRejected`` (429 with Retry-After). When a slot
+frees up, the oldest waiter whose community is below its limit is started,
+so one saturated community does not block others.
+
+All state is touched only from the event loop, so no locks are needed.
+Waiters are plain futures created on the running loop; the controller is
+not bound to any one loop.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+
+from src.api.config import get_settings
+from src.metrics.prometheus import ADMISSION_REJECTED, ADMISSION_WAIT, REGISTRY, Sample
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """An agent run could not be admitted (queue full or wait timed out)."""
+
+    def __init__(self, community_id: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"Agent run for {community_id!r} rejected: {reason}")
+        self.community_id = community_id
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionPermit:
+    """A held run slot. ``release()`` is idempotent."""
+
+    def __init__(self, controller: "AdmissionController", community_id: str) -> None:
+        self._controller = controller
+        self.community_id = community_id
+        self._released = False
+
+    def release(self) -> None:
+        """Give the slot back (no-op if already released)."""
+        if self._released:
+            return
+        self._released = True
+        self._controller._finish(self.community_id)
+
+
+class AdmissionController:
+    """Global and per-community concurrency limits with bounded wait queues.
+
+    A value of 0 means unlimited for every setting: no concurrency limit, no
+    queue bound, or no wait timeout.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_per_community: int,
+        max_queue_per_community: int,
+        queue_timeout_seconds: float,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_per_community = max_per_community
+        self.max_queue_per_community = max_queue_per_community
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._running = 0
+        self._running_by_community: defaultdict[str, int] = defaultdict(int)
+        self._queued_by_community: defaultdict[str, int] = defaultdict(int)
+        self._waiters: deque[tuple[str, asyncio.Future[None]]] = deque()
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds clients are told to wait after a rejection."""
+        return max(1, math.ceil(self.queue_timeout_seconds))
+
+    def _can_start(self, community_id: str) -> bool:
+        if self.max_concurrent and self._running >= self.max_concurrent:
+            return False
+        return not (
+            self.max_per_community
+            and self._running_by_community.get(community_id, 0) >= self.max_per_community
+        )
+
+    def _start(self, community_id: str) -> None:
+        self._running += 1
+        self._running_by_community[community_id] += 1
+
+    def _finish(self, community_id: str) -> None:
+        self._running -= 1
+        self._running_by_community[community_id] -= 1
+        if not self._running_by_community[community_id]:
+            del self._running_by_community[community_id]
+        self._wake()
+
+    def _wake(self) -> None:
+        """Start the oldest waiters that fit under the limits."""
+        for waiter in list(self._waiters):
+            if self.max_concurrent and self._running >= self.max_concurrent:
+                return
+            community_id, future = waiter
+            if future.done() or not self._can_start(community_id):
+                continue
+            self._waiters.remove(waiter)
+            self._start(community_id)
+            future.set_result(None)
+
+    def _reject(self, community_id: str, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.inc(community=community_id, reason=reason)
+        logger.warning(
+            "Rejecting agent run for %s (%s): %d running, %d queued",
+            community_id,
+            reason,
+            self._running,
+            self._queued_by_community.get(community_id, 0),
+        )
+        return AdmissionRejected(community_id, reason, self.retry_after)
+
+    async def acquire(self, community_id: str) -> AdmissionPermit:
+        """Wait for a run slot.
+
+        Raises:
+            AdmissionRejected: If the community's queue is full or the wait
+                timed out.
+        """
+        if self._can_start(community_id):
+            self._start(community_id)
+            ADMISSION_WAIT.observe(0.0, community=community_id)
+            return AdmissionPermit(self, community_id)
+
+        if (
+            self.max_queue_per_community
+            and self._queued_by_community.get(community_id, 0) >= self.max_queue_per_community
+        ):
+            raise self._reject(community_id, "queue_full")
+
+        start = time.perf_counter()
+        waiter = (community_id, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._queued_by_community[community_id] += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout_seconds or None):
+                await waiter[1]
+        except BaseException as e:
+            future = waiter[1]
+            if future.done() and not future.cancelled():
+                # Granted just as the wait was cancelled; give the slot back
+                self._finish(community_id)
+            else:
+                future.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                raise self._reject(community_id, "timeout") from None
+            raise
+        finally:
+            self._queued_by_community[community_id] -= 1
+            if not self._queued_by_community[community_id]:
+                del self._queued_by_community[community_id]
+
+        ADMISSION_WAIT.observe(time.perf_counter() - start, community=community_id)
+        return AdmissionPermit(self, community_id)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return running and queued counts by community."""
+        return {
+            "running": dict(self._running_by_community),
+            "queued": dict(self._queued_by_community),
+        }
+
+
+_controller: AdmissionController | None = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller, creating it from settings."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            settings = get_settings()
+            _controller = AdmissionController(
+                max_concurrent=settings.agent_max_concurrent_runs,
+                max_per_community=settings.agent_max_concurrent_runs_per_community,
+                max_queue_per_community=settings.agent_max_queued_runs_per_community,
+                queue_timeout_seconds=settings.agent_queue_timeout_seconds,
+            )
+        return _controller
+
+
+def set_admission_controller(controller: AdmissionController | None) -> None:
+    """Replace the process-wide admission controller (for tests)."""
+    global _controller
+    with _controller_lock:
+        _controller = controller
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export running and queued agent runs by community."""
+    controller = _controller
+    if controller is None:
+        return []
+    stats = controller.stats()
+    samples = [
+        Sample(
+            "osa_agent_runs_in_progress",
+            "gauge",
+            "Agent runs holding an admission slot.",
+            count,
+            {"community": community_id},
+        )
+        for community_id, count in stats["running"].items()
+    ]
+    samples.extend(
+        Sample(
+            "osa_admission_queue_depth",
+            "gauge",
+            "Agent requests waiting for an admission slot.",
+            count,
+            {"community": community_id},
+        )
+        for community_id, count in stats["queued"].items()
+    )
+    return samples
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
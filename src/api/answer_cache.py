@@ -0,0 +1,162 @@
+"""Opt-in answer cache for the stateless /ask endpoint.
+
+Each community's suggested questions are asked over and over, and every
+repeat pays for an LLM run with tool calls. With
+``ASK_ANSWER_CACHE_TTL_SECONDS`` > 0, successful /ask answers are cached
+in process. Keys are built from the community, model, normalized question,
+page context, origin and response format, plus the community's knowledge
+generation. Streaming answers are stored as their SSE frames and replayed
+as-is, so clients see the same events as for a live run.
+
+The generation is bumped whenever a sync for the community succeeds or its
+preloaded docs change. That also drops the community's cached answers. An
+answer from a run that started before the bump is not stored, because its
+generation is no longer current. Syncs run in another process (the CLI)
+are not seen; the TTL bounds how stale those answers can get.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from src.api.singleflight import flight_key
+from src.metrics.prometheus import REGISTRY, Sample
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class _Entry:
+    community_id: str
+    value: Any
+    expires_at: float
+
+
+class AnswerCache:
+    """Thread-safe TTL cache of answers with LRU eviction and per-community generations."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def generation(self, community_id: str) -> int:
+        """Return the community's current knowledge generation."""
+        with self._lock:
+            return self._generations.get(community_id, 0)
+
+    @staticmethod
+    def key_for(community_id: str, generation: int, *parts: Any) -> str:
+        """Build a cache key for a community, generation and request parts."""
+        return flight_key(community_id, generation, *parts)
+
+    def get(self, key: str) -> Any | None:
+        """Return a fresh cached value, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self, community_id: str, generation: int, key: str, value: Any, ttl_seconds: float
+    ) -> bool:
+        """Store a value unless the community's generation moved on.
+
+        Returns:
+            True if stored.
+        """
+        if ttl_seconds <= 0:
+            return False
+        with self._lock:
+            if self._generations.get(community_id, 0) != generation:
+                return False
+            self._entries[key] = _Entry(community_id, value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stores += 1
+            return True
+
+    def invalidate(self, community_id: str) -> int:
+        """Bump a community's generation and drop its cached answers.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            self._generations[community_id] = self._generations.get(community_id, 0) + 1
+            keys = [k for k, e in self._entries.items() if e.community_id == community_id]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += 1
+        if keys:
+            logger.info("Dropped %d cached answers for %s", len(keys), community_id)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries (generations are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return entry count and hit/miss/store/invalidation counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "invalidations": self.invalidations,
+            }
+
+
+answer_cache = AnswerCache()
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export /ask answer cache counters."""
+    stats = answer_cache.stats()
+    return [
+        Sample("osa_ask_answer_cache_entries", "gauge", "Cached /ask answers.", stats["entries"]),
+        Sample(
+            "osa_ask_answer_cache_hits_total",
+            "counter",
+            "/ask requests answered from the answer cache.",
+            stats["hits"],
+        ),
+        Sample(
+            "osa_ask_answer_cache_misses_total",
+            "counter",
+            "/ask answer cache lookups that ran the agent.",
+            stats["misses"],
+        ),
+        Sample(
+            "osa_ask_answer_cache_invalidations_total",
+            "counter",
+            "Answer cache invalidations from syncs and preloaded doc changes.",
+            stats["invalidations"],
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
@@ -138,6 +138,49 @@ class Settings(BaseSettings):
     # Empty databases are automatically seeded on startup when sync is enabled
     sync_enabled: bool = Field(default=True, description="Enable automated knowledge sync")
 
+    # Chat session storage ("sqlite" shares sessions between workers on one host)
+    session_backend: str = Field(
+        default="memory",
+        pattern="^(memory|sqlite)$",
+        description="Chat session store: 'memory' (per process) or 'sqlite' (DATA_DIR/sessions.db)",
+    )
+
+    # Public endpoint caching (community config, public metrics)
+    public_cache_ttl_seconds: int = Field(
+        default=60,
+        ge=0,
+        description="TTL for cached public GET responses and their Cache-Control max-age "
+        "(0 disables server-side caching)",
+    )
+
+    # Answer cache for stateless /ask (opt-in)
+    ask_answer_cache_ttl_seconds: int = Field(
+        default=0,
+        ge=0,
+        description="TTL for cached /ask answers (0 disables the cache). Answers are "
+        "invalidated when the community's knowledge sync or preloaded docs change",
+    )
+
+    # Admission control for agent runs (/ask, /chat); 0 means unlimited for
+    # every setting here, including the queue bound and the wait timeout
+    agent_max_concurrent_runs: int = Field(
+        default=32, ge=0, description="Maximum agent runs in progress across all communities"
+    )
+    agent_max_concurrent_runs_per_community: int = Field(
+        default=8, ge=0, description="Maximum agent runs in progress per community"
+    )
+    agent_max_queued_runs_per_community: int = Field(
+        default=32,
+        ge=0,
+        description="Requests per community that may wait for a run slot before 429s",
+    )
+    agent_queue_timeout_seconds: float = Field(
+        default=15.0,
+        ge=0,
+        description="How long a request waits for a run slot before a 429 with Retry-After "
+        "(0 waits indefinitely)",
+    )
+
     def parse_admin_keys(self) -> set[str]:
         """Parse API_KEYS into a set of valid admin keys.
 
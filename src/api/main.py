@@ -25,12 +25,21 @@ from src.api.routers import (
 from src.api.routers.health import router as health_router
 from src.api.routers.widget_test import router as widget_test_router
 from src.api.scheduler import start_scheduler, stop_scheduler
+from src.api.sessions import close_session_store
 from src.assistants import discover_assistants, registry
 from src.core.logging import configure_secure_logging
-from src.knowledge.db import reset_active_mirror, set_active_mirror
+from src.knowledge.db import (
+    close_read_connections,
+    reset_active_mirror,
+    set_active_mirror,
+    shutdown_db_executor,
+)
 from src.knowledge.mirror import CorruptMirrorError, get_mirror
-from src.metrics.db import init_metrics_db
+from src.metrics.budget import rehydrate_spend_tracker
+from src.metrics.db import init_metrics_db, metrics_connection
 from src.metrics.middleware import MetricsMiddleware
+from src.metrics.writer import start_metrics_writer, stop_metrics_writer
+from src.tools.fetcher import shutdown_fetcher
 
 # Must run before any getLogger() calls to ensure handlers with
 # SecureFormatter are installed on the root logger first.
@@ -72,6 +81,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Initialize metrics database (non-critical; degrade gracefully if unavailable)
     try:
         init_metrics_db()
+        with metrics_connection() as conn:
+            rehydrate_spend_tracker(conn)
+        start_metrics_writer()
     except Exception:
         logger.error(
             "Failed to initialize metrics database. Metrics collection will be unavailable. "
@@ -90,6 +102,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down %s", settings.app_name)
     stop_scheduler()
+    stop_metrics_writer()
+    close_session_store()
+    shutdown_db_executor()
+    close_read_connections()
+    shutdown_fetcher()
 
 
 def _wildcard_origin_to_regex(pattern: str) -> str:
@@ -0,0 +1,169 @@
+"""Short-TTL response cache with ETag support for public GET endpoints.
+
+Public endpoints (community config, public metrics) are hit on every widget
+and dashboard page load but only change slowly. Responses are cached in
+process for ``PUBLIC_CACHE_TTL_SECONDS`` keyed by path and query string, so
+bursts of traffic are served without touching SQLite.
+
+Every response carries a strong ETag and ``Cache-Control: public, max-age``
+so browsers, widgets and the Cloudflare worker can cache as well; a matching
+``If-None-Match`` returns 304 without a body.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.api.config import get_settings
+from src.metrics.prometheus import REGISTRY, Sample
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized JSON response body with its ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe TTL cache of JSON response bodies with LRU eviction."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        """Cache key: path plus query parameters in sorted order."""
+        params = sorted(request.query_params.multi_items())
+        query = "&".join(f"{k}={v}" for k, v in params)
+        return f"{request.url.path}?{query}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return a fresh cached entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, ttl_seconds: float) -> CachedResponse:
+        """Store a body and return the entry (with its ETag)."""
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = CachedResponse(body=body, etag=etag, expires_at=time.monotonic() + ttl_seconds)
+        if ttl_seconds <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def respond(self, request: Request, build: Callable[[], Any]) -> Response:
+        """Serve a cached JSON response, building and caching it on a miss.
+
+        Exceptions from ``build`` (e.g. HTTPException for 503) propagate and
+        nothing is cached.
+
+        Args:
+            request: The incoming request (for the cache key and If-None-Match).
+            build: Returns the JSON-serializable response content.
+        """
+        ttl = get_settings().public_cache_ttl_seconds
+        key = self.key_for(request)
+
+        entry = self.get(key) if ttl > 0 else None
+        if entry is None:
+            content = jsonable_encoder(build())
+            body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+            entry = self.put(key, body, ttl)
+
+        headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={max(ttl, 0)}"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict[str, int]:
+        """Return entry count and hit/miss/304 counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+public_response_cache = ResponseCache()
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export public response cache counters."""
+    stats = public_response_cache.stats()
+    return [
+        Sample(
+            "osa_public_cache_hits_total", "counter", "Public response cache hits.", stats["hits"]
+        ),
+        Sample(
+            "osa_public_cache_misses_total",
+            "counter",
+            "Public response cache misses.",
+            stats["misses"],
+        ),
+        Sample(
+            "osa_public_cache_not_modified_total",
+            "counter",
+            "Public responses answered with 304 Not Modified.",
+            stats["not_modified"],
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
@@ -4,42 +4,62 @@ Creates parameterized routers for any registered community.
 Each community gets endpoints like /{community_id}/ask, /{community_id}/chat, etc.
 """
 
+import asyncio
 import hashlib
-import json
 import logging
 import os
 import re
 import sqlite3
 import time
 import uuid
-from collections.abc import AsyncGenerator
-from dataclasses import dataclass
-from datetime import UTC, datetime
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import aclosing, suppress
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
 from fastapi import APIRouter, Header, HTTPException, Query, Request
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.messages.utils import count_tokens_approximately
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, SecretStr, field_validator
+from starlette.background import BackgroundTask
 
 from src.agents.base import DEFAULT_MAX_CONVERSATION_TOKENS
+from src.api.admission import AdmissionPermit, AdmissionRejected, get_admission_controller
+from src.api.answer_cache import answer_cache
 from src.api.config import get_settings
+from src.api.response_cache import public_response_cache
 from src.api.routers.health import compute_community_health
 from src.api.security import AuthScope, RequireAuth, RequireScopedAuth
+from src.api.sessions import (
+    ChatSession,
+    SessionInfo,
+    delete_session,
+    get_or_create_session,  # noqa: F401 - re-exported for callers of this module
+    get_session,
+    list_sessions,
+    run_session_io,
+    start_turn,
+)
+from src.api.singleflight import Subscription, ask_flights, flight_key, normalize_question
+from src.api.sse import KEEPALIVE_FRAME, TOOL_OUTPUT_PREVIEW_CHARS, SSEEncoder, ToolOutputMode
 from src.assistants import registry
 from src.assistants.community import CommunityAssistant
 from src.assistants.community import PageContext as AgentPageContext
+from src.assistants.pool import AssistantPoolKey, get_assistant_pool
 from src.assistants.registry import AssistantInfo
 from src.core.config.community import WidgetConfig
 from src.core.services.litellm_llm import create_openrouter_llm
+from src.metrics.budget import get_spend_tracker
+from src.metrics.callbacks import PrometheusCallbackHandler
 from src.metrics.cost import COST_BLOCK_THRESHOLD, COST_WARN_THRESHOLD, MODEL_PRICING, estimate_cost
 from src.metrics.db import (
     RequestLogEntry,
+    cache_token_usage,
+    extract_cache_token_usage,
     extract_token_usage,
     extract_tool_names,
-    log_request,
     metrics_connection,
     now_iso,
 )
@@ -51,6 +71,8 @@ from src.metrics.queries import (
     get_quality_summary,
     get_usage_stats,
 )
+from src.metrics.rollups import ANSWER_CACHE_KEY_SOURCE
+from src.metrics.writer import record_request
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +135,13 @@ class ChatRequest(BaseModel):
         default=None,
         description="Optional context about the page where the widget is embedded",
     )
+    tool_output: ToolOutputMode = Field(
+        default="full",
+        description=(
+            "Tool output in streamed tool_end events: 'full', 'truncated' "
+            f"(first {TOOL_OUTPUT_PREVIEW_CHARS} characters) or 'none' (name only)"
+        ),
+    )
 
 
 class AskRequest(BaseModel):
@@ -128,6 +157,13 @@ class AskRequest(BaseModel):
         default=None,
         description="Optional model override (OpenRouter format: creator/model-name). Requires BYOK.",
     )
+    tool_output: ToolOutputMode = Field(
+        default="full",
+        description=(
+            "Tool output in streamed tool_end events: 'full', 'truncated' "
+            f"(first {TOOL_OUTPUT_PREVIEW_CHARS} characters) or 'none' (name only)"
+        ),
+    )
 
 
 class ToolCallInfo(BaseModel):
@@ -156,16 +192,6 @@ class AskResponse(BaseModel):
     )
 
 
-class SessionInfo(BaseModel):
-    """Information about a chat session."""
-
-    session_id: str = Field(..., description="Unique session identifier", min_length=1)
-    community_id: str = Field(..., description="Community this session belongs to", min_length=1)
-    message_count: int = Field(..., description="Number of messages in session", ge=0)
-    created_at: str = Field(..., description="ISO timestamp when session was created")
-    last_active: str = Field(..., description="ISO timestamp of last activity")
-
-
 class WidgetConfigResponse(BaseModel):
     """Widget display configuration returned to the frontend."""
 
@@ -197,181 +223,6 @@ class CommunityConfigResponse(BaseModel):
     status: str = Field(..., description="Health status: healthy, degraded, or error")
 
 
-# ---------------------------------------------------------------------------
-# Session Management (In-Memory, per-community isolation)
-# ---------------------------------------------------------------------------
-
-# Session limits and constraints
-MAX_SESSIONS_PER_COMMUNITY = 1000  # Prevent memory exhaustion
-SESSION_TTL_HOURS = 24  # Auto-delete inactive sessions after 24h
-MAX_MESSAGES_PER_SESSION = 100  # Limit conversation length
-MAX_MESSAGE_LENGTH = 10000  # Max characters per message
-
-
-class ChatSession:
-    """A chat session with message history.
-
-    Enforces constraints:
-    - Max messages per session: 100
-    - Max message length: 10,000 characters
-    - TTL: 24 hours from last activity
-    """
-
-    def __init__(self, session_id: str, community_id: str) -> None:
-        self.session_id = session_id
-        self.community_id = community_id
-        self.messages: list[HumanMessage | AIMessage] = []
-        self.created_at = datetime.now(UTC)
-        self.last_active = self.created_at
-
-    def add_user_message(self, content: str) -> None:
-        """Add a user message to history.
-
-        Raises:
-            ValueError: If message exceeds length limit or session at max messages.
-        """
-        if len(content) > MAX_MESSAGE_LENGTH:
-            raise ValueError(f"Message too long ({len(content)} chars). Max: {MAX_MESSAGE_LENGTH}")
-        if len(self.messages) >= MAX_MESSAGES_PER_SESSION:
-            raise ValueError(
-                f"Session has reached max messages ({MAX_MESSAGES_PER_SESSION}). "
-                "Start a new session."
-            )
-        self.messages.append(HumanMessage(content=content))
-        self.last_active = datetime.now(UTC)
-
-    def add_assistant_message(self, content: str) -> None:
-        """Add an assistant message to history.
-
-        Raises:
-            ValueError: If message exceeds length limit or session at max messages.
-        """
-        if len(content) > MAX_MESSAGE_LENGTH:
-            raise ValueError(f"Message too long ({len(content)} chars). Max: {MAX_MESSAGE_LENGTH}")
-        if len(self.messages) >= MAX_MESSAGES_PER_SESSION:
-            raise ValueError(
-                f"Session has reached max messages ({MAX_MESSAGES_PER_SESSION}). "
-                "Start a new session."
-            )
-        self.messages.append(AIMessage(content=content))
-        self.last_active = datetime.now(UTC)
-
-    def is_expired(self) -> bool:
-        """Check if session has exceeded TTL."""
-        age_hours = (datetime.now(UTC) - self.last_active).total_seconds() / 3600
-        return age_hours > SESSION_TTL_HOURS
-
-    def to_info(self) -> SessionInfo:
-        """Convert to SessionInfo model."""
-        return SessionInfo(
-            session_id=self.session_id,
-            community_id=self.community_id,
-            message_count=len(self.messages),
-            created_at=self.created_at.isoformat(),
-            last_active=self.last_active.isoformat(),
-        )
-
-
-# Global session store: {community_id: {session_id: ChatSession}}
-_community_sessions: dict[str, dict[str, ChatSession]] = {}
-
-
-def _get_session_store(community_id: str) -> dict[str, ChatSession]:
-    """Get or create session store for a community."""
-    if community_id not in _community_sessions:
-        _community_sessions[community_id] = {}
-    return _community_sessions[community_id]
-
-
-def _evict_expired_sessions(community_id: str) -> int:
-    """Remove expired sessions from store. Returns count of evicted sessions."""
-    store = _get_session_store(community_id)
-    expired = [sid for sid, session in store.items() if session.is_expired()]
-    for sid in expired:
-        del store[sid]
-    if expired:
-        logger.info("Evicted %d expired sessions from community %s", len(expired), community_id)
-    return len(expired)
-
-
-def _evict_lru_session(community_id: str) -> None:
-    """Remove least-recently-used session when limit is reached."""
-    store = _get_session_store(community_id)
-    if not store:
-        return
-
-    # Find session with oldest last_active timestamp
-    lru_id = min(store.keys(), key=lambda sid: store[sid].last_active)
-    del store[lru_id]
-    logger.warning(
-        "Evicted LRU session %s from community %s (limit: %d)",
-        lru_id,
-        community_id,
-        MAX_SESSIONS_PER_COMMUNITY,
-    )
-
-
-def get_or_create_session(community_id: str, session_id: str | None) -> ChatSession:
-    """Get existing session or create a new one.
-
-    Enforces session limits:
-    - Evicts expired sessions (TTL)
-    - Evicts LRU session if at capacity
-    - Max sessions per community: 1000
-    """
-    store = _get_session_store(community_id)
-
-    # Try to get existing session
-    if session_id and session_id in store:
-        session = store[session_id]
-        # Check if expired
-        if session.is_expired():
-            del store[session_id]
-            logger.info("Removed expired session %s", session_id)
-        else:
-            return session
-
-    # Evict expired sessions before creating new one
-    _evict_expired_sessions(community_id)
-
-    # If at capacity, evict LRU
-    if len(store) >= MAX_SESSIONS_PER_COMMUNITY:
-        _evict_lru_session(community_id)
-
-    # Create new session
-    new_id = session_id or str(uuid.uuid4())
-    session = ChatSession(new_id, community_id)
-    store[new_id] = session
-    return session
-
-
-def get_session(community_id: str, session_id: str) -> ChatSession | None:
-    """Get a session by ID, returns None if not found or expired."""
-    store = _get_session_store(community_id)
-    session = store.get(session_id)
-    if session and session.is_expired():
-        del store[session_id]
-        logger.info("Removed expired session %s", session_id)
-        return None
-    return session
-
-
-def delete_session(community_id: str, session_id: str) -> bool:
-    """Delete a session. Returns True if deleted, False if not found."""
-    store = _get_session_store(community_id)
-    if session_id in store:
-        del store[session_id]
-        return True
-    return False
-
-
-def list_sessions(community_id: str) -> list[ChatSession]:
-    """List all active (non-expired) sessions for a community."""
-    _evict_expired_sessions(community_id)
-    store = _get_session_store(community_id)
-    return list(store.values())
-
-
 # ---------------------------------------------------------------------------
 # Assistant Factory
 # ---------------------------------------------------------------------------
@@ -602,6 +453,72 @@ def _select_model(
     return (default_model, default_provider)
 
 
+def _check_budget_limit(community_info: AssistantInfo, key_source: str) -> None:
+    """Reject requests on platform or community keys once a budget limit is reached.
+
+    Reads the in-memory spend counters, so the check is O(1) and reflects
+    every request logged by this process, not just the last scheduled check.
+    BYOK requests are never limited.
+
+    Args:
+        community_info: Registry entry for the community.
+        key_source: One of "byok", "community", or "platform".
+
+    Raises:
+        HTTPException(429): If the daily or monthly budget has been reached.
+    """
+    if key_source == "byok":
+        return
+    config = community_info.community_config
+    if not config or not config.budget:
+        return
+
+    status = get_spend_tracker().status(community_info.id, config.budget)
+    if not (status.daily_exceeded or status.monthly_exceeded):
+        return
+
+    period = "daily" if status.daily_exceeded else "monthly"
+    logger.warning(
+        "Rejecting %s request for %s: %s budget reached (daily $%.2f, monthly $%.2f)",
+        key_source,
+        community_info.id,
+        period,
+        status.daily_spend_usd,
+        status.monthly_spend_usd,
+    )
+    raise HTTPException(
+        status_code=429,
+        detail=(
+            f"The {period} budget for '{community_info.id}' has been reached. "
+            "Please try again later, or provide your own API key via the "
+            "X-OpenRouter-Key header. Get a key at: https://openrouter.ai/keys"
+        ),
+        headers={"Retry-After": "3600"},
+    )
+
+
+async def _admit_agent_run(community_id: str) -> AdmissionPermit:
+    """Wait for an agent run slot for the community.
+
+    The caller must release the permit when the run ends.
+
+    Raises:
+        HTTPException(429): If the community's wait queue is full or the wait
+            timed out.
+    """
+    try:
+        return await get_admission_controller().acquire(community_id)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=(
+                f"The '{community_id}' assistant is handling too many requests. "
+                "Please try again shortly."
+            ),
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+
+
 def _check_model_cost(model: str, key_source: str) -> None:
     """Check if a model's cost exceeds platform thresholds.
 
@@ -706,13 +623,34 @@ def _get_cache_user_id(community_id: str, api_key: str | None, user_id: str | No
 
 @dataclass
 class AssistantWithMetrics:
-    """Community assistant bundled with metadata for metrics logging."""
+    """Community assistant bundled with metadata for metrics logging.
+
+    The assistant is shared through the assistant pool; ``configurable``
+    carries this request's API key, cache user id and page context.
+    """
 
     assistant: CommunityAssistant
     model: str
     key_source: str
     langfuse_config: dict | None = None
     langfuse_trace_id: str | None = None
+    configurable: dict[str, Any] = field(default_factory=dict)
+    community_id: str = ""
+
+    @property
+    def run_config(self) -> dict[str, Any]:
+        """Runnable config for this request: callbacks plus per-request values.
+
+        Callbacks are LangFuse tracing (when configured) and the Prometheus
+        handler timing LLM first tokens and tool calls.
+        """
+        config = dict(self.langfuse_config or {})
+        config["callbacks"] = [
+            *config.get("callbacks", []),
+            PrometheusCallbackHandler(self.community_id),
+        ]
+        config["configurable"] = {**config.get("configurable", {}), **self.configurable}
+        return config
 
 
 def create_community_assistant(
@@ -724,7 +662,11 @@ def create_community_assistant(
     preload_docs: bool = True,
     page_context: PageContext | None = None,
 ) -> AssistantWithMetrics:
-    """Create a community assistant instance with authorization checks.
+    """Get a pooled community assistant with authorization checks.
+
+    Assistants are built once per (community, model, provider, key source)
+    and reused; the API key, cache user id and page context for this request
+    are returned in ``configurable`` and must be passed via ``run_config``.
 
     **Authorization:**
     - If BYOK provided -> always allowed
@@ -745,8 +687,8 @@ def create_community_assistant(
         page_context: Optional context about the page where the widget is embedded
 
     Returns:
-        AssistantWithMetrics containing the assistant, resolved model, and key source.
-        Access the assistant via .assistant attribute.
+        AssistantWithMetrics containing the assistant, resolved model, key source
+        and per-request runnable config. Access the assistant via .assistant attribute.
 
     Raises:
         ValueError: If community_id is not registered
@@ -774,6 +716,9 @@ def create_community_assistant(
     # Block expensive models on platform/community keys
     _check_model_cost(selected_model, key_source)
 
+    # Stop spending platform/community keys once the budget is used up
+    _check_budget_limit(community_info, key_source)
+
     logger.debug(
         "Using model %s",
         selected_model,
@@ -783,14 +728,6 @@ def create_community_assistant(
     # Determine user_id for prompt caching optimization
     cache_user_id = _get_cache_user_id(community_id, byok, user_id)
 
-    model = create_openrouter_llm(
-        model=selected_model,
-        api_key=effective_api_key,
-        temperature=settings.llm_temperature,
-        provider=selected_provider,
-        user_id=cache_user_id,
-    )
-
     # Convert Pydantic PageContext to agent's dataclass PageContext
     agent_page_context = None
     if page_context:
@@ -800,13 +737,43 @@ def create_community_assistant(
             widget_instructions=page_context.widget_instructions,
         )
 
-    assistant = registry.create_assistant(
-        community_id,
-        model=model,
+    community_config = community_info.community_config
+    pool_key = AssistantPoolKey(
+        community_id=community_id,
+        model=selected_model,
+        provider=selected_provider,
+        key_source=key_source,
         preload_docs=preload_docs,
-        page_context=agent_page_context,
+        page_tool=bool(
+            community_config
+            and community_config.enable_page_context
+            and agent_page_context
+            and agent_page_context.url
+        ),
     )
 
+    def build_assistant() -> CommunityAssistant:
+        # The API key and user id are supplied per request through the runnable
+        # config, so the shared model is built without them.
+        model = create_openrouter_llm(
+            model=selected_model,
+            temperature=settings.llm_temperature,
+            provider=selected_provider,
+        )
+        return registry.create_assistant(
+            community_id,
+            model=model,
+            preload_docs=preload_docs,
+            page_tool=pool_key.page_tool,
+        )
+
+    assistant = get_assistant_pool().get_or_create(pool_key, build_assistant)
+    configurable: dict[str, Any] = {
+        "api_key": SecretStr(effective_api_key),
+        "user_id": cache_user_id,
+        "page_context": agent_page_context,
+    }
+
     # Wire LangFuse tracing if configured
     langfuse_config = None
     langfuse_trace_id = None
@@ -836,6 +803,8 @@ def create_community_assistant(
         key_source=key_source,
         langfuse_config=langfuse_config,
         langfuse_trace_id=langfuse_trace_id,
+        configurable=configurable,
+        community_id=community_id,
     )
 
 
@@ -849,6 +818,8 @@ class AgentResult:
     input_tokens: int
     output_tokens: int
     total_tokens: int
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
 
 
 def _extract_agent_result(result: dict) -> AgentResult:
@@ -870,6 +841,7 @@ def _extract_agent_result(result: dict) -> AgentResult:
     ]
 
     inp, out, total = extract_token_usage(result)
+    cache_read, cache_creation = extract_cache_token_usage(result)
     return AgentResult(
         response_content=response_content,
         tool_calls_info=tool_calls_info,
@@ -877,6 +849,8 @@ def _extract_agent_result(result: dict) -> AgentResult:
         input_tokens=inp,
         output_tokens=out,
         total_tokens=total,
+        cache_read_tokens=cache_read,
+        cache_creation_tokens=cache_creation,
     )
 
 
@@ -892,6 +866,8 @@ def _set_metrics_on_request(
         "input_tokens": agent_result.input_tokens,
         "output_tokens": agent_result.output_tokens,
         "total_tokens": agent_result.total_tokens,
+        "cache_read_tokens": agent_result.cache_read_tokens,
+        "cache_creation_tokens": agent_result.cache_creation_tokens,
         "estimated_cost": estimate_cost(
             awm.model, agent_result.input_tokens, agent_result.output_tokens
         ),
@@ -1013,10 +989,52 @@ def create_community_router(community_id: str) -> APIRouter:
         """
         # Extract origin for authorization
         origin = http_request.headers.get("origin")
+        sse_headers = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
+        key_parts = _ask_key_parts(body, origin)
+
+        # Cached answers (opt-in) skip the agent entirely. BYOK requests are
+        # never cached or shared; they always run on the caller's own key.
+        cache_ttl = get_settings().ask_answer_cache_ttl_seconds
+        cache_key = None
+        generation = 0
+        if cache_ttl > 0 and not x_openrouter_key:
+            generation = answer_cache.generation(community_id)
+            cache_key = answer_cache.key_for(community_id, generation, *key_parts)
+            if (cached := answer_cache.get(cache_key)) is not None:
+                if body.stream:
+                    return StreamingResponse(
+                        _replay_cached_ask(cached, community_id, http_request),
+                        media_type="text/event-stream",
+                        headers=sse_headers,
+                    )
+                http_request.state.metrics_agent_data = {
+                    "key_source": ANSWER_CACHE_KEY_SOURCE,
+                    "stream": False,
+                }
+                return AskResponse.model_validate(cached)
+
+        # Identical concurrent streaming questions share one run
+        flight = None
+        if body.stream and not x_openrouter_key:
+            flight = flight_key(community_id, *key_parts)
+            if shared := ask_flights.join(flight):
+                subscription = shared.subscribe()
+                return StreamingResponse(
+                    _stream_shared_ask(subscription, community_id, http_request),
+                    media_type="text/event-stream",
+                    headers=sse_headers,
+                    # Covers a body that is never started (client gone first)
+                    background=BackgroundTask(subscription.close),
+                )
+
+        permit = await _admit_agent_run(community_id)
 
         if body.stream:
-            return StreamingResponse(
-                _stream_ask_response(
+            # Until the permit is handed to a response or flight, any failure
+            # must give the slot back (release is idempotent)
+            try:
+                sse = SSEEncoder(tool_output=body.tool_output)
+                stream = _stream_ask_response(
                     community_id,
                     body.question,
                     x_openrouter_key,
@@ -1025,13 +1043,40 @@ def create_community_router(community_id: str) -> APIRouter:
                     body.page_context,
                     body.model,
                     http_request=http_request,
-                ),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                },
-            )
+                    # A shared run is cancelled when its last subscriber leaves instead
+                    watch_disconnect=flight is None,
+                    sse=sse,
+                )
+                if cache_key is not None:
+                    stream = _cache_ask_frames(
+                        stream, sse, community_id, generation, cache_key, cache_ttl
+                    )
+                if flight is not None:
+                    # An identical request may have started a run while this one waited
+                    if shared := ask_flights.join(flight):
+                        permit.release()
+                        await stream.aclose()
+                        subscription = shared.subscribe()
+                        chunks = _stream_shared_ask(subscription, community_id, http_request)
+                    else:
+                        shared = ask_flights.start(flight, stream, on_done=permit.release)
+                        chunks = subscription = shared.subscribe()
+                    return StreamingResponse(
+                        chunks,
+                        media_type="text/event-stream",
+                        headers=sse_headers,
+                        background=BackgroundTask(subscription.close),
+                    )
+                return StreamingResponse(
+                    _release_when_done(stream, permit),
+                    media_type="text/event-stream",
+                    headers=sse_headers,
+                    # Covers a stream that is never started (client gone before the body)
+                    background=BackgroundTask(permit.release),
+                )
+            except BaseException:
+                permit.release()
+                raise
 
         try:
             awm = create_community_assistant(
@@ -1043,12 +1088,17 @@ def create_community_router(community_id: str) -> APIRouter:
                 page_context=body.page_context,
             )
             messages = [HumanMessage(content=body.question)]
-            result = await awm.assistant.ainvoke(messages, config=awm.langfuse_config)
+            result = await awm.assistant.ainvoke(messages, config=awm.run_config)
 
             ar = _extract_agent_result(result)
             _set_metrics_on_request(http_request, awm, ar)
 
-            return AskResponse(answer=ar.response_content, tool_calls=ar.tool_calls_info)
+            response = AskResponse(answer=ar.response_content, tool_calls=ar.tool_calls_info)
+            if cache_key is not None and response.answer:
+                answer_cache.put(
+                    community_id, generation, cache_key, response.model_dump(), cache_ttl
+                )
+            return response
 
         except HTTPException:
             raise
@@ -1063,6 +1113,8 @@ def create_community_router(community_id: str) -> APIRouter:
                 status_code=500,
                 detail="Internal server error. Please contact support if the issue persists.",
             ) from e
+        finally:
+            permit.release()
 
     @router.post(
         "/chat",
@@ -1098,34 +1150,49 @@ def create_community_router(community_id: str) -> APIRouter:
         # Extract origin for authorization
         origin = http_request.headers.get("origin")
 
-        session = get_or_create_session(community_id, body.session_id)
-        user_id = x_user_id or session.session_id
+        # Admit before touching the session so a 429 leaves it unchanged
+        permit = await _admit_agent_run(community_id)
 
-        # Add user message with constraint validation
+        # Until the permit is handed to a response, any failure (a locked
+        # session database, a cancelled request) must give the slot back
         try:
-            session.add_user_message(body.message)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e)) from e
-
-        if body.stream:
-            return StreamingResponse(
-                _stream_chat_response(
-                    community_id,
-                    session,
-                    x_openrouter_key,
-                    origin,
-                    user_id,
-                    body.model,
-                    page_context=body.page_context,
-                    http_request=http_request,
-                ),
-                media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive",
-                    "X-Session-ID": session.session_id,
-                },
-            )
+            # Add user message with constraint validation
+            try:
+                session = await run_session_io(
+                    start_turn, community_id, body.session_id, body.message
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            user_id = x_user_id or session.session_id
+
+            if body.stream:
+                return StreamingResponse(
+                    _release_when_done(
+                        _stream_chat_response(
+                            community_id,
+                            session,
+                            x_openrouter_key,
+                            origin,
+                            user_id,
+                            body.model,
+                            page_context=body.page_context,
+                            http_request=http_request,
+                            tool_output=body.tool_output,
+                        ),
+                        permit,
+                    ),
+                    media_type="text/event-stream",
+                    headers={
+                        "Cache-Control": "no-cache",
+                        "Connection": "keep-alive",
+                        "X-Session-ID": session.session_id,
+                    },
+                    # Covers a stream that is never started (client gone before the body)
+                    background=BackgroundTask(permit.release),
+                )
+        except BaseException:
+            permit.release()
+            raise
 
         try:
             awm = create_community_assistant(
@@ -1136,14 +1203,14 @@ def create_community_router(community_id: str) -> APIRouter:
                 requested_model=body.model,
                 page_context=body.page_context,
             )
-            result = await awm.assistant.ainvoke(session.messages, config=awm.langfuse_config)
+            result = await awm.assistant.ainvoke(session.messages, config=awm.run_config)
 
             ar = _extract_agent_result(result)
             _set_metrics_on_request(http_request, awm, ar)
 
             # Add assistant message with constraint validation
             try:
-                session.add_assistant_message(ar.response_content)
+                await run_session_io(session.add_assistant_message, ar.response_content)
             except ValueError as e:
                 logger.error("Session limit exceeded: %s", e)
                 raise HTTPException(
@@ -1175,11 +1242,13 @@ def create_community_router(community_id: str) -> APIRouter:
                 status_code=500,
                 detail="Internal server error. Please contact support if the issue persists.",
             ) from e
+        finally:
+            permit.release()
 
     @router.get("/sessions/{session_id}", response_model=SessionInfo)
     async def get_session_info(session_id: str, _auth: RequireAuth) -> SessionInfo:
         """Get information about a chat session."""
-        session = get_session(community_id, session_id)
+        session = await run_session_io(get_session, community_id, session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         return session.to_info()
@@ -1187,78 +1256,85 @@ def create_community_router(community_id: str) -> APIRouter:
     @router.delete("/sessions/{session_id}")
     async def delete_session_endpoint(session_id: str, _auth: RequireAuth) -> dict[str, str]:
         """Delete a chat session."""
-        if not delete_session(community_id, session_id):
+        if not await run_session_io(delete_session, community_id, session_id):
             raise HTTPException(status_code=404, detail="Session not found")
         return {"status": "deleted", "session_id": session_id}
 
     @router.get("/sessions", response_model=list[SessionInfo])
     async def list_sessions_endpoint(_auth: RequireAuth) -> list[SessionInfo]:
         """List all active chat sessions for this community."""
-        return [session.to_info() for session in list_sessions(community_id)]
+        sessions = await run_session_io(list_sessions, community_id)
+        return [session.to_info() for session in sessions]
 
     @router.get("", response_model=CommunityConfigResponse)
     @router.get("/", response_model=CommunityConfigResponse, include_in_schema=False)
-    async def get_community_config() -> CommunityConfigResponse:
+    async def get_community_config(request: Request) -> Response:
         """Get community configuration including default model settings.
 
         Returns community information and model configuration that the
         frontend widget uses to display settings and defaults.
 
         No authentication required - this is public configuration info.
-        """
-        settings = get_settings()
 
-        # Determine default model: community-specific or platform default
-        default_model = settings.default_model
-        default_provider = settings.default_model_provider
-
-        if info.community_config and info.community_config.default_model:
-            default_model = info.community_config.default_model
-            default_provider = info.community_config.default_model_provider
+        Responses are cached briefly and carry an ETag (see src.api.response_cache).
+        """
 
-        # Validate required configuration
-        if not default_model:
-            logger.error(
-                "No default model configured for community %s (platform: %s, community: %s)",
-                info.id,
-                settings.default_model,
-                info.community_config.default_model if info.community_config else None,
-            )
-            raise HTTPException(
-                status_code=500,
-                detail="Community configuration incomplete: no default model configured",
-            )
+        def build() -> CommunityConfigResponse:
+            settings = get_settings()
 
-        # Resolve widget config with defaults applied
-        widget_cfg = (
-            info.community_config.widget if info.community_config else None
-        ) or WidgetConfig()
+            # Determine default model: community-specific or platform default
+            default_model = settings.default_model
+            default_provider = settings.default_model_provider
 
-        # Convention-based logo: if no explicit logo_url, check for logo file
-        conv_logo = convention_logo_url(community_id, widget_cfg)
+            if info.community_config and info.community_config.default_model:
+                default_model = info.community_config.default_model
+                default_provider = info.community_config.default_model_provider
 
-        # Compute lightweight health status for public display
-        health_status = "error"
-        if info.community_config:
-            try:
-                health_status = compute_community_health(info.community_config)["status"]
-            except (AttributeError, KeyError, TypeError) as e:
+            # Validate required configuration
+            if not default_model:
                 logger.error(
-                    "Failed to compute health for community %s: %s",
+                    "No default model configured for community %s (platform: %s, community: %s)",
                     info.id,
-                    e,
-                    exc_info=True,
+                    settings.default_model,
+                    info.community_config.default_model if info.community_config else None,
+                )
+                raise HTTPException(
+                    status_code=500,
+                    detail="Community configuration incomplete: no default model configured",
                 )
 
-        return CommunityConfigResponse(
-            id=info.id,
-            name=info.name,
-            description=info.description,
-            default_model=default_model,
-            default_model_provider=default_provider,
-            widget=WidgetConfigResponse(**widget_cfg.resolve(info.name, logo_url=conv_logo)),
-            status=health_status,
-        )
+            # Resolve widget config with defaults applied
+            widget_cfg = (
+                info.community_config.widget if info.community_config else None
+            ) or WidgetConfig()
+
+            # Convention-based logo: if no explicit logo_url, check for logo file
+            conv_logo = convention_logo_url(community_id, widget_cfg)
+
+            # Compute lightweight health status for public display
+            health_status = "error"
+            if info.community_config:
+                try:
+                    health_status = compute_community_health(info.community_config)["status"]
+                except (AttributeError, KeyError, TypeError) as e:
+                    logger.error(
+                        "Failed to compute health for community %s: %s",
+                        info.id,
+                        e,
+                        exc_info=True,
+                    )
+
+            return CommunityConfigResponse(
+                id=info.id,
+                name=info.name,
+                description=info.description,
+                default_model=default_model,
+                default_model_provider=default_provider,
+                widget=WidgetConfigResponse(**widget_cfg.resolve(info.name, logo_url=conv_logo)),
+                status=health_status,
+            )
+
+        return public_response_cache.respond(request, build)
 
     @router.get("/logo")
     async def get_community_logo() -> FileResponse:
@@ -1382,112 +1458,125 @@ def create_community_router(community_id: str) -> APIRouter:
     # -----------------------------------------------------------------------
 
     @router.get("/metrics/public")
-    async def community_metrics_public() -> dict[str, Any]:
+    async def community_metrics_public(request: Request) -> Response:
         """Get public metrics summary for this community.
 
         Returns request counts, error rate, top tools, and config health.
-        No tokens, costs, or model information exposed.
+        No tokens, costs, or model information exposed. Cached briefly with an ETag.
         """
-        try:
-            with metrics_connection() as conn:
-                result = get_public_community_summary(community_id, conn)
-        except sqlite3.Error:
-            logger.exception("Failed to query public metrics for community %s", community_id)
-            raise HTTPException(
-                status_code=503,
-                detail="Metrics database is temporarily unavailable.",
-            )
 
-        # Add config health alongside usage metrics
-        fallback_health: dict[str, Any] = {
-            "status": "error",
-            "api_key": "missing",
-            "documents": 0,
-            "warnings": ["Community configuration not found"],
-        }
-        if info.community_config:
+        def build() -> dict[str, Any]:
             try:
-                health = compute_community_health(info.community_config)
-                # Sanitize warnings for public endpoint: strip env var names
-                public_warnings = [w for w in health["warnings"] if "Environment variable" not in w]
-                if health["api_key"] == "missing" and not public_warnings:
+                with metrics_connection() as conn:
+                    result = get_public_community_summary(community_id, conn)
+            except sqlite3.Error:
+                logger.exception("Failed to query public metrics for community %s", community_id)
+                raise HTTPException(
+                    status_code=503,
+                    detail="Metrics database is temporarily unavailable.",
+                )
+
+            # Add config health alongside usage metrics
+            fallback_health: dict[str, Any] = {
+                "status": "error",
+                "api_key": "missing",
+                "documents": 0,
+                "warnings": ["Community configuration not found"],
+            }
+            if info.community_config:
+                try:
+                    health = compute_community_health(info.community_config)
+                    # Sanitize warnings for public endpoint: strip env var names
                     public_warnings = [
-                        "API key not configured; using shared platform key. "
-                        "This is for demonstration only and is not sustainable."
+                        w for w in health["warnings"] if "Environment variable" not in w
                     ]
-                result["config_health"] = {
-                    "status": health["status"],
-                    "api_key": health["api_key"],
-                    "documents": health["documents"],
-                    "warnings": public_warnings,
-                }
-            except (AttributeError, KeyError, TypeError) as e:
-                logger.error(
-                    "Failed to compute health for community %s: %s",
-                    community_id,
-                    e,
-                    exc_info=True,
-                )
+                    if health["api_key"] == "missing" and not public_warnings:
+                        public_warnings = [
+                            "API key not configured; using shared platform key. "
+                            "This is for demonstration only and is not sustainable."
+                        ]
+                    result["config_health"] = {
+                        "status": health["status"],
+                        "api_key": health["api_key"],
+                        "documents": health["documents"],
+                        "warnings": public_warnings,
+                    }
+                except (AttributeError, KeyError, TypeError) as e:
+                    logger.error(
+                        "Failed to compute health for community %s: %s",
+                        community_id,
+                        e,
+                        exc_info=True,
+                    )
+                    result["config_health"] = fallback_health
+            else:
                 result["config_health"] = fallback_health
-        else:
-            result["config_health"] = fallback_health
 
-        # Derive available tools from community config
-        if info.community_config:
-            try:
-                config = info.community_config
-                tools = []
-                if config.documentation:
-                    tools.append(f"retrieve_{config.id}_docs")
-                if config.github and config.github.repos:
-                    tools.append(f"search_{config.id}_discussions")
-                    tools.append(f"list_{config.id}_recent")
-                if config.citations and (config.citations.queries or config.citations.dois):
-                    tools.append(f"search_{config.id}_papers")
-                if config.docstrings and config.docstrings.repos:
-                    tools.append(f"search_{config.id}_code_docs")
-                if config.faq_generation and config.mailman:
-                    tools.append(f"search_{config.id}_faq")
-                if config.discourse:
-                    tools.append(f"search_{config.id}_forum")
-                result["available_tools_list"] = tools
-            except (AttributeError, TypeError) as e:
-                logger.error(
-                    "Failed to derive tools for community %s: %s",
-                    community_id,
-                    e,
-                    exc_info=True,
-                )
+            # Derive available tools from community config
+            if info.community_config:
+                try:
+                    config = info.community_config
+                    tools = []
+                    if config.documentation:
+                        tools.append(f"retrieve_{config.id}_docs")
+                    if config.github and config.github.repos:
+                        tools.append(f"search_{config.id}_discussions")
+                        tools.append(f"list_{config.id}_recent")
+                    if config.citations and (config.citations.queries or config.citations.dois):
+                        tools.append(f"search_{config.id}_papers")
+                    if config.docstrings and config.docstrings.repos:
+                        tools.append(f"search_{config.id}_code_docs")
+                    if config.faq_generation and config.mailman:
+                        tools.append(f"search_{config.id}_faq")
+                    if config.discourse:
+                        tools.append(f"search_{config.id}_forum")
+                    result["available_tools_list"] = tools
+                except (AttributeError, TypeError) as e:
+                    logger.error(
+                        "Failed to derive tools for community %s: %s",
+                        community_id,
+                        e,
+                        exc_info=True,
+                    )
+                    result["available_tools_list"] = []
+            else:
                 result["available_tools_list"] = []
-        else:
-            result["available_tools_list"] = []
 
-        return result
+            return result
+
+        return public_response_cache.respond(request, build)
 
     @router.get("/metrics/public/usage")
     async def community_usage_public(
+        request: Request,
         period: str = Query(
             default="daily",
             description="Time bucket period",
             pattern="^(daily|weekly|monthly)$",
         ),
-    ) -> dict[str, Any]:
+    ) -> Response:
         """Get public time-bucketed usage stats for this community.
 
         Returns request counts and errors per time bucket.
-        No tokens or costs exposed.
+        No tokens or costs exposed. Cached briefly with an ETag.
         """
-        try:
-            with metrics_connection() as conn:
-                return get_public_usage_stats(community_id, period, conn)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e)) from e
-        except sqlite3.Error:
-            logger.exception("Failed to query public usage stats for community %s", community_id)
-            raise HTTPException(
-                status_code=503,
-                detail="Metrics database is temporarily unavailable.",
-            )
+
+        def build() -> dict[str, Any]:
+            try:
+                with metrics_connection() as conn:
+                    return get_public_usage_stats(community_id, period, conn)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            except sqlite3.Error:
+                logger.exception(
+                    "Failed to query public usage stats for community %s", community_id
+                )
+                raise HTTPException(
+                    status_code=503,
+                    detail="Metrics database is temporarily unavailable.",
+                )
+
+        return public_response_cache.respond(request, build)
 
     return router
 
@@ -1515,6 +1604,22 @@ def _extract_token_usage(event_data: dict) -> tuple[int, int]:
         return 0, 0
 
 
+def _extract_cache_usage(event_data: dict) -> tuple[int, int]:
+    """Extract prompt-cache read/creation token counts from an on_chat_model_end event.
+
+    Returns (0, 0) when usage metadata is absent or malformed. Never raises.
+    """
+    try:
+        ai_msg = event_data.get("output")
+        usage = getattr(ai_msg, "usage_metadata", None) if ai_msg else None
+        if not usage or not isinstance(usage, dict):
+            return 0, 0
+        return cache_token_usage(usage)
+    except Exception:
+        logger.debug("Failed to extract cache usage from event data", exc_info=True)
+        return 0, 0
+
+
 def _log_streaming_metrics(
     http_request: Request | None,
     community_id: str,
@@ -1525,12 +1630,17 @@ def _log_streaming_metrics(
     status_code: int,
     input_tokens: int = 0,
     output_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    cache_creation_tokens: int = 0,
+    error_message: str | None = None,
+    key_source: str | None = None,
 ) -> None:
     """Log metrics at the end of a streaming response.
 
     Called directly from streaming generators since middleware fires
     before streaming completes. Wrapped in try/except to never disrupt
-    the SSE stream on failure.
+    the SSE stream on failure. ``key_source`` is used when there is no
+    assistant (e.g. answer-cache replays).
     """
     try:
         duration_ms = (time.monotonic() - start_time) * 1000
@@ -1554,7 +1664,7 @@ def _log_streaming_metrics(
             duration_ms=round(duration_ms, 1),
             status_code=status_code,
             model=model,
-            key_source=awm.key_source if awm else None,
+            key_source=awm.key_source if awm else key_source,
             tools_called=tools_called,
             stream=True,
             tool_call_count=len(tools_called),
@@ -1562,9 +1672,12 @@ def _log_streaming_metrics(
             input_tokens=input_tokens if has_tokens else None,
             output_tokens=output_tokens if has_tokens else None,
             total_tokens=total_tokens if has_tokens else None,
+            cache_read_tokens=cache_read_tokens if has_tokens else None,
+            cache_creation_tokens=cache_creation_tokens if has_tokens else None,
             estimated_cost=cost,
+            error_message=error_message,
         )
-        log_request(entry)
+        record_request(entry)
     except Exception:
         logger.exception(
             "Failed to log streaming metrics for %s (community=%s, status=%d)",
@@ -1578,6 +1691,183 @@ def _log_streaming_metrics(
 # Streaming Helpers
 # ---------------------------------------------------------------------------
 
+# Status logged for streams the client abandoned (nginx's "client closed request")
+CLIENT_CLOSED_REQUEST = 499
+
+# How often a running stream checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+
+# How long a stream waits for the next graph event before yielding IDLE_EVENT
+# (to flush coalesced content or send a keep-alive)
+STREAM_IDLE_SECONDS = 0.25
+IDLE_EVENT: dict[str, Any] = {"event": "idle"}
+
+
+class ClientDisconnected(Exception):
+    """The SSE client disconnected while the agent was still running."""
+
+
+def _approx_tokens(chars: int) -> int:
+    """Rough token count for streamed text (about 4 characters per token)."""
+    return (chars + 3) // 4
+
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """Return once the client has disconnected."""
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def _stream_graph_events(
+    graph: Any,
+    state: dict[str, Any],
+    config: dict[str, Any],
+    http_request: Request | None,
+    idle_seconds: float | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield ``astream_events`` for a run, stopping it if the client disconnects.
+
+    A watcher polls the connection while the run is in progress, so a
+    disconnect is noticed during long tool calls too, not only when the
+    next event is written. With ``idle_seconds``, ``IDLE_EVENT`` is yielded
+    each time that long passes without a graph event.
+
+    Closing this generator (on disconnect, on error, or when the caller is
+    cancelled) closes the event stream, which cancels the graph run: the
+    upstream LLM HTTP stream is aborted and async tools are cancelled. Sync
+    tools already running in a worker thread finish in the background and
+    their results are discarded.
+
+    Raises:
+        ClientDisconnected: If the client went away before the run finished.
+    """
+    events = graph.astream_events(state, version="v2", config=config)
+    watcher = asyncio.create_task(_wait_for_disconnect(http_request)) if http_request else None
+    next_event: asyncio.Future[Any] | None = None
+    try:
+        while True:
+            next_event = asyncio.ensure_future(anext(events))
+            waiters = {next_event} if watcher is None else {next_event, watcher}
+            while True:
+                await asyncio.wait(
+                    waiters, timeout=idle_seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+                if watcher is not None and watcher.done():
+                    raise ClientDisconnected
+                if next_event.done():
+                    break
+                yield IDLE_EVENT
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        # The event stream cannot be closed while a step is still running in it
+        if next_event is not None and not next_event.done():
+            next_event.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await next_event
+        await events.aclose()
+
+
+async def _release_when_done(
+    stream: AsyncGenerator[str, None], permit: AdmissionPermit
+) -> AsyncGenerator[str, None]:
+    """Pass a response stream through, holding its admission slot until it ends."""
+    try:
+        async with aclosing(stream):
+            async for chunk in stream:
+                yield chunk
+    finally:
+        permit.release()
+
+
+def _ask_key_parts(body: AskRequest, origin: str | None) -> tuple[Any, ...]:
+    """Request fields that decide an /ask answer and its encoding.
+
+    Used (with the community) to key shared runs and cached answers. Origin
+    is included because it decides which API key a run may use.
+    """
+    return (
+        normalize_question(body.question),
+        body.model,
+        body.page_context.model_dump(mode="json") if body.page_context else None,
+        origin,
+        body.tool_output if body.stream else "json",
+    )
+
+
+async def _cache_ask_frames(
+    stream: AsyncGenerator[str, None],
+    sse: SSEEncoder,
+    community_id: str,
+    generation: int,
+    cache_key: str,
+    ttl_seconds: float,
+) -> AsyncGenerator[str, None]:
+    """Pass an /ask stream through, caching its frames if the run completed cleanly.
+
+    ``sse`` is the stream's encoder; streams that encoded an error event or
+    were cut short before ``done`` are not cached.
+    """
+    frames: list[str] = []
+    async with aclosing(stream):
+        async for chunk in stream:
+            if chunk != KEEPALIVE_FRAME:
+                frames.append(chunk)
+            yield chunk
+    if sse.completed and not sse.errored:
+        answer_cache.put(community_id, generation, cache_key, "".join(frames), ttl_seconds)
+
+
+async def _replay_cached_ask(
+    frames: str, community_id: str, http_request: Request
+) -> AsyncGenerator[str, None]:
+    """Stream a cached /ask answer, logged without tokens as an answer-cache hit."""
+    start_time = time.monotonic()
+    yield frames
+    _log_streaming_metrics(
+        http_request=http_request,
+        community_id=community_id,
+        endpoint=f"/{community_id}/ask",
+        awm=None,
+        tools_called=[],
+        start_time=start_time,
+        status_code=200,
+        key_source=ANSWER_CACHE_KEY_SOURCE,
+    )
+
+
+async def _stream_shared_ask(
+    chunks: Subscription, community_id: str, http_request: Request
+) -> AsyncGenerator[str, None]:
+    """Stream a joined /ask run to one more client.
+
+    The run's tokens and cost are logged once by the request that started
+    it; joined requests are logged without tokens.
+    """
+    start_time = time.monotonic()
+    status_code = CLIENT_CLOSED_REQUEST
+    try:
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+        status_code = 200
+    finally:
+        _log_streaming_metrics(
+            http_request=http_request,
+            community_id=community_id,
+            endpoint=f"/{community_id}/ask",
+            awm=None,
+            tools_called=[],
+            start_time=start_time,
+            status_code=status_code,
+            error_message=None if status_code == 200 else "client_cancelled",
+        )
+
 
 async def _stream_ask_response(
     community_id: str,
@@ -1588,21 +1878,35 @@ async def _stream_ask_response(
     page_context: PageContext | None = None,
     requested_model: str | None = None,
     http_request: Request | None = None,
+    tool_output: ToolOutputMode = "full",
+    watch_disconnect: bool = True,
+    sse: SSEEncoder | None = None,
 ) -> AsyncGenerator[str, None]:
     """Stream response for ask endpoint with JSON-encoded SSE events.
 
     Event format:
         data: {"event": "content", "content": "text chunk"}
         data: {"event": "tool_start", "name": "tool_name", "input": {...}}
-        data: {"event": "tool_end", "name": "tool_name", "output": {...}}
+        data: {"event": "tool_end", "name": "tool_name", "output": "..."}
         data: {"event": "done"}
         data: {"event": "error", "message": "error text"}
+
+    Content chunks are coalesced and ``: keep-alive`` comments are sent
+    while tools run (see ``SSEEncoder``). Pass ``sse`` to read the
+    encoder's ``completed``/``errored`` flags after the stream ends;
+    otherwise one is built from ``tool_output``.
     """
     start_time = time.monotonic()
     tools_called: list[str] = []
     awm: AssistantWithMetrics | None = None
     total_input_tokens = 0
     total_output_tokens = 0
+    total_cache_read_tokens = 0
+    total_cache_creation_tokens = 0
+    # Characters streamed by the LLM call in progress (not yet in the token totals)
+    pending_output_chars = 0
+    if sse is None:
+        sse = SSEEncoder(tool_output=tool_output)
 
     try:
         awm = create_community_assistant(
@@ -1614,7 +1918,7 @@ async def _stream_ask_response(
             preload_docs=True,
             page_context=page_context,
         )
-        graph = awm.assistant.build_graph()
+        graph = awm.assistant.get_graph()
 
         state = {
             "messages": [HumanMessage(content=question)],
@@ -1622,44 +1926,60 @@ async def _stream_ask_response(
             "tool_calls": [],
         }
 
-        stream_config = awm.langfuse_config or {}
-        async for event in graph.astream_events(state, version="v2", config=stream_config):
-            kind = event.get("event")
-
-            if kind == "on_chat_model_stream":
-                content = event.get("data", {}).get("chunk", {})
-                if hasattr(content, "content") and content.content:
-                    sse_event = {"event": "content", "content": content.content}
-                    yield f"data: {json.dumps(sse_event)}\n\n"
-
-            elif kind == "on_chat_model_end":
-                inp, out = _extract_token_usage(event.get("data", {}))
-                total_input_tokens += inp
-                total_output_tokens += out
-
-            elif kind == "on_tool_start":
-                tool_input = event.get("data", {}).get("input", {})
-                tool_name = event.get("name", "")
-                if tool_name:
-                    tools_called.append(tool_name)
-                sse_event = {
-                    "event": "tool_start",
-                    "name": tool_name,
-                    "input": tool_input if isinstance(tool_input, dict) else {},
-                }
-                yield f"data: {json.dumps(sse_event)}\n\n"
-
-            elif kind == "on_tool_end":
-                tool_output = event.get("data", {}).get("output", {})
-                sse_event = {
-                    "event": "tool_end",
-                    "name": event.get("name", ""),
-                    "output": str(tool_output) if tool_output else "",
-                }
-                yield f"data: {json.dumps(sse_event)}\n\n"
+        stream_config = awm.run_config
+        async with aclosing(
+            _stream_graph_events(
+                graph,
+                state,
+                stream_config,
+                http_request if watch_disconnect else None,
+                idle_seconds=STREAM_IDLE_SECONDS,
+            )
+        ) as events:
+            async for event in events:
+                kind = event.get("event")
+
+                if kind == "on_chat_model_stream":
+                    content = event.get("data", {}).get("chunk", {})
+                    if hasattr(content, "content") and content.content:
+                        pending_output_chars += len(content.content)
+                        if data := sse.content(content.content):
+                            yield data
+
+                elif kind == "on_chat_model_end":
+                    pending_output_chars = 0
+                    if data := sse.flush():
+                        yield data
+                    inp, out = _extract_token_usage(event.get("data", {}))
+                    total_input_tokens += inp
+                    total_output_tokens += out
+                    cache_read, cache_creation = _extract_cache_usage(event.get("data", {}))
+                    total_cache_read_tokens += cache_read
+                    total_cache_creation_tokens += cache_creation
+
+                elif kind == "on_tool_start":
+                    tool_input = event.get("data", {}).get("input", {})
+                    tool_name = event.get("name", "")
+                    if tool_name:
+                        tools_called.append(tool_name)
+                    sse_event = {
+                        "event": "tool_start",
+                        "name": tool_name,
+                        "input": tool_input if isinstance(tool_input, dict) else {},
+                    }
+                    yield sse.event(sse_event)
+
+                elif kind == "on_tool_end":
+                    yield sse.tool_end(
+                        event.get("name", ""), event.get("data", {}).get("output", {})
+                    )
+
+                elif kind == "idle":
+                    if data := sse.idle():
+                        yield data
 
         sse_event = {"event": "done"}
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
 
         # Log metrics at end of streaming
         _log_streaming_metrics(
@@ -1672,8 +1992,30 @@ async def _stream_ask_response(
             status_code=200,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
 
+    except (ClientDisconnected, asyncio.CancelledError, GeneratorExit) as e:
+        # The client went away. Closing the event stream has already cancelled
+        # the graph run, so record what was spent; nothing more can be sent.
+        logger.info("Client disconnected from ask stream for community %s", community_id)
+        _log_streaming_metrics(
+            http_request=http_request,
+            community_id=community_id,
+            endpoint=f"/{community_id}/ask",
+            awm=awm,
+            tools_called=tools_called,
+            start_time=start_time,
+            status_code=CLIENT_CLOSED_REQUEST,
+            input_tokens=total_input_tokens,
+            output_tokens=total_output_tokens + _approx_tokens(pending_output_chars),
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
+            error_message="client_cancelled",
+        )
+        if not isinstance(e, ClientDisconnected):
+            raise
     except HTTPException as e:
         # HTTPException in streaming context (e.g., auth failure, rate limit).
         # Cannot re-raise because response headers are already sent as 200.
@@ -1684,7 +2026,7 @@ async def _stream_ask_response(
             e.detail,
         )
         sse_event = {"event": "error", "message": str(e.detail)}
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1695,6 +2037,8 @@ async def _stream_ask_response(
             status_code=e.status_code,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
     except ValueError as e:
         # Input validation errors - user's fault
@@ -1704,7 +2048,7 @@ async def _stream_ask_response(
             "message": f"Invalid request: {str(e)}",
             "retryable": False,
         }
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1715,6 +2059,8 @@ async def _stream_ask_response(
             status_code=400,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
     except Exception as e:
         # Unexpected errors - log with full context
@@ -1736,7 +2082,7 @@ async def _stream_ask_response(
             "message": "An error occurred while generating the response. Please try again.",
             "error_id": error_id,
         }
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1747,6 +2093,8 @@ async def _stream_ask_response(
             status_code=500,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
 
 
@@ -1759,27 +2107,36 @@ async def _stream_chat_response(
     requested_model: str | None = None,
     page_context: PageContext | None = None,
     http_request: Request | None = None,
+    tool_output: ToolOutputMode = "full",
 ) -> AsyncGenerator[str, None]:
     """Stream assistant response as JSON-encoded Server-Sent Events.
 
     Event format:
         data: {"event": "content", "content": "text chunk"}
         data: {"event": "tool_start", "name": "tool_name", "input": {...}}
-        data: {"event": "tool_end", "name": "tool_name", "output": {...}}
+        data: {"event": "tool_end", "name": "tool_name", "output": "..."}
         data: {"event": "session", "session_id": "..."}  (sent first)
         data: {"event": "done", "session_id": "..."}
         data: {"event": "error", "message": "error text"}
+
+    Content chunks are coalesced and ``: keep-alive`` comments are sent
+    while tools run (see ``SSEEncoder``).
     """
     start_time = time.monotonic()
     tools_called: list[str] = []
     awm: AssistantWithMetrics | None = None
     total_input_tokens = 0
     total_output_tokens = 0
+    total_cache_read_tokens = 0
+    total_cache_creation_tokens = 0
+    # Characters streamed by the LLM call in progress (not yet in the token totals)
+    pending_output_chars = 0
+    sse = SSEEncoder(tool_output=tool_output)
 
     # Send session_id immediately so the client captures it even if the
     # stream is truncated by a proxy timeout.
     sse_event = {"event": "session", "session_id": session.session_id}
-    yield f"data: {json.dumps(sse_event)}\n\n"
+    yield sse.event(sse_event)
 
     try:
         awm = create_community_assistant(
@@ -1791,7 +2148,7 @@ async def _stream_chat_response(
             preload_docs=True,
             page_context=page_context,
         )
-        graph = awm.assistant.build_graph()
+        graph = awm.assistant.get_graph()
 
         state = {
             "messages": session.messages.copy(),
@@ -1799,54 +2156,66 @@ async def _stream_chat_response(
             "tool_calls": [],
         }
 
-        stream_config = awm.langfuse_config or {}
+        stream_config = awm.run_config
         full_response = ""
 
-        async for event in graph.astream_events(state, version="v2", config=stream_config):
-            kind = event.get("event")
-
-            if kind == "on_chat_model_stream":
-                content = event.get("data", {}).get("chunk", {})
-                if hasattr(content, "content") and content.content:
-                    chunk = content.content
-                    full_response += chunk
-                    sse_event = {"event": "content", "content": chunk}
-                    yield f"data: {json.dumps(sse_event)}\n\n"
-
-            elif kind == "on_chat_model_end":
-                inp, out = _extract_token_usage(event.get("data", {}))
-                total_input_tokens += inp
-                total_output_tokens += out
-
-            elif kind == "on_tool_start":
-                tool_input = event.get("data", {}).get("input", {})
-                tool_name = event.get("name", "")
-                if tool_name:
-                    tools_called.append(tool_name)
-                sse_event = {
-                    "event": "tool_start",
-                    "name": tool_name,
-                    "input": tool_input if isinstance(tool_input, dict) else {},
-                }
-                yield f"data: {json.dumps(sse_event)}\n\n"
-
-            elif kind == "on_tool_end":
-                tool_output = event.get("data", {}).get("output", {})
-                sse_event = {
-                    "event": "tool_end",
-                    "name": event.get("name", ""),
-                    "output": str(tool_output) if tool_output else "",
-                }
-                yield f"data: {json.dumps(sse_event)}\n\n"
+        async with aclosing(
+            _stream_graph_events(
+                graph, state, stream_config, http_request, idle_seconds=STREAM_IDLE_SECONDS
+            )
+        ) as events:
+            async for event in events:
+                kind = event.get("event")
+
+                if kind == "on_chat_model_stream":
+                    content = event.get("data", {}).get("chunk", {})
+                    if hasattr(content, "content") and content.content:
+                        chunk = content.content
+                        full_response += chunk
+                        pending_output_chars += len(chunk)
+                        if data := sse.content(chunk):
+                            yield data
+
+                elif kind == "on_chat_model_end":
+                    pending_output_chars = 0
+                    if data := sse.flush():
+                        yield data
+                    inp, out = _extract_token_usage(event.get("data", {}))
+                    total_input_tokens += inp
+                    total_output_tokens += out
+                    cache_read, cache_creation = _extract_cache_usage(event.get("data", {}))
+                    total_cache_read_tokens += cache_read
+                    total_cache_creation_tokens += cache_creation
+
+                elif kind == "on_tool_start":
+                    tool_input = event.get("data", {}).get("input", {})
+                    tool_name = event.get("name", "")
+                    if tool_name:
+                        tools_called.append(tool_name)
+                    sse_event = {
+                        "event": "tool_start",
+                        "name": tool_name,
+                        "input": tool_input if isinstance(tool_input, dict) else {},
+                    }
+                    yield sse.event(sse_event)
+
+                elif kind == "on_tool_end":
+                    yield sse.tool_end(
+                        event.get("name", ""), event.get("data", {}).get("output", {})
+                    )
+
+                elif kind == "idle":
+                    if data := sse.idle():
+                        yield data
 
         if full_response:
             try:
-                session.add_assistant_message(full_response)
+                await run_session_io(session.add_assistant_message, full_response)
             except ValueError as e:
                 # Session limit exceeded
                 logger.error("Session limit exceeded in streaming: %s", e)
                 sse_event = {"event": "error", "message": str(e)}
-                yield f"data: {json.dumps(sse_event)}\n\n"
+                yield sse.event(sse_event)
                 return
 
         # Warn if conversation is approaching the token budget (87.5% of 80K).
@@ -1857,10 +2226,10 @@ async def _stream_chat_response(
                 "event": "warning",
                 "message": "Conversation is getting long. Consider starting a new chat for best results.",
             }
-            yield f"data: {json.dumps(sse_event)}\n\n"
+            yield sse.event(sse_event)
 
         sse_event = {"event": "done", "session_id": session.session_id}
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
 
         # Log metrics at end of streaming
         _log_streaming_metrics(
@@ -1873,8 +2242,30 @@ async def _stream_chat_response(
             status_code=200,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
 
+    except (ClientDisconnected, asyncio.CancelledError, GeneratorExit) as e:
+        # The client went away. Closing the event stream has already cancelled
+        # the graph run, so record what was spent; nothing more can be sent.
+        logger.info("Client disconnected from chat stream for community %s", community_id)
+        _log_streaming_metrics(
+            http_request=http_request,
+            community_id=community_id,
+            endpoint=f"/{community_id}/chat",
+            awm=awm,
+            tools_called=tools_called,
+            start_time=start_time,
+            status_code=CLIENT_CLOSED_REQUEST,
+            input_tokens=total_input_tokens,
+            output_tokens=total_output_tokens + _approx_tokens(pending_output_chars),
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
+            error_message="client_cancelled",
+        )
+        if not isinstance(e, ClientDisconnected):
+            raise
     except HTTPException as e:
         # HTTPException in streaming context (e.g., auth failure, rate limit).
         # Cannot re-raise because response headers are already sent as 200.
@@ -1886,7 +2277,7 @@ async def _stream_chat_response(
             e.detail,
         )
         sse_event = {"event": "error", "message": str(e.detail)}
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1897,12 +2288,14 @@ async def _stream_chat_response(
             status_code=e.status_code,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
     except ValueError as e:
         # Session limit errors
         logger.error("Session limit error: %s", e)
         sse_event = {"event": "error", "message": str(e)}
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1913,6 +2306,8 @@ async def _stream_chat_response(
             status_code=400,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
     except Exception as e:
         error_id = str(uuid.uuid4())
@@ -1934,7 +2329,7 @@ async def _stream_chat_response(
             "message": "An error occurred while processing your request.",
             "error_id": error_id,
         }
-        yield f"data: {json.dumps(sse_event)}\n\n"
+        yield sse.event(sse_event)
         _log_streaming_metrics(
             http_request=http_request,
             community_id=community_id,
@@ -1945,4 +2340,6 @@ async def _stream_chat_response(
             status_code=500,
             input_tokens=total_input_tokens,
             output_tokens=total_output_tokens,
+            cache_read_tokens=total_cache_read_tokens,
+            cache_creation_tokens=total_cache_creation_tokens,
         )
@@ -9,15 +9,18 @@ import sqlite3
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
-from src.api.security import RequireScopedAuth
+from src.api.security import RequireAdminAuth, RequireScopedAuth
 from src.metrics.db import metrics_connection
+from src.metrics.prometheus import CONTENT_TYPE, REGISTRY
 from src.metrics.queries import (
     get_community_summary,
     get_overview,
     get_quality_summary,
     get_token_breakdown,
 )
+from src.metrics.writer import get_metrics_writer
 
 logger = logging.getLogger(__name__)
 
@@ -96,3 +99,27 @@ async def quality_overview(auth: RequireScopedAuth) -> dict[str, Any]:
             status_code=503,
             detail="Metrics database is temporarily unavailable.",
         )
+
+
+@router.get("/writer")
+async def writer_status(auth: RequireScopedAuth) -> dict[str, Any]:
+    """Get background metrics writer status (admin only).
+
+    Reports queue depth and written/dropped/failed entry counters.
+    """
+    if auth.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin key required.")
+    writer = get_metrics_writer()
+    if writer is None:
+        return {"running": False}
+    return writer.stats()
+
+
+@router.get("/prometheus", include_in_schema=False)
+async def prometheus_metrics(_auth: RequireAdminAuth) -> Response:
+    """Expose in-process counters and histograms in Prometheus text format.
+
+    Served from memory only; scraping never queries the metrics database.
+    Requires an admin key (X-API-Key header).
+    """
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
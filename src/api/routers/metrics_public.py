@@ -11,8 +11,10 @@ import logging
 import sqlite3
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 
+from src.api.response_cache import public_response_cache
 from src.assistants import registry
 from src.metrics.db import metrics_connection
 from src.metrics.queries import get_public_overview
@@ -23,20 +25,25 @@ router = APIRouter(prefix="/metrics/public", tags=["Public Metrics"])
 
 
 @router.get("/overview")
-async def public_overview() -> dict[str, Any]:
+async def public_overview(request: Request) -> Response:
     """Get public metrics overview across all communities.
 
     Returns total requests, error rate, active community count,
     and per-community request counts. No tokens, costs, or model info.
     All registered communities appear even if they have zero requests.
+    Cached briefly with an ETag.
     """
-    registered = [info.id for info in registry.list_available()]
-    try:
-        with metrics_connection() as conn:
-            return get_public_overview(conn, registered_communities=registered)
-    except sqlite3.Error:
-        logger.exception("Failed to query metrics database for public overview")
-        raise HTTPException(
-            status_code=503,
-            detail="Metrics database is temporarily unavailable.",
-        )
+
+    def build() -> dict[str, Any]:
+        registered = [info.id for info in registry.list_available()]
+        try:
+            with metrics_connection() as conn:
+                return get_public_overview(conn, registered_communities=registered)
+        except sqlite3.Error:
+            logger.exception("Failed to query metrics database for public overview")
+            raise HTTPException(
+                status_code=503,
+                detail="Metrics database is temporarily unavailable.",
+            )
+
+    return public_response_cache.respond(request, build)
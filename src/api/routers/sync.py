@@ -6,6 +6,9 @@ Provides endpoints for:
 - Health checks for monitoring
 """
 
+import asyncio
+import contextvars
+import functools
 import logging
 from datetime import UTC, datetime
 from typing import Any
@@ -17,7 +20,7 @@ from src.api.config import get_settings
 from src.api.scheduler import get_scheduler, run_sync_now
 from src.api.security import RequireAdminAuth
 from src.assistants import registry
-from src.knowledge.db import get_connection, get_stats
+from src.knowledge.db import get_read_connection, get_stats
 
 logger = logging.getLogger(__name__)
 
@@ -125,9 +128,10 @@ def _get_sync_metadata(project: str = "hed") -> dict[str, Any]:
     metadata: dict[str, Any] = {}
 
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             rows = conn.execute(
-                "SELECT source_type, source_name, last_sync_at, items_synced FROM sync_metadata"
+                "SELECT source_type, source_name, last_sync_at, items_synced,"
+                " items_inserted, items_updated, items_unchanged FROM sync_metadata"
             ).fetchall()
 
             for row in rows:
@@ -138,6 +142,9 @@ def _get_sync_metadata(project: str = "hed") -> dict[str, Any]:
                 metadata[source_type][source_name] = {
                     "last_sync": row["last_sync_at"],
                     "items_synced": row["items_synced"],
+                    "items_inserted": row["items_inserted"],
+                    "items_updated": row["items_updated"],
+                    "items_unchanged": row["items_unchanged"],
                 }
     except Exception as e:
         logger.warning("Failed to get sync metadata for %s: %s", project, e, exc_info=True)
@@ -150,7 +157,7 @@ def _get_repo_counts(project: str = "hed") -> dict[str, int]:
     counts: dict[str, int] = {}
 
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             rows = conn.execute(
                 "SELECT repo, COUNT(*) as count FROM github_items GROUP BY repo"
             ).fetchall()
@@ -369,8 +376,13 @@ async def trigger_sync(
             detail=f"Invalid sync_type: {request.sync_type}. Must be one of {valid_types}",
         )
 
+    # Sync jobs block (and run their own event loops), so keep them off this one
+    ctx = contextvars.copy_context()
     try:
-        results = run_sync_now(request.sync_type)
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, ctx.run, functools.partial(run_sync_now, request.sync_type)
+        )
         total = sum(results.values())
         return TriggerResponse(
             success=True,
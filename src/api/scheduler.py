@@ -9,29 +9,38 @@ sync configuration in their config.yaml. Sync types:
 - FAQ generation from discussions (LLM-powered)
 - BIDS Extension Proposals (BEP) sync
 - Community budget checks (every 15 minutes, global)
+- Preloaded documentation refresh (every 30 minutes, global)
 
 Each community controls its own schedule via the `sync:` section in config.yaml.
 On startup, empty databases are automatically seeded with an immediate sync.
 """
 
+import functools
 import logging
 import os
 import threading
+import time
 from collections.abc import Callable
+from datetime import UTC, datetime
 from typing import Any
 
+import httpx
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from src.api.answer_cache import answer_cache
 from src.api.config import get_settings
 from src.assistants import registry
+from src.assistants.pool import get_assistant_pool
 from src.knowledge.bep_sync import sync_beps
 from src.knowledge.db import init_db, is_db_populated
-from src.knowledge.github_sync import sync_repos
+from src.knowledge.github_sync import sync_all_repos
 from src.knowledge.papers_sync import sync_all_papers, sync_citing_papers
 from src.metrics.alerts import create_budget_alert_issue
-from src.metrics.budget import check_budget
+from src.metrics.budget import check_budget, get_spend_tracker
 from src.metrics.db import metrics_connection
+from src.metrics.prometheus import SYNC_JOB_DURATION
+from src.tools.fetcher import get_fetcher
 
 logger = logging.getLogger(__name__)
 
@@ -80,32 +89,96 @@ def _reset_failure(sync_type: str, community_id: str) -> None:
         _sync_failures.pop(key, None)
 
 
+def _record_sync(sync_type: str, community_id: str, start: float, ok: bool) -> None:
+    """Record a finished sync job in Prometheus; a success drops cached /ask answers."""
+    if ok:
+        # Cached /ask answers may be based on the old knowledge
+        answer_cache.invalidate(community_id)
+    SYNC_JOB_DURATION.observe(
+        time.perf_counter() - start,
+        sync_type=sync_type,
+        community=community_id,
+        result="success" if ok else "failure",
+    )
+
+
+def _timed_sync(sync_type: str) -> Callable[[Callable[[str], bool]], Callable[[str], bool]]:
+    """Record a per-community sync job's duration and result in Prometheus.
+
+    A successful sync also invalidates the community's cached /ask answers.
+    """
+
+    def decorator(func: Callable[[str], bool]) -> Callable[[str], bool]:
+        @functools.wraps(func)
+        def wrapper(community_id: str) -> bool:
+            start = time.perf_counter()
+            ok = False
+            try:
+                ok = func(community_id)
+                return ok
+            finally:
+                _record_sync(sync_type, community_id, start, ok)
+
+        return wrapper
+
+    return decorator
+
+
 # ---------------------------------------------------------------------------
 # Per-community sync job functions
 # ---------------------------------------------------------------------------
 
 
-def _run_github_sync_for_community(community_id: str) -> bool:
-    """Run GitHub sync for a single community. Returns True on success."""
-    logger.info("Starting scheduled GitHub sync for %s", community_id)
-    try:
+def _run_github_sync_for_communities(community_ids: list[str]) -> list[str]:
+    """Run GitHub sync for several communities in one concurrent run.
+
+    All repos share one HTTP client and one GitHub rate limiter, so
+    communities are synced together rather than one after another.
+
+    Returns:
+        The community IDs that synced successfully.
+    """
+    start = time.perf_counter()
+    logger.info("Starting scheduled GitHub sync for %s", ", ".join(community_ids))
+    succeeded: list[str] = []
+    repos_by_project: dict[str, list[str]] = {}
+    for community_id in community_ids:
         info = registry.get(community_id)
         if not info or not info.community_config or not info.community_config.github:
             logger.debug("No GitHub repos configured for %s", community_id)
-            return True
+            succeeded.append(community_id)
+            continue
+        try:
+            init_db(community_id)
+        except Exception as e:
+            _track_failure("github", community_id, e)
+            continue
+        repos_by_project[community_id] = info.community_config.github.repos
+
+    if repos_by_project:
+        try:
+            results = sync_all_repos(repos_by_project, incremental=True)
+        except Exception as e:
+            for community_id in repos_by_project:
+                _track_failure("github", community_id, e)
+        else:
+            for community_id in repos_by_project:
+                total = sum(results.get(community_id, {}).values())
+                logger.info("GitHub sync complete for %s: %d items", community_id, total)
+                _reset_failure("github", community_id)
+                succeeded.append(community_id)
 
-        repos = info.community_config.github.repos
-        init_db(community_id)
-        results = sync_repos(repos, project=community_id, incremental=True)
-        total = sum(results.values())
-        logger.info("GitHub sync complete for %s: %d items", community_id, total)
-        _reset_failure("github", community_id)
-        return True
-    except Exception as e:
-        _track_failure("github", community_id, e)
-        return False
+    for community_id in community_ids:
+        _record_sync("github", community_id, start, community_id in succeeded)
+    return succeeded
 
 
+def _run_github_sync_for_community(community_id: str) -> bool:
+    """Run GitHub sync for a single community. Returns True on success."""
+    return community_id in _run_github_sync_for_communities([community_id])
+
+
+@_timed_sync("papers")
 def _run_papers_sync_for_community(community_id: str) -> bool:
     """Run papers sync for a single community. Returns True on success."""
     settings = get_settings()
@@ -148,6 +221,7 @@ def _run_papers_sync_for_community(community_id: str) -> bool:
         return False
 
 
+@_timed_sync("docstrings")
 def _run_docstrings_sync_for_community(community_id: str) -> bool:
     """Run docstring extraction sync for a single community. Returns True on success."""
     logger.info("Starting scheduled docstrings sync for %s", community_id)
@@ -186,6 +260,7 @@ def _run_docstrings_sync_for_community(community_id: str) -> bool:
         return False
 
 
+@_timed_sync("mailman")
 def _run_mailman_sync_for_community(community_id: str) -> bool:
     """Run mailing list archive sync for a single community. Returns True on success."""
     logger.info("Starting scheduled mailman sync for %s", community_id)
@@ -222,6 +297,7 @@ def _run_mailman_sync_for_community(community_id: str) -> bool:
         return False
 
 
+@_timed_sync("faq")
 def _run_faq_sync_for_community(community_id: str) -> bool:
     """Run FAQ generation sync for a single community. Returns True on success."""
     logger.info("Starting scheduled FAQ sync for %s", community_id)
@@ -248,11 +324,13 @@ def _run_faq_sync_for_community(community_id: str) -> bool:
                 quality_threshold=config.faq_generation.quality_threshold,
             )
             logger.info(
-                "FAQ sync for %s/%s: %d created, %d skipped",
+                "FAQ sync for %s/%s: %d created, %d skipped, %d failed ($%.4f)",
                 community_id,
                 list_name,
-                result.get("created", 0),
+                result.get("summarized", 0),
                 result.get("skipped", 0),
+                result.get("failed", 0),
+                result.get("total_cost", 0.0),
             )
 
         _reset_failure("faq", community_id)
@@ -262,6 +340,7 @@ def _run_faq_sync_for_community(community_id: str) -> bool:
         return False
 
 
+@_timed_sync("beps")
 def _run_beps_sync_for_community(community_id: str) -> bool:
     """Run BEP sync for a single community (typically BIDS only). Returns True on success."""
     logger.info("Starting scheduled BEP sync for %s", community_id)
@@ -308,6 +387,36 @@ def _cleanup_mirrors() -> None:
         )
 
 
+def _refresh_preloaded_docs() -> None:
+    """Revalidate every community's preloaded docs so requests never wait on doc hosts.
+
+    Pooled assistants embed preloaded docs in their system prompt, so a
+    community whose docs changed has its pooled assistants and cached /ask
+    answers dropped.
+    """
+    fetcher = get_fetcher()
+    for info in registry.list_all():
+        config = info.community_config
+        if not config or not config.documentation:
+            continue
+
+        changed = False
+        for doc in config.get_doc_registry().get_preloaded():
+            try:
+                changed = fetcher.refresh(doc) or changed
+            except httpx.HTTPError as e:
+                logger.warning("Preloaded doc refresh failed for %s: %s", doc.source_url, e)
+
+        if changed:
+            answer_cache.invalidate(info.id)
+            removed = get_assistant_pool().invalidate(info.id)
+            logger.info(
+                "Preloaded docs changed for %s, dropped %d pooled assistants",
+                info.id,
+                removed,
+            )
+
+
 def _check_community_budgets() -> None:
     """Check budget limits for all communities and create alert issues if exceeded."""
     global _budget_check_failures
@@ -332,6 +441,13 @@ def _check_community_budgets() -> None:
                         conn=conn,
                     )
                     communities_checked += 1
+                    # Keep request-time enforcement in line with the database,
+                    # which also includes spend from other worker processes
+                    get_spend_tracker().reconcile(
+                        info.id,
+                        budget_status.daily_spend_usd,
+                        budget_status.monthly_spend_usd,
+                    )
 
                     if budget_status.needs_alert:
                         issue_url = create_budget_alert_issue(
@@ -520,7 +636,9 @@ def start_scheduler() -> BackgroundScheduler | None:
     _scheduler = BackgroundScheduler()
     jobs_registered = 0
 
-    # Register per-community sync jobs
+    # Register per-community sync jobs; GitHub communities sharing a schedule
+    # are synced together in one job
+    github_by_cron: dict[str, list[str]] = {}
     for info in registry.list_all():
         if not info.community_config or not info.community_config.sync:
             continue
@@ -542,6 +660,10 @@ def start_scheduler() -> BackgroundScheduler | None:
                 )
                 continue
 
+            if sync_type == "github":
+                github_by_cron.setdefault(schedule.cron, []).append(community_id)
+                continue
+
             job_id = f"{sync_type}_{community_id}"
             try:
                 trigger = CronTrigger.from_crontab(schedule.cron)
@@ -568,6 +690,25 @@ def start_scheduler() -> BackgroundScheduler | None:
                     e,
                 )
 
+    for cron, community_ids in github_by_cron.items():
+        try:
+            _scheduler.add_job(
+                _run_github_sync_for_communities,
+                trigger=CronTrigger.from_crontab(cron),
+                args=[community_ids],
+                id=f"github_{'_'.join(community_ids)}",
+                name=f"github sync for {', '.join(community_ids)}",
+                replace_existing=True,
+            )
+            jobs_registered += 1
+            logger.info("Scheduled github sync for %s: %s", ", ".join(community_ids), cron)
+        except ValueError as e:
+            logger.error(
+                "Invalid cron expression for %s/github: %s",
+                ", ".join(community_ids),
+                e,
+            )
+
     # Budget check (global, every 15 minutes)
     try:
         budget_trigger = CronTrigger(minute="*/15")
@@ -582,6 +723,20 @@ def start_scheduler() -> BackgroundScheduler | None:
     except ValueError as e:
         logger.error("Failed to schedule budget check: %s", e)
 
+    # Preloaded doc refresh (every 30 minutes, plus once now to warm the cache)
+    try:
+        _scheduler.add_job(
+            _refresh_preloaded_docs,
+            trigger=CronTrigger(minute="*/30"),
+            id="doc_refresh",
+            name="Preloaded Documentation Refresh",
+            replace_existing=True,
+            next_run_time=datetime.now(UTC),
+        )
+        logger.info("Preloaded doc refresh scheduled: every 30 minutes")
+    except ValueError as e:
+        logger.error("Failed to schedule preloaded doc refresh: %s", e)
+
     # Mirror cleanup (every hour, removes expired ephemeral database mirrors)
     try:
         mirror_trigger = CronTrigger(minute="30")  # Every hour at :30
@@ -649,6 +804,7 @@ def run_sync_now(sync_type: str = "all") -> dict[str, int]:
 
     sync_types_to_run = list(_SYNC_TYPE_MAP.keys()) if sync_type == "all" else [sync_type]
 
+    github_communities: list[str] = []
     for info in registry.list_all():
         if not info.community_config:
             continue
@@ -661,9 +817,16 @@ def run_sync_now(sync_type: str = "all") -> dict[str, int]:
             if not data_check(config):
                 continue
 
+            if st == "github":
+                github_communities.append(community_id)
+                continue
+
             # job_func handles its own exceptions via _track_failure and
             # returns False on failure, so no outer try/except needed
             if job_func(community_id):
                 results[st] = results.get(st, 0) + 1
 
+    if github_communities and (succeeded := _run_github_sync_for_communities(github_communities)):
+        results["github"] = len(succeeded)
+
     return results
@@ -0,0 +1,594 @@
+"""Chat session storage for community chat endpoints.
+
+Sessions live behind a ``SessionStore`` backend selected by the
+``SESSION_BACKEND`` setting:
+
+- ``memory`` (default): per-community ``OrderedDict`` kept in last-activity
+  order. Because every session shares one TTL, the front of that order is
+  also the next session to expire, so expiry and LRU eviction both pop
+  from the front in O(1) per session removed.
+- ``sqlite``: a WAL-mode database under DATA_DIR that several uvicorn
+  workers on one host can share, and that survives restarts. Messages are
+  stored one row per message (zlib-compressed) and loaded only when a
+  session's history is first read; listing sessions reads metadata only.
+
+Store calls block (on disk I/O, and on another worker's write lock for up
+to the busy timeout), so async handlers run them through
+``run_session_io``, which uses a dedicated single-thread executor.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal, Protocol, TypeVar
+
+from langchain_core.messages import AIMessage, HumanMessage
+from pydantic import BaseModel, Field
+
+from src.api.config import get_settings
+from src.metrics.prometheus import REGISTRY, SESSIONS_CREATED, Sample
+
+logger = logging.getLogger(__name__)
+
+# Session limits and constraints
+MAX_SESSIONS_PER_COMMUNITY = 1000  # Prevent memory exhaustion
+SESSION_TTL_HOURS = 24  # Auto-delete inactive sessions after 24h
+MAX_MESSAGES_PER_SESSION = 100  # Limit conversation length
+MAX_MESSAGE_LENGTH = 10000  # Max characters per message
+
+SessionMessage = HumanMessage | AIMessage
+Role = Literal["h", "a"]
+
+
+class SessionInfo(BaseModel):
+    """Information about a chat session."""
+
+    session_id: str = Field(..., description="Unique session identifier", min_length=1)
+    community_id: str = Field(..., description="Community this session belongs to", min_length=1)
+    message_count: int = Field(..., description="Number of messages in session", ge=0)
+    created_at: str = Field(..., description="ISO timestamp when session was created")
+    last_active: str = Field(..., description="ISO timestamp of last activity")
+
+
+class ChatSession:
+    """A chat session with message history.
+
+    Enforces constraints:
+    - Max messages per session: 100
+    - Max message length: 10,000 characters
+    - TTL: 24 hours from last activity
+
+    Sessions loaded from a persistent store fetch their history on first
+    access to ``messages``; new messages are written through to the store.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        community_id: str,
+        *,
+        created_at: datetime | None = None,
+        last_active: datetime | None = None,
+        message_count: int = 0,
+        loader: Callable[[], list[SessionMessage]] | None = None,
+        store: "SessionStore | None" = None,
+    ) -> None:
+        self.session_id = session_id
+        self.community_id = community_id
+        self.created_at = created_at or datetime.now(UTC)
+        self.last_active = last_active or self.created_at
+        self._message_count = message_count
+        self._messages: list[SessionMessage] | None = None if loader else []
+        self._loader = loader
+        self._store = store
+
+    @property
+    def messages(self) -> list[SessionMessage]:
+        """Conversation history, loaded from the store on first access."""
+        if self._messages is None:
+            self._messages = self._loader() if self._loader else []
+            self._message_count = len(self._messages)
+        return self._messages
+
+    @property
+    def message_count(self) -> int:
+        """Number of messages, without loading the history."""
+        if self._messages is not None:
+            return len(self._messages)
+        return self._message_count
+
+    def _check_can_add(self, content: str) -> None:
+        if len(content) > MAX_MESSAGE_LENGTH:
+            raise ValueError(f"Message too long ({len(content)} chars). Max: {MAX_MESSAGE_LENGTH}")
+        if self.message_count >= MAX_MESSAGES_PER_SESSION:
+            raise ValueError(
+                f"Session has reached max messages ({MAX_MESSAGES_PER_SESSION}). "
+                "Start a new session."
+            )
+
+    def _add(self, message: SessionMessage, role: Role) -> None:
+        if self._messages is not None:
+            self._messages.append(message)
+        else:
+            self._message_count += 1
+        self.last_active = datetime.now(UTC)
+        if self._store is not None:
+            self._store.append_message(self, role, str(message.content))
+
+    def add_user_message(self, content: str) -> None:
+        """Add a user message to history.
+
+        Raises:
+            ValueError: If message exceeds length limit or session at max messages.
+        """
+        self._check_can_add(content)
+        self._add(HumanMessage(content=content), "h")
+
+    def add_assistant_message(self, content: str) -> None:
+        """Add an assistant message to history.
+
+        Raises:
+            ValueError: If message exceeds length limit or session at max messages.
+        """
+        self._check_can_add(content)
+        self._add(AIMessage(content=content), "a")
+
+    def is_expired(self) -> bool:
+        """Check if session has exceeded TTL."""
+        age_hours = (datetime.now(UTC) - self.last_active).total_seconds() / 3600
+        return age_hours > SESSION_TTL_HOURS
+
+    def to_info(self) -> SessionInfo:
+        """Convert to SessionInfo model."""
+        return SessionInfo(
+            session_id=self.session_id,
+            community_id=self.community_id,
+            message_count=self.message_count,
+            created_at=self.created_at.isoformat(),
+            last_active=self.last_active.isoformat(),
+        )
+
+
+class SessionStore(Protocol):
+    """Backend for chat sessions, isolated per community."""
+
+    def get(self, community_id: str, session_id: str) -> ChatSession | None:
+        """Return a live session, or None if missing or expired."""
+        ...
+
+    def create(self, community_id: str, session_id: str) -> ChatSession:
+        """Create (or replace) a session, evicting expired and LRU sessions first."""
+        ...
+
+    def delete(self, community_id: str, session_id: str) -> bool:
+        """Delete a session. Returns True if it existed."""
+        ...
+
+    def list_sessions(self, community_id: str) -> list[ChatSession]:
+        """Return live sessions, least recently active first."""
+        ...
+
+    def append_message(self, session: ChatSession, role: Role, content: str) -> None:
+        """Record a message just added to ``session`` and mark it active."""
+        ...
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+        ...
+
+
+class MemorySessionStore:
+    """In-process sessions in per-community OrderedDicts (last activity order)."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS_PER_COMMUNITY) -> None:
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, OrderedDict[str, ChatSession]] = {}
+        self._lock = threading.Lock()
+
+    def _community(self, community_id: str) -> OrderedDict[str, ChatSession]:
+        sessions = self._sessions.get(community_id)
+        if sessions is None:
+            sessions = self._sessions[community_id] = OrderedDict()
+        return sessions
+
+    @staticmethod
+    def _prune_expired(community_id: str, sessions: OrderedDict[str, ChatSession]) -> None:
+        """Drop expired sessions from the front of the activity order."""
+        evicted = 0
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if not oldest.is_expired():
+                break
+            sessions.popitem(last=False)
+            evicted += 1
+        if evicted:
+            logger.info("Evicted %d expired sessions from community %s", evicted, community_id)
+
+    def get(self, community_id: str, session_id: str) -> ChatSession | None:
+        with self._lock:
+            sessions = self._community(community_id)
+            session = sessions.get(session_id)
+            if session is not None and session.is_expired():
+                del sessions[session_id]
+                logger.info("Removed expired session %s", session_id)
+                return None
+            return session
+
+    def create(self, community_id: str, session_id: str) -> ChatSession:
+        with self._lock:
+            sessions = self._community(community_id)
+            sessions.pop(session_id, None)
+            self._prune_expired(community_id, sessions)
+            while len(sessions) >= self.max_sessions:
+                lru_id, _ = sessions.popitem(last=False)
+                logger.warning(
+                    "Evicted LRU session %s from community %s (limit: %d)",
+                    lru_id,
+                    community_id,
+                    self.max_sessions,
+                )
+            session = ChatSession(session_id, community_id, store=self)
+            sessions[session_id] = session
+            return session
+
+    def delete(self, community_id: str, session_id: str) -> bool:
+        with self._lock:
+            return self._community(community_id).pop(session_id, None) is not None
+
+    def list_sessions(self, community_id: str) -> list[ChatSession]:
+        with self._lock:
+            sessions = self._community(community_id)
+            self._prune_expired(community_id, sessions)
+            return list(sessions.values())
+
+    def append_message(self, session: ChatSession, role: Role, content: str) -> None:  # noqa: ARG002
+        with self._lock:
+            sessions = self._sessions.get(session.community_id)
+            if sessions is not None and session.session_id in sessions:
+                sessions.move_to_end(session.session_id)
+
+    def counts(self) -> dict[str, int]:
+        """Sessions held per community (expired ones until pruned)."""
+        with self._lock:
+            return {cid: len(sessions) for cid, sessions in self._sessions.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    community_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_active REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (community_id, session_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_sessions_activity
+    ON chat_sessions(community_id, last_active);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    community_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content BLOB NOT NULL,
+    PRIMARY KEY (community_id, session_id, seq),
+    FOREIGN KEY (community_id, session_id)
+        REFERENCES chat_sessions(community_id, session_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+"""
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC)
+
+
+class SQLiteSessionStore:
+    """Sessions in a WAL-mode SQLite database shared by workers on one host.
+
+    Session objects are not shared between calls: ``get`` returns a fresh
+    ChatSession whose history is loaded lazily, and appended messages are
+    written immediately.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_sessions: int = MAX_SESSIONS_PER_COMMUNITY,
+        busy_timeout: float = 5.0,
+    ) -> None:
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), timeout=busy_timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _cutoff() -> float:
+        return time.time() - SESSION_TTL_HOURS * 3600
+
+    def _session(
+        self,
+        community_id: str,
+        session_id: str,
+        created_at: float,
+        last_active: float,
+        message_count: int,
+    ) -> ChatSession:
+        return ChatSession(
+            session_id,
+            community_id,
+            created_at=_to_datetime(created_at),
+            last_active=_to_datetime(last_active),
+            message_count=message_count,
+            loader=functools.partial(self._load_messages, community_id, session_id),
+            store=self,
+        )
+
+    def _load_messages(self, community_id: str, session_id: str) -> list[SessionMessage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content FROM chat_messages "
+                "WHERE community_id = ? AND session_id = ? ORDER BY seq",
+                (community_id, session_id),
+            ).fetchall()
+        return [
+            (HumanMessage if role == "h" else AIMessage)(content=zlib.decompress(blob).decode())
+            for role, blob in rows
+        ]
+
+    def get(self, community_id: str, session_id: str) -> ChatSession | None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT created_at, last_active, message_count FROM chat_sessions "
+                "WHERE community_id = ? AND session_id = ?",
+                (community_id, session_id),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < self._cutoff():
+                self._conn.execute(
+                    "DELETE FROM chat_sessions WHERE community_id = ? AND session_id = ?",
+                    (community_id, session_id),
+                )
+                logger.info("Removed expired session %s", session_id)
+                return None
+        return self._session(community_id, session_id, *row)
+
+    def create(self, community_id: str, session_id: str) -> ChatSession:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM chat_sessions "
+                "WHERE community_id = ? AND (session_id = ? OR last_active < ?)",
+                (community_id, session_id, self._cutoff()),
+            )
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM chat_sessions WHERE community_id = ?", (community_id,)
+            ).fetchone()
+            excess = count - self.max_sessions + 1
+            if excess > 0:
+                self._conn.execute(
+                    """
+                    DELETE FROM chat_sessions WHERE rowid IN (
+                        SELECT rowid FROM chat_sessions WHERE community_id = ?
+                        ORDER BY last_active LIMIT ?
+                    )
+                    """,
+                    (community_id, excess),
+                )
+                logger.warning(
+                    "Evicted %d LRU sessions from community %s (limit: %d)",
+                    excess,
+                    community_id,
+                    self.max_sessions,
+                )
+            self._conn.execute(
+                "INSERT INTO chat_sessions (community_id, session_id, created_at, last_active) "
+                "VALUES (?, ?, ?, ?)",
+                (community_id, session_id, now, now),
+            )
+        return ChatSession(
+            session_id,
+            community_id,
+            created_at=_to_datetime(now),
+            last_active=_to_datetime(now),
+            store=self,
+        )
+
+    def delete(self, community_id: str, session_id: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM chat_sessions WHERE community_id = ? AND session_id = ?",
+                (community_id, session_id),
+            )
+            return cursor.rowcount > 0
+
+    def list_sessions(self, community_id: str) -> list[ChatSession]:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM chat_sessions WHERE community_id = ? AND last_active < ?",
+                (community_id, self._cutoff()),
+            )
+            rows = self._conn.execute(
+                "SELECT session_id, created_at, last_active, message_count FROM chat_sessions "
+                "WHERE community_id = ? ORDER BY last_active",
+                (community_id,),
+            ).fetchall()
+        return [self._session(community_id, *row) for row in rows]
+
+    def append_message(self, session: ChatSession, role: Role, content: str) -> None:
+        key = (session.community_id, session.session_id)
+        with self._lock, self._conn:
+            # seq comes from the stored count so concurrent workers cannot collide
+            self._conn.execute(
+                "INSERT INTO chat_messages (community_id, session_id, seq, role, content) "
+                "SELECT community_id, session_id, message_count, ?, ? FROM chat_sessions "
+                "WHERE community_id = ? AND session_id = ?",
+                (role, zlib.compress(content.encode()), *key),
+            )
+            self._conn.execute(
+                "UPDATE chat_sessions SET message_count = message_count + 1, last_active = ? "
+                "WHERE community_id = ? AND session_id = ?",
+                (session.last_active.timestamp(), *key),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_sessions_db_path() -> Path:
+    """Return path to the shared sessions database (DATA_DIR or user data dir)."""
+    from platformdirs import user_data_dir
+
+    data_dir_env = os.environ.get("DATA_DIR")
+    base = Path(data_dir_env) if data_dir_env else Path(user_data_dir("osa", "osc"))
+    base.mkdir(parents=True, exist_ok=True)
+    return base / "sessions.db"
+
+
+_store: SessionStore | None = None
+_store_lock = threading.Lock()
+
+# One worker: the SQLite store serializes on its connection anyway, and a
+# single thread keeps a session's writes in order.
+_T = TypeVar("_T")
+_session_executor: ThreadPoolExecutor | None = None
+_session_executor_lock = threading.Lock()
+
+
+def _get_session_executor() -> ThreadPoolExecutor:
+    global _session_executor
+    with _session_executor_lock:
+        if _session_executor is None:
+            _session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sessions")
+        return _session_executor
+
+
+async def run_session_io(func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Run a blocking session call (store access, message writes) off the event loop."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(_get_session_executor(), call)
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store, creating it from settings."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if get_settings().session_backend == "sqlite":
+                _store = SQLiteSessionStore(get_sessions_db_path())
+                logger.info("Using SQLite session store at %s", _store.db_path)
+            else:
+                _store = MemorySessionStore()
+        return _store
+
+
+def set_session_store(store: SessionStore | None) -> None:
+    """Replace the process-wide session store (for tests)."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def close_session_store() -> None:
+    """Finish pending session writes, then close and forget the session store."""
+    global _store, _session_executor
+    with _session_executor_lock:
+        executor, _session_executor = _session_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
+
+
+def get_or_create_session(community_id: str, session_id: str | None) -> ChatSession:
+    """Get existing session or create a new one.
+
+    Enforces session limits:
+    - Evicts expired sessions (TTL)
+    - Evicts LRU session if at capacity
+    - Max sessions per community: 1000
+    """
+    store = get_session_store()
+    if session_id:
+        session = store.get(community_id, session_id)
+        if session is not None:
+            return session
+
+    session = store.create(community_id, session_id or str(uuid.uuid4()))
+    SESSIONS_CREATED.inc(community=community_id)
+    return session
+
+
+def start_turn(community_id: str, session_id: str | None, message: str) -> ChatSession:
+    """Get or create a session, add the user's message and load its history.
+
+    Does all of a chat turn's up-front store work in one call, so async
+    callers make a single ``run_session_io`` hop.
+
+    Raises:
+        ValueError: If the message exceeds the length limit or the session is full.
+    """
+    session = get_or_create_session(community_id, session_id)
+    session.add_user_message(message)
+    session.messages  # noqa: B018 - load the history here, not on the event loop
+    return session
+
+
+def get_session(community_id: str, session_id: str) -> ChatSession | None:
+    """Get a session by ID, returns None if not found or expired."""
+    return get_session_store().get(community_id, session_id)
+
+
+def delete_session(community_id: str, session_id: str) -> bool:
+    """Delete a session. Returns True if deleted, False if not found."""
+    return get_session_store().delete(community_id, session_id)
+
+
+def list_sessions(community_id: str) -> list[ChatSession]:
+    """List all active (non-expired) sessions for a community."""
+    return get_session_store().list_sessions(community_id)
+
+
+def _collect_session_samples() -> list[Sample]:
+    """Export in-memory session counts. The SQLite store is not queried at scrape time."""
+    store = _store
+    if not isinstance(store, MemorySessionStore):
+        return []
+    return [
+        Sample(
+            "osa_chat_sessions",
+            "gauge",
+            "Chat sessions held in memory.",
+            n,
+            {"community": community_id},
+        )
+        for community_id, n in store.counts().items()
+    ]
+
+
+REGISTRY.add_collector(_collect_session_samples)
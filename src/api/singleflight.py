@@ -0,0 +1,223 @@
+"""Request coalescing ("singleflight") for identical streaming /ask requests.
+
+When a community announces something, many widget users send the same
+suggested question within seconds. Instead of one agent run per request,
+concurrent requests with the same key share a single in-flight response
+stream: the first request starts the run, later ones join it. Every
+subscriber replays the stream from the start, so late joiners receive the
+full answer.
+
+The run belongs to the flight, not to the request that started it. It
+keeps going while any subscriber is reading or about to read, and is
+cancelled when the last one disconnects. A subscription whose response
+body never starts must be closed with ``Subscription.close()`` (the
+response's background task) so it does not hold the run open. All state
+is touched only from the event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import AsyncGenerator, Callable
+from contextlib import aclosing
+from typing import Any
+
+from src.metrics.prometheus import REGISTRY, Sample
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold and collapse whitespace so trivially different questions match."""
+    return " ".join(question.casefold().split())
+
+
+def flight_key(*parts: Any) -> str:
+    """Hash key parts (strings, None, or JSON-serializable values) into a key."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class Subscription:
+    """One subscriber's async iterator over a SharedStream, from the first chunk.
+
+    Until iteration starts, the subscription is pending and keeps the run
+    alive; once started it counts as a subscriber until its iteration ends.
+    """
+
+    def __init__(self, shared: "SharedStream") -> None:
+        self._shared = shared
+        self._chunks = shared._iterate(self)
+        self.started = False
+        self._closed = False
+        shared._pending += 1
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> str:
+        return await anext(self._chunks)
+
+    async def aclose(self) -> None:
+        """Stop iterating (or drop the subscription if it never started)."""
+        await self._chunks.aclose()
+        self.close()
+
+    def close(self) -> None:
+        """Drop a subscription that never started iterating. Idempotent."""
+        if self.started or self._closed:
+            return
+        self._closed = True
+        self._shared._pending -= 1
+        self._shared._cancel_if_unwatched()
+
+
+class SharedStream:
+    """One in-flight response stream, replayed to every subscriber."""
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._finished = False
+        self._abandoned = False
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._pending = 0
+        self.subscribers = 0
+
+    @property
+    def joinable(self) -> bool:
+        """Whether new subscribers can still get the whole stream."""
+        return not (self._finished or self._abandoned)
+
+    def _publish(self, chunk: str | None) -> None:
+        """Append a chunk (or mark the end with None) and wake subscribers."""
+        if chunk is None:
+            self._finished = True
+        else:
+            self._chunks.append(chunk)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def subscribe(self) -> Subscription:
+        """Return a new subscription over every chunk, from the first.
+
+        When the last subscription ends (or is closed unstarted) before the
+        stream does, the run is cancelled.
+        """
+        return Subscription(self)
+
+    async def _iterate(self, subscription: Subscription) -> AsyncGenerator[str, None]:
+        subscription.started = True
+        self._pending -= 1
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self._chunks):
+                    yield self._chunks[index]
+                    index += 1
+                if self._finished:
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            self._cancel_if_unwatched()
+
+    def _cancel_if_unwatched(self) -> None:
+        """Cancel the run if nobody is reading it or about to."""
+        if self.subscribers or self._pending:
+            return
+        if self._task is not None and not self._task.done():
+            logger.info("All subscribers left a shared stream; cancelling its run")
+            self._abandoned = True
+            self._task.cancel()
+
+
+class SingleFlight:
+    """Registry of in-flight shared streams by key."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, SharedStream] = {}
+        # Runs still finishing after their flight was replaced or removed
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.started = 0
+        self.joined = 0
+
+    def join(self, key: str) -> SharedStream | None:
+        """Return the in-flight stream for a key, or None."""
+        shared = self._flights.get(key)
+        if shared is None or not shared.joinable:
+            return None
+        self.joined += 1
+        return shared
+
+    def start(
+        self,
+        key: str,
+        source: AsyncGenerator[str, None],
+        on_done: Callable[[], None] | None = None,
+    ) -> SharedStream:
+        """Run ``source`` in a background task and share its output under ``key``.
+
+        Args:
+            key: Flight key; later ``join(key)`` calls get this stream.
+            source: The response stream to run once.
+            on_done: Called when the run ends, however it ends.
+        """
+        shared = SharedStream()
+        self._flights[key] = shared
+        self.started += 1
+
+        async def pump() -> None:
+            try:
+                async with aclosing(source):
+                    async for chunk in source:
+                        shared._publish(chunk)
+            except Exception:
+                # Nobody awaits this task; subscribers just see the stream end
+                logger.exception("Shared stream run failed")
+            finally:
+                if self._flights.get(key) is shared:
+                    del self._flights[key]
+                shared._publish(None)
+                if on_done is not None:
+                    on_done()
+
+        shared._task = task = asyncio.create_task(pump())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return shared
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+
+ask_flights = SingleFlight()
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export /ask coalescing counters."""
+    return [
+        Sample(
+            "osa_ask_flights_in_progress",
+            "gauge",
+            "Shared /ask runs currently streaming.",
+            len(ask_flights),
+        ),
+        Sample(
+            "osa_ask_flights_started_total",
+            "counter",
+            "Streaming /ask runs started as a shareable flight.",
+            ask_flights.started,
+        ),
+        Sample(
+            "osa_ask_flights_joined_total",
+            "counter",
+            "Streaming /ask requests served by joining an identical in-flight run.",
+            ask_flights.joined,
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
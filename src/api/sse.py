@@ -0,0 +1,140 @@
+"""Server-Sent Events encoding for the streaming /ask and /chat endpoints.
+
+LLM providers stream a few characters per chunk, and framing each chunk as
+its own ``data:`` event costs a JSON encode and an SSE frame per token.
+``SSEEncoder`` coalesces content chunks over a short time/size window (the
+first chunk is sent at once so time to first token is unchanged), emits
+``: keep-alive`` comments while tools run so proxies and the widget's idle
+timeout do not cut the connection, and trims ``tool_end`` outputs for
+clients that only display tool names.
+
+JSON is encoded with orjson when it is installed, falling back to a compact
+stdlib encoder.
+"""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any, Literal
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+ToolOutputMode = Literal["full", "truncated", "none"]
+
+# Flush buffered content once it holds this many characters...
+COALESCE_MAX_CHARS = 256
+# ...or once its oldest chunk has waited this long
+COALESCE_MAX_SECONDS = 0.05
+
+# Send a keep-alive comment after this long without writing anything
+KEEPALIVE_SECONDS = 15.0
+
+# Characters of tool output kept when the client asks for "truncated"
+TOOL_OUTPUT_PREVIEW_CHARS = 500
+
+KEEPALIVE_FRAME = ": keep-alive\n\n"
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(payload: Any) -> str:
+    """Serialize a payload to compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+    return _json_encoder.encode(payload)
+
+
+def frame(payload: dict[str, Any]) -> str:
+    """Format one SSE ``data:`` frame."""
+    return f"data: {dumps(payload)}\n\n"
+
+
+class SSEEncoder:
+    """Encodes one response stream's events into SSE frames.
+
+    Every method returns the text to write, which may be empty. Any
+    non-content event first flushes buffered content, so event order is
+    preserved. ``completed`` and ``errored`` record whether a ``done`` or
+    ``error`` event has been encoded.
+    """
+
+    def __init__(
+        self,
+        tool_output: ToolOutputMode = "full",
+        coalesce_chars: int = COALESCE_MAX_CHARS,
+        coalesce_seconds: float = COALESCE_MAX_SECONDS,
+        keepalive_seconds: float = KEEPALIVE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.tool_output = tool_output
+        self.coalesce_chars = coalesce_chars
+        self.coalesce_seconds = coalesce_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self._clock = clock
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._buffer_started = 0.0
+        self._sent_content = False
+        self._last_write = clock()
+        self.completed = False
+        self.errored = False
+
+    def content(self, text: str) -> str:
+        """Buffer a content chunk; return a frame when the window is full."""
+        now = self._clock()
+        if not self._buffer:
+            self._buffer_started = now
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        if (
+            not self._sent_content
+            or self._buffered_chars >= self.coalesce_chars
+            or now - self._buffer_started >= self.coalesce_seconds
+        ):
+            return self.flush()
+        return ""
+
+    def flush(self) -> str:
+        """Return buffered content as a single frame (empty if none)."""
+        if not self._buffer:
+            return ""
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        self._sent_content = True
+        return self._write(frame({"event": "content", "content": text}))
+
+    def event(self, payload: dict[str, Any]) -> str:
+        """Flush buffered content, then frame a non-content event."""
+        kind = payload.get("event")
+        if kind == "done":
+            self.completed = True
+        elif kind == "error":
+            self.errored = True
+        return self.flush() + self._write(frame(payload))
+
+    def tool_end(self, name: str, output: Any) -> str:
+        """Frame a ``tool_end`` event, trimming the output per the client's choice."""
+        payload: dict[str, Any] = {"event": "tool_end", "name": name}
+        if self.tool_output != "none":
+            text = str(output) if output else ""
+            if self.tool_output == "truncated" and len(text) > TOOL_OUTPUT_PREVIEW_CHARS:
+                text = text[:TOOL_OUTPUT_PREVIEW_CHARS]
+                payload["truncated"] = True
+            payload["output"] = text
+        return self.event(payload)
+
+    def idle(self) -> str:
+        """Called while no events arrive: flush stalled content or send a keep-alive."""
+        if self._buffer:
+            return self.flush()
+        if self._clock() - self._last_write >= self.keepalive_seconds:
+            return self._write(KEEPALIVE_FRAME)
+        return ""
+
+    def _write(self, text: str) -> str:
+        self._last_write = self._clock()
+        return text
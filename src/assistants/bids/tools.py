@@ -3,9 +3,9 @@
 import logging
 import sqlite3
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
-from src.knowledge.db import get_db_path
+from src.knowledge.db import get_db_path, run_in_db_executor
 from src.knowledge.search import search_beps
 
 logger = logging.getLogger(__name__)
@@ -18,8 +18,7 @@ _BEP_NOT_INITIALIZED_MSG = (
 )
 
 
-@tool
-def lookup_bep(
+def _lookup_bep(
     query: str,
     limit: int = 3,
 ) -> str:
@@ -90,5 +89,15 @@ def lookup_bep(
     return "\n".join(lines)
 
 
+async def _alookup_bep(query: str, limit: int = 3) -> str:
+    """Run lookup_bep on the knowledge DB executor."""
+    return await run_in_db_executor(_lookup_bep, query, limit)
+
+
+lookup_bep = StructuredTool.from_function(
+    func=_lookup_bep, coroutine=_alookup_bep, name="lookup_bep"
+)
+
+
 # Export for plugin discovery
 __all__ = ["lookup_bep"]
@@ -11,6 +11,8 @@ Generic tools (doc retrieval, knowledge search) are auto-generated
 by CommunityAssistant based on the YAML config.
 """
 
+import asyncio
+import contextlib
 import json
 import logging
 import os
@@ -20,28 +22,20 @@ import subprocess
 from typing import Any
 
 import httpx
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
 logger = logging.getLogger(__name__)
 
+HED_BASE_URL = "https://hedtools.org/hed"
+SUGGEST_TIMEOUT_SECONDS = 30
 
-def _get_session_info(base_url: str = "https://hedtools.org/hed") -> tuple[str, str]:
-    """Get session cookie and CSRF token from hedtools.org.
 
-    Args:
-        base_url: Base URL for HED tools
-
-    Returns:
-        Tuple of (cookie_value, csrf_token)
+def _parse_session_response(response: httpx.Response) -> tuple[str, str]:
+    """Extract the session cookie and CSRF token from a hedtools.org services page.
 
     Raises:
-        httpx.HTTPError: If session setup fails
+        ValueError: If the cookie or token is missing
     """
-    csrf_url = f"{base_url}/services"
-
-    response = httpx.get(csrf_url, timeout=10.0, follow_redirects=True)
-    response.raise_for_status()
-
     # Extract cookie from Set-Cookie header
     cookie = response.cookies.get("session")
     if not cookie:
@@ -65,8 +59,86 @@ def _get_session_info(base_url: str = "https://hedtools.org/hed") -> tuple[str,
     return cookie, csrf_token
 
 
-@tool
-def validate_hed_string(hed_string: str, schema_version: str = "8.4.0") -> dict[str, Any]:
+def _get_session_info(base_url: str = HED_BASE_URL) -> tuple[str, str]:
+    """Get session cookie and CSRF token from hedtools.org.
+
+    Args:
+        base_url: Base URL for HED tools
+
+    Returns:
+        Tuple of (cookie_value, csrf_token)
+
+    Raises:
+        httpx.HTTPError: If session setup fails
+    """
+    response = httpx.get(f"{base_url}/services", timeout=10.0, follow_redirects=True)
+    response.raise_for_status()
+    return _parse_session_response(response)
+
+
+async def _aget_session_info(
+    client: httpx.AsyncClient, base_url: str = HED_BASE_URL
+) -> tuple[str, str]:
+    """Async variant of _get_session_info using a shared client."""
+    response = await client.get(f"{base_url}/services", timeout=10.0, follow_redirects=True)
+    response.raise_for_status()
+    return _parse_session_response(response)
+
+
+def _validation_request(
+    hed_string: str, schema_version: str, cookie: str, csrf_token: str
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Build the payload and CSRF-protected headers for a validation request."""
+    # Service name changed from docs - API uses strings_validate
+    payload = {
+        "service": "strings_validate",
+        "schema_version": schema_version,
+        "string_list": [hed_string],
+        "check_for_warnings": False,
+    }
+    headers = {
+        "X-CSRFToken": csrf_token,
+        "Cookie": f"session={cookie}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+    return payload, headers
+
+
+def _validation_result(result: dict[str, Any], schema_version: str) -> dict[str, Any]:
+    """Convert a services_submit response into the tool's result dict."""
+    results = result.get("results", {})
+    msg_category = results.get("msg_category", "error")
+
+    if msg_category == "success":
+        return {
+            "valid": True,
+            "errors": "",
+            "schema_version": results.get("schema_version", schema_version),
+        }
+    return {
+        "valid": False,
+        "errors": results.get("data", "Unknown validation error"),
+        "schema_version": results.get("schema_version", schema_version),
+    }
+
+
+def _validation_unavailable(schema_version: str, internal: bool = False) -> dict[str, Any]:
+    """Result returned when the validation service cannot be used."""
+    reason = (
+        "Validation failed due to an internal error. "
+        if internal
+        else "Validation service is temporarily unavailable. "
+    )
+    return {
+        "valid": False,
+        "errors": reason + "Do NOT present unvalidated HED tags to users. "
+        "Tell the user you cannot validate right now.",
+        "schema_version": schema_version,
+    }
+
+
+def _validate_hed_string(hed_string: str, schema_version: str = "8.4.0") -> dict[str, Any]:
     """Validate a HED annotation string using the hedtools.org API.
 
     **Primary Use**: Self-check tool for the agent to validate examples BEFORE showing to users.
@@ -95,71 +167,108 @@ def validate_hed_string(hed_string: str, schema_version: str = "8.4.0") -> dict[
         ... else:
         ...     print(f"Fix needed: {result['errors']}")
     """
-    base_url = "https://hedtools.org/hed"
-    url = f"{base_url}/services_submit"
+    url = f"{HED_BASE_URL}/services_submit"
 
     try:
         # Get session cookie and CSRF token
-        cookie, csrf_token = _get_session_info(base_url)
-
-        # Prepare payload (service name changed from docs - API uses strings_validate)
-        payload = {
-            "service": "strings_validate",
-            "schema_version": schema_version,
-            "string_list": [hed_string],
-            "check_for_warnings": False,
-        }
-
-        # Make request with CSRF protection headers
-        headers = {
-            "X-CSRFToken": csrf_token,
-            "Cookie": f"session={cookie}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        cookie, csrf_token = _get_session_info(HED_BASE_URL)
+        payload, headers = _validation_request(hed_string, schema_version, cookie, csrf_token)
 
         response = httpx.post(url, json=payload, headers=headers, timeout=30.0)
         response.raise_for_status()
-        result = response.json()
+        return _validation_result(response.json(), schema_version)
 
-        results = result.get("results", {})
-        msg_category = results.get("msg_category", "error")
-
-        if msg_category == "success":
-            return {
-                "valid": True,
-                "errors": "",
-                "schema_version": results.get("schema_version", schema_version),
-            }
-        else:
-            return {
-                "valid": False,
-                "errors": results.get("data", "Unknown validation error"),
-                "schema_version": results.get("schema_version", schema_version),
-            }
+    except httpx.HTTPError as e:
+        logger.warning("HED validation API error: %s", e)
+        return _validation_unavailable(schema_version)
+    except Exception:
+        logger.exception("Unexpected error during HED validation")
+        return _validation_unavailable(schema_version, internal=True)
+
+
+async def _avalidate_hed_string(hed_string: str, schema_version: str = "8.4.0") -> dict[str, Any]:
+    """Async variant of validate_hed_string."""
+    url = f"{HED_BASE_URL}/services_submit"
+
+    try:
+        async with httpx.AsyncClient() as client:
+            cookie, csrf_token = await _aget_session_info(client, HED_BASE_URL)
+            payload, headers = _validation_request(hed_string, schema_version, cookie, csrf_token)
+
+            response = await client.post(url, json=payload, headers=headers, timeout=30.0)
+            response.raise_for_status()
+            return _validation_result(response.json(), schema_version)
 
     except httpx.HTTPError as e:
         logger.warning("HED validation API error: %s", e)
-        return {
-            "valid": False,
-            "errors": "Validation service is temporarily unavailable. "
-            "Do NOT present unvalidated HED tags to users. "
-            "Tell the user you cannot validate right now.",
-            "schema_version": schema_version,
-        }
+        return _validation_unavailable(schema_version)
     except Exception:
         logger.exception("Unexpected error during HED validation")
-        return {
-            "valid": False,
-            "errors": "Validation failed due to an internal error. "
-            "Do NOT present unvalidated HED tags to users. "
-            "Tell the user you cannot validate right now.",
-            "schema_version": schema_version,
-        }
+        return _validation_unavailable(schema_version, internal=True)
+
+
+def _find_hed_suggest_cli() -> str | None:
+    """Locate the hed-suggest CLI.
+
+    1. Check if it's in PATH (global install)
+    2. Check configured path via HED_LSP_PATH env var
+    3. Check common local dev path
+    """
+    cli_path = shutil.which("hed-suggest")
+
+    if not cli_path:
+        # Check env var for local dev path
+        hed_lsp_path = os.environ.get("HED_LSP_PATH")
+        if hed_lsp_path:
+            candidate = os.path.join(hed_lsp_path, "server", "out", "cli.js")
+            if os.path.exists(candidate):
+                cli_path = candidate
+
+    if not cli_path:
+        # Check common local dev path
+        dev_path = os.path.expanduser("~/Documents/git/HED/hed-lsp/server/out/cli.js")
+        if os.path.exists(dev_path):
+            cli_path = dev_path
+
+    return cli_path
+
 
+def _suggest_command(cli_path: str, search_terms: list[str], top_n: int) -> list[str]:
+    """Build the hed-suggest command line."""
+    cmd = ["node", cli_path] if cli_path.endswith(".js") else [cli_path]
+    cmd.extend(["--json", "--top", str(top_n)])
+    cmd.extend(search_terms)
+    return cmd
 
-@tool
-def suggest_hed_tags(search_terms: list[str], top_n: int = 10) -> dict[str, Any]:
+
+def _suggest_error(message: str, search_terms: list[str]) -> dict[str, Any]:
+    """Result returned when tag suggestions are unavailable."""
+    return {
+        "error": f"{message} You MUST use validate_hed_string to verify any tags you want to use.",
+        **{term: [] for term in search_terms},
+    }
+
+
+def _suggest_result(
+    returncode: int, stdout: str, stderr: str, search_terms: list[str]
+) -> dict[str, Any]:
+    """Interpret a finished hed-suggest run."""
+    if returncode != 0:
+        logger.warning(
+            "hed-suggest CLI failed with exit code %d: %s",
+            returncode,
+            stderr[:200] if stderr else "(no stderr)",
+        )
+        return _suggest_error("Tag suggestion tool failed.", search_terms)
+
+    try:
+        return json.loads(stdout)
+    except json.JSONDecodeError as e:
+        logger.error("hed-suggest CLI returned invalid JSON: %s", e)
+        return _suggest_error("Tag suggestion tool returned invalid data.", search_terms)
+
+
+def _suggest_hed_tags(search_terms: list[str], top_n: int = 10) -> dict[str, Any]:
     """Suggest valid HED tags for natural language search terms.
 
     Use this tool to find valid HED tags that match natural language descriptions.
@@ -191,89 +300,60 @@ def suggest_hed_tags(search_terms: list[str], top_n: int = 10) -> dict[str, Any]
             "visual flash": ["Flash", "Flickering", "Visual-presentation"]
         }
     """
-    # Try to find hed-suggest CLI
-    # 1. Check if it's in PATH (global install)
-    # 2. Check configured path via HED_LSP_PATH env var
-    # 3. Check common local dev path
-    cli_path = shutil.which("hed-suggest")
-
-    if not cli_path:
-        # Check env var for local dev path
-        hed_lsp_path = os.environ.get("HED_LSP_PATH")
-        if hed_lsp_path:
-            candidate = os.path.join(hed_lsp_path, "server", "out", "cli.js")
-            if os.path.exists(candidate):
-                cli_path = candidate
-
-    if not cli_path:
-        # Check common local dev path
-        dev_path = os.path.expanduser("~/Documents/git/HED/hed-lsp/server/out/cli.js")
-        if os.path.exists(dev_path):
-            cli_path = dev_path
-
+    cli_path = _find_hed_suggest_cli()
     if not cli_path:
         logger.warning("hed-suggest CLI not found; tag suggestions unavailable")
-        return {
-            "error": "Tag suggestion tool is not available. "
-            "You MUST use validate_hed_string to verify any tags you want to use.",
-            **{term: [] for term in search_terms},
-        }
+        return _suggest_error("Tag suggestion tool is not available.", search_terms)
 
     try:
-        # Build command
-        cmd = ["node", cli_path] if cli_path.endswith(".js") else [cli_path]
-        cmd.extend(["--json", "--top", str(top_n)])
-        cmd.extend(search_terms)
-
-        # Run CLI
         result = subprocess.run(
-            cmd,
+            _suggest_command(cli_path, search_terms, top_n),
             capture_output=True,
             text=True,
-            timeout=30,
+            timeout=SUGGEST_TIMEOUT_SECONDS,
         )
-
-        if result.returncode != 0:
-            logger.warning(
-                "hed-suggest CLI failed with exit code %d: %s",
-                result.returncode,
-                result.stderr[:200] if result.stderr else "(no stderr)",
-            )
-            return {
-                "error": "Tag suggestion tool failed. "
-                "You MUST use validate_hed_string to verify any tags you want to use.",
-                **{term: [] for term in search_terms},
-            }
-
-        # Parse JSON from stdout
-        output = json.loads(result.stdout)
-        return output
+        return _suggest_result(result.returncode, result.stdout, result.stderr, search_terms)
 
     except subprocess.TimeoutExpired:
-        logger.error("hed-suggest CLI timed out after 30 seconds")
-        return {
-            "error": "Tag suggestion tool timed out. "
-            "You MUST use validate_hed_string to verify any tags you want to use.",
-            **{term: [] for term in search_terms},
-        }
-    except json.JSONDecodeError as e:
-        logger.error("hed-suggest CLI returned invalid JSON: %s", e)
-        return {
-            "error": "Tag suggestion tool returned invalid data. "
-            "You MUST use validate_hed_string to verify any tags you want to use.",
-            **{term: [] for term in search_terms},
-        }
+        logger.error("hed-suggest CLI timed out after %d seconds", SUGGEST_TIMEOUT_SECONDS)
+        return _suggest_error("Tag suggestion tool timed out.", search_terms)
     except Exception:
         logger.exception("Unexpected error in suggest_hed_tags")
-        return {
-            "error": "Tag suggestion tool encountered an error. "
-            "You MUST use validate_hed_string to verify any tags you want to use.",
-            **{term: [] for term in search_terms},
-        }
+        return _suggest_error("Tag suggestion tool encountered an error.", search_terms)
+
+
+async def _asuggest_hed_tags(search_terms: list[str], top_n: int = 10) -> dict[str, Any]:
+    """Async variant of suggest_hed_tags using a non-blocking subprocess."""
+    cli_path = _find_hed_suggest_cli()
+    if not cli_path:
+        logger.warning("hed-suggest CLI not found; tag suggestions unavailable")
+        return _suggest_error("Tag suggestion tool is not available.", search_terms)
+
+    proc = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_suggest_command(cli_path, search_terms, top_n),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=SUGGEST_TIMEOUT_SECONDS)
+        return _suggest_result(proc.returncode or 0, stdout.decode(), stderr.decode(), search_terms)
+
+    except TimeoutError:
+        logger.error("hed-suggest CLI timed out after %d seconds", SUGGEST_TIMEOUT_SECONDS)
+        return _suggest_error("Tag suggestion tool timed out.", search_terms)
+    except Exception:
+        logger.exception("Unexpected error in suggest_hed_tags")
+        return _suggest_error("Tag suggestion tool encountered an error.", search_terms)
+    finally:
+        # Also reached on cancellation; never leave the CLI running
+        if proc is not None and proc.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
 
 
-@tool
-def get_hed_schema_versions() -> dict[str, Any]:
+def _get_hed_schema_versions() -> dict[str, Any]:
     """Get list of available HED schema versions from hedtools.org.
 
     Use this to check which schema versions are available for validation.
@@ -289,7 +369,7 @@ def get_hed_schema_versions() -> dict[str, Any]:
         >>> print(result["versions"][:5])
         ['8.4.0', '8.3.0', '8.2.0', '8.1.0', '8.0.0']
     """
-    url = "https://hedtools.org/hed/schema_versions"
+    url = f"{HED_BASE_URL}/schema_versions"
 
     try:
         response = httpx.get(url, timeout=10.0, follow_redirects=True)
@@ -307,5 +387,45 @@ def get_hed_schema_versions() -> dict[str, Any]:
         return {"versions": [], "error": f"Failed to get versions: {e}"}
 
 
+async def _aget_hed_schema_versions() -> dict[str, Any]:
+    """Async variant of get_hed_schema_versions."""
+    url = f"{HED_BASE_URL}/schema_versions"
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, timeout=10.0, follow_redirects=True)
+            response.raise_for_status()
+            result = response.json()
+
+        versions = result.get("schema_version_list", [])
+        return {"versions": versions, "error": ""}
+
+    except httpx.HTTPError as e:
+        logger.warning("Failed to get HED schema versions from hedtools.org: %s", e)
+        return {"versions": [], "error": f"API error: {e}"}
+    except Exception as e:
+        logger.exception("Unexpected error getting HED schema versions")
+        return {"versions": [], "error": f"Failed to get versions: {e}"}
+
+
+# Each tool keeps its sync implementation (used by invoke) and gets an async
+# one (used by ainvoke/astream_events) so async agents never block on I/O.
+validate_hed_string = StructuredTool.from_function(
+    func=_validate_hed_string,
+    coroutine=_avalidate_hed_string,
+    name="validate_hed_string",
+)
+suggest_hed_tags = StructuredTool.from_function(
+    func=_suggest_hed_tags,
+    coroutine=_asuggest_hed_tags,
+    name="suggest_hed_tags",
+)
+get_hed_schema_versions = StructuredTool.from_function(
+    func=_get_hed_schema_versions,
+    coroutine=_aget_hed_schema_versions,
+    name="get_hed_schema_versions",
+)
+
+
 # Export for plugin discovery
 __all__ = ["validate_hed_string", "suggest_hed_tags", "get_hed_schema_versions"]
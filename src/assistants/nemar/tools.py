@@ -17,7 +17,7 @@ import time
 from typing import Any
 
 import httpx
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,38 @@ _cache_timestamp: float = 0.0
 _CACHE_TTL_SECONDS: float = 300.0  # 5 minutes
 
 
+def _cached_datasets(now: float) -> list[dict[str, Any]] | None:
+    """Return the cached dataset list if it is still fresh."""
+    if _datasets_cache and (now - _cache_timestamp) < _CACHE_TTL_SECONDS:
+        return _datasets_cache
+    return None
+
+
+def _store_datasets(data: dict[str, Any], now: float) -> list[dict[str, Any]]:
+    """Extract datasets from a records response and cache them."""
+    global _datasets_cache, _cache_timestamp  # noqa: PLW0603
+
+    entries = data.get("entries", {})
+    if not entries:
+        logger.warning("NEMAR API returned empty entries")
+        return []
+
+    # entries is a dict with string indices: {"0": {...}, "1": {...}, ...}
+    numeric_keys = [k for k in entries if k.isdigit()]
+    datasets = [entries[k] for k in sorted(numeric_keys, key=int)]
+
+    _datasets_cache = datasets
+    _cache_timestamp = now
+    return datasets
+
+
+def _records_request() -> tuple[str, dict[str, Any]]:
+    """URL and JSON body for the dataset list request."""
+    url = f"{NEMAR_API_BASE}/records"
+    payload = {"table_name": TABLE_NAME, "start": 0, "limit": 1000}
+    return url, payload
+
+
 def _fetch_all_datasets() -> list[dict[str, Any]]:
     """Fetch all datasets from NEMAR API, with a 5-minute TTL cache.
 
@@ -40,32 +72,33 @@ def _fetch_all_datasets() -> list[dict[str, Any]]:
     Raises:
         httpx.HTTPError: If the API request fails.
     """
-    global _datasets_cache, _cache_timestamp  # noqa: PLW0603
-
     now = time.monotonic()
-    if _datasets_cache and (now - _cache_timestamp) < _CACHE_TTL_SECONDS:
-        return _datasets_cache
+    cached = _cached_datasets(now)
+    if cached is not None:
+        return cached
 
-    url = f"{NEMAR_API_BASE}/records"
-    payload = {"table_name": TABLE_NAME, "start": 0, "limit": 1000}
+    url, payload = _records_request()
 
     # NEMAR API uses GET with JSON body (unusual but required)
     response = httpx.request("GET", url, json=payload, timeout=30.0)
     response.raise_for_status()
-    data = response.json()
+    return _store_datasets(response.json(), now)
 
-    entries = data.get("entries", {})
-    if not entries:
-        logger.warning("NEMAR API returned empty entries")
-        return []
 
-    # entries is a dict with string indices: {"0": {...}, "1": {...}, ...}
-    numeric_keys = [k for k in entries if k.isdigit()]
-    datasets = [entries[k] for k in sorted(numeric_keys, key=int)]
+async def _afetch_all_datasets() -> list[dict[str, Any]]:
+    """Async variant of _fetch_all_datasets sharing the same TTL cache."""
+    now = time.monotonic()
+    cached = _cached_datasets(now)
+    if cached is not None:
+        return cached
 
-    _datasets_cache = datasets
-    _cache_timestamp = now
-    return datasets
+    url, payload = _records_request()
+
+    async with httpx.AsyncClient() as client:
+        response = await client.request("GET", url, json=payload, timeout=30.0)
+        response.raise_for_status()
+        data = response.json()
+    return _store_datasets(data, now)
 
 
 def _parse_sep_field(value: str) -> list[str]:
@@ -139,8 +172,65 @@ def _format_summary(dataset: dict[str, Any]) -> str:
     )
 
 
-@tool
-def search_nemar_datasets(
+def _datasets_error(error: Exception) -> str:
+    """Log a dataset list failure and return the message shown to the agent.
+
+    Must be called from the ``except`` block handling ``error``.
+    """
+    if isinstance(error, httpx.HTTPError):
+        logger.warning("NEMAR API error: %s", error)
+        return f"Failed to fetch datasets from NEMAR: {error}"
+    if isinstance(error, ValueError | KeyError):
+        logger.warning("Failed to parse NEMAR API response: %s", error)
+        return "Failed to parse NEMAR API response. Please try again later."
+    logger.exception("Unexpected error fetching NEMAR datasets")
+    return "Failed to fetch datasets from NEMAR. Please try again later."
+
+
+def _format_search_results(
+    datasets: list[dict[str, Any]],
+    query: str | None,
+    modality_filter: str | None,
+    task_filter: str | None,
+    has_hed: bool | None,
+    min_participants: int | None,
+    limit: int,
+) -> str:
+    """Filter datasets and format the matches as a markdown summary."""
+    matched = [
+        ds
+        for ds in datasets
+        if _matches(ds, query, modality_filter, task_filter, has_hed, min_participants)
+    ]
+
+    total_matched = len(matched)
+    if total_matched == 0:
+        active_filters = {
+            "query": f'"{query}"' if query else None,
+            "modality": modality_filter,
+            "task": task_filter,
+            "has_hed": "True" if has_hed else None,
+            "min_participants": str(min_participants) if min_participants else None,
+        }
+        filters_desc = [f"{k}={v}" for k, v in active_filters.items() if v]
+        return f"No datasets found matching: {', '.join(filters_desc)}. Total datasets in NEMAR: {len(datasets)}."
+
+    # Cap results
+    shown = matched[:limit]
+
+    lines = [f"Found **{total_matched}** matching datasets (showing {len(shown)}):\n"]
+    for ds in shown:
+        lines.append(_format_summary(ds))
+
+    if total_matched > limit:
+        lines.append(
+            f"\n*{total_matched - limit} more results not shown. Narrow your search or increase limit.*"
+        )
+
+    return "\n".join(lines)
+
+
+def _search_nemar_datasets(
     query: str | None = None,
     modality_filter: str | None = None,
     task_filter: str | None = None,
@@ -171,52 +261,74 @@ def search_nemar_datasets(
 
     try:
         datasets = _fetch_all_datasets()
-    except httpx.HTTPError as e:
-        logger.warning("NEMAR API error: %s", e)
-        return f"Failed to fetch datasets from NEMAR: {e}"
-    except (ValueError, KeyError) as e:
-        logger.warning("Failed to parse NEMAR API response: %s", e)
-        return "Failed to parse NEMAR API response. Please try again later."
-    except Exception:
-        logger.exception("Unexpected error fetching NEMAR datasets")
-        return "Failed to fetch datasets from NEMAR. Please try again later."
+    except Exception as e:
+        return _datasets_error(e)
 
-    # Apply filters
-    matched = [
-        ds
-        for ds in datasets
-        if _matches(ds, query, modality_filter, task_filter, has_hed, min_participants)
-    ]
+    return _format_search_results(
+        datasets, query, modality_filter, task_filter, has_hed, min_participants, limit
+    )
 
-    total_matched = len(matched)
-    if total_matched == 0:
-        active_filters = {
-            "query": f'"{query}"' if query else None,
-            "modality": modality_filter,
-            "task": task_filter,
-            "has_hed": "True" if has_hed else None,
-            "min_participants": str(min_participants) if min_participants else None,
-        }
-        filters_desc = [f"{k}={v}" for k, v in active_filters.items() if v]
-        return f"No datasets found matching: {', '.join(filters_desc)}. Total datasets in NEMAR: {len(datasets)}."
 
-    # Cap results
-    shown = matched[:limit]
+async def _asearch_nemar_datasets(
+    query: str | None = None,
+    modality_filter: str | None = None,
+    task_filter: str | None = None,
+    has_hed: bool | None = None,
+    min_participants: int | None = None,
+    limit: int = 20,
+) -> str:
+    """Async variant of search_nemar_datasets."""
+    limit = min(limit, 50)
 
-    lines = [f"Found **{total_matched}** matching datasets (showing {len(shown)}):\n"]
-    for ds in shown:
-        lines.append(_format_summary(ds))
+    try:
+        datasets = await _afetch_all_datasets()
+    except Exception as e:
+        return _datasets_error(e)
 
-    if total_matched > limit:
-        lines.append(
-            f"\n*{total_matched - limit} more results not shown. Narrow your search or increase limit.*"
-        )
+    return _format_search_results(
+        datasets, query, modality_filter, task_filter, has_hed, min_participants, limit
+    )
+
+
+def _invalid_dataset_id(dataset_id: str) -> str | None:
+    """Return an error message if dataset_id is malformed."""
+    if not dataset_id or not re.match(r"^ds\d{4,6}$", dataset_id):
+        return f"Invalid dataset ID '{dataset_id}'. Expected format: ds000248 (ds + 4-6 digits)."
+    return None
+
+
+def _details_request(dataset_id: str) -> tuple[str, dict[str, Any]]:
+    """URL and JSON body for a single dataset request."""
+    url = f"{NEMAR_API_BASE}/datasetid"
+    payload = {"table_name": TABLE_NAME, "dataset_id": dataset_id}
+    return url, payload
+
+
+def _dataset_from_response(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Extract the dataset from a datasetid response, or None if not found."""
+    entry = data.get("entry", {})
+    if not entry:
+        return None
+    # entry is {"0": {...}} for single results
+    return next(iter(entry.values()))
 
-    return "\n".join(lines)
 
+def _details_error(error: Exception, dataset_id: str) -> str:
+    """Log a dataset detail failure and return the message shown to the agent.
 
-@tool
-def get_nemar_dataset_details(dataset_id: str) -> str:
+    Must be called from the ``except`` block handling ``error``.
+    """
+    if isinstance(error, httpx.HTTPError):
+        logger.warning("NEMAR API error for dataset %s: %s", dataset_id, error)
+        return f"Failed to fetch dataset {dataset_id} from NEMAR: {error}"
+    if isinstance(error, ValueError | KeyError | StopIteration):
+        logger.warning("Failed to parse NEMAR response for %s: %s", dataset_id, error)
+        return f"Failed to parse NEMAR response for dataset {dataset_id}."
+    logger.exception("Unexpected error fetching NEMAR dataset %s", dataset_id)
+    return f"Failed to fetch dataset {dataset_id}. Please try again later."
+
+
+def _get_nemar_dataset_details(dataset_id: str) -> str:
     """Get comprehensive metadata for a specific NEMAR dataset.
 
     Retrieves full information including description, citation, licensing,
@@ -230,33 +342,47 @@ def get_nemar_dataset_details(dataset_id: str) -> str:
         including OpenNeuro link, DOI, authors, license, and README.
     """
     # Basic input validation
-    if not dataset_id or not re.match(r"^ds\d{4,6}$", dataset_id):
-        return f"Invalid dataset ID '{dataset_id}'. Expected format: ds000248 (ds + 4-6 digits)."
+    invalid = _invalid_dataset_id(dataset_id)
+    if invalid:
+        return invalid
 
-    url = f"{NEMAR_API_BASE}/datasetid"
-    payload = {"table_name": TABLE_NAME, "dataset_id": dataset_id}
+    url, payload = _details_request(dataset_id)
 
     try:
         response = httpx.request("GET", url, json=payload, timeout=30.0)
         response.raise_for_status()
-        data = response.json()
+        ds = _dataset_from_response(response.json())
+    except Exception as e:
+        return _details_error(e, dataset_id)
 
-        entry = data.get("entry", {})
-        if not entry:
-            return f"Dataset '{dataset_id}' not found on NEMAR."
-
-        # entry is {"0": {...}} for single results
-        ds = next(iter(entry.values()))
-    except httpx.HTTPError as e:
-        logger.warning("NEMAR API error for dataset %s: %s", dataset_id, e)
-        return f"Failed to fetch dataset {dataset_id} from NEMAR: {e}"
-    except (ValueError, KeyError, StopIteration) as e:
-        logger.warning("Failed to parse NEMAR response for %s: %s", dataset_id, e)
-        return f"Failed to parse NEMAR response for dataset {dataset_id}."
-    except Exception:
-        logger.exception("Unexpected error fetching NEMAR dataset %s", dataset_id)
-        return f"Failed to fetch dataset {dataset_id}. Please try again later."
+    if ds is None:
+        return f"Dataset '{dataset_id}' not found on NEMAR."
+    return _format_dataset_details(ds, dataset_id)
 
+
+async def _aget_nemar_dataset_details(dataset_id: str) -> str:
+    """Async variant of get_nemar_dataset_details."""
+    invalid = _invalid_dataset_id(dataset_id)
+    if invalid:
+        return invalid
+
+    url, payload = _details_request(dataset_id)
+
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.request("GET", url, json=payload, timeout=30.0)
+            response.raise_for_status()
+            ds = _dataset_from_response(response.json())
+    except Exception as e:
+        return _details_error(e, dataset_id)
+
+    if ds is None:
+        return f"Dataset '{dataset_id}' not found on NEMAR."
+    return _format_dataset_details(ds, dataset_id)
+
+
+def _format_dataset_details(ds: dict[str, Any], dataset_id: str) -> str:
+    """Format full dataset metadata as markdown."""
     ds_id = ds.get("id", dataset_id)
     name = ds.get("name", ds_id)
     openneuro_url = f"https://openneuro.org/datasets/{ds_id}"
@@ -378,4 +504,17 @@ def get_nemar_dataset_details(dataset_id: str) -> str:
     return "\n".join(lines)
 
 
+# Sync implementations serve invoke; the async ones serve ainvoke/astream_events
+search_nemar_datasets = StructuredTool.from_function(
+    func=_search_nemar_datasets,
+    coroutine=_asearch_nemar_datasets,
+    name="search_nemar_datasets",
+)
+get_nemar_dataset_details = StructuredTool.from_function(
+    func=_get_nemar_dataset_details,
+    coroutine=_aget_nemar_dataset_details,
+    name="get_nemar_dataset_details",
+)
+
+
 __all__ = ["search_nemar_datasets", "get_nemar_dataset_details"]
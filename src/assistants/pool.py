@@ -0,0 +1,153 @@
+"""Pool of prebuilt community assistants.
+
+Building a CommunityAssistant preloads documentation, renders a large system
+prompt, binds tools and compiles a LangGraph workflow. None of that depends on
+who is asking, so assistants are built once per (community, model, provider,
+key source) and shared across requests. Per-request values (API key, user id,
+page context) are passed through the runnable config's ``configurable`` dict
+instead of being baked into the assistant.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 32
+
+
+@dataclass(frozen=True)
+class AssistantPoolKey:
+    """Identity of a pooled assistant.
+
+    Everything that changes how the assistant is built belongs here; anything
+    that only varies per request belongs in the runnable config.
+    """
+
+    community_id: str
+    model: str
+    provider: str | None
+    key_source: str
+    preload_docs: bool = True
+    page_tool: bool = False
+
+
+class AssistantPool:
+    """Thread-safe LRU pool of prebuilt assistants.
+
+    Args:
+        max_size: Maximum number of assistants kept; the least recently used
+            one is dropped when the pool is full.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.max_size = max_size
+        self._entries: OrderedDict[AssistantPoolKey, Any] = OrderedDict()
+        # Bumped by invalidate() so builds that started earlier are not stored
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key: AssistantPoolKey, factory: Callable[[], Any]) -> Any:
+        """Return the pooled assistant for ``key``, building it with ``factory`` on a miss.
+
+        The factory runs outside the lock so a slow build (document preloading)
+        does not block lookups for other keys. If two callers race on the same
+        key, the first stored assistant wins and the other is discarded. If the
+        community is invalidated while the build runs, the assistant is
+        returned to this caller but not pooled, since it may carry stale docs.
+        """
+        with self._lock:
+            assistant = self._entries.get(key)
+            if assistant is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return assistant
+            self.misses += 1
+            generation = self._generation(key.community_id)
+
+        built = factory()
+
+        with self._lock:
+            if self._generation(key.community_id) != generation:
+                logger.info(
+                    "Not pooling assistant for %s: invalidated during build", key.community_id
+                )
+                return built
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = built
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug("Evicted pooled assistant %s", evicted)
+
+        logger.info(
+            "Built pooled assistant for %s (model=%s, key_source=%s)",
+            key.community_id,
+            key.model,
+            key.key_source,
+        )
+        return built
+
+    def invalidate(self, community_id: str | None = None) -> int:
+        """Drop pooled assistants for one community, or all of them.
+
+        Call this when something baked into an assistant changes, such as its
+        community config or preloaded documents.
+
+        Returns:
+            Number of assistants removed.
+        """
+        with self._lock:
+            if community_id is None:
+                self._epoch += 1
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            self._generations[community_id] = self._generations.get(community_id, 0) + 1
+            keys = [k for k in self._entries if k.community_id == community_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def _generation(self, community_id: str) -> tuple[int, int]:
+        """Return the invalidation generation for a community (call under the lock)."""
+        return self._epoch, self._generations.get(community_id, 0)
+
+    def stats(self) -> dict[str, int]:
+        """Return pool size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_default_pool: AssistantPool | None = None
+
+
+def get_assistant_pool() -> AssistantPool:
+    """Get or create the process-wide assistant pool."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = AssistantPool()
+    return _default_pool
@@ -166,6 +166,7 @@ class AssistantRegistry:
             **kwargs: Additional arguments for CommunityAssistant.
                 - preload_docs: Whether to preload docs (default: True)
                 - page_context: PageContext for widget embedding
+                - page_tool: Always register the fetch_current_page tool
                 - additional_tools: Extra tools to include
                 - additional_instructions: Extra text for system prompt
 
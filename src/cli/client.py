@@ -181,7 +181,7 @@ class OSAClient:
         """
         return self._stream_request(
             f"{self.api_url}/{community}/ask",
-            {"question": question, "stream": True},
+            {"question": question, "stream": True, "tool_output": "none"},
         )
 
     @staticmethod
@@ -192,6 +192,9 @@ class OSAClient:
     ) -> dict[str, Any]:
         """Build a chat request payload."""
         payload: dict[str, Any] = {"message": message, "stream": stream}
+        if stream:
+            # The CLI only shows tool names
+            payload["tool_output"] = "none"
         if session_id:
             payload["session_id"] = session_id
         return payload
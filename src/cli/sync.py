@@ -20,7 +20,7 @@ from src.cli.config import load_config
 from src.knowledge.bep_sync import sync_beps
 from src.knowledge.db import get_db_path, get_stats, init_db
 from src.knowledge.docstring_sync import sync_repo_docstrings
-from src.knowledge.github_sync import sync_repo, sync_repos
+from src.knowledge.github_sync import sync_all_repos, sync_repo, sync_repos
 from src.knowledge.papers_sync import (
     configure_openalex,
     sync_all_papers,
@@ -502,7 +502,9 @@ def sync_beps_cmd(
         raise typer.Exit(1)
 
     console.print(
-        f"[green]BEPs synced: {stats['total']} total, "
+        f"[green]BEPs synced: {stats['total']} total "
+        f"({stats['inserted']} new, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged), "
         f"{stats['with_content']} with spec content, "
         f"{stats['skipped']} skipped[/green]"
     )
@@ -541,19 +543,28 @@ def sync_all(
     grand_bep_total = 0
     grand_discourse_total = 0
 
+    ready = {comm_id: _safe_init_db(comm_id) for comm_id in communities}
+
+    # GitHub for every community in one concurrent run (shared client and rate limit)
+    github_repos = {
+        comm_id: repos
+        for comm_id in communities
+        if ready[comm_id] and (repos := _get_community_repos(comm_id))
+    }
+    github_results: dict[str, dict[str, int]] = {}
+    if github_repos:
+        with console.status("[green]Syncing GitHub repositories...[/green]"):
+            github_results = sync_all_repos(github_repos, incremental=not full)
+
     for comm_id in communities:
         console.print(f"\n[bold cyan]═══ Syncing {comm_id} ═══[/bold cyan]")
-        if not _safe_init_db(comm_id):
+        if not ready[comm_id]:
             console.print(f"[red]Skipping {comm_id} due to database error[/red]")
             continue
 
         # GitHub
-        repos = _get_community_repos(comm_id)
-        if repos:
-            console.print("[bold]Syncing GitHub repositories...[/bold]")
-            with console.status(f"[green]Syncing {comm_id} GitHub...[/green]"):
-                github_results = sync_repos(repos, project=comm_id, incremental=not full)
-            github_total = sum(github_results.values())
+        if comm_id in github_results:
+            github_total = sum(github_results[comm_id].values())
             console.print(f"[green]GitHub: {github_total} items[/green]")
             grand_github_total += github_total
         else:
@@ -825,6 +836,10 @@ def sync_faq(
         int | None,
         typer.Option("--max", help="Maximum threads to process"),
     ] = None,
+    retry_failed: Annotated[
+        bool,
+        typer.Option("--retry-failed", help="Retry all failed threads, ignoring retry policy"),
+    ] = False,
 ) -> None:
     """Generate FAQ summaries from mailing list threads using LLM."""
     _require_admin()
@@ -877,6 +892,7 @@ def sync_faq(
                 project=community,
                 quality_threshold=quality_threshold,
                 max_threads=max_threads,
+                retry_failed=retry_failed,
             )
 
             # Show results table
@@ -887,7 +903,9 @@ def sync_faq(
             table.add_row("Processed", str(result["processed"]))
             table.add_row("Summarized", str(result["summarized"]))
             table.add_row("Skipped", str(result["skipped"]))
-            table.add_row("Estimated cost", f"${result['total_cost']:.2f}")
+            table.add_row("Failed", str(result.get("failed", 0)))
+            table.add_row("Tokens", f"{result.get('total_tokens', 0):,}")
+            table.add_row("Cost", f"${result['total_cost']:.2f}")
 
             console.print(table)
 
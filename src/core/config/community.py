@@ -589,6 +589,27 @@ class FAQGenerationConfig(BaseModel):
     - 0.9+: Restrictive, only highest quality content
     """
 
+    max_concurrency: int = Field(default=4, ge=1, le=64)
+    """Maximum LLM calls (scoring and summarization) in flight at once."""
+
+    scoring_batch_size: int = Field(default=1, ge=1, le=20)
+    """Threads scored per evaluation prompt.
+
+    Values above 1 score several threads in one call, cutting per-call
+    overhead for cheap evaluation models. Replies that don't parse into one
+    score per thread fall back to scoring each thread individually.
+    """
+
+    retry_max_attempts: int = Field(default=3, ge=0)
+    """How many times a thread whose scoring or summarization failed is retried.
+
+    Once exhausted, the thread is left alone until its content changes
+    (new replies) or a manual run passes ``--retry-failed``.
+    """
+
+    retry_backoff_hours: float = Field(default=24.0, ge=0.0)
+    """Minimum hours between retries of a failed thread."""
+
     sources: dict[str, FAQSourceConfig] = Field(default_factory=dict)
     """Source-specific settings for different discussion platforms.
 
@@ -937,6 +958,16 @@ class CommunityConfig(BaseModel):
     Set to False if the assistant won't be used in a widget context.
     """
 
+    prompt_layout: Literal["inline", "split"] = "inline"
+    """Where per-request page context goes in the prompt (default: "inline").
+
+    "inline" renders page context into the system prompt at the
+    {page_context_section} placeholder. "split" keeps the system prompt
+    (instructions plus preloaded docs) byte-identical for every request and
+    sends page context as a separate, uncached system message after it, so
+    widget traffic from different pages shares one prompt-cache entry.
+    """
+
     cors_origins: list[str] = Field(default_factory=list)
     """Allowed CORS origins for this community's widget embedding.
 
@@ -40,6 +40,11 @@ from langchain_core.runnables import Runnable
 
 logger = logging.getLogger(__name__)
 
+# Set this key in a SystemMessage's additional_kwargs to send it without a
+# cache_control marker (e.g. per-request context that follows a stable,
+# cached system prompt).
+NO_CACHE_KWARG = "osa_no_cache"
+
 
 def create_openrouter_llm(
     model: str = "openai/gpt-oss-120b",
@@ -266,7 +271,8 @@ class CachingLLMWrapper(BaseChatModel):
     def _add_cache_control(self, messages: list[BaseMessage]) -> list[dict]:
         """Transform messages to add cache_control to system messages.
 
-        Applies cache_control markers to SystemMessage instances. Transforms
+        Applies cache_control markers to SystemMessage instances, except those
+        flagged with NO_CACHE_KWARG in additional_kwargs. Transforms
         AIMessage tool_calls and ToolMessage into OpenAI dict format for
         LiteLLM compatibility. HumanMessage instances get role assignment only.
 
@@ -318,6 +324,10 @@ class CachingLLMWrapper(BaseChatModel):
                         )
                     content = str(msg.content)
 
+                    if msg.additional_kwargs.get(NO_CACHE_KWARG):
+                        result.append({"role": "system", "content": content})
+                        continue
+
                     # Transform system message to multipart format with cache_control
                     result.append(
                         {
@@ -437,7 +447,11 @@ class CachingLLMWrapper(BaseChatModel):
         logger.debug(
             "Transformed %d messages, added cache_control to %d system messages",
             len(messages),
-            sum(1 for msg in messages if isinstance(msg, SystemMessage)),
+            sum(
+                1
+                for msg in messages
+                if isinstance(msg, SystemMessage) and not msg.additional_kwargs.get(NO_CACHE_KWARG)
+            ),
         )
 
         # Add trailing cache breakpoint for conversation prefix caching
@@ -13,7 +13,7 @@ Design principle: These are for DISCOVERY, not authoritative answers.
 The agent should link users to relevant discussions, not answer from them.
 """
 
-from src.knowledge.db import get_connection, get_db_path, init_db
+from src.knowledge.db import get_connection, get_db_path, get_read_connection, init_db
 from src.knowledge.search import (
     BEPResult,
     DiscourseTopicResult,
@@ -29,6 +29,7 @@ __all__ = [
     "DiscourseTopicResult",
     "get_connection",
     "get_db_path",
+    "get_read_connection",
     "init_db",
     "search_beps",
     "search_discourse_topics",
@@ -14,7 +14,7 @@ from typing import TypedDict
 import httpx
 import yaml
 
-from src.knowledge.db import get_connection, update_sync_metadata, upsert_bep_item
+from src.knowledge.db import UpsertCounts, get_connection, update_sync_metadata, upsert_bep_item
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +39,9 @@ class SyncStats(TypedDict):
     total: int
     with_content: int
     skipped: int
+    inserted: int
+    updated: int
+    unchanged: int
 
 
 def _get_github_headers() -> dict[str, str]:
@@ -271,7 +274,15 @@ def sync_beps(community_id: str = "bids") -> SyncStats:
         )
 
     headers = _get_github_headers()
-    stats: SyncStats = {"total": 0, "with_content": 0, "skipped": 0}
+    stats: SyncStats = {
+        "total": 0,
+        "with_content": 0,
+        "skipped": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    changes = UpsertCounts()
 
     with httpx.Client(timeout=30.0, headers=headers, follow_redirects=True) as client:
         # Fetch BEP metadata (let errors propagate to caller)
@@ -316,7 +327,7 @@ def sync_beps(community_id: str = "bids") -> SyncStats:
                             exc_info=True,
                         )
 
-                upsert_bep_item(
+                outcome = upsert_bep_item(
                     conn,
                     bep_number=bep_number,
                     title=title,
@@ -328,14 +339,19 @@ def sync_beps(community_id: str = "bids") -> SyncStats:
                     leads=leads,
                     content=content,
                 )
+                changes.record(outcome)
                 stats["total"] += 1
 
             conn.commit()
 
-    update_sync_metadata("beps", "bids-website", stats["total"], community_id)
+    stats["inserted"] = changes.inserted
+    stats["updated"] = changes.updated
+    stats["unchanged"] = changes.unchanged
+    update_sync_metadata("beps", "bids-website", stats["total"], community_id, changes=changes)
     logger.info(
-        "BEP sync complete: %d total, %d with content, %d skipped",
+        "BEP sync complete: %d total (%s), %d with content, %d skipped",
         stats["total"],
+        changes,
         stats["with_content"],
         stats["skipped"],
     )
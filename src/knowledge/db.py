@@ -11,14 +11,21 @@ Design: Discovery, not knowledge. These are pointers to discussions,
 not authoritative sources for answering questions.
 """
 
+import asyncio
 import contextvars
+import functools
+import hashlib
 import json
 import logging
 import sqlite3
-from collections.abc import Iterator
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any, Literal, TypeVar
 
 from src.cli.config import get_data_dir
 from src.core.validation import is_safe_identifier
@@ -89,6 +96,7 @@ CREATE TABLE IF NOT EXISTS github_items (
     url TEXT NOT NULL,
     created_at TEXT NOT NULL,
     synced_at TEXT NOT NULL,
+    content_hash TEXT,
     UNIQUE(repo, item_type, number)
 );
 
@@ -114,7 +122,7 @@ CREATE TRIGGER IF NOT EXISTS github_items_ad AFTER DELETE ON github_items BEGIN
     VALUES('delete', old.id, old.title, old.first_message);
 END;
 
-CREATE TRIGGER IF NOT EXISTS github_items_au AFTER UPDATE ON github_items BEGIN
+CREATE TRIGGER IF NOT EXISTS github_items_au AFTER UPDATE OF title, first_message ON github_items BEGIN
     INSERT INTO github_items_fts(github_items_fts, rowid, title, first_message)
     VALUES('delete', old.id, old.title, old.first_message);
     INSERT INTO github_items_fts(rowid, title, first_message)
@@ -132,6 +140,7 @@ CREATE TABLE IF NOT EXISTS papers (
     url TEXT NOT NULL,
     created_at TEXT,
     synced_at TEXT NOT NULL,
+    content_hash TEXT,
     UNIQUE(source, external_id)
 );
 
@@ -154,7 +163,7 @@ CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
     VALUES('delete', old.id, old.title, old.first_message);
 END;
 
-CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE OF title, first_message ON papers BEGIN
     INSERT INTO papers_fts(papers_fts, rowid, title, first_message)
     VALUES('delete', old.id, old.title, old.first_message);
     INSERT INTO papers_fts(rowid, title, first_message)
@@ -168,6 +177,11 @@ CREATE TABLE IF NOT EXISTS sync_metadata (
     source_name TEXT NOT NULL,
     last_sync_at TEXT NOT NULL,
     items_synced INTEGER DEFAULT 0,
+    items_inserted INTEGER DEFAULT 0,
+    items_updated INTEGER DEFAULT 0,
+    items_unchanged INTEGER DEFAULT 0,
+    watermark TEXT,
+    etag TEXT,
     UNIQUE(source_type, source_name)
 );
 
@@ -183,6 +197,7 @@ CREATE TABLE IF NOT EXISTS docstrings (
     line_number INTEGER,
     branch TEXT NOT NULL DEFAULT 'main',
     synced_at TEXT NOT NULL,
+    content_hash TEXT,
     UNIQUE(repo, file_path, symbol_name)
 );
 
@@ -205,7 +220,7 @@ CREATE TRIGGER IF NOT EXISTS docstrings_ad AFTER DELETE ON docstrings BEGIN
     VALUES('delete', old.id, old.symbol_name, old.docstring);
 END;
 
-CREATE TRIGGER IF NOT EXISTS docstrings_au AFTER UPDATE ON docstrings BEGIN
+CREATE TRIGGER IF NOT EXISTS docstrings_au AFTER UPDATE OF symbol_name, docstring ON docstrings BEGIN
     INSERT INTO docstrings_fts(docstrings_fts, rowid, symbol_name, docstring)
     VALUES('delete', old.id, old.symbol_name, old.docstring);
     INSERT INTO docstrings_fts(rowid, symbol_name, docstring)
@@ -227,6 +242,7 @@ CREATE TABLE IF NOT EXISTS mailing_list_messages (
     url TEXT NOT NULL,
     year INTEGER NOT NULL,
     synced_at TEXT NOT NULL,
+    content_hash TEXT,
     UNIQUE(list_name, message_id)
 );
 
@@ -250,7 +266,7 @@ CREATE TRIGGER IF NOT EXISTS mailing_list_messages_ad AFTER DELETE ON mailing_li
     VALUES('delete', old.id, old.subject, old.body, old.author);
 END;
 
-CREATE TRIGGER IF NOT EXISTS mailing_list_messages_au AFTER UPDATE ON mailing_list_messages BEGIN
+CREATE TRIGGER IF NOT EXISTS mailing_list_messages_au AFTER UPDATE OF subject, body, author ON mailing_list_messages BEGIN
     INSERT INTO mailing_list_messages_fts(mailing_list_messages_fts, rowid, subject, body, author)
     VALUES('delete', old.id, old.subject, old.body, old.author);
     INSERT INTO mailing_list_messages_fts(rowid, subject, body, author)
@@ -296,7 +312,7 @@ CREATE TRIGGER IF NOT EXISTS faq_entries_ad AFTER DELETE ON faq_entries BEGIN
     VALUES('delete', old.id, old.question, old.answer, old.tags);
 END;
 
-CREATE TRIGGER IF NOT EXISTS faq_entries_au AFTER UPDATE ON faq_entries BEGIN
+CREATE TRIGGER IF NOT EXISTS faq_entries_au AFTER UPDATE OF question, answer, tags ON faq_entries BEGIN
     INSERT INTO faq_entries_fts(faq_entries_fts, rowid, question, answer, tags)
     VALUES('delete', old.id, old.question, old.answer, old.tags);
     INSERT INTO faq_entries_fts(rowid, question, answer, tags)
@@ -313,6 +329,8 @@ CREATE TABLE IF NOT EXISTS summarization_status (
     token_count INTEGER,
     cost_estimate REAL,
     attempted_at TEXT,
+    thread_fingerprint TEXT,      -- Message IDs/count of the thread when last attempted
+    attempts INTEGER DEFAULT 0,   -- Consecutive failures at this fingerprint
     UNIQUE(list_name, thread_id)
 );
 
@@ -328,7 +346,8 @@ CREATE TABLE IF NOT EXISTS bep_items (
     google_doc_url TEXT,
     leads TEXT,
     content TEXT,
-    synced_at TEXT NOT NULL
+    synced_at TEXT NOT NULL,
+    content_hash TEXT
 );
 
 -- FTS5 for BEP search on title and content
@@ -350,7 +369,7 @@ CREATE TRIGGER IF NOT EXISTS bep_items_ad AFTER DELETE ON bep_items BEGIN
     VALUES('delete', old.id, old.title, old.content);
 END;
 
-CREATE TRIGGER IF NOT EXISTS bep_items_au AFTER UPDATE ON bep_items BEGIN
+CREATE TRIGGER IF NOT EXISTS bep_items_au AFTER UPDATE OF title, content ON bep_items BEGIN
     INSERT INTO bep_items_fts(bep_items_fts, rowid, title, content)
     VALUES('delete', old.id, old.title, old.content);
     INSERT INTO bep_items_fts(rowid, title, content)
@@ -374,6 +393,7 @@ CREATE TABLE IF NOT EXISTS discourse_topics (
     created_at TEXT NOT NULL,
     last_posted_at TEXT,
     synced_at TEXT NOT NULL,
+    content_hash TEXT,
     UNIQUE(forum_url, topic_id)
 );
 
@@ -397,7 +417,7 @@ CREATE TRIGGER IF NOT EXISTS discourse_topics_ad AFTER DELETE ON discourse_topic
     VALUES('delete', old.id, old.title, old.first_post, old.accepted_answer);
 END;
 
-CREATE TRIGGER IF NOT EXISTS discourse_topics_au AFTER UPDATE ON discourse_topics BEGIN
+CREATE TRIGGER IF NOT EXISTS discourse_topics_au AFTER UPDATE OF title, first_post, accepted_answer ON discourse_topics BEGIN
     INSERT INTO discourse_topics_fts(discourse_topics_fts, rowid, title, first_post, accepted_answer)
     VALUES('delete', old.id, old.title, old.first_post, old.accepted_answer);
     INSERT INTO discourse_topics_fts(rowid, title, first_post, accepted_answer)
@@ -486,6 +506,221 @@ def get_connection(project: str = "hed") -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
+# Read-connection pool tuning. mmap and a larger page cache keep the FTS5
+# indexes resident between searches; values are per connection.
+READ_POOL_MAX_IDLE = 8
+READ_MMAP_SIZE = 256 * 1024 * 1024  # 256 MiB
+READ_CACHE_SIZE_KIB = 16 * 1024  # 16 MiB (negative cache_size means KiB)
+
+
+class _PooledConnection:
+    """An idle read-only connection plus the file identity it was opened on."""
+
+    __slots__ = ("conn", "inode")
+
+    def __init__(self, conn: sqlite3.Connection, inode: int):
+        self.conn = conn
+        self.inode = inode
+
+
+class ReadConnectionPool:
+    """Pool of long-lived, read-only SQLite connections keyed by database path.
+
+    Keying by resolved path (rather than project name) means production
+    databases and mirror databases get separate pools automatically, so
+    ContextVar-based mirror routing keeps working unchanged.
+
+    Connections are opened with check_same_thread=False and handed out to
+    one borrower at a time, so they can be reused across threads and
+    requests. A connection is discarded instead of reused when its
+    database file has been deleted or replaced (e.g. mirror cleanup).
+    """
+
+    def __init__(self, max_idle: int = READ_POOL_MAX_IDLE):
+        self._max_idle = max_idle
+        self._idle: dict[str, list[_PooledConnection]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _open(db_path: Path) -> _PooledConnection:
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size={READ_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{READ_CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA query_only=ON")
+        return _PooledConnection(conn, db_path.stat().st_ino)
+
+    def acquire(self, db_path: Path) -> _PooledConnection:
+        """Borrow a connection for db_path, opening one if none are idle."""
+        key = str(db_path)
+        try:
+            inode = db_path.stat().st_ino
+        except FileNotFoundError:
+            inode = None
+
+        stale: list[_PooledConnection] = []
+        pooled = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate = idle.pop()
+                if candidate.inode == inode:
+                    pooled = candidate
+                    break
+                stale.append(candidate)
+        for entry in stale:
+            entry.conn.close()
+
+        if pooled is not None:
+            return pooled
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        return self._open(db_path)
+
+    def release(self, db_path: Path, pooled: _PooledConnection) -> None:
+        """Return a borrowed connection, closing it if the pool is full."""
+        if pooled.conn.in_transaction:
+            pooled.conn.rollback()
+        with self._lock:
+            idle = self._idle.setdefault(str(db_path), [])
+            if len(idle) < self._max_idle:
+                idle.append(pooled)
+                return
+        pooled.conn.close()
+
+    def discard(self, pooled: _PooledConnection) -> None:
+        """Close a borrowed connection that must not be reused."""
+        pooled.conn.close()
+
+    def close_all(self, db_path: Path | None = None) -> None:
+        """Close idle connections for one database, or for all databases."""
+        with self._lock:
+            if db_path is None:
+                entries = [e for idle in self._idle.values() for e in idle]
+                self._idle.clear()
+            else:
+                entries = self._idle.pop(str(db_path), [])
+        for entry in entries:
+            entry.conn.close()
+
+    def idle_count(self, db_path: Path | None = None) -> int:
+        """Number of idle connections held (for one database or in total)."""
+        with self._lock:
+            if db_path is not None:
+                return len(self._idle.get(str(db_path), []))
+            return sum(len(idle) for idle in self._idle.values())
+
+
+_read_pool = ReadConnectionPool()
+
+
+def get_read_pool() -> ReadConnectionPool:
+    """Get the process-wide read connection pool."""
+    return _read_pool
+
+
+def close_read_connections(project: str | None = None) -> None:
+    """Close pooled read connections.
+
+    Args:
+        project: Close only this project's connections (respecting the
+            active mirror). None closes every pooled connection.
+    """
+    _read_pool.close_all(get_db_path(project) if project else None)
+
+
+# Async callers (agent tools under astream_events) run knowledge queries on
+# this executor rather than the event loop's default pool, so slow searches
+# cannot starve other blocking work. One worker per pooled read connection.
+DB_EXECUTOR_MAX_WORKERS = READ_POOL_MAX_IDLE
+
+_T = TypeVar("_T")
+_db_executor: ThreadPoolExecutor | None = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor for knowledge database work."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=DB_EXECUTOR_MAX_WORKERS, thread_name_prefix="knowledge-db"
+            )
+        return _db_executor
+
+
+async def run_in_db_executor(func: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Run a blocking database call on the knowledge DB executor.
+
+    The caller's context is copied into the worker so ContextVar-based
+    mirror routing applies to the query.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_db_executor(), call)
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the knowledge DB executor, waiting for running queries."""
+    global _db_executor
+    with _db_executor_lock:
+        executor, _db_executor = _db_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+@contextmanager
+def get_read_connection(project: str = "hed") -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled, read-only database connection.
+
+    Use this for search and lookup paths. Connections stay open between
+    calls with mmap and a warm page cache, and PRAGMA query_only rejects
+    accidental writes. Use get_connection() for anything that writes.
+
+    Args:
+        project: Assistant/project name. Defaults to 'hed'.
+
+    Usage:
+        with get_read_connection("bids") as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+    """
+    db_path = get_db_path(project)
+    pooled = _read_pool.acquire(db_path)
+    broken = False
+    try:
+        yield pooled.conn
+    except sqlite3.DatabaseError:
+        # Corruption or I/O errors leave the connection in an unknown state
+        broken = True
+        raise
+    finally:
+        if broken:
+            _read_pool.discard(pooled)
+        else:
+            _read_pool.release(db_path, pooled)
+
+
+# Columns added after initial schema; ALTER TABLE for existing databases
+_MIGRATION_COLUMNS: dict[str, list[tuple[str, str]]] = {
+    "github_items": [("content_hash", "TEXT")],
+    "papers": [("content_hash", "TEXT")],
+    "docstrings": [("content_hash", "TEXT")],
+    "mailing_list_messages": [("content_hash", "TEXT")],
+    "bep_items": [("content_hash", "TEXT")],
+    "discourse_topics": [("content_hash", "TEXT")],
+    "summarization_status": [("thread_fingerprint", "TEXT"), ("attempts", "INTEGER DEFAULT 0")],
+    "sync_metadata": [
+        ("items_inserted", "INTEGER DEFAULT 0"),
+        ("items_updated", "INTEGER DEFAULT 0"),
+        ("items_unchanged", "INTEGER DEFAULT 0"),
+        ("watermark", "TEXT"),
+        ("etag", "TEXT"),
+    ],
+}
+
+
 def _migrate_db(conn: sqlite3.Connection) -> None:
     """Run database migrations for schema changes.
 
@@ -507,6 +742,32 @@ def _migrate_db(conn: sqlite3.Connection) -> None:
         # Table doesn't exist yet - this is fine, schema will create it
         logger.debug("Docstrings table not found during migration (will be created): %s", e)
 
+    # Migration: content_hash change detection and per-sync change counts (added 2026-10-16)
+    for table, columns in _MIGRATION_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        for col_name, col_def in columns:
+            if existing and col_name not in existing:
+                logger.info("Migrating %s table: adding %s column", table, col_name)
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_def}")
+    conn.commit()
+
+    # Migration: restrict FTS update triggers to indexed columns (added 2026-10-16).
+    # Older databases have "AFTER UPDATE ON" triggers that re-index the FTS row
+    # on any column change; drop them so SCHEMA_SQL recreates the narrow version.
+    outdated = [
+        name
+        for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchall()
+        if name.endswith("_au") and "UPDATE OF" not in sql.upper()
+    ]
+    if outdated:
+        logger.info("Migrating FTS update triggers: %s", outdated)
+        for name in outdated:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.executescript(SCHEMA_SQL)
+        conn.commit()
+
 
 def init_db(project: str = "hed") -> None:
     """Initialize database schema for a project.
@@ -519,6 +780,8 @@ def init_db(project: str = "hed") -> None:
         project: Assistant/project name. Defaults to 'hed'.
     """
     with get_connection(project) as conn:
+        # WAL lets pooled readers keep searching while a sync is writing
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.executescript(SCHEMA_SQL)
         conn.commit()
 
@@ -533,6 +796,69 @@ def _now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
+# Result of an upsert_* call: whether the row was new, rewritten, or left alone
+UpsertOutcome = Literal["inserted", "updated", "unchanged"]
+
+
+@dataclass
+class UpsertCounts:
+    """Tally of upsert outcomes for one sync run."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def record(self, outcome: UpsertOutcome) -> None:
+        """Count one upsert outcome."""
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def merge(self, other: "UpsertCounts") -> None:
+        """Add another tally into this one."""
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+
+    @property
+    def total(self) -> int:
+        """Number of items processed."""
+        return self.inserted + self.updated + self.unchanged
+
+    def __str__(self) -> str:
+        return f"{self.inserted} new, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def _content_hash(*values: object) -> str:
+    """Hash the stored field values of an item for change detection."""
+    payload = json.dumps(values, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _upsert_if_changed(
+    conn: sqlite3.Connection,
+    table: str,
+    key: dict[str, object],
+    sql: str,
+    params: tuple[object, ...],
+    content_hash: str,
+) -> UpsertOutcome:
+    """Run an upsert only when the item's content hash differs from the stored one.
+
+    Unchanged rows skip the UPDATE entirely, so the FTS update trigger does
+    not fire and no FTS segments or WAL pages are rewritten. The upsert SQL
+    also guards on content_hash in its DO UPDATE WHERE clause, so concurrent
+    writers cannot turn a no-op into a rewrite.
+    """
+    where = " AND ".join(f"{column} = ?" for column in key)
+    row = conn.execute(
+        f"SELECT content_hash FROM {table} WHERE {where}",  # noqa: S608
+        tuple(key.values()),
+    ).fetchone()
+    if row is not None and row[0] == content_hash:
+        return "unchanged"
+    conn.execute(sql, params)
+    return "inserted" if row is None else "updated"
+
+
 def upsert_github_item(
     conn: sqlite3.Connection,
     *,
@@ -544,7 +870,7 @@ def upsert_github_item(
     status: str,
     url: str,
     created_at: str,
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a GitHub item.
 
     Args:
@@ -557,23 +883,44 @@ def upsert_github_item(
         status: 'open' or 'closed'
         url: URL to the issue/PR
         created_at: ISO 8601 creation timestamp
+
+    Returns:
+        Whether the item was inserted, updated, or already up to date
     """
     # Limit first_message size to prevent bloat
     if first_message and len(first_message) > 5000:
         first_message = first_message[:5000]
 
-    conn.execute(
+    content_hash = _content_hash(title, first_message, status)
+    return _upsert_if_changed(
+        conn,
+        "github_items",
+        {"repo": repo, "item_type": item_type, "number": number},
         """
         INSERT INTO github_items (repo, item_type, number, title, first_message,
-                                  status, url, created_at, synced_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                  status, url, created_at, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(repo, item_type, number) DO UPDATE SET
             title=excluded.title,
             first_message=excluded.first_message,
             status=excluded.status,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE github_items.content_hash IS NOT excluded.content_hash
         """,
-        (repo, item_type, number, title, first_message, status, url, created_at, _now_iso()),
+        (
+            repo,
+            item_type,
+            number,
+            title,
+            first_message,
+            status,
+            url,
+            created_at,
+            _now_iso(),
+            content_hash,
+        ),
+        content_hash,
     )
 
 
@@ -586,7 +933,7 @@ def upsert_paper(
     first_message: str | None,
     url: str,
     created_at: str | None,
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a paper.
 
     Args:
@@ -597,22 +944,32 @@ def upsert_paper(
         first_message: Abstract (limited to ~2000 chars)
         url: URL to the paper (DOI or source URL)
         created_at: Publication date (ISO 8601 or year string)
+
+    Returns:
+        Whether the paper was inserted, updated, or already up to date
     """
     # Limit first_message size
     if first_message and len(first_message) > 2000:
         first_message = first_message[:2000]
 
-    conn.execute(
+    content_hash = _content_hash(title, first_message)
+    return _upsert_if_changed(
+        conn,
+        "papers",
+        {"source": source, "external_id": external_id},
         """
         INSERT INTO papers (source, external_id, title, first_message,
-                            status, url, created_at, synced_at)
-        VALUES (?, ?, ?, ?, 'published', ?, ?, ?)
+                            status, url, created_at, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, 'published', ?, ?, ?, ?)
         ON CONFLICT(source, external_id) DO UPDATE SET
             title=excluded.title,
             first_message=excluded.first_message,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE papers.content_hash IS NOT excluded.content_hash
         """,
-        (source, external_id, title, first_message, url, created_at, _now_iso()),
+        (source, external_id, title, first_message, url, created_at, _now_iso(), content_hash),
+        content_hash,
     )
 
 
@@ -627,7 +984,7 @@ def upsert_docstring(
     docstring: str,
     line_number: int | None = None,
     branch: str = "main",
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a docstring entry.
 
     Args:
@@ -640,22 +997,31 @@ def upsert_docstring(
         docstring: Full docstring text
         line_number: Starting line in source file (optional)
         branch: Git branch name (e.g., 'main', 'develop', 'master')
+
+    Returns:
+        Whether the docstring was inserted, updated, or already up to date
     """
     # Limit docstring size to prevent bloat
     if len(docstring) > 10000:
         docstring = docstring[:10000]
 
-    conn.execute(
+    content_hash = _content_hash(docstring, symbol_type, line_number, branch)
+    return _upsert_if_changed(
+        conn,
+        "docstrings",
+        {"repo": repo, "file_path": file_path, "symbol_name": symbol_name},
         """
-        INSERT INTO docstrings (repo, file_path, language, symbol_name,
-                                symbol_type, docstring, line_number, branch, synced_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO docstrings (repo, file_path, language, symbol_name, symbol_type,
+                                docstring, line_number, branch, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(repo, file_path, symbol_name) DO UPDATE SET
             docstring=excluded.docstring,
             symbol_type=excluded.symbol_type,
             line_number=excluded.line_number,
             branch=excluded.branch,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE docstrings.content_hash IS NOT excluded.content_hash
         """,
         (
             repo,
@@ -667,7 +1033,9 @@ def upsert_docstring(
             line_number,
             branch,
             _now_iso(),
+            content_hash,
         ),
+        content_hash,
     )
 
 
@@ -682,7 +1050,7 @@ def get_last_sync(source_type: str, source_name: str, project: str = "hed") -> s
     Returns:
         ISO 8601 timestamp of last sync, or None if never synced
     """
-    with get_connection(project) as conn:
+    with get_read_connection(project) as conn:
         row = conn.execute(
             "SELECT last_sync_at FROM sync_metadata WHERE source_type = ? AND source_name = ?",
             (source_type, source_name),
@@ -690,8 +1058,37 @@ def get_last_sync(source_type: str, source_name: str, project: str = "hed") -> s
         return row["last_sync_at"] if row else None
 
 
+def get_sync_cursor(
+    source_type: str, source_name: str, project: str = "hed"
+) -> tuple[str | None, str | None]:
+    """Get the incremental-sync cursor for a source.
+
+    Args:
+        source_type: Source type (e.g., 'github_issues', 'github_prs')
+        source_name: Repository name, paper source name, or base URL
+        project: Assistant/project name. Defaults to 'hed'.
+
+    Returns:
+        Tuple of (watermark, etag). The watermark is the newest upstream
+        update timestamp seen so far; the etag is the validator from the
+        last upstream response. Either may be None.
+    """
+    with get_read_connection(project) as conn:
+        row = conn.execute(
+            "SELECT watermark, etag FROM sync_metadata WHERE source_type = ? AND source_name = ?",
+            (source_type, source_name),
+        ).fetchone()
+        return (row["watermark"], row["etag"]) if row else (None, None)
+
+
 def update_sync_metadata(
-    source_type: str, source_name: str, items_synced: int, project: str = "hed"
+    source_type: str,
+    source_name: str,
+    items_synced: int,
+    project: str = "hed",
+    changes: UpsertCounts | None = None,
+    watermark: str | None = None,
+    etag: str | None = None,
 ) -> None:
     """Update sync metadata for a source.
 
@@ -700,21 +1097,61 @@ def update_sync_metadata(
         source_name: Repository name, paper source name, or base URL
         items_synced: Number of items synced in this run
         project: Assistant/project name. Defaults to 'hed'.
+        changes: Optional breakdown of inserted/updated/unchanged items
+        watermark: Newest upstream update timestamp seen (kept if None)
+        etag: Upstream response validator for conditional requests (kept if None)
     """
     with get_connection(project) as conn:
-        conn.execute(
-            """
-            INSERT INTO sync_metadata (source_type, source_name, last_sync_at, items_synced)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(source_type, source_name) DO UPDATE SET
-                last_sync_at=excluded.last_sync_at,
-                items_synced=excluded.items_synced
-            """,
-            (source_type, source_name, _now_iso(), items_synced),
+        write_sync_metadata(
+            conn, source_type, source_name, items_synced, changes, watermark=watermark, etag=etag
         )
         conn.commit()
 
 
+def write_sync_metadata(
+    conn: sqlite3.Connection,
+    source_type: str,
+    source_name: str,
+    items_synced: int,
+    changes: UpsertCounts | None = None,
+    watermark: str | None = None,
+    etag: str | None = None,
+) -> None:
+    """Write a sync metadata row on an open connection without committing.
+
+    Lets batched writers record metadata in the same transaction as the
+    items themselves. See update_sync_metadata() for the arguments.
+    """
+    changes = changes or UpsertCounts()
+    conn.execute(
+        """
+        INSERT INTO sync_metadata (source_type, source_name, last_sync_at, items_synced,
+                                   items_inserted, items_updated, items_unchanged,
+                                   watermark, etag)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(source_type, source_name) DO UPDATE SET
+            last_sync_at=excluded.last_sync_at,
+            items_synced=excluded.items_synced,
+            items_inserted=excluded.items_inserted,
+            items_updated=excluded.items_updated,
+            items_unchanged=excluded.items_unchanged,
+            watermark=COALESCE(excluded.watermark, sync_metadata.watermark),
+            etag=COALESCE(excluded.etag, sync_metadata.etag)
+        """,
+        (
+            source_type,
+            source_name,
+            _now_iso(),
+            items_synced,
+            changes.inserted,
+            changes.updated,
+            changes.unchanged,
+            watermark,
+            etag,
+        ),
+    )
+
+
 def upsert_bep_item(
     conn: sqlite3.Connection,
     *,
@@ -727,7 +1164,7 @@ def upsert_bep_item(
     google_doc_url: str | None = None,
     leads: str | None = None,
     content: str | None = None,
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a BIDS Extension Proposal.
 
     Args:
@@ -741,13 +1178,29 @@ def upsert_bep_item(
         google_doc_url: URL to Google Doc (for draft BEPs)
         leads: JSON-encoded list of lead names
         content: Concatenated markdown from PR spec files
+
+    Returns:
+        Whether the BEP was inserted, updated, or already up to date
     """
-    conn.execute(
+    content_hash = _content_hash(
+        title,
+        status,
+        pull_request_url,
+        pull_request_number,
+        html_preview_url,
+        google_doc_url,
+        leads,
+        content,
+    )
+    return _upsert_if_changed(
+        conn,
+        "bep_items",
+        {"bep_number": bep_number},
         """
         INSERT INTO bep_items (bep_number, title, status, pull_request_url,
                                pull_request_number, html_preview_url, google_doc_url,
-                               leads, content, synced_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                               leads, content, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(bep_number) DO UPDATE SET
             title=excluded.title,
             status=excluded.status,
@@ -757,7 +1210,9 @@ def upsert_bep_item(
             google_doc_url=excluded.google_doc_url,
             leads=excluded.leads,
             content=excluded.content,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE bep_items.content_hash IS NOT excluded.content_hash
         """,
         (
             bep_number,
@@ -770,7 +1225,9 @@ def upsert_bep_item(
             leads,
             content,
             _now_iso(),
+            content_hash,
         ),
+        content_hash,
     )
 
 
@@ -783,7 +1240,7 @@ def get_stats(project: str = "hed") -> dict[str, int]:
     Returns:
         Dict with counts for each category
     """
-    with get_connection(project) as conn:
+    with get_read_connection(project) as conn:
         stats = {}
 
         # GitHub stats
@@ -866,7 +1323,7 @@ def upsert_mailing_list_message(
     in_reply_to: str | None,
     url: str,
     year: int,
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a mailing list message.
 
     Args:
@@ -882,17 +1339,24 @@ def upsert_mailing_list_message(
         in_reply_to: Parent message_id
         url: URL to original message
         year: Year for partitioning
+
+    Returns:
+        Whether the message was inserted, updated, or already up to date
     """
     # Limit body size to prevent bloat
     if body and len(body) > 10000:
         body = body[:10000]
 
-    conn.execute(
+    content_hash = _content_hash(thread_id, subject, author, author_email, date, body, in_reply_to)
+    return _upsert_if_changed(
+        conn,
+        "mailing_list_messages",
+        {"list_name": list_name, "message_id": message_id},
         """
         INSERT INTO mailing_list_messages (list_name, message_id, thread_id, subject,
                                            author, author_email, date, body, in_reply_to,
-                                           url, year, synced_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                           url, year, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(list_name, message_id) DO UPDATE SET
             thread_id=excluded.thread_id,
             subject=excluded.subject,
@@ -901,7 +1365,9 @@ def upsert_mailing_list_message(
             date=excluded.date,
             body=excluded.body,
             in_reply_to=excluded.in_reply_to,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE mailing_list_messages.content_hash IS NOT excluded.content_hash
         """,
         (
             list_name,
@@ -916,7 +1382,9 @@ def upsert_mailing_list_message(
             url,
             year,
             _now_iso(),
+            content_hash,
         ),
+        content_hash,
     )
 
 
@@ -1002,9 +1470,13 @@ def update_summarization_status(
     failure_reason: str | None = None,
     token_count: int | None = None,
     cost_estimate: float | None = None,
+    thread_fingerprint: str | None = None,
 ) -> None:
     """Track summarization progress.
 
+    Failures are counted in ``attempts``; the count resets when the thread
+    succeeds or is skipped, and restarts at 1 when its fingerprint changed.
+
     Args:
         conn: Database connection
         list_name: Mailing list identifier
@@ -1013,20 +1485,42 @@ def update_summarization_status(
         failure_reason: Error message if failed
         token_count: Estimated tokens processed
         cost_estimate: Estimated cost in USD
+        thread_fingerprint: Fingerprint of the thread content that was
+            attempted (kept if None)
     """
     conn.execute(
         """
         INSERT INTO summarization_status (list_name, thread_id, status, failure_reason,
-                                         token_count, cost_estimate, attempted_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+                                         token_count, cost_estimate, attempted_at,
+                                         thread_fingerprint, attempts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CASE WHEN ? = 'failed' THEN 1 ELSE 0 END)
         ON CONFLICT(list_name, thread_id) DO UPDATE SET
             status=excluded.status,
             failure_reason=excluded.failure_reason,
             token_count=excluded.token_count,
             cost_estimate=excluded.cost_estimate,
-            attempted_at=excluded.attempted_at
+            attempted_at=excluded.attempted_at,
+            attempts=CASE
+                WHEN excluded.status != 'failed' THEN 0
+                WHEN excluded.thread_fingerprint IS NULL
+                     OR excluded.thread_fingerprint IS summarization_status.thread_fingerprint
+                    THEN COALESCE(summarization_status.attempts, 0) + 1
+                ELSE 1
+            END,
+            thread_fingerprint=COALESCE(excluded.thread_fingerprint,
+                                        summarization_status.thread_fingerprint)
         """,
-        (list_name, thread_id, status, failure_reason, token_count, cost_estimate, _now_iso()),
+        (
+            list_name,
+            thread_id,
+            status,
+            failure_reason,
+            token_count,
+            cost_estimate,
+            _now_iso(),
+            thread_fingerprint,
+            status,
+        ),
     )
 
 
@@ -1046,7 +1540,7 @@ def upsert_discourse_topic(
     url: str,
     created_at: str,
     last_posted_at: str | None,
-) -> None:
+) -> UpsertOutcome:
     """Insert or update a Discourse forum topic.
 
     Args:
@@ -1064,6 +1558,9 @@ def upsert_discourse_topic(
         url: Full URL to the topic
         created_at: ISO 8601 creation timestamp
         last_posted_at: ISO 8601 timestamp of last post
+
+    Returns:
+        Whether the topic was inserted, updated, or already up to date
     """
     # Limit post sizes to prevent bloat
     if first_post and len(first_post) > 5000:
@@ -1071,13 +1568,28 @@ def upsert_discourse_topic(
     if accepted_answer and len(accepted_answer) > 5000:
         accepted_answer = accepted_answer[:5000]
 
-    conn.execute(
+    tags_json = json.dumps(tags) if tags else None
+    content_hash = _content_hash(
+        title,
+        first_post,
+        accepted_answer,
+        category_name,
+        tags_json,
+        reply_count,
+        like_count,
+        views,
+        last_posted_at,
+    )
+    return _upsert_if_changed(
+        conn,
+        "discourse_topics",
+        {"forum_url": forum_url, "topic_id": topic_id},
         """
         INSERT INTO discourse_topics (forum_url, topic_id, title, first_post,
                                       accepted_answer, category_name, tags,
                                       reply_count, like_count, views, url,
-                                      created_at, last_posted_at, synced_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                      created_at, last_posted_at, synced_at, content_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(forum_url, topic_id) DO UPDATE SET
             title=excluded.title,
             first_post=excluded.first_post,
@@ -1088,7 +1600,9 @@ def upsert_discourse_topic(
             like_count=excluded.like_count,
             views=excluded.views,
             last_posted_at=excluded.last_posted_at,
-            synced_at=excluded.synced_at
+            synced_at=excluded.synced_at,
+            content_hash=excluded.content_hash
+        WHERE discourse_topics.content_hash IS NOT excluded.content_hash
         """,
         (
             forum_url,
@@ -1097,7 +1611,7 @@ def upsert_discourse_topic(
             first_post,
             accepted_answer,
             category_name,
-            json.dumps(tags) if tags else None,
+            tags_json,
             reply_count,
             like_count,
             views,
@@ -1105,7 +1619,9 @@ def upsert_discourse_topic(
             created_at,
             last_posted_at,
             _now_iso(),
+            content_hash,
         ),
+        content_hash,
     )
 
 
@@ -1137,7 +1653,7 @@ def is_db_populated(project: str) -> dict[str, bool]:
         return dict.fromkeys(table_map, False)
 
     result = {}
-    with get_connection(project) as conn:
+    with get_read_connection(project) as conn:
         for sync_type, table_name in table_map.items():
             try:
                 row = conn.execute(f"SELECT 1 FROM {table_name} LIMIT 1").fetchone()  # noqa: S608
@@ -26,6 +26,7 @@ if TYPE_CHECKING:
     from src.core.config.community import DiscourseCategoryConfig
 
 from src.knowledge.db import (
+    UpsertCounts,
     get_connection,
     get_last_sync,
     update_sync_metadata,
@@ -187,6 +188,7 @@ def sync_discourse_topics(
 
     # Fetch and store each topic
     total_synced = 0
+    changes = UpsertCounts()
     failed = 0
     uncommitted = 0
 
@@ -217,7 +219,7 @@ def sync_discourse_topics(
                     first_post = _html_to_markdown(first_post_html)
                     accepted_answer = _get_accepted_answer(posts) if len(posts) > 1 else None
 
-                    upsert_discourse_topic(
+                    outcome = upsert_discourse_topic(
                         conn,
                         forum_url=base_url,
                         topic_id=resolved_id,
@@ -233,6 +235,7 @@ def sync_discourse_topics(
                         created_at=data.get("created_at", ""),
                         last_posted_at=data.get("last_posted_at"),
                     )
+                    changes.record(outcome)
                     total_synced += 1
                     uncommitted += 1
 
@@ -250,9 +253,9 @@ def sync_discourse_topics(
             conn.commit()
 
     # Update sync metadata
-    update_sync_metadata("discourse", base_url, total_synced, project)
+    update_sync_metadata("discourse", base_url, total_synced, project, changes=changes)
 
-    console.print(f"[green]Synced {total_synced} topics[/green]")
+    console.print(f"[green]Synced {total_synced} topics ({changes})[/green]")
     if failed:
         console.print(f"[yellow]Failed to fetch {failed} topics[/yellow]")
 
@@ -12,7 +12,7 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from src.api.config import get_settings
-from src.knowledge.db import get_connection, update_sync_metadata, upsert_docstring
+from src.knowledge.db import UpsertCounts, get_connection, update_sync_metadata, upsert_docstring
 from src.knowledge.matlab_parser import parse_matlab_file
 from src.knowledge.python_parser import parse_python_file
 
@@ -58,6 +58,7 @@ def sync_repo_docstrings(
 
     # Process files and extract docstrings
     total_docstrings = 0
+    changes = UpsertCounts()
     failed_files: list[tuple[str, str]] = []
     uncommitted = 0
 
@@ -82,7 +83,7 @@ def sync_repo_docstrings(
 
                     # Insert into database
                     for doc in docstrings:
-                        upsert_docstring(
+                        outcome = upsert_docstring(
                             conn,
                             repo=repo,
                             file_path=file_path,
@@ -93,6 +94,7 @@ def sync_repo_docstrings(
                             line_number=doc.line_number,
                             branch=branch,
                         )
+                        changes.record(outcome)
                         total_docstrings += 1
                         uncommitted += 1
 
@@ -121,10 +123,12 @@ def sync_repo_docstrings(
             conn.commit()
 
     # Update sync metadata
-    update_sync_metadata("docstrings", f"{repo}:{language}", total_docstrings, project)
+    update_sync_metadata(
+        "docstrings", f"{repo}:{language}", total_docstrings, project, changes=changes
+    )
 
     # Report results
-    console.print(f"[green]✓ Extracted {total_docstrings} docstrings[/green]")
+    console.print(f"[green]✓ Extracted {total_docstrings} docstrings ({changes})[/green]")
 
     if failed_files:
         console.print(f"\n[yellow]Warning: Failed to process {len(failed_files)} files:[/yellow]")
@@ -5,20 +5,31 @@ Uses a two-stage approach to balance cost and quality:
 2. Summarize high-quality threads with summary agent (quality model)
 
 Models are configured per-community in config.yaml under faq_generation.
-Cost tracking and estimation included for budget management (Anthropic models only).
+Threads are scored and summarized concurrently (faq_generation.max_concurrency
+LLM calls in flight, optionally several threads per scoring prompt via
+faq_generation.scoring_batch_size). Run costs come from the token usage the
+models report; the up-front estimate uses Anthropic list prices.
+
+Candidate threads are chosen from summarization_status and a fingerprint
+of each thread's messages, so recurring runs only pay for new or changed
+threads (plus failed ones still within the retry policy).
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
 import sqlite3
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from src.knowledge.db import get_connection, update_summarization_status, upsert_faq_entry
+from src.metrics.cost import estimate_cost
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -44,6 +55,194 @@ class FAQSummary:
     quality_score: float
 
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When threads whose scoring or summarization failed are attempted again."""
+
+    max_attempts: int = 3
+    backoff: timedelta = timedelta(hours=24)
+
+
+@dataclass
+class ThreadCandidate:
+    """A thread selected for scoring, with the stats stored alongside its FAQ."""
+
+    thread_id: str
+    msg_count: int
+    participant_count: int
+    first_date: str | None
+    fingerprint: str
+    reason: str  # 'new', 'changed' or 'retry'
+
+
+def _thread_fingerprint(message_ids: list[str]) -> str:
+    """Fingerprint a thread's content by its message IDs and count."""
+    digest = hashlib.sha256(f"{len(message_ids)}\n".encode())
+    for message_id in sorted(message_ids):
+        digest.update(message_id.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()[:32]
+
+
+def _retry_due(status_row: sqlite3.Row, policy: RetryPolicy, now: datetime) -> bool:
+    """Whether a failed thread (unchanged since it failed) should be retried now."""
+    if (status_row["attempts"] or 0) >= policy.max_attempts:
+        return False
+    attempted_at = status_row["attempted_at"]
+    if not attempted_at:
+        return True
+    try:
+        last = datetime.fromisoformat(attempted_at)
+    except ValueError:
+        return True
+    if last.tzinfo is None:
+        last = last.replace(tzinfo=UTC)
+    return now - last >= policy.backoff
+
+
+def select_candidate_threads(
+    conn: sqlite3.Connection,
+    list_name: str,
+    *,
+    min_messages: int = 2,
+    max_threads: int | None = None,
+    retry_policy: RetryPolicy | None = None,
+    retry_failed: bool = False,
+) -> list[ThreadCandidate]:
+    """Pick the threads worth sending to the LLM.
+
+    A thread is a candidate when it has no summarization_status row (and no
+    FAQ entry), when its fingerprint differs from the one recorded at its
+    last attempt, or when it failed and is due for a retry. Threads scored
+    below threshold ('skipped') are not re-scored until they change.
+
+    Status rows written before fingerprints were recorded are adopted as-is:
+    their current fingerprint is stored so later changes are detected.
+
+    Args:
+        conn: Database connection
+        list_name: Mailing list identifier
+        min_messages: Minimum messages for a thread to be considered
+        max_threads: Maximum candidates to return (largest threads first)
+        retry_policy: Retry policy for failed threads (defaults to RetryPolicy())
+        retry_failed: Retry every unchanged failed thread regardless of policy
+
+    Returns:
+        Candidates ordered by message count, largest first
+    """
+    policy = retry_policy or RetryPolicy()
+    now = datetime.now(UTC)
+
+    threads: dict[str, dict] = {}
+    cursor = conn.execute(
+        """
+        SELECT thread_id, message_id, author, date
+        FROM mailing_list_messages
+        WHERE list_name = ? AND thread_id IS NOT NULL
+        """,
+        (list_name,),
+    )
+    for row in cursor:
+        thread = threads.setdefault(
+            row["thread_id"], {"message_ids": [], "authors": set(), "first_date": None}
+        )
+        thread["message_ids"].append(row["message_id"])
+        if row["author"] is not None:
+            thread["authors"].add(row["author"])
+        if row["date"] is not None and (
+            thread["first_date"] is None or row["date"] < thread["first_date"]
+        ):
+            thread["first_date"] = row["date"]
+
+    statuses = {
+        row["thread_id"]: row
+        for row in conn.execute(
+            """
+            SELECT thread_id, status, thread_fingerprint, attempts, attempted_at
+            FROM summarization_status WHERE list_name = ?
+            """,
+            (list_name,),
+        )
+    }
+    with_faq = {
+        row["thread_id"]
+        for row in conn.execute(
+            "SELECT thread_id FROM faq_entries WHERE list_name = ?", (list_name,)
+        )
+    }
+
+    candidates: list[ThreadCandidate] = []
+    adopted: list[tuple[str, str, str]] = []
+    for thread_id, thread in threads.items():
+        msg_count = len(thread["message_ids"])
+        if msg_count < min_messages:
+            continue
+
+        fingerprint = _thread_fingerprint(thread["message_ids"])
+        status_row = statuses.get(thread_id)
+
+        if status_row is None:
+            if thread_id in with_faq:
+                continue  # Summarized before status tracking existed
+            reason = "new"
+        elif status_row["status"] == "pending":
+            reason = "new"
+        elif status_row["thread_fingerprint"] is None:
+            adopted.append((fingerprint, list_name, thread_id))
+            if status_row["status"] != "failed" or not (
+                retry_failed or _retry_due(status_row, policy, now)
+            ):
+                continue
+            reason = "retry"
+        elif status_row["thread_fingerprint"] != fingerprint:
+            reason = "changed"
+        elif status_row["status"] == "failed" and (
+            retry_failed or _retry_due(status_row, policy, now)
+        ):
+            reason = "retry"
+        else:
+            continue
+
+        candidates.append(
+            ThreadCandidate(
+                thread_id=thread_id,
+                msg_count=msg_count,
+                participant_count=len(thread["authors"]),
+                first_date=thread["first_date"],
+                fingerprint=fingerprint,
+                reason=reason,
+            )
+        )
+
+    if adopted:
+        conn.executemany(
+            """
+            UPDATE summarization_status SET thread_fingerprint = ?
+            WHERE list_name = ? AND thread_id = ? AND thread_fingerprint IS NULL
+            """,
+            adopted,
+        )
+        conn.commit()
+        logger.info("Recorded fingerprints for %d previously attempted threads", len(adopted))
+
+    candidates.sort(key=lambda c: c.msg_count, reverse=True)
+    if max_threads is not None:
+        candidates = candidates[:max_threads]
+
+    if candidates:
+        reasons: dict[str, int] = {}
+        for candidate in candidates:
+            reasons[candidate.reason] = reasons.get(candidate.reason, 0) + 1
+        logger.info(
+            "Selected %d of %d threads in %s for scoring: %s",
+            len(candidates),
+            len(threads),
+            list_name,
+            ", ".join(f"{n} {reason}" for reason, n in sorted(reasons.items())),
+        )
+    return candidates
+
+
 def _build_thread_context(messages: list[dict]) -> str:
     """Format thread messages for LLM prompt.
 
@@ -70,17 +269,9 @@ def _build_thread_context(messages: list[dict]) -> str:
     return "\n".join(lines)
 
 
-def _score_thread_quality(thread_context: str, model) -> float | None:
-    """Use LLM to score thread quality (0.0-1.0).
-
-    Args:
-        thread_context: Formatted thread messages
-        model: LLM instance for scoring
-
-    Returns:
-        Quality score between 0.0 and 1.0, or None if scoring failed
-    """
-    prompt = f"""Rate the value of this mailing list thread as a FAQ entry on a scale of 0.0 to 1.0.
+def _score_prompt(thread_context: str) -> str:
+    """Build the single-thread quality scoring prompt."""
+    return f"""Rate the value of this mailing list thread as a FAQ entry on a scale of 0.0 to 1.0.
 
 Consider:
 - Does it have a clear, answerable technical question?
@@ -93,43 +284,28 @@ Thread:
 
 Respond with ONLY a number between 0.0 and 1.0 (e.g., "0.75"):"""
 
-    try:
-        response = model.invoke([HumanMessage(content=prompt)])
-        score_text = response.content.strip()
-        # Extract first float found
-        match = re.search(r"(\d+\.?\d*)", score_text)
-        if match:
-            score = float(match.group(1))
-            return max(0.0, min(1.0, score))
-
-        # LLM didn't return a parseable score
-        logger.warning(
-            "LLM returned unparseable score: %s",
-            score_text[:100],
-            extra={"response_preview": score_text[:100]},
-        )
-        return None
 
-    except Exception as e:
-        logger.error(
-            "Error scoring thread: %s",
-            e,
-            exc_info=True,
-        )
-        raise
+def _batch_score_prompt(thread_contexts: list[str]) -> str:
+    """Build a prompt scoring several threads in one LLM call."""
+    threads = "\n\n".join(
+        f"=== Thread {i} ===\n{context}" for i, context in enumerate(thread_contexts, 1)
+    )
+    n = len(thread_contexts)
+    return f"""Rate the value of each of the following {n} mailing list threads as a FAQ entry \
+on a scale of 0.0 to 1.0. Score every thread independently.
 
+Consider:
+- Does it have a clear, answerable technical question?
+- Are the responses helpful and authoritative?
+- Is it substantive (not just social chat or spam)?
+- Would future users benefit from this Q&A?
 
-def _summarize_thread(thread_context: str, model) -> FAQSummary | None:
-    """Use LLM to create FAQ summary.
+{threads}
 
-    Args:
-        thread_context: Formatted thread messages
-        model: LLM instance for summarization
+Respond with ONLY a JSON array of {n} numbers, one per thread in order (e.g., [0.75, 0.2]):"""
 
-    Returns:
-        FAQSummary or None if summarization failed
-    """
-    system_prompt = """You are an expert at creating FAQ entries from mailing list threads.
+
+_SUMMARY_SYSTEM_PROMPT = """You are an expert at creating FAQ entries from mailing list threads.
 
 Extract:
 1. Core Question: The main technical question being asked
@@ -145,86 +321,182 @@ Format as JSON:
   "category": "..."
 }"""
 
-    user_prompt = f"""Thread:
-{thread_context}"""
 
+def _summary_messages(thread_context: str) -> list:
+    return [
+        SystemMessage(content=_SUMMARY_SYSTEM_PROMPT),
+        HumanMessage(
+            content=f"""Thread:
+{thread_context}"""
+        ),
+    ]
+
+
+def _parse_score(score_text: str) -> float | None:
+    """Extract a 0.0-1.0 score from an LLM reply, or None if there is none."""
+    score_text = score_text.strip()
+    # Extract first float found
+    match = re.search(r"(\d+\.?\d*)", score_text)
+    if match:
+        score = float(match.group(1))
+        return max(0.0, min(1.0, score))
+
+    # LLM didn't return a parseable score
+    logger.warning(
+        "LLM returned unparseable score: %s",
+        score_text[:100],
+        extra={"response_preview": score_text[:100]},
+    )
+    return None
+
+
+def _parse_batch_scores(text: str, expected: int) -> list[float] | None:
+    """Extract a JSON array of ``expected`` scores, or None if it doesn't parse."""
+    match = re.search(r"\[.*?\]", text, re.DOTALL)
+    if not match:
+        return None
     try:
-        response = model.invoke(
-            [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
-        )
+        values = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(values, list) or len(values) != expected:
+        return None
+    try:
+        return [max(0.0, min(1.0, float(v))) for v in values]
+    except (TypeError, ValueError):
+        return None
 
-        # Parse JSON response
-        content = response.content.strip()
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            # Remove trailing code block
-            if content.endswith("```"):
-                content = content[:-3]
 
-        try:
-            data = json.loads(content.strip())
-        except json.JSONDecodeError as e:
-            logger.error(
-                "LLM returned invalid JSON: %s. Response was: %s",
-                e,
-                content[:500],
-                extra={"response_preview": content[:500], "error_position": e.pos},
-            )
-            return None
+def _parse_summary(content: str) -> FAQSummary | None:
+    """Parse and validate the JSON FAQ entry returned by the summary agent."""
+    content = content.strip()
+    # Remove markdown code blocks if present
+    if content.startswith("```"):
+        content = content.split("```")[1]
+        if content.startswith("json"):
+            content = content[4:]
+        # Remove trailing code block
+        if content.endswith("```"):
+            content = content[:-3]
 
-        # Validate required fields
-        required_fields = ["question", "answer"]
-        missing_fields = [f for f in required_fields if f not in data]
-        if missing_fields:
-            logger.error(
-                "LLM response missing required fields: %s. Response was: %s",
-                missing_fields,
-                data,
-                extra={"missing_fields": missing_fields, "response": data},
-            )
-            return None
-
-        # Validate and normalize optional fields
-        category = data.get("category", "discussion") or "discussion"
-        tags = data.get("tags", []) or []
-        answer = data["answer"]
-
-        # Validate category is one of expected values
-        valid_categories = {
-            "troubleshooting",
-            "how-to",
-            "bug-report",
-            "feature-request",
-            "discussion",
-            "reference",
-        }
-        if category not in valid_categories:
-            logger.warning("LLM returned invalid category '%s', using 'discussion'", category)
-            category = "discussion"
-
-        # Limit answer length to prevent bloat
-        if len(answer) > 10000:
-            logger.warning("Answer too long (%d chars), truncating to 10000", len(answer))
-            answer = answer[:10000] + "\n\n[Answer truncated due to length]"
-
-        return FAQSummary(
-            question=data["question"],
-            answer=answer,
-            tags=tags,
-            category=category,
-            quality_score=0.0,  # Set externally
+    try:
+        data = json.loads(content.strip())
+    except json.JSONDecodeError as e:
+        logger.error(
+            "LLM returned invalid JSON: %s. Response was: %s",
+            e,
+            content[:500],
+            extra={"response_preview": content[:500], "error_position": e.pos},
         )
+        return None
 
-    except Exception as e:
+    # Validate required fields
+    required_fields = ["question", "answer"]
+    missing_fields = [f for f in required_fields if f not in data]
+    if missing_fields:
         logger.error(
-            "Error summarizing thread: %s",
-            e,
-            exc_info=True,
+            "LLM response missing required fields: %s. Response was: %s",
+            missing_fields,
+            data,
+            extra={"missing_fields": missing_fields, "response": data},
+        )
+        return None
+
+    # Validate and normalize optional fields
+    category = data.get("category", "discussion") or "discussion"
+    tags = data.get("tags", []) or []
+    answer = data["answer"]
+
+    # Validate category is one of expected values
+    valid_categories = {
+        "troubleshooting",
+        "how-to",
+        "bug-report",
+        "feature-request",
+        "discussion",
+        "reference",
+    }
+    if category not in valid_categories:
+        logger.warning("LLM returned invalid category '%s', using 'discussion'", category)
+        category = "discussion"
+
+    # Limit answer length to prevent bloat
+    if len(answer) > 10000:
+        logger.warning("Answer too long (%d chars), truncating to 10000", len(answer))
+        answer = answer[:10000] + "\n\n[Answer truncated due to length]"
+
+    return FAQSummary(
+        question=data["question"],
+        answer=answer,
+        tags=tags,
+        category=category,
+        quality_score=0.0,  # Set externally
+    )
+
+
+@dataclass
+class LLMUsage:
+    """Token usage of one agent, summed from the responses' usage_metadata."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, response) -> tuple[int, int]:
+        """Add a response's reported usage; returns its (input, output) tokens."""
+        usage = getattr(response, "usage_metadata", None)
+        if not isinstance(usage, dict):
+            return 0, 0
+        tokens_in = usage.get("input_tokens") or 0
+        tokens_out = usage.get("output_tokens") or 0
+        self.input_tokens += tokens_in
+        self.output_tokens += tokens_out
+        return tokens_in, tokens_out
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+async def _ascore_threads(
+    thread_contexts: list[str], model, usage: LLMUsage
+) -> tuple[list[float | None], int, int]:
+    """Score one or more threads, several per prompt when given more than one.
+
+    A multi-thread reply that does not parse into one score per thread is
+    retried thread by thread.
+
+    Returns:
+        (scores in input order, input tokens, output tokens)
+    """
+    tokens_in = tokens_out = 0
+    if len(thread_contexts) > 1:
+        response = await model.ainvoke([HumanMessage(content=_batch_score_prompt(thread_contexts))])
+        tokens_in, tokens_out = usage.add(response)
+        scores = _parse_batch_scores(response.content, len(thread_contexts))
+        if scores is not None:
+            return list(scores), tokens_in, tokens_out
+        logger.warning(
+            "Unparseable multi-thread score reply, scoring %d threads individually",
+            len(thread_contexts),
         )
-        raise
+
+    scores: list[float | None] = []
+    for context in thread_contexts:
+        response = await model.ainvoke([HumanMessage(content=_score_prompt(context))])
+        t_in, t_out = usage.add(response)
+        tokens_in += t_in
+        tokens_out += t_out
+        scores.append(_parse_score(response.content))
+    return scores, tokens_in, tokens_out
+
+
+async def _asummarize_thread(
+    thread_context: str, model, usage: LLMUsage
+) -> tuple[FAQSummary | None, int, int]:
+    """Use the LLM to create an FAQ summary of one thread; also reports token usage."""
+    response = await model.ainvoke(_summary_messages(thread_context))
+    tokens_in, tokens_out = usage.add(response)
+    return _parse_summary(response.content), tokens_in, tokens_out
 
 
 def estimate_summarization_cost(
@@ -303,22 +575,27 @@ def summarize_threads(
     quality_threshold: float | None = None,
     batch_size: int = 10,
     max_threads: int | None = None,
+    retry_failed: bool = False,
 ) -> dict:
     """Summarize mailing list threads into FAQ entries.
 
-    Uses community-specific FAQ generation config for model selection
-    and quality thresholds. Falls back to defaults if not configured.
+    Uses community-specific FAQ generation config for model selection,
+    quality thresholds and the retry policy. Falls back to defaults if not
+    configured. Only new or changed threads are scored; see
+    select_candidate_threads().
 
     Args:
         list_name: Mailing list identifier
         project: Community ID
         quality_threshold: Minimum quality score to summarize (0.0-1.0)
                           If None, uses community config (default: 0.7)
-        batch_size: Number of threads per LLM batch
+        batch_size: Number of processed threads per database commit
         max_threads: Maximum threads to process (for testing/budgeting)
+        retry_failed: Retry all failed threads, ignoring the retry policy
 
     Returns:
-        Summary stats: {processed, summarized, skipped, total_cost, total_tokens}
+        Summary stats: {processed, summarized, skipped, failed, total_cost, total_tokens};
+        cost and tokens are from the models' reported usage
     """
     # Load community config for FAQ generation settings
     from src.assistants import registry
@@ -345,12 +622,20 @@ def summarize_threads(
             enable_caching=faq_config.summary_agent.enable_caching,
         )
 
-        # Track model name for database
+        # Track model names for database and cost
         summary_model_name = faq_config.summary_agent.model
+        eval_model_name = faq_config.evaluation_agent.model
+        max_concurrency = faq_config.max_concurrency
+        scoring_batch_size = faq_config.scoring_batch_size
 
         # Use config threshold if not overridden
         if quality_threshold is None:
             quality_threshold = faq_config.quality_threshold
+
+        retry_policy = RetryPolicy(
+            max_attempts=faq_config.retry_max_attempts,
+            backoff=timedelta(hours=faq_config.retry_backoff_hours),
+        )
     else:
         # Fallback to hardcoded defaults (backward compatibility)
         # Note: Uses same model for both agents (Haiku 4.5) with different temperatures.
@@ -361,7 +646,9 @@ def summarize_threads(
             "No faq_generation config found for %s, using defaults",
             project,
         )
-        summary_model_name = "anthropic/claude-haiku-4.5"
+        summary_model_name = eval_model_name = "anthropic/claude-haiku-4.5"
+        max_concurrency = 4
+        scoring_batch_size = 1
         eval_agent = create_openrouter_llm(
             model=summary_model_name,
             provider="Anthropic",
@@ -376,198 +663,347 @@ def summarize_threads(
         )
         if quality_threshold is None:
             quality_threshold = 0.7
+        retry_policy = RetryPolicy()
 
     with get_connection(project) as conn:
-        # Get threads needing summarization
+        # Only new/changed threads and failed threads due for a retry
         # TODO: Use faq_config.sources settings for min_messages, min_participants, enabled
         # Currently hardcoded to msg_count >= 2 for backward compatibility
         # See FAQSourceConfig in src/core/config/community.py
-        cursor = conn.execute(
-            """
-            SELECT m.thread_id, COUNT(*) as msg_count,
-                   COUNT(DISTINCT m.author) as participant_count,
-                   MIN(m.date) as first_date
-            FROM mailing_list_messages m
-            LEFT JOIN faq_entries f ON m.thread_id = f.thread_id AND m.list_name = f.list_name
-            WHERE m.list_name = ? AND m.thread_id IS NOT NULL
-              AND f.id IS NULL
-            GROUP BY m.thread_id
-            HAVING msg_count >= 2
-            ORDER BY msg_count DESC
-            LIMIT ?
-        """,
-            (list_name, max_threads or 999999),
+        threads_to_process = select_candidate_threads(
+            conn,
+            list_name,
+            max_threads=max_threads,
+            retry_policy=retry_policy,
+            retry_failed=retry_failed,
         )
 
-        threads_to_process = cursor.fetchall()
-
         if not threads_to_process:
             console.print("[yellow]No threads to summarize[/yellow]")
-            return {"processed": 0, "summarized": 0, "skipped": 0, "total_cost": 0.0}
+            return {
+                "processed": 0,
+                "summarized": 0,
+                "skipped": 0,
+                "failed": 0,
+                "total_cost": 0.0,
+                "total_tokens": 0,
+            }
 
         console.print(f"Found {len(threads_to_process)} threads to process")
 
-        # Process threads
-        processed = 0
-        summarized = 0
-        skipped = 0
-        total_cost = 0.0
+        pipeline = _FAQPipeline(
+            conn,
+            list_name,
+            eval_agent=eval_agent,
+            summary_agent=summary_agent,
+            eval_model_name=eval_model_name,
+            summary_model_name=summary_model_name,
+            quality_threshold=quality_threshold,
+            max_concurrency=max_concurrency,
+            scoring_batch_size=scoring_batch_size,
+            commit_every=batch_size,
+        )
 
         with Progress(
             SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
         ) as progress:
             task = progress.add_task("Summarizing threads...", total=len(threads_to_process))
+            stats = asyncio.run(
+                pipeline.run(threads_to_process, on_done=lambda n: progress.update(task, advance=n))
+            )
 
-            for thread_info in threads_to_process:
-                thread_id = thread_info["thread_id"]
-
-                try:
-                    # Fetch thread messages
-                    cursor = conn.execute(
-                        """
-                        SELECT * FROM mailing_list_messages
-                        WHERE list_name = ? AND thread_id = ?
-                        ORDER BY date
-                    """,
-                        (list_name, thread_id),
-                    )
+        console.print(
+            f"\n[green]✓ Summarized {stats['summarized']}/{stats['processed']} threads[/green]"
+        )
+        console.print(
+            f"[dim]Cost: ${stats['total_cost']:.2f} ({stats['total_tokens']:,} tokens)[/dim]"
+        )
+        return stats
 
-                    messages = [dict(row) for row in cursor.fetchall()]
-                    thread_context = _build_thread_context(messages)
-
-                    # Score quality
-                    quality_score = _score_thread_quality(thread_context, eval_agent)
-
-                    if quality_score is None:
-                        # Scoring failed due to LLM error (not a low score, which would be < threshold)
-                        # These threads are marked 'failed' and won't be retried automatically
-                        # This prevents problematic threads from blocking batch processing
-                        # Manual retry: Delete failed entry from DB or run sync with --retry-failed flag
-                        skipped += 1
-                        update_summarization_status(
-                            conn,
-                            list_name=list_name,
-                            thread_id=thread_id,
-                            status="failed",
-                            failure_reason="Failed to score thread quality (LLM error)",
-                        )
-                        progress.update(task, advance=1)
-                        continue
-
-                    if quality_score < quality_threshold:
-                        skipped += 1
-                        update_summarization_status(
-                            conn,
-                            list_name=list_name,
-                            thread_id=thread_id,
-                            status="skipped",
-                            failure_reason=f"Quality score {quality_score:.2f} below threshold",
-                        )
-                        progress.update(task, advance=1)
-                        continue
-
-                    # Summarize with summary agent (for high-quality threads)
-                    summary = _summarize_thread(thread_context, summary_agent)
-                    if not summary:
-                        update_summarization_status(
-                            conn,
-                            list_name=list_name,
-                            thread_id=thread_id,
-                            status="failed",
-                            failure_reason="Summarization failed",
-                        )
-                        progress.update(task, advance=1)
-                        continue
-
-                    # Insert FAQ entry
-                    summary.quality_score = quality_score
-                    thread_url = messages[0]["url"].rsplit("/", 1)[0] + f"/thread.html#{thread_id}"
-
-                    upsert_faq_entry(
-                        conn,
-                        list_name=list_name,
-                        thread_id=thread_id,
-                        thread_url=thread_url,
-                        question=summary.question,
-                        answer=summary.answer,
-                        tags=summary.tags,
-                        category=summary.category,
-                        message_count=len(messages),
-                        participant_count=thread_info["participant_count"],
-                        first_message_date=thread_info["first_date"],
-                        quality_score=quality_score,
-                        summary_model=summary_model_name,
-                    )
 
-                    update_summarization_status(
-                        conn,
-                        list_name=list_name,
-                        thread_id=thread_id,
-                        status="summarized",
-                    )
+@dataclass
+class _ThreadOutcome:
+    """Result of scoring (and possibly summarizing) one thread."""
+
+    candidate: ThreadCandidate
+    messages: list[dict]
+    status: str  # 'summarized', 'skipped' or 'failed'
+    quality_score: float | None = None
+    summary: FAQSummary | None = None
+    failure_reason: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+
+class _FAQPipeline:
+    """Scores and summarizes candidate threads concurrently.
+
+    Candidates are processed in windows: each window's messages are loaded
+    with one grouped query, then scoring groups (``scoring_batch_size``
+    threads per prompt) run concurrently with at most ``max_concurrency``
+    LLM calls in flight. Outcomes are written as they complete and
+    committed every ``commit_every`` threads, so progress survives an
+    interrupted run. All database access stays on the calling thread.
+    """
 
-                    summarized += 1
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        list_name: str,
+        *,
+        eval_agent,
+        summary_agent,
+        eval_model_name: str,
+        summary_model_name: str,
+        quality_threshold: float,
+        max_concurrency: int = 4,
+        scoring_batch_size: int = 1,
+        commit_every: int = 10,
+    ) -> None:
+        self.conn = conn
+        self.list_name = list_name
+        self.eval_agent = eval_agent
+        self.summary_agent = summary_agent
+        self.eval_model_name = eval_model_name
+        self.summary_model_name = summary_model_name
+        self.quality_threshold = quality_threshold
+        self.max_concurrency = max(1, max_concurrency)
+        self.scoring_batch_size = max(1, scoring_batch_size)
+        self.commit_every = max(1, commit_every)
+        self.eval_usage = LLMUsage()
+        self.summary_usage = LLMUsage()
+
+    async def run(self, candidates: list[ThreadCandidate], on_done=None) -> dict:
+        """Process all candidates; returns the summary stats of summarize_threads()."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        counts = {"processed": 0, "summarized": 0, "skipped": 0, "failed": 0}
+        uncommitted = 0
+        window_size = self.max_concurrency * self.scoring_batch_size * 4
+
+        for start in range(0, len(candidates), window_size):
+            window = candidates[start : start + window_size]
+            messages = _load_thread_messages(
+                self.conn, self.list_name, [c.thread_id for c in window]
+            )
+            groups = [
+                [
+                    (c, messages.get(c.thread_id, []))
+                    for c in window[i : i + self.scoring_batch_size]
+                ]
+                for i in range(0, len(window), self.scoring_batch_size)
+            ]
+            tasks = [asyncio.create_task(self._process_group(group, semaphore)) for group in groups]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    outcomes = await finished
+                    for outcome in outcomes:
+                        self._store(outcome)
+                        counts["processed"] += 1
+                        counts[outcome.status] += 1
+                    uncommitted += len(outcomes)
+                    if uncommitted >= self.commit_every:
+                        self.conn.commit()
+                        uncommitted = 0
+                    if on_done:
+                        on_done(len(outcomes))
+            except BaseException:
+                for pending in tasks:
+                    pending.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.conn.commit()  # Keep what was already stored
+                raise
+
+        self.conn.commit()
+
+        total_cost = estimate_cost(
+            self.eval_model_name, self.eval_usage.input_tokens, self.eval_usage.output_tokens
+        ) + estimate_cost(
+            self.summary_model_name,
+            self.summary_usage.input_tokens,
+            self.summary_usage.output_tokens,
+        )
+        return {
+            **counts,
+            "total_cost": total_cost,
+            "total_tokens": self.eval_usage.total_tokens + self.summary_usage.total_tokens,
+        }
 
-                    # Estimate cost (rough)
-                    tokens = len(thread_context) // 4  # ~4 chars per token
-                    cost = (
-                        tokens * (SONNET_COST_PER_1M_INPUT + SONNET_COST_PER_1M_OUTPUT) / 1_000_000
-                    )
-                    total_cost += cost
-
-                    # Commit every batch
-                    if summarized % batch_size == 0:
-                        conn.commit()
-
-                except sqlite3.Error as db_err:
-                    # Database errors should probably abort the entire batch
-                    logger.error(
-                        "Database error processing thread %s: %s",
-                        thread_id,
-                        db_err,
-                        exc_info=True,
-                        extra={
-                            "list_name": list_name,
-                            "thread_id": thread_id,
-                            "operation": "database",
-                        },
-                    )
-                    # Re-raise database errors as they indicate serious problems
-                    raise
-
-                except Exception as e:
-                    # Unexpected error - likely a programming bug
-                    logger.error(
-                        "Unexpected error processing thread %s: %s",
-                        thread_id,
-                        e,
-                        exc_info=True,
-                        extra={
-                            "list_name": list_name,
-                            "thread_id": thread_id,
-                            "message_count": len(messages) if "messages" in locals() else None,
-                        },
+    async def _process_group(
+        self, group: list[tuple[ThreadCandidate, list[dict]]], semaphore: asyncio.Semaphore
+    ) -> list[_ThreadOutcome]:
+        """Score a group of threads in one prompt, then summarize those above threshold."""
+        contexts = [_build_thread_context(messages) for _, messages in group]
+        try:
+            async with semaphore:
+                scores, tokens_in, tokens_out = await _ascore_threads(
+                    contexts, self.eval_agent, self.eval_usage
+                )
+        except Exception as e:
+            logger.error(
+                "Error scoring %d thread(s) starting at %s: %s",
+                len(group),
+                group[0][0].thread_id,
+                e,
+                exc_info=True,
+                extra={"list_name": self.list_name, "operation": "scoring"},
+            )
+            return [
+                _ThreadOutcome(
+                    candidate,
+                    messages,
+                    "failed",
+                    failure_reason=f"Unexpected error: {type(e).__name__}",
+                )
+                for candidate, messages in group
+            ]
+
+        # Scoring tokens of a multi-thread prompt are shared evenly
+        share_in, share_out = tokens_in // len(group), tokens_out // len(group)
+        share_cost = estimate_cost(self.eval_model_name, share_in, share_out)
+
+        async def finish(candidate, messages, context, score) -> _ThreadOutcome:
+            outcome = _ThreadOutcome(
+                candidate,
+                messages,
+                "failed",
+                quality_score=score,
+                input_tokens=share_in,
+                output_tokens=share_out,
+                cost=share_cost,
+            )
+            if score is None:
+                # Scoring failed due to LLM error (not a low score, which would be < threshold)
+                # These threads are marked 'failed' and retried under the retry policy
+                # (faq_generation.retry_*); a content change or --retry-failed also retries
+                outcome.failure_reason = "Failed to score thread quality (LLM error)"
+                return outcome
+            if score < self.quality_threshold:
+                outcome.status = "skipped"
+                outcome.failure_reason = f"Quality score {score:.2f} below threshold"
+                return outcome
+
+            # Summarize with summary agent (for high-quality threads)
+            try:
+                async with semaphore:
+                    summary, s_in, s_out = await _asummarize_thread(
+                        context, self.summary_agent, self.summary_usage
                     )
-                    update_summarization_status(
-                        conn,
-                        list_name=list_name,
-                        thread_id=thread_id,
-                        status="failed",
-                        failure_reason=f"Unexpected error: {type(e).__name__}",
+            except Exception as e:
+                logger.error(
+                    "Error summarizing thread %s: %s",
+                    candidate.thread_id,
+                    e,
+                    exc_info=True,
+                    extra={
+                        "list_name": self.list_name,
+                        "thread_id": candidate.thread_id,
+                        "message_count": len(messages),
+                    },
+                )
+                outcome.failure_reason = f"Unexpected error: {type(e).__name__}"
+                return outcome
+
+            outcome.input_tokens += s_in
+            outcome.output_tokens += s_out
+            outcome.cost += estimate_cost(self.summary_model_name, s_in, s_out)
+            if not summary:
+                outcome.failure_reason = "Summarization failed"
+                return outcome
+
+            summary.quality_score = score
+            outcome.summary = summary
+            outcome.status = "summarized"
+            return outcome
+
+        return list(
+            await asyncio.gather(
+                *(
+                    finish(candidate, messages, context, score)
+                    for (candidate, messages), context, score in zip(
+                        group, contexts, scores, strict=True
                     )
+                )
+            )
+        )
 
-                processed += 1
-                progress.update(task, advance=1)
+    def _store(self, outcome: _ThreadOutcome) -> None:
+        """Write a thread outcome (FAQ entry and status) without committing.
+
+        Raises:
+            sqlite3.Error: Database errors abort the run
+        """
+        candidate = outcome.candidate
+        thread_id = candidate.thread_id
+        try:
+            if outcome.summary:
+                summary = outcome.summary
+                thread_url = (
+                    outcome.messages[0]["url"].rsplit("/", 1)[0] + f"/thread.html#{thread_id}"
+                )
+                upsert_faq_entry(
+                    self.conn,
+                    list_name=self.list_name,
+                    thread_id=thread_id,
+                    thread_url=thread_url,
+                    question=summary.question,
+                    answer=summary.answer,
+                    tags=summary.tags,
+                    category=summary.category,
+                    message_count=len(outcome.messages),
+                    participant_count=candidate.participant_count,
+                    first_message_date=candidate.first_date,
+                    quality_score=summary.quality_score,
+                    summary_model=self.summary_model_name,
+                )
+
+            update_summarization_status(
+                self.conn,
+                list_name=self.list_name,
+                thread_id=thread_id,
+                status=outcome.status,
+                failure_reason=outcome.failure_reason,
+                token_count=outcome.input_tokens + outcome.output_tokens,
+                cost_estimate=outcome.cost,
+                thread_fingerprint=candidate.fingerprint,
+            )
+        except sqlite3.Error as db_err:
+            # Database errors abort the entire run
+            logger.error(
+                "Database error processing thread %s: %s",
+                thread_id,
+                db_err,
+                exc_info=True,
+                extra={
+                    "list_name": self.list_name,
+                    "thread_id": thread_id,
+                    "operation": "database",
+                },
+            )
+            raise
 
-            # Final commit
-            conn.commit()
 
-        console.print(f"\n[green]✓ Summarized {summarized}/{processed} threads[/green]")
-        console.print(f"[dim]Estimated cost: ${total_cost:.2f}[/dim]")
+def _load_thread_messages(
+    conn: sqlite3.Connection, list_name: str, thread_ids: list[str]
+) -> dict[str, list[dict]]:
+    """Load the messages of several threads with grouped queries.
 
-        return {
-            "processed": processed,
-            "summarized": summarized,
-            "skipped": skipped,
-            "total_cost": total_cost,
-        }
+    Returns:
+        Dict mapping thread ID to its messages ordered by date
+    """
+    messages: dict[str, list[dict]] = {thread_id: [] for thread_id in thread_ids}
+    # Stay well below SQLite's bound-parameter limit
+    for start in range(0, len(thread_ids), 500):
+        chunk = thread_ids[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        cursor = conn.execute(
+            f"""
+            SELECT * FROM mailing_list_messages
+            WHERE list_name = ? AND thread_id IN ({placeholders})
+            ORDER BY thread_id, date
+            """,
+            (list_name, *chunk),
+        )
+        for row in cursor:
+            messages[row["thread_id"]].append(dict(row))
+    return messages
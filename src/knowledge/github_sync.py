@@ -5,348 +5,988 @@ Each assistant can configure its own repos via sync_config.
 
 Only stores title, first message (body), status, URL, and created date.
 No replies or comments are stored.
+
+Incremental syncs are pushed to the API rather than filtered locally:
+items are requested newest-updated first, issues use the ``since``
+parameter, PR pagination stops at the stored watermark, and the first
+page is sent with ``If-None-Match`` so an unchanged repo costs a single
+304 response (which does not count against the rate limit).
+
+Multi-repo syncs (sync_repos, sync_all_repos) run on an asyncio engine:
+one pooled ``httpx.AsyncClient`` fetches the issues and PRs of many repos
+concurrently, a process-wide GitHubRateLimiter reads ``X-RateLimit-*``
+headers so every community draws on the same budget, and a single batched
+writer persists the results.
 """
 
+import asyncio
+import json
 import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
 from src.api.config import get_settings
-from src.knowledge.db import get_connection, get_last_sync, update_sync_metadata, upsert_github_item
+from src.knowledge.db import (
+    UpsertCounts,
+    get_connection,
+    get_last_sync,
+    get_sync_cursor,
+    update_sync_metadata,
+    upsert_github_item,
+    write_sync_metadata,
+)
 
 logger = logging.getLogger(__name__)
 
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_PER_PAGE = 100
+
+# sync_metadata source types holding the per-endpoint watermark and ETag
+ISSUES_CURSOR = "github_issues"
+PRS_CURSOR = "github_prs"
+
+_ENDPOINTS = (("issue", ISSUES_CURSOR), ("pr", PRS_CURSOR))
+
+# Async engine tuning
+GITHUB_MAX_CONCURRENCY = 8  # Page requests in flight at once
+GITHUB_WRITE_BATCH_SIZE = 16  # Repos persisted per write transaction
+RATE_LIMIT_RESERVE = 5  # Requests left untouched before pausing for the reset
+RATE_LIMIT_MAX_WAIT = 900.0  # Longest pause (seconds) before giving up on a fetch
+RATE_LIMIT_RETRIES = 1  # Re-sends of a page rejected for rate limiting
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when the rate limit would require waiting longer than allowed."""
+
+
+class GitHubRateLimiter:
+    """Process-wide GitHub request budget shared by every sync.
+
+    Tracks the most recent ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset``
+    values seen on any response and claims one request per call to
+    reserve_delay(), so concurrent fetches for different repos (and
+    communities syncing in different scheduler threads) cannot overdraw the
+    budget between responses. Once only ``reserve`` requests are left,
+    callers are told to wait until the window resets.
+    """
+
+    def __init__(self, reserve: int = RATE_LIMIT_RESERVE, clock=time.time) -> None:
+        self.reserve = reserve
+        self.waits = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._remaining: int | None = None
+        self._reset_at: float | None = None
+
+    @property
+    def remaining(self) -> int | None:
+        """Requests believed to be left in the current window (None if unknown)."""
+        with self._lock:
+            return self._remaining
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the rate-limit headers of a GitHub response."""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+
+        with self._lock:
+            if self._reset_at is None or reset_at > self._reset_at:
+                # First response of a new window
+                self._remaining = remaining
+                self._reset_at = reset_at
+            elif reset_at == self._reset_at and (
+                self._remaining is None or remaining < self._remaining
+            ):
+                # Concurrent responses arrive out of order; the lowest count is current
+                self._remaining = remaining
+
+    def reserve_delay(self) -> float:
+        """Claim one request from the budget.
+
+        Returns:
+            Seconds to wait before sending the request (0.0 to send now)
+        """
+        with self._lock:
+            if self._remaining is None or self._reset_at is None:
+                return 0.0
+
+            now = self._clock()
+            if now >= self._reset_at:
+                # Window rolled over; the next response reports the new budget
+                self._remaining = None
+                self._reset_at = None
+                return 0.0
+
+            if self._remaining > self.reserve:
+                self._remaining -= 1
+                return 0.0
+
+            self.waits += 1
+            return self._reset_at - now + 1.0
+
+    def _checked_delay(self, max_wait: float) -> float:
+        delay = self.reserve_delay()
+        if delay > max_wait:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit exhausted; resets in {delay:.0f}s (max wait {max_wait:.0f}s)"
+            )
+        if delay:
+            logger.warning(
+                "GitHub rate limit nearly exhausted (%s left), pausing %.0fs until reset",
+                self._remaining,
+                delay,
+            )
+        return delay
+
+    def wait(self, max_wait: float = RATE_LIMIT_MAX_WAIT) -> None:
+        """Block until a request may be sent.
+
+        Raises:
+            GitHubRateLimitError: If the wait would exceed max_wait seconds
+        """
+        delay = self._checked_delay(max_wait)
+        if delay:
+            time.sleep(delay)
+
+    async def async_wait(self, max_wait: float = RATE_LIMIT_MAX_WAIT) -> None:
+        """Asynchronous variant of wait()."""
+        delay = self._checked_delay(max_wait)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_rate_limiter = GitHubRateLimiter()
+
+
+def get_rate_limiter() -> GitHubRateLimiter:
+    """Get the process-wide GitHub rate limiter."""
+    return _rate_limiter
+
+
+@dataclass
+class GitHubFetchResult:
+    """Items fetched from a paginated GitHub endpoint."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    etag: str | None = None
+    not_modified: bool = False
+    pages: int = 0
+
+
+@dataclass
+class ItemSyncResult:
+    """Outcome of syncing one endpoint (issues or PRs) of a repository."""
+
+    count: int = 0
+    watermark: str | None = None
+    etag: str | None = None
+    not_modified: bool = False
+    failed: bool = False
+
+
+def _github_headers() -> dict[str, str]:
+    """Build GitHub REST API headers, with the optional token for higher rate limits."""
+    settings = get_settings()
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+
+    # Optional token for higher rate limits
+    if settings.github_token:
+        headers["Authorization"] = f"Bearer {settings.github_token}"
+        logger.debug("Using GitHub token for authentication")
+
+    return headers
 
-def _github_request(
-    endpoint: str, params: dict[str, Any] | None = None, timeout: int = 30
-) -> list[dict[str, Any]]:
-    """Make GitHub REST API request with pagination.
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Whether a response was rejected because the rate limit is exhausted."""
+    return (
+        response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def _handle_page(
+    response: httpx.Response,
+    result: GitHubFetchResult,
+    *,
+    endpoint: str,
+    page: int,
+    per_page: int,
+    etag: str | None,
+    stop_before: str | None,
+) -> bool:
+    """Fold one page response into a fetch result.
+
+    Returns:
+        True if the next page should be fetched
+
+    Raises:
+        httpx.HTTPStatusError: If HTTP request failed (4xx/5xx status)
+        ValueError: If response is not valid JSON
+    """
+    result.pages += 1
+
+    if response.status_code == 304:
+        logger.debug("GitHub %s not modified since last sync", endpoint)
+        result.etag = etag
+        result.not_modified = True
+        return False
+
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        # Provide detailed error context
+        status = e.response.status_code
+        if status == 403:
+            logger.error(
+                "GitHub API rate limit or forbidden (HTTP %d) on page %d of %s. Response: %s",
+                status,
+                page,
+                endpoint,
+                e.response.text[:200],
+            )
+        elif status == 404:
+            logger.error("Repository or endpoint not found (HTTP %d): %s", status, endpoint)
+        elif status == 401:
+            logger.error("GitHub API authentication failed (HTTP %d). Check GITHUB_TOKEN.", status)
+        else:
+            logger.error(
+                "GitHub API HTTP %d error on page %d of %s: %s",
+                status,
+                page,
+                endpoint,
+                e.response.text[:200],
+            )
+        raise
+
+    if page == 1:
+        result.etag = response.headers.get("ETag")
+
+    # Log rate limit info
+    if "X-RateLimit-Remaining" in response.headers:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        limit = response.headers.get("X-RateLimit-Limit")
+        logger.debug("GitHub rate limit: %s/%s remaining", remaining, limit)
+
+        if int(remaining) < 10:
+            logger.warning(
+                "GitHub rate limit low: %s/%s remaining. Consider adding GITHUB_TOKEN.",
+                remaining,
+                limit,
+            )
+
+    # Parse JSON with error handling
+    try:
+        items = response.json()
+    except json.JSONDecodeError as e:
+        logger.error(
+            "GitHub API returned invalid JSON for %s (status %d): %s",
+            response.url,
+            response.status_code,
+            str(e),
+        )
+        raise ValueError(f"Invalid JSON response from GitHub API: {e}") from e
+
+    if not items:
+        return False
+
+    if stop_before:
+        fresh = [item for item in items if item.get("updated_at", "") >= stop_before]
+        result.items.extend(fresh)
+        # Results are newest-first, so anything older means we've caught up
+        if len(fresh) < len(items):
+            return False
+    else:
+        result.items.extend(items)
+
+    # Check if there are more pages
+    return len(items) >= per_page
+
+
+def _github_fetch(
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    timeout: int = 30,
+    etag: str | None = None,
+    stop_before: str | None = None,
+) -> GitHubFetchResult:
+    """Make a GitHub REST API request with pagination and conditional GETs.
 
     Args:
         endpoint: API endpoint (e.g., '/repos/owner/repo/issues')
         params: Query parameters
         timeout: Request timeout in seconds
+        etag: ETag from a previous identical request. Sent as If-None-Match
+            on the first page; a 304 reply short-circuits the whole fetch.
+        stop_before: ISO timestamp watermark. Requires results sorted by
+            updated time (descending); pagination stops at the first item
+            whose ``updated_at`` is older, and older items are dropped.
 
     Returns:
-        List of items from API response
+        GitHubFetchResult with the items and the first page's ETag
 
     Raises:
         httpx.HTTPStatusError: If HTTP request fails (4xx/5xx status)
         httpx.TimeoutException: If request times out
         httpx.NetworkError: If network connectivity fails
         ValueError: If response is not valid JSON
+        GitHubRateLimitError: If the rate limit is exhausted for too long
 
     Note:
         Works without authentication for public repos (60 req/hour).
         Optional GITHUB_TOKEN env var enables higher rate limits (5000 req/hour).
     """
-    import json
-
-    settings = get_settings()
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    # Optional token for higher rate limits
-    if settings.github_token:
-        headers["Authorization"] = f"Bearer {settings.github_token}"
-        logger.debug("Using GitHub token for authentication")
-
-    url = f"https://api.github.com{endpoint}"
+    headers = _github_headers()
+    url = f"{GITHUB_API_URL}{endpoint}"
     logger.debug("GET %s with params %s", url, params)
 
-    all_items = []
+    limiter = get_rate_limiter()
+    result = GitHubFetchResult()
     page = 1
-    per_page = 100
+    per_page = GITHUB_PER_PAGE
+    retries = RATE_LIMIT_RETRIES
 
-    # Handle pagination
     while True:
         page_params = {**(params or {}), "page": page, "per_page": per_page}
-
-        try:
-            response = httpx.get(url, headers=headers, params=page_params, timeout=timeout)
-            response.raise_for_status()
-
-            # Log rate limit info
-            if "X-RateLimit-Remaining" in response.headers:
-                remaining = response.headers.get("X-RateLimit-Remaining")
-                limit = response.headers.get("X-RateLimit-Limit")
-                logger.debug("GitHub rate limit: %s/%s remaining", remaining, limit)
-
-                if int(remaining) < 10:
-                    logger.warning(
-                        "GitHub rate limit low: %s/%s remaining. Consider adding GITHUB_TOKEN.",
-                        remaining,
-                        limit,
-                    )
-
-            # Parse JSON with error handling
-            try:
-                items = response.json()
-            except json.JSONDecodeError as e:
-                logger.error(
-                    "GitHub API returned invalid JSON for %s (status %d): %s",
-                    url,
-                    response.status_code,
-                    str(e),
-                )
-                raise ValueError(f"Invalid JSON response from GitHub API: {e}") from e
-
-        except httpx.HTTPStatusError as e:
-            # Provide detailed error context
-            status = e.response.status_code
-            if status == 403:
-                logger.error(
-                    "GitHub API rate limit or forbidden (HTTP %d) on page %d of %s. Response: %s",
-                    status,
-                    page,
-                    endpoint,
-                    e.response.text[:200],
-                )
-            elif status == 404:
-                logger.error("Repository or endpoint not found (HTTP %d): %s", status, endpoint)
-            elif status == 401:
-                logger.error(
-                    "GitHub API authentication failed (HTTP %d). Check GITHUB_TOKEN.", status
-                )
-            else:
-                logger.error(
-                    "GitHub API HTTP %d error on page %d of %s: %s",
-                    status,
-                    page,
-                    endpoint,
-                    e.response.text[:200],
-                )
-            raise
-
-        if not items:
+        page_headers = headers
+        if page == 1 and etag:
+            page_headers = {**headers, "If-None-Match": etag}
+
+        limiter.wait()
+        response = httpx.get(url, headers=page_headers, params=page_params, timeout=timeout)
+        limiter.update(response.headers)
+        if _is_rate_limited(response) and retries > 0:
+            retries -= 1
+            continue
+
+        more = _handle_page(
+            response,
+            result,
+            endpoint=endpoint,
+            page=page,
+            per_page=per_page,
+            etag=etag,
+            stop_before=stop_before,
+        )
+        if not more:
             break
+        page += 1
 
-        all_items.extend(items)
+    logger.debug(
+        "Fetched %d items from %s in %d page(s)", len(result.items), endpoint, result.pages
+    )
+    return result
+
+
+async def _github_fetch_async(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    etag: str | None = None,
+    stop_before: str | None = None,
+    max_wait: float = RATE_LIMIT_MAX_WAIT,
+) -> GitHubFetchResult:
+    """Asynchronous variant of _github_fetch() on a shared client.
+
+    Pages of one endpoint are fetched in order (the stop condition depends on
+    the previous page); concurrency comes from running many endpoints at
+    once, with ``semaphore`` bounding the requests in flight.
+    """
+    limiter = get_rate_limiter()
+    result = GitHubFetchResult()
+    page = 1
+    per_page = GITHUB_PER_PAGE
+    retries = RATE_LIMIT_RETRIES
 
-        # Check if there are more pages
-        if len(items) < per_page:
+    while True:
+        page_params = {**(params or {}), "page": page, "per_page": per_page}
+        page_headers = {"If-None-Match": etag} if page == 1 and etag else None
+
+        await limiter.async_wait(max_wait)
+        async with semaphore:
+            response = await client.get(
+                f"{GITHUB_API_URL}{endpoint}", params=page_params, headers=page_headers
+            )
+        limiter.update(response.headers)
+        if _is_rate_limited(response) and retries > 0:
+            retries -= 1
+            continue
+
+        more = _handle_page(
+            response,
+            result,
+            endpoint=endpoint,
+            page=page,
+            per_page=per_page,
+            etag=etag,
+            stop_before=stop_before,
+        )
+        if not more:
             break
-
         page += 1
 
-    logger.debug("Fetched %d items from %s", len(all_items), endpoint)
-    return all_items
+    logger.debug(
+        "Fetched %d items from %s in %d page(s)", len(result.items), endpoint, result.pages
+    )
+    return result
 
 
-def sync_repo_issues(repo: str, project: str = "hed", since: str | None = None) -> int:
-    """Sync issues from a repository using GitHub REST API.
+def _github_request(
+    endpoint: str, params: dict[str, Any] | None = None, timeout: int = 30
+) -> list[dict[str, Any]]:
+    """Make GitHub REST API request with pagination.
 
-    Args:
-        repo: Repository in owner/name format
-        project: Assistant/project name for database isolation. Defaults to 'hed'.
-        since: Optional ISO date to sync from (for incremental sync)
+    Unconditional variant of _github_fetch() that returns every item.
 
-    Returns:
-        Number of items synced
+    Raises:
+        httpx.HTTPStatusError: If HTTP request fails (4xx/5xx status)
+        httpx.TimeoutException: If request times out
+        httpx.NetworkError: If network connectivity fails
+        ValueError: If response is not valid JSON
     """
-    import sqlite3
+    return _github_fetch(endpoint, params, timeout).items
+
 
-    # Validate repo format
+def _is_valid_repo(repo: str) -> bool:
+    """Check the owner/name format, logging invalid names."""
     if "/" not in repo or repo.count("/") > 1:
         logger.error("Invalid repo format: %s. Expected 'owner/name'.", repo)
-        return 0
+        return False
+    return True
+
+
+def _endpoint_request(
+    repo: str, item_type: str, since: str | None
+) -> tuple[str, dict[str, Any], str | None]:
+    """Build (endpoint, params, stop_before) for listing a repo's issues or PRs."""
+    # Newest-updated first, so incremental runs can stop early and the first
+    # page (and its ETag) only changes when something in the repo changed.
+    params: dict[str, Any] = {"state": "all", "sort": "updated", "direction": "desc"}
+    if item_type == "issue":
+        params["filter"] = "all"
+        if since:
+            params["since"] = since
+        return f"/repos/{repo}/issues", params, None  # Filtered server-side via since=
 
-    try:
-        items = _github_request(
-            f"/repos/{repo}/issues",
-            params={"state": "all", "filter": "all"},
-        )
-    except httpx.TimeoutException as e:
+    # The pulls endpoint has no since= parameter
+    return f"/repos/{repo}/pulls", params, since
+
+
+def _log_fetch_error(repo: str, error: Exception) -> None:
+    """Log a failed fetch; HTTP status and JSON errors were logged when raised."""
+    if isinstance(error, httpx.TimeoutException):
         logger.error(
             "GitHub API timeout for %s: %s. Check network connectivity or increase timeout.",
             repo,
-            e,
+            error,
         )
-        return 0
-    except httpx.NetworkError as e:
-        logger.error("Network error syncing %s: %s. Check internet connectivity.", repo, e)
-        return 0
-    except (httpx.HTTPStatusError, ValueError):
-        # HTTPStatusError and JSON parsing errors already logged in _github_request
-        return 0
-    except httpx.RequestError as e:
-        logger.error("GitHub API request failed for %s: %s", repo, e)
-        return 0
+    elif isinstance(error, httpx.NetworkError):
+        logger.error("Network error syncing %s: %s. Check internet connectivity.", repo, error)
+    elif isinstance(error, GitHubRateLimitError):
+        logger.error("Skipping %s: %s", repo, error)
+    elif isinstance(error, httpx.RequestError):
+        logger.error("GitHub API request failed for %s: %s", repo, error)
+
+
+def _store_items(
+    conn: sqlite3.Connection,
+    repo: str,
+    item_type: str,
+    items: list[dict[str, Any]],
+    changes: UpsertCounts,
+) -> int:
+    """Upsert fetched issues or PRs on an open connection (no commit).
 
+    Returns:
+        Number of items stored
+    """
+    label = "issues" if item_type == "issue" else "PRs"
     count = 0
-    skipped = 0
-
-    try:
-        with get_connection(project) as conn:
-            for item in items:
-                try:
-                    # Skip pull requests (they appear in issues endpoint too)
-                    if "pull_request" in item:
-                        continue
-
-                    # Skip if before since date (for incremental sync)
-                    if since and item.get("created_at", "") < since:
-                        skipped += 1
-                        continue
-
-                    upsert_github_item(
-                        conn,
-                        repo=repo,
-                        item_type="issue",
-                        number=item["number"],
-                        title=item["title"],
-                        first_message=item.get("body"),
-                        status="open" if item.get("state") == "open" else "closed",
-                        url=item["html_url"],
-                        created_at=item["created_at"],
-                    )
-                    count += 1
-                except KeyError as e:
-                    logger.warning("Skipping issue due to missing field %s in %s", e, repo)
-                    continue
+    for item in items:
+        try:
+            # Skip pull requests (they appear in issues endpoint too)
+            if item_type == "issue" and "pull_request" in item:
+                continue
+
+            outcome = upsert_github_item(
+                conn,
+                repo=repo,
+                item_type=item_type,
+                number=item["number"],
+                title=item["title"],
+                first_message=item.get("body"),
+                status="open" if item.get("state") == "open" else "closed",
+                url=item["html_url"],
+                created_at=item["created_at"],
+            )
+            changes.record(outcome)
+            count += 1
+        except KeyError as e:
+            logger.warning("Skipping %s item due to missing field %s in %s", label, e, repo)
+            continue
+    return count
 
-            conn.commit()
-    except sqlite3.OperationalError as e:
-        logger.error("Database locked or I/O error for %s: %s", repo, e)
-        return 0
-    except sqlite3.Error as e:
-        logger.error("Database error syncing %s: %s", repo, e)
-        return 0
 
-    if since and skipped > 0:
+def _fetched_result(
+    repo: str,
+    item_type: str,
+    project: str,
+    fetched: GitHubFetchResult,
+    count: int,
+    changes: UpsertCounts,
+    since: str | None,
+    etag: str | None,
+) -> ItemSyncResult:
+    """Log a stored fetch and build the cursor to record for the next run."""
+    label = "issues" if item_type == "issue" else "PRs"
+
+    if fetched.not_modified:
+        logger.info("No %s changes in %s since last sync (HTTP 304)", label, repo)
+        return ItemSyncResult(watermark=since, etag=etag, not_modified=True)
+
+    # Newest update seen; includes PRs listed by the issues endpoint since the
+    # server-side since= filter applies to them as well.
+    watermark = max((item.get("updated_at") or "" for item in fetched.items), default="")
+
+    if since:
         logger.info(
-            "Synced %d issues from %s to %s.db (skipped %d older than %s)",
+            "Synced %d %s from %s to %s.db [%s] (updated since %s, %d page(s))",
             count,
+            label,
             repo,
             project,
-            skipped,
+            changes,
             since,
+            fetched.pages,
         )
     else:
-        logger.info("Synced %d issues from %s to %s.db", count, repo, project)
-    return count
+        logger.info("Synced %d %s from %s to %s.db [%s]", count, label, repo, project, changes)
+    return ItemSyncResult(count=count, watermark=watermark or since, etag=fetched.etag)
 
 
-def sync_repo_prs(repo: str, project: str = "hed", since: str | None = None) -> int:
-    """Sync PRs from a repository using GitHub REST API.
+def _sync_items(
+    repo: str,
+    item_type: str,
+    project: str = "hed",
+    since: str | None = None,
+    etag: str | None = None,
+    counts: UpsertCounts | None = None,
+) -> ItemSyncResult:
+    """Fetch and store issues or PRs from a repository.
+
+    Args:
+        repo: Repository in owner/name format
+        item_type: 'issue' or 'pr'
+        project: Assistant/project name for database isolation
+        since: Only fetch items updated at or after this ISO timestamp
+        etag: ETag from the previous identical request, for a conditional GET
+        counts: Optional tally to accumulate inserted/updated/unchanged outcomes into
+
+    Returns:
+        ItemSyncResult with the count and the cursor to store for next time
+    """
+    if not _is_valid_repo(repo):
+        return ItemSyncResult(failed=True)
+
+    endpoint, params, stop_before = _endpoint_request(repo, item_type, since)
+    try:
+        fetched = _github_fetch(endpoint, params=params, etag=etag, stop_before=stop_before)
+    except (httpx.HTTPError, ValueError, GitHubRateLimitError) as e:
+        _log_fetch_error(repo, e)
+        return ItemSyncResult(failed=True)
+
+    count = 0
+    changes = UpsertCounts()
+    if not fetched.not_modified:
+        try:
+            with get_connection(project) as conn:
+                count = _store_items(conn, repo, item_type, fetched.items, changes)
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            logger.error("Database locked or I/O error for %s: %s", repo, e)
+            return ItemSyncResult(failed=True)
+        except sqlite3.Error as e:
+            logger.error("Database error syncing %s: %s", repo, e)
+            return ItemSyncResult(failed=True)
+
+    if counts is not None:
+        counts.merge(changes)
+
+    return _fetched_result(repo, item_type, project, fetched, count, changes, since, etag)
+
+
+def sync_repo_issues(
+    repo: str,
+    project: str = "hed",
+    since: str | None = None,
+    counts: UpsertCounts | None = None,
+) -> int:
+    """Sync issues from a repository using GitHub REST API.
 
     Args:
         repo: Repository in owner/name format
         project: Assistant/project name for database isolation. Defaults to 'hed'.
-        since: Optional ISO date to sync from (for incremental sync)
+        since: Optional ISO timestamp; only issues updated at or after it are
+            fetched (for incremental sync)
+        counts: Optional tally to accumulate inserted/updated/unchanged outcomes into
 
     Returns:
         Number of items synced
     """
-    import sqlite3
+    return _sync_items(repo, "issue", project, since=since, counts=counts).count
 
-    # Validate repo format
-    if "/" not in repo or repo.count("/") > 1:
-        logger.error("Invalid repo format: %s. Expected 'owner/name'.", repo)
-        return 0
 
-    try:
-        items = _github_request(
-            f"/repos/{repo}/pulls",
-            params={"state": "all"},
-        )
-    except httpx.TimeoutException as e:
-        logger.error(
-            "GitHub API timeout for %s: %s. Check network connectivity or increase timeout.",
-            repo,
-            e,
-        )
-        return 0
-    except httpx.NetworkError as e:
-        logger.error("Network error syncing %s: %s. Check internet connectivity.", repo, e)
-        return 0
-    except (httpx.HTTPStatusError, ValueError):
-        # HTTPStatusError and JSON parsing errors already logged in _github_request
-        return 0
-    except httpx.RequestError as e:
-        logger.error("GitHub API request failed for %s: %s", repo, e)
-        return 0
+def sync_repo_prs(
+    repo: str,
+    project: str = "hed",
+    since: str | None = None,
+    counts: UpsertCounts | None = None,
+) -> int:
+    """Sync PRs from a repository using GitHub REST API.
 
-    count = 0
-    skipped = 0
+    Args:
+        repo: Repository in owner/name format
+        project: Assistant/project name for database isolation. Defaults to 'hed'.
+        since: Optional ISO timestamp; pagination stops at PRs last updated
+            before it (for incremental sync)
+        counts: Optional tally to accumulate inserted/updated/unchanged outcomes into
 
-    try:
-        with get_connection(project) as conn:
-            for item in items:
-                try:
-                    # Skip if before since date (for incremental sync)
-                    if since and item.get("created_at", "") < since:
-                        skipped += 1
-                        continue
-
-                    # Map PR state (open, closed) to simple status
-                    # Note: Merged status available via 'merged' field if needed in future
-                    status = "open" if item.get("state") == "open" else "closed"
-
-                    upsert_github_item(
-                        conn,
-                        repo=repo,
-                        item_type="pr",
-                        number=item["number"],
-                        title=item["title"],
-                        first_message=item.get("body"),
-                        status=status,
-                        url=item["html_url"],
-                        created_at=item["created_at"],
-                    )
-                    count += 1
-                except KeyError as e:
-                    logger.warning("Skipping PR due to missing field %s in %s", e, repo)
-                    continue
+    Returns:
+        Number of items synced
+    """
+    return _sync_items(repo, "pr", project, since=since, counts=counts).count
 
-            conn.commit()
-    except sqlite3.OperationalError as e:
-        logger.error("Database locked or I/O error for %s: %s", repo, e)
-        return 0
-    except sqlite3.Error as e:
-        logger.error("Database error syncing %s: %s", repo, e)
-        return 0
 
-    if since and skipped > 0:
-        logger.info(
-            "Synced %d PRs from %s to %s.db (skipped %d older than %s)",
-            count,
-            repo,
-            project,
-            skipped,
-            since,
-        )
-    else:
-        logger.info("Synced %d PRs from %s to %s.db", count, repo, project)
-    return count
+def _load_cursor(
+    repo: str, cursor_type: str, item_type: str, project: str, incremental: bool
+) -> tuple[str | None, str | None]:
+    """Get the (since, etag) to resume an endpoint from."""
+    if not incremental:
+        return None, None
+
+    since, etag = get_sync_cursor(cursor_type, repo, project)
+    if since is None:
+        since = get_last_sync("github", repo, project)
+    if since:
+        logger.info("Incremental %s sync from %s for %s", item_type, since, repo)
+    return since, etag
 
 
 def sync_repo(repo: str, project: str = "hed", incremental: bool = True) -> int:
     """Sync both issues and PRs from a repository.
 
+    Incremental syncs resume from the per-endpoint watermark and ETag stored
+    in sync_metadata (falling back to the last sync time for repos synced
+    before cursors were recorded). Full syncs fetch everything but still
+    record a fresh cursor for the next incremental run.
+
     Args:
         repo: Repository in owner/name format
         project: Assistant/project name for database isolation. Defaults to 'hed'.
-        incremental: If True, only sync items since last sync
+        incremental: If True, only sync items updated since last sync
 
     Returns:
         Total number of items synced
     """
-    since = None
-    if incremental:
-        since = get_last_sync("github", repo, project)
-        if since:
-            logger.info("Incremental sync from %s for %s", since, repo)
+    changes = UpsertCounts()
+    total = 0
+
+    for item_type, cursor_type in _ENDPOINTS:
+        since, etag = _load_cursor(repo, cursor_type, item_type, project, incremental)
+        result = _sync_items(repo, item_type, project, since=since, etag=etag, counts=changes)
+        total += result.count
+        if not result.failed:
+            update_sync_metadata(
+                cursor_type,
+                repo,
+                result.count,
+                project,
+                watermark=result.watermark,
+                etag=result.etag,
+            )
+
+    update_sync_metadata("github", repo, total, project, changes=changes)
+    return total
 
-    issues = sync_repo_issues(repo, project, since)
-    prs = sync_repo_prs(repo, project, since)
-    total = issues + prs
 
-    update_sync_metadata("github", repo, total, project)
-    return total
+# ---------------------------------------------------------------------------
+# Async multi-repo engine
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _EndpointFetch:
+    """Fetched (not yet stored) issues or PRs of one repository."""
+
+    item_type: str
+    cursor_type: str
+    since: str | None = None
+    etag: str | None = None
+    fetched: GitHubFetchResult | None = None  # None if the fetch failed
+
+
+@dataclass
+class _RepoFetch:
+    """Both endpoints of one repository, ready for the writer."""
+
+    project: str
+    repo: str
+    endpoints: list[_EndpointFetch]
+
+
+def _write_repo_batch(project: str, repos: list[_RepoFetch]) -> list[int]:
+    """Store fetched repos of one project and their cursors in a single transaction.
+
+    Returns:
+        Items synced per repo, in input order
+    """
+    totals = []
+    with get_connection(project) as conn:
+        for repo_fetch in repos:
+            repo = repo_fetch.repo
+            changes = UpsertCounts()
+            total = 0
+            for ep in repo_fetch.endpoints:
+                if ep.fetched is None:
+                    continue
+                ep_changes = UpsertCounts()
+                count = 0
+                if not ep.fetched.not_modified:
+                    count = _store_items(conn, repo, ep.item_type, ep.fetched.items, ep_changes)
+                result = _fetched_result(
+                    repo, ep.item_type, project, ep.fetched, count, ep_changes, ep.since, ep.etag
+                )
+                write_sync_metadata(
+                    conn,
+                    ep.cursor_type,
+                    repo,
+                    result.count,
+                    watermark=result.watermark,
+                    etag=result.etag,
+                )
+                changes.merge(ep_changes)
+                total += count
+            write_sync_metadata(conn, "github", repo, total, changes)
+            totals.append(total)
+        conn.commit()
+    return totals
+
+
+class _BatchedWriter:
+    """Single consumer persisting fetched repos in per-project batches.
+
+    Fetch tasks hand over complete repos via submit(); the writer drains
+    whatever is queued (up to ``batch_size``), groups it by project and
+    writes each group in one transaction on a worker thread. SQLite sees a
+    single writer and one commit per batch instead of one per endpoint.
+    """
+
+    def __init__(self, batch_size: int = GITHUB_WRITE_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.batches = 0
+        self._queue: asyncio.Queue[tuple[_RepoFetch, asyncio.Future[int]] | None] = asyncio.Queue()
+
+    async def submit(self, repo_fetch: _RepoFetch) -> int:
+        """Queue a fetched repo and wait until it is stored.
+
+        Returns:
+            Number of items synced for the repo
+        """
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        await self._queue.put((repo_fetch, future))
+        return await future
+
+    async def close(self) -> None:
+        """Ask run() to exit once everything queued so far is written."""
+        await self._queue.put(None)
+
+    async def run(self) -> None:
+        """Write batches until close() is called."""
+        closing = False
+        while not closing:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                entry = self._queue.get_nowait()
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+
+            by_project: dict[str, list[tuple[_RepoFetch, asyncio.Future[int]]]] = {}
+            for repo_fetch, future in batch:
+                by_project.setdefault(repo_fetch.project, []).append((repo_fetch, future))
+
+            for project, entries in by_project.items():
+                self.batches += 1
+                try:
+                    totals = await asyncio.to_thread(
+                        _write_repo_batch, project, [repo_fetch for repo_fetch, _ in entries]
+                    )
+                except Exception as e:
+                    for _, future in entries:
+                        future.set_exception(e)
+                else:
+                    for (_, future), total in zip(entries, totals, strict=True):
+                        future.set_result(total)
+
+
+async def _fetch_endpoint(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    repo: str,
+    project: str,
+    item_type: str,
+    cursor_type: str,
+    incremental: bool,
+) -> _EndpointFetch:
+    """Fetch one endpoint of a repo, resuming from its stored cursor."""
+    since, etag = await asyncio.to_thread(
+        _load_cursor, repo, cursor_type, item_type, project, incremental
+    )
+    ep = _EndpointFetch(item_type, cursor_type, since, etag)
+    endpoint, params, stop_before = _endpoint_request(repo, item_type, since)
+    try:
+        ep.fetched = await _github_fetch_async(
+            client, semaphore, endpoint, params=params, etag=etag, stop_before=stop_before
+        )
+    except (httpx.HTTPError, ValueError, GitHubRateLimitError) as e:
+        _log_fetch_error(repo, e)
+    return ep
+
+
+async def _sync_repo_async(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    writer: _BatchedWriter,
+    repo: str,
+    project: str,
+    incremental: bool,
+) -> int:
+    """Fetch issues and PRs of a repo concurrently and hand them to the writer."""
+    if _is_valid_repo(repo):
+        endpoints = await asyncio.gather(
+            *(
+                _fetch_endpoint(client, semaphore, repo, project, item_type, cursor, incremental)
+                for item_type, cursor in _ENDPOINTS
+            )
+        )
+    else:
+        endpoints = []
+    return await writer.submit(_RepoFetch(project, repo, list(endpoints)))
+
+
+async def sync_all_repos_async(
+    repos_by_project: Mapping[str, list[str]],
+    incremental: bool = True,
+    max_concurrency: int = GITHUB_MAX_CONCURRENCY,
+) -> dict[str, dict[str, int]]:
+    """Sync many repositories across projects concurrently.
+
+    All requests share one pooled ``httpx.AsyncClient`` and the process-wide
+    rate limiter; all writes go through one batched writer.
+
+    Args:
+        repos_by_project: Mapping of project name to repositories (owner/name)
+        incremental: If True, only sync items since last sync
+        max_concurrency: Maximum page requests in flight at once
+
+    Returns:
+        Dict mapping project to a dict of repo to items synced
+    """
+    for project, repos in repos_by_project.items():
+        if isinstance(repos, str):
+            raise TypeError(
+                f"repos must be a list of strings, not a bare string: {project}={repos!r}"
+            )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    writer = _BatchedWriter()
+    writer_task = asyncio.create_task(writer.run())
+    jobs = [(project, repo) for project, repos in repos_by_project.items() for repo in repos]
+
+    limits = httpx.Limits(
+        max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+    )
+    async with httpx.AsyncClient(headers=_github_headers(), timeout=30, limits=limits) as client:
+        try:
+            outcomes = await asyncio.gather(
+                *(
+                    _sync_repo_async(client, semaphore, writer, repo, project, incremental)
+                    for project, repo in jobs
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            await writer.close()
+            await writer_task
+
+    results: dict[str, dict[str, int]] = {project: {} for project in repos_by_project}
+    failed: dict[str, list[str]] = {}
+    for (project, repo), outcome in zip(jobs, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            logger.error("Failed to sync %s: %s", repo, outcome)
+            results[project][repo] = 0
+            failed.setdefault(project, []).append(repo)
+            continue
+        results[project][repo] = outcome
+        if outcome == 0:
+            logger.warning("No items synced from %s (could be no new items or sync error)", repo)
+
+    for project, repo_counts in results.items():
+        total = sum(repo_counts.values())
+        if project in failed:
+            logger.error(
+                "Total items synced for %s: %d (%d repos failed: %s)",
+                project,
+                total,
+                len(failed[project]),
+                failed[project],
+            )
+        else:
+            logger.info(
+                "Total items synced for %s: %d (all %d repos succeeded)",
+                project,
+                total,
+                len(repo_counts),
+            )
+    logger.debug("GitHub sync wrote %d batch(es) for %d repos", writer.batches, len(jobs))
+
+    return results
+
+
+def sync_all_repos(
+    repos_by_project: Mapping[str, list[str]], incremental: bool = True
+) -> dict[str, dict[str, int]]:
+    """Sync repositories of several projects in one concurrent run.
+
+    Blocking wrapper around sync_all_repos_async(); must not be called from
+    a running event loop.
+
+    Args:
+        repos_by_project: Mapping of project name to repositories (owner/name)
+        incremental: If True, only sync items since last sync
+
+    Returns:
+        Dict mapping project to a dict of repo to items synced
+    """
+    return asyncio.run(sync_all_repos_async(repos_by_project, incremental))
 
 
 def sync_repos(repos: list[str], project: str = "hed", incremental: bool = True) -> dict[str, int]:
@@ -362,37 +1002,4 @@ def sync_repos(repos: list[str], project: str = "hed", incremental: bool = True)
     """
     if isinstance(repos, str):
         raise TypeError(f"repos must be a list of strings, not a bare string: {repos!r}")
-    results = {}
-    failed = []
-
-    for repo in repos:
-        try:
-            count = sync_repo(repo, project, incremental)
-            results[repo] = count
-            if count == 0:
-                logger.warning(
-                    "No items synced from %s (could be no new items or sync error)", repo
-                )
-        except (KeyboardInterrupt, SystemExit):
-            # Let these propagate - user cancellation or system exit should not be caught
-            raise
-        except Exception as e:
-            logger.error("Failed to sync %s: %s", repo, e)
-            results[repo] = 0
-            failed.append(repo)
-
-    total = sum(results.values())
-    if failed:
-        logger.error(
-            "Total items synced for %s: %d (%d repos failed: %s)",
-            project,
-            total,
-            len(failed),
-            failed,
-        )
-    else:
-        logger.info(
-            "Total items synced for %s: %d (all %d repos succeeded)", project, total, len(repos)
-        )
-
-    return results
+    return sync_all_repos({project: repos}, incremental)[project]
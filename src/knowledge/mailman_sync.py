@@ -22,7 +22,7 @@ from markdownify import markdownify
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from src.knowledge.db import get_connection, upsert_mailing_list_message
+from src.knowledge.db import UpsertCounts, get_connection, upsert_mailing_list_message
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -313,6 +313,7 @@ def sync_mailing_list_year(
 
     # Fetch and parse each message
     count = 0
+    changes = UpsertCounts()
     failed = 0
 
     with Progress(
@@ -343,7 +344,7 @@ def sync_mailing_list_year(
 
                 # Upsert to database
                 try:
-                    upsert_mailing_list_message(
+                    outcome = upsert_mailing_list_message(
                         conn,
                         list_name=list_name,
                         message_id=msg_info.message_id,
@@ -357,6 +358,7 @@ def sync_mailing_list_year(
                         url=msg_info.url,
                         year=year,
                     )
+                    changes.record(outcome)
                     count += 1
 
                     # Commit every 50 messages
@@ -404,7 +406,7 @@ def sync_mailing_list_year(
             # Final commit
             conn.commit()
 
-    console.print(f"[green]✓ Synced {count} messages from {year}[/green]")
+    console.print(f"[green]✓ Synced {count} messages from {year} ({changes})[/green]")
     if failed > 0:
         console.print(f"[yellow]⚠ Failed to process {failed} messages[/yellow]")
 
@@ -11,6 +11,7 @@ Default TTL is 48 hours; maximum is 168 hours (7 days).
 import json
 import logging
 import shutil
+import sqlite3
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -196,6 +197,24 @@ def _get_production_db_path(community_id: str) -> Path:
     return get_data_dir() / "knowledge" / f"{community_id}.db"
 
 
+def _copy_database(source_db: Path, dest_db: Path) -> None:
+    """Copy a SQLite database using the online backup API.
+
+    Knowledge databases run in WAL mode, so recent commits may still live
+    in the -wal file; a plain file copy of the .db would miss them. The
+    backup API produces a consistent snapshot even while readers are active.
+    """
+    src = sqlite3.connect(str(source_db))
+    try:
+        dest = sqlite3.connect(str(dest_db))
+        try:
+            src.backup(dest)
+        finally:
+            dest.close()
+    finally:
+        src.close()
+
+
 def get_mirror_db_path(mirror_id: str, community_id: str) -> Path:
     """Get the path to a community database file within a mirror.
 
@@ -265,7 +284,7 @@ def create_mirror(
                 logger.warning("No database found for community '%s', skipping", community_id)
                 continue
             dest_db = mirror_dir / f"{community_id}.db"
-            shutil.copy2(str(source_db), str(dest_db))
+            _copy_database(source_db, dest_db)
             copied_communities.append(community_id)
             logger.info("Copied %s to mirror %s", community_id, mirror_id)
 
@@ -395,7 +414,7 @@ def refresh_mirror(
             logger.warning("No production database for '%s', skipping refresh", community_id)
             continue
         dest_db = mirror_dir / f"{community_id}.db"
-        shutil.copy2(str(source_db), str(dest_db))
+        _copy_database(source_db, dest_db)
         refreshed.append(community_id)
         logger.info("Refreshed %s in mirror %s", community_id, mirror_id)
 
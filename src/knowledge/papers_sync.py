@@ -18,7 +18,7 @@ import httpx
 import pyalex
 from pyalex import Works
 
-from src.knowledge.db import get_connection, update_sync_metadata, upsert_paper
+from src.knowledge.db import UpsertCounts, get_connection, update_sync_metadata, upsert_paper
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +142,8 @@ def sync_openalex_papers(query: str, max_results: int = 100, project: str = "hed
         return 0
 
     count = 0
+
+    changes = UpsertCounts()
     with get_connection(project) as conn:
         for work in works:
             if count >= max_results:
@@ -156,7 +158,7 @@ def sync_openalex_papers(query: str, max_results: int = 100, project: str = "hed
             url = _get_paper_url(work.get("doi"), work.get("id", ""))
             external_id = _get_openalex_external_id(work.get("id", ""))
 
-            upsert_paper(
+            outcome = upsert_paper(
                 conn,
                 source="openalex",
                 external_id=external_id,
@@ -165,12 +167,13 @@ def sync_openalex_papers(query: str, max_results: int = 100, project: str = "hed
                 url=url,
                 created_at=work.get("publication_date"),
             )
+            changes.record(outcome)
             count += 1
 
         conn.commit()
 
-    logger.info("Synced %d papers from OpenALEX for '%s'", count, query)
-    update_sync_metadata("papers", f"openalex:{query}", count, project)
+    logger.info("Synced %d papers from OpenALEX for '%s' [%s]", count, query, changes)
+    update_sync_metadata("papers", f"openalex:{query}", count, project, changes=changes)
     return count
 
 
@@ -216,6 +219,8 @@ def sync_semanticscholar_papers(
         return 0
 
     count = 0
+
+    changes = UpsertCounts()
     with get_connection(project) as conn:
         for paper in data.get("data", []):
             if count >= max_results:
@@ -234,7 +239,7 @@ def sync_semanticscholar_papers(
             if open_access and open_access.get("url"):
                 paper_url = open_access["url"]
 
-            upsert_paper(
+            outcome = upsert_paper(
                 conn,
                 source="semanticscholar",
                 external_id=paper_id,
@@ -243,12 +248,13 @@ def sync_semanticscholar_papers(
                 url=paper_url,
                 created_at=str(paper.get("year")) if paper.get("year") else None,
             )
+            changes.record(outcome)
             count += 1
 
         conn.commit()
 
-    logger.info("Synced %d papers from Semantic Scholar for '%s'", count, query)
-    update_sync_metadata("papers", f"semanticscholar:{query}", count, project)
+    logger.info("Synced %d papers from Semantic Scholar for '%s' [%s]", count, query, changes)
+    update_sync_metadata("papers", f"semanticscholar:{query}", count, project, changes=changes)
 
     # Rate limiting
     time.sleep(SEMANTIC_SCHOLAR_DELAY)
@@ -328,6 +334,8 @@ def sync_pubmed_papers(
         return 0
 
     count = 0
+
+    changes = UpsertCounts()
     with get_connection(project) as conn:
         for article in root.findall(".//PubmedArticle"):
             pmid_elem = article.find(".//PMID")
@@ -345,7 +353,7 @@ def sync_pubmed_papers(
 
             url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
 
-            upsert_paper(
+            outcome = upsert_paper(
                 conn,
                 source="pubmed",
                 external_id=pmid,
@@ -354,12 +362,13 @@ def sync_pubmed_papers(
                 url=url,
                 created_at=year,
             )
+            changes.record(outcome)
             count += 1
 
         conn.commit()
 
-    logger.info("Synced %d papers from PubMed for '%s'", count, query)
-    update_sync_metadata("papers", f"pubmed:{query}", count, project)
+    logger.info("Synced %d papers from PubMed for '%s' [%s]", count, query, changes)
+    update_sync_metadata("papers", f"pubmed:{query}", count, project, changes=changes)
 
     # Rate limiting
     time.sleep(PUBMED_DELAY)
@@ -482,6 +491,8 @@ def sync_citing_papers(
             continue
 
         count = 0
+
+        changes = UpsertCounts()
         with get_connection(project) as conn:
             for work in works:
                 if count >= max_results:
@@ -495,7 +506,7 @@ def sync_citing_papers(
                 url = _get_paper_url(work.get("doi"), work.get("id", ""))
                 external_id = _get_openalex_external_id(work.get("id", ""))
 
-                upsert_paper(
+                outcome = upsert_paper(
                     conn,
                     source="openalex",
                     external_id=external_id,
@@ -504,13 +515,14 @@ def sync_citing_papers(
                     url=url,
                     created_at=work.get("publication_date"),
                 )
+                changes.record(outcome)
                 count += 1
 
             conn.commit()
 
         # Update sync metadata with citing_ prefix to distinguish from query-based syncs
-        update_sync_metadata("papers", f"citing_{doi}", count, project)
-        logger.info("Synced %d papers citing %s", count, doi)
+        update_sync_metadata("papers", f"citing_{doi}", count, project, changes=changes)
+        logger.info("Synced %d papers citing %s [%s]", count, doi, changes)
         total += count
 
     return total
@@ -13,7 +13,8 @@ import sqlite3
 import unicodedata
 from dataclasses import dataclass
 
-from src.knowledge.db import get_connection
+from src.knowledge.db import get_read_connection
+from src.metrics.prometheus import timed_search
 
 logger = logging.getLogger(__name__)
 
@@ -182,6 +183,7 @@ def _row_to_result(row: sqlite3.Row) -> SearchResult:
     )
 
 
+@timed_search("github_items")
 def search_github_items(
     query: str,
     project: str = "hed",
@@ -211,7 +213,7 @@ def search_github_items(
     seen_urls: set[str] = set()
 
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             # Phase 1: Try direct number lookup
             number = _extract_number(query)
             is_pure_number = _is_pure_number_query(query)
@@ -290,6 +292,7 @@ def search_github_items(
     return results
 
 
+@timed_search("papers")
 def search_papers(
     query: str,
     project: str = "hed",
@@ -326,7 +329,7 @@ def search_papers(
     results = []
     seen_titles: list[set[str]] = []  # List of word sets for fuzzy matching
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             # Sanitize user query to prevent FTS5 injection
             safe_query = _sanitize_fts5_query(query)
             params[0] = safe_query
@@ -443,7 +446,7 @@ def list_recent_github_items(
 
     results = []
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             for row in conn.execute(sql, params):
                 results.append(
                     SearchResult(
@@ -473,6 +476,7 @@ def list_recent_github_items(
     return results
 
 
+@timed_search("docstrings")
 def search_docstrings(
     query: str,
     project: str = "hed",
@@ -520,7 +524,7 @@ def search_docstrings(
     results: list[SearchResult] = []
     query_lower = query.strip().lower()
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             # Sanitize user query to prevent FTS5 injection
             safe_query = _sanitize_fts5_query(query)
             params[0] = safe_query
@@ -636,7 +640,7 @@ def get_full_docstring(
 
     results: list[SearchResult] = []
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             for row in conn.execute(sql, params):
                 file_path = row["file_path"] or ""
                 repo_name = row["repo"]
@@ -706,6 +710,7 @@ class FAQResult:
     first_message_date: str
 
 
+@timed_search("faq_entries")
 def search_faq_entries(
     query: str,
     project: str = "eeglab",
@@ -753,7 +758,7 @@ def search_faq_entries(
 
     results = []
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             # Sanitize user query to prevent FTS5 injection
             safe_query = _sanitize_fts5_query(query)
             params[0] = safe_query
@@ -804,6 +809,7 @@ class BEPResult:
     snippet: str
 
 
+@timed_search("bep_items")
 def search_beps(
     query: str,
     project: str = "bids",
@@ -829,7 +835,7 @@ def search_beps(
     is_number = normalized.isdigit()
 
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             if is_number:
                 bep_number = normalized.zfill(3)
                 rows = conn.execute(
@@ -911,6 +917,7 @@ class DiscourseTopicResult:
     created_at: str
 
 
+@timed_search("discourse_topics")
 def search_discourse_topics(
     query: str,
     project: str = "mne",
@@ -947,7 +954,7 @@ def search_discourse_topics(
 
     results = []
     try:
-        with get_connection(project) as conn:
+        with get_read_connection(project) as conn:
             safe_query = _sanitize_fts5_query(query)
             params[0] = safe_query
 
@@ -2,11 +2,17 @@
 
 Queries the metrics database for current spend and compares against
 configured budget limits.
+
+SpendTracker keeps per-community daily and monthly spend in memory, updated
+as each request's cost is recorded, so request handlers can enforce limits
+in O(1) without querying the database.
 """
 
 import logging
 import sqlite3
+import threading
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 
 from src.core.config.community import BudgetConfig
 
@@ -72,6 +78,24 @@ class BudgetStatus:
         return self.daily_alert or self.monthly_alert
 
 
+def _period_bounds(now: datetime) -> tuple[str, str, str, str]:
+    """Return ISO bounds (day_start, day_end, month_start, month_end) for a UTC time.
+
+    Bounds use the same format as stored timestamps (``datetime.isoformat()``
+    in UTC), so range filters compare correctly as strings and can use the
+    timestamp indexes.
+    """
+    day_start = now.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return (
+        day_start.isoformat(),
+        (day_start + timedelta(days=1)).isoformat(),
+        month_start.isoformat(),
+        next_month.isoformat(),
+    )
+
+
 def check_budget(
     community_id: str,
     config: BudgetConfig,
@@ -89,33 +113,173 @@ def check_budget(
     Returns:
         BudgetStatus with current spend and limit info.
     """
-    # Daily spend (today UTC)
-    daily_row = conn.execute(
-        """
-        SELECT COALESCE(SUM(estimated_cost), 0) as spend
-        FROM request_log
-        WHERE community_id = ?
-          AND date(timestamp) = date('now')
-        """,
-        (community_id,),
-    ).fetchone()
+    day_start, day_end, month_start, month_end = _period_bounds(datetime.now(UTC))
 
-    # Monthly spend (current month UTC)
-    monthly_row = conn.execute(
+    # Range filters (rather than date()/strftime() on the column) let SQLite
+    # use the (community_id, timestamp) index.
+    row = conn.execute(
         """
-        SELECT COALESCE(SUM(estimated_cost), 0) as spend
+        SELECT
+            COALESCE(SUM(CASE WHEN timestamp >= ? AND timestamp < ?
+                THEN estimated_cost END), 0) as daily_spend,
+            COALESCE(SUM(estimated_cost), 0) as monthly_spend
         FROM request_log
         WHERE community_id = ?
-          AND strftime('%Y-%m', timestamp) = strftime('%Y-%m', 'now')
+          AND timestamp >= ? AND timestamp < ?
         """,
-        (community_id,),
+        (day_start, day_end, community_id, month_start, month_end),
     ).fetchone()
 
     return BudgetStatus(
         community_id=community_id,
-        daily_spend_usd=round(daily_row["spend"], 6),
-        monthly_spend_usd=round(monthly_row["spend"], 6),
+        daily_spend_usd=round(row["daily_spend"], 6),
+        monthly_spend_usd=round(row["monthly_spend"], 6),
         daily_limit_usd=config.daily_limit_usd,
         monthly_limit_usd=config.monthly_limit_usd,
         alert_threshold_pct=config.alert_threshold_pct,
     )
+
+
+@dataclass
+class _Spend:
+    """Running spend for one community in the current day and month."""
+
+    day: str
+    month: str
+    daily: float = 0.0
+    monthly: float = 0.0
+
+    def roll(self, day: str, month: str) -> None:
+        """Reset counters whose period has ended."""
+        if self.month != month:
+            self.month = month
+            self.monthly = 0.0
+        if self.day != day:
+            self.day = day
+            self.daily = 0.0
+
+
+class SpendTracker:
+    """Thread-safe in-memory daily/monthly spend per community.
+
+    Counters roll over at UTC day and month boundaries. They are rehydrated
+    from the metrics database on startup and reconciled by the periodic
+    budget check, which also covers spend recorded by other worker processes.
+    """
+
+    def __init__(self) -> None:
+        self._spend: dict[str, _Spend] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _periods(now: datetime | None) -> tuple[str, str]:
+        now = (now or datetime.now(UTC)).astimezone(UTC)
+        return now.strftime("%Y-%m-%d"), now.strftime("%Y-%m")
+
+    def _entry(self, community_id: str, day: str, month: str) -> _Spend:
+        spend = self._spend.get(community_id)
+        if spend is None:
+            spend = self._spend[community_id] = _Spend(day=day, month=month)
+        else:
+            spend.roll(day, month)
+        return spend
+
+    def record(self, community_id: str, cost: float, now: datetime | None = None) -> None:
+        """Add a request's cost to the community's daily and monthly spend."""
+        if cost <= 0:
+            return
+        day, month = self._periods(now)
+        with self._lock:
+            spend = self._entry(community_id, day, month)
+            spend.daily += cost
+            spend.monthly += cost
+
+    def reconcile(
+        self,
+        community_id: str,
+        daily: float,
+        monthly: float,
+        now: datetime | None = None,
+    ) -> None:
+        """Raise counters to at least the given database totals.
+
+        Never lowers them: entries still queued for the metrics writer are
+        counted in memory but not yet in the database.
+        """
+        day, month = self._periods(now)
+        with self._lock:
+            spend = self._entry(community_id, day, month)
+            spend.daily = max(spend.daily, daily)
+            spend.monthly = max(spend.monthly, monthly)
+
+    def spend(self, community_id: str, now: datetime | None = None) -> tuple[float, float]:
+        """Return (daily, monthly) spend in USD for the current periods."""
+        day, month = self._periods(now)
+        with self._lock:
+            spend = self._spend.get(community_id)
+            if spend is None:
+                return 0.0, 0.0
+            spend.roll(day, month)
+            return spend.daily, spend.monthly
+
+    def status(
+        self,
+        community_id: str,
+        config: BudgetConfig,
+        now: datetime | None = None,
+    ) -> BudgetStatus:
+        """Return a BudgetStatus computed from the in-memory counters."""
+        daily, monthly = self.spend(community_id, now)
+        return BudgetStatus(
+            community_id=community_id,
+            daily_spend_usd=round(daily, 6),
+            monthly_spend_usd=round(monthly, 6),
+            daily_limit_usd=config.daily_limit_usd,
+            monthly_limit_usd=config.monthly_limit_usd,
+            alert_threshold_pct=config.alert_threshold_pct,
+        )
+
+    def clear(self) -> None:
+        """Drop all counters."""
+        with self._lock:
+            self._spend.clear()
+
+
+_spend_tracker = SpendTracker()
+
+
+def get_spend_tracker() -> SpendTracker:
+    """Return the process-wide spend tracker."""
+    return _spend_tracker
+
+
+def rehydrate_spend_tracker(conn: sqlite3.Connection, now: datetime | None = None) -> int:
+    """Load this month's spend per community from the metrics database.
+
+    Args:
+        conn: SQLite connection.
+        now: Override for the current time (for testing).
+
+    Returns:
+        Number of communities loaded.
+    """
+    now = now or datetime.now(UTC)
+    day_start, day_end, month_start, month_end = _period_bounds(now)
+    rows = conn.execute(
+        """
+        SELECT
+            community_id,
+            COALESCE(SUM(CASE WHEN timestamp >= ? AND timestamp < ?
+                THEN estimated_cost END), 0) as daily_spend,
+            COALESCE(SUM(estimated_cost), 0) as monthly_spend
+        FROM request_log
+        WHERE timestamp >= ? AND timestamp < ?
+          AND community_id IS NOT NULL AND estimated_cost IS NOT NULL
+        GROUP BY community_id
+        """,
+        (day_start, day_end, month_start, month_end),
+    ).fetchall()
+    for r in rows:
+        _spend_tracker.reconcile(r["community_id"], r["daily_spend"], r["monthly_spend"], now)
+    logger.info("Rehydrated spend counters for %d communities", len(rows))
+    return len(rows)
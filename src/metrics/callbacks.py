@@ -0,0 +1,80 @@
+"""LangChain callback handler feeding the in-process Prometheus metrics.
+
+Attached to each agent run's config, it records LLM time to first token
+and per-tool call latency for both streaming and non-streaming requests.
+"""
+
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.metrics.prometheus import LLM_TIME_TO_FIRST_TOKEN, TOOL_CALL_DURATION
+
+
+class PrometheusCallbackHandler(BaseCallbackHandler):
+    """Times LLM first tokens and tool calls for one request.
+
+    Runs inline (no executor hop) since every callback is a dict operation.
+    """
+
+    run_inline = True
+
+    def __init__(self, community_id: str) -> None:
+        self.community_id = community_id
+        self._llm_starts: dict[UUID, float] = {}
+        self._tool_starts: dict[UUID, tuple[str, float]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],  # noqa: ARG002
+        messages: list[list[Any]],  # noqa: ARG002
+        *,
+        run_id: UUID,
+        **kwargs: Any,  # noqa: ARG002
+    ) -> None:
+        self._llm_starts[run_id] = time.perf_counter()
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ARG002
+        start = self._llm_starts.pop(run_id, None)
+        if start is not None:
+            LLM_TIME_TO_FIRST_TOKEN.observe(
+                time.perf_counter() - start, community=self.community_id
+            )
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ARG002
+        # Non-streaming calls never emit a token
+        self._llm_starts.pop(run_id, None)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ARG002
+        self._llm_starts.pop(run_id, None)
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any] | None,
+        input_str: str,  # noqa: ARG002
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._tool_starts[run_id] = (name, time.perf_counter())
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ARG002
+        self._finish_tool(run_id, "success")
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ARG002
+        self._finish_tool(run_id, "error")
+
+    def _finish_tool(self, run_id: UUID, status: str) -> None:
+        started = self._tool_starts.pop(run_id, None)
+        if started is None:
+            return
+        name, start = started
+        TOOL_CALL_DURATION.observe(
+            time.perf_counter() - start,
+            community=self.community_id,
+            tool=name,
+            status=status,
+        )
@@ -15,6 +15,8 @@ from pathlib import Path
 
 from langchain_core.messages import AIMessage, BaseMessage
 
+from src.metrics.rollups import ROLLUP_SCHEMA_SQL, refresh_rollups
+
 logger = logging.getLogger(__name__)
 
 # Track consecutive log_request failures for escalation
@@ -40,7 +42,9 @@ CREATE TABLE IF NOT EXISTS request_log (
     stream INTEGER DEFAULT 0,
     tool_call_count INTEGER DEFAULT 0,
     error_message TEXT,
-    langfuse_trace_id TEXT
+    langfuse_trace_id TEXT,
+    cache_read_tokens INTEGER,
+    cache_creation_tokens INTEGER
 );
 
 CREATE INDEX IF NOT EXISTS idx_request_log_community
@@ -49,6 +53,17 @@ CREATE INDEX IF NOT EXISTS idx_request_log_timestamp
     ON request_log(timestamp);
 CREATE INDEX IF NOT EXISTS idx_request_log_community_timestamp
     ON request_log(community_id, timestamp);
+
+-- One row per tool call in request_log.tools_called, for indexed top-N queries
+CREATE TABLE IF NOT EXISTS request_tools (
+    request_id TEXT NOT NULL,
+    community_id TEXT,
+    tool TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_request_tools_community_tool
+    ON request_tools(community_id, tool);
 """
 
 # Columns added after initial schema; ALTER TABLE for existing databases
@@ -56,6 +71,8 @@ _MIGRATION_COLUMNS = [
     ("tool_call_count", "INTEGER DEFAULT 0"),
     ("error_message", "TEXT"),
     ("langfuse_trace_id", "TEXT"),
+    ("cache_read_tokens", "INTEGER"),
+    ("cache_creation_tokens", "INTEGER"),
 ]
 
 
@@ -81,6 +98,8 @@ class RequestLogEntry:
     tool_call_count: int = 0
     error_message: str | None = None
     langfuse_trace_id: str | None = None
+    cache_read_tokens: int | None = None
+    cache_creation_tokens: int | None = None
 
 
 def get_metrics_db_path() -> Path:
@@ -146,12 +165,37 @@ def _migrate_columns(conn: sqlite3.Connection) -> None:
                 raise
 
 
+def _backfill_request_tools(conn: sqlite3.Connection) -> None:
+    """Populate request_tools from the tools_called JSON of existing rows.
+
+    Runs once, when the request_tools table is first created. Rows whose
+    tools_called is not a valid JSON array are skipped.
+    """
+    cursor = conn.execute(
+        """
+        INSERT INTO request_tools (request_id, community_id, tool, timestamp)
+        SELECT r.request_id, r.community_id, j.value, r.timestamp
+        FROM request_log AS r,
+            json_each(
+                CASE WHEN json_valid(r.tools_called) THEN
+                    CASE WHEN json_type(r.tools_called) = 'array' THEN r.tools_called END
+                END
+            ) AS j
+        WHERE r.tools_called IS NOT NULL AND j.type = 'text'
+        """
+    )
+    if cursor.rowcount > 0:
+        logger.info("Backfilled %d rows into request_tools", cursor.rowcount)
+
+
 def init_metrics_db(db_path: Path | None = None) -> None:
     """Initialize the metrics database schema. Idempotent.
 
     Creates the request_log table and indexes if they don't exist.
     Enables WAL mode for concurrent read/write access.
-    Runs migrations to add new columns to existing databases.
+    Runs migrations to add new columns to existing databases, backfills
+    request_tools when that table is new, then rolls up any request_log
+    rows not yet in the daily rollup (a full backfill the first time).
 
     Args:
         db_path: Optional path override (for testing).
@@ -159,17 +203,91 @@ def init_metrics_db(db_path: Path | None = None) -> None:
     conn = get_metrics_connection(db_path)
     try:
         conn.execute("PRAGMA journal_mode=WAL")
+        has_tools_table = (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'request_tools'"
+            ).fetchone()
+            is not None
+        )
         conn.executescript(METRICS_SCHEMA_SQL)
         _migrate_columns(conn)
+        if not has_tools_table:
+            _backfill_request_tools(conn)
+        conn.executescript(ROLLUP_SCHEMA_SQL)
         conn.commit()
+        refresh_rollups(conn)
         logger.info("Metrics database initialized at %s", db_path or get_metrics_db_path())
     finally:
         conn.close()
 
 
+_INSERT_REQUEST_SQL = """
+INSERT INTO request_log (
+    request_id, timestamp, community_id, endpoint, method,
+    duration_ms, status_code, model, input_tokens, output_tokens,
+    total_tokens, estimated_cost, tools_called, key_source, stream,
+    tool_call_count, error_message, langfuse_trace_id,
+    cache_read_tokens, cache_creation_tokens
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _entry_params(entry: RequestLogEntry) -> tuple:
+    """Return the INSERT parameters for a request log entry."""
+    return (
+        entry.request_id,
+        entry.timestamp,
+        entry.community_id,
+        entry.endpoint,
+        entry.method,
+        entry.duration_ms,
+        entry.status_code,
+        entry.model,
+        entry.input_tokens,
+        entry.output_tokens,
+        entry.total_tokens,
+        entry.estimated_cost,
+        json.dumps(entry.tools_called) if entry.tools_called else None,
+        entry.key_source,
+        1 if entry.stream else 0,
+        entry.tool_call_count,
+        entry.error_message,
+        entry.langfuse_trace_id,
+        entry.cache_read_tokens,
+        entry.cache_creation_tokens,
+    )
+
+
+def insert_request_entries(conn: sqlite3.Connection, entries: list[RequestLogEntry]) -> None:
+    """Insert a batch of request log entries and their tool rows, and commit once.
+
+    Raises sqlite3.Error on failure; the caller decides how to report it.
+
+    Args:
+        conn: Open metrics database connection.
+        entries: Entries to insert.
+    """
+    if not entries:
+        return
+    conn.executemany(_INSERT_REQUEST_SQL, [_entry_params(e) for e in entries])
+    conn.executemany(
+        "INSERT INTO request_tools (request_id, community_id, tool, timestamp) VALUES (?, ?, ?, ?)",
+        [
+            (e.request_id, e.community_id, tool, e.timestamp)
+            for e in entries
+            for tool in e.tools_called
+        ],
+    )
+    conn.commit()
+
+
 def log_request(entry: RequestLogEntry, db_path: Path | None = None) -> None:
     """Insert a request log entry into the database.
 
+    Writes synchronously on a fresh connection. Request handlers should use
+    ``src.metrics.writer.record_request`` instead, which batches writes on a
+    background thread.
+
     Args:
         entry: The log entry to insert.
         db_path: Optional path override (for testing).
@@ -177,37 +295,7 @@ def log_request(entry: RequestLogEntry, db_path: Path | None = None) -> None:
     global _log_request_failures
     conn = get_metrics_connection(db_path)
     try:
-        conn.execute(
-            """
-            INSERT INTO request_log (
-                request_id, timestamp, community_id, endpoint, method,
-                duration_ms, status_code, model, input_tokens, output_tokens,
-                total_tokens, estimated_cost, tools_called, key_source, stream,
-                tool_call_count, error_message, langfuse_trace_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                entry.request_id,
-                entry.timestamp,
-                entry.community_id,
-                entry.endpoint,
-                entry.method,
-                entry.duration_ms,
-                entry.status_code,
-                entry.model,
-                entry.input_tokens,
-                entry.output_tokens,
-                entry.total_tokens,
-                entry.estimated_cost,
-                json.dumps(entry.tools_called) if entry.tools_called else None,
-                entry.key_source,
-                1 if entry.stream else 0,
-                entry.tool_call_count,
-                entry.error_message,
-                entry.langfuse_trace_id,
-            ),
-        )
-        conn.commit()
+        insert_request_entries(conn, [entry])
     except sqlite3.Error:
         _log_request_failures += 1
         logger.exception(
@@ -262,6 +350,42 @@ def extract_token_usage(result: dict) -> tuple[int, int, int]:
     return input_tokens, output_tokens, total_tokens
 
 
+def cache_token_usage(usage: dict) -> tuple[int, int]:
+    """Return (cache_read, cache_creation) tokens from one usage_metadata dict.
+
+    Prompt-cache counts live under usage_metadata["input_token_details"] and
+    are already included in input_tokens. Missing details count as zero.
+    """
+    details = usage.get("input_token_details") or {}
+    if not isinstance(details, dict):
+        return 0, 0
+    return details.get("cache_read") or 0, details.get("cache_creation") or 0
+
+
+def extract_cache_token_usage(result: dict) -> tuple[int, int]:
+    """Extract prompt-cache token usage from agent result messages.
+
+    Args:
+        result: Agent result dict containing "messages" list.
+
+    Returns:
+        Tuple of (cache_read_tokens, cache_creation_tokens).
+    """
+    cache_read = 0
+    cache_creation = 0
+
+    for msg in result.get("messages", []):
+        if not isinstance(msg, AIMessage):
+            continue
+        usage = getattr(msg, "usage_metadata", None)
+        if isinstance(usage, dict):
+            read, creation = cache_token_usage(usage)
+            cache_read += read
+            cache_creation += creation
+
+    return cache_read, cache_creation
+
+
 def extract_tool_names(result: dict) -> list[str]:
     """Extract tool names from agent result.
 
@@ -7,6 +7,9 @@ middleware reads after the response completes.
 Streaming caveat: For streaming responses, the middleware fires before
 streaming completes. Streaming handlers log metrics directly at the end
 of the generator instead.
+
+Entries are handed to the background metrics writer, so no database I/O
+happens on the request path.
 """
 
 import logging
@@ -17,7 +20,8 @@ from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoin
 from starlette.requests import Request
 from starlette.responses import Response
 
-from src.metrics.db import RequestLogEntry, log_request, now_iso
+from src.metrics.db import RequestLogEntry, now_iso
+from src.metrics.writer import record_request
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,9 @@ _COMMUNITY_SUFFIXES = {"ask", "chat", "sessions", "metrics", "config"}
 # Top-level path prefixes that are NOT community IDs
 _RESERVED_PREFIXES = {"health", "metrics", "sync", "docs", "redoc", "openapi.json", "frontend"}
 
+# Prometheus scrapes are frequent and not user traffic, so they are not logged
+_SCRAPE_PATH = "/metrics/prometheus"
+
 
 def _extract_community_id(path: str) -> str | None:
     """Extract community_id from community-scoped URL paths.
@@ -53,7 +60,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
     Sets request.state.request_id and request.state.start_time for
     downstream handlers to use. After the response, logs a basic
     request entry unless the handler has set request.state.metrics_logged
-    (indicating the handler logged its own detailed entry, e.g. streaming).
+    (indicating the handler logged its own detailed entry, e.g. streaming)
+    or the request is a Prometheus scrape.
     """
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
@@ -63,6 +71,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         request.state.metrics_logged = False
 
         response = await call_next(request)
+        if request.url.path == _SCRAPE_PATH:
+            return response
 
         try:
             # If handler already logged metrics (streaming), skip
@@ -89,6 +99,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
                     "tool_call_count": agent_data.get("tool_call_count", 0),
                     "error_message": agent_data.get("error_message"),
                     "langfuse_trace_id": agent_data.get("langfuse_trace_id"),
+                    "cache_read_tokens": agent_data.get("cache_read_tokens"),
+                    "cache_creation_tokens": agent_data.get("cache_creation_tokens"),
                 }
 
             entry = RequestLogEntry(
@@ -102,7 +114,7 @@ class MetricsMiddleware(BaseHTTPMiddleware):
                 **agent_kwargs,
             )
 
-            log_request(entry)
+            record_request(entry)
         except Exception:
             logger.exception("Metrics middleware failed for request %s", request_id)
 
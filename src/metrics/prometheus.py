@@ -0,0 +1,432 @@
+"""In-process Prometheus metrics.
+
+Counters and histograms live in memory and are rendered in the Prometheus
+text exposition format by ``GET /metrics/prometheus``. Scraping never
+touches SQLite: request_log and the rollups stay the source for dashboards
+and history, while these series are for live operational monitoring.
+
+Instrumentation is a dict lookup and a few additions under a per-metric
+lock, cheap enough to leave on for every request. Values reset when the
+process restarts, which Prometheus handles for counters and histograms.
+
+Values owned elsewhere (cache hit counters, session counts, writer queue
+depth) are exported by collectors registered with ``REGISTRY.add_collector``
+and read only at scrape time.
+"""
+
+import bisect
+import functools
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Literal, ParamSpec, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request, tool and search latencies, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# LLM time to first token, in seconds
+TTFT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0)
+# Sync jobs run from seconds to tens of minutes
+SYNC_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled in-process metrics."""
+
+    type: MetricType
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        try:
+            key = tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"{self.name}: missing label {e.args[0]!r}") from None
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name}: expected labels {self.labelnames}, got {sorted(labels)}"
+            )
+        return key
+
+    def render(self) -> Iterator[str]:
+        """Yield exposition lines for this metric."""
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._render_samples()
+
+    def _render_samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop all recorded values (for tests)."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type: MetricType = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` (must be non-negative)."""
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value for a label set (0 if never incremented)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+@dataclass
+class _HistogramValue:
+    bucket_counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    """Bucketed distribution per label set."""
+
+    type: MetricType = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        if list(buckets) != sorted(buckets):
+            raise ValueError(f"{self.name}: buckets must be sorted")
+        self.buckets = tuple(float(b) for b in buckets)
+        self._values: dict[tuple[str, ...], _HistogramValue] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = _HistogramValue([0] * (len(self.buckets) + 1))
+            entry.bucket_counts[index] += 1
+            entry.sum += value
+            entry.count += 1
+
+    def count(self, **labels: str) -> int:
+        """Number of observations for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            return entry.count if entry else 0
+
+    def _render_samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [
+                (key, list(v.bucket_counts), v.sum, v.count)
+                for key, v in sorted(self._values.items())
+            ]
+        bucket_labels = (*self.labelnames, "le")
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for key, bucket_counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(bounds, bucket_counts, strict=True):
+                cumulative += n
+                labels = _format_labels(bucket_labels, (*key, bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def time(self, **labels: str) -> "_Timer":
+        """Context manager that observes the elapsed wall time in seconds."""
+        return _Timer(self, labels)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+
+@dataclass
+class Sample:
+    """One collector-provided value, rendered as-is at scrape time."""
+
+    name: str
+    type: MetricType
+    documentation: str
+    value: float
+    labels: dict[str, str] = field(default_factory=dict)
+
+
+Collector = Callable[[], Iterable[Sample]]
+
+
+class Registry:
+    """Set of metrics and scrape-time collectors rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        """Add a metric. Names must be unique."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a function that returns samples at scrape time."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric and collector in the text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+
+        families: dict[str, list[Sample]] = {}
+        for collector in collectors:
+            try:
+                for sample in collector():
+                    families.setdefault(sample.name, []).append(sample)
+            except Exception:
+                # A broken collector must not take down the whole scrape
+                logger.exception("Prometheus collector %r failed", collector)
+        for name, samples in families.items():
+            lines.append(f"# HELP {name} {_escape(samples[0].documentation)}")
+            lines.append(f"# TYPE {name} {samples[0].type}")
+            for sample in samples:
+                names = sorted(sample.labels)
+                labels = _format_labels(names, [sample.labels[n] for n in names])
+                lines.append(f"{name}{labels} {_format_value(sample.value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset every metric's values (for tests). Collectors are kept."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "osa_http_requests_total",
+    "HTTP requests by community, endpoint, method and status code.",
+    ("community", "endpoint", "method", "status"),
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "osa_http_request_duration_seconds",
+    "HTTP request duration, including the full stream for streaming responses.",
+    ("community", "endpoint"),
+)
+LLM_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "osa_llm_time_to_first_token_seconds",
+    "Time from an LLM call starting to its first streamed token.",
+    ("community",),
+    buckets=TTFT_BUCKETS,
+)
+LLM_TOKENS = REGISTRY.counter(
+    "osa_llm_tokens_total",
+    "LLM tokens by community and type (input, output, cache_read, cache_creation).",
+    ("community", "type"),
+)
+TOOL_CALL_DURATION = REGISTRY.histogram(
+    "osa_tool_call_duration_seconds",
+    "Agent tool call duration by tool and outcome.",
+    ("community", "tool", "status"),
+)
+KNOWLEDGE_SEARCH_DURATION = REGISTRY.histogram(
+    "osa_knowledge_search_duration_seconds",
+    "Knowledge database search duration by table.",
+    ("table",),
+)
+SESSIONS_CREATED = REGISTRY.counter(
+    "osa_chat_sessions_created_total",
+    "Chat sessions created by community.",
+    ("community",),
+)
+SYNC_JOB_DURATION = REGISTRY.histogram(
+    "osa_sync_job_duration_seconds",
+    "Knowledge sync job duration by sync type, community and result.",
+    ("sync_type", "community", "result"),
+    buckets=SYNC_BUCKETS,
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    "osa_admission_wait_seconds",
+    "Time admitted agent requests waited for a run slot.",
+    ("community",),
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "osa_admission_rejected_total",
+    "Agent requests rejected with 429 by admission control, by reason (queue_full, timeout).",
+    ("community", "reason"),
+)
+
+
+def timed_search(table: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a knowledge search function to record its latency."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                KNOWLEDGE_SEARCH_DURATION.observe(time.perf_counter() - start, table=table)
+
+        return wrapper
+
+    return decorator
+
+
+_ID_SEGMENT_MIN_LENGTH = 8
+
+
+def endpoint_label(path: str, community_id: str | None, status_code: int | None) -> str:
+    """Normalize a request path into a bounded-cardinality endpoint label.
+
+    The community prefix becomes ``{community}`` and id-like segments
+    (session ids, hashes) become ``{id}``. Unmatched routes (404) share one
+    label so scanners cannot create new series.
+    """
+    if status_code == 404:
+        return "unmatched"
+    parts = path.strip("/").split("/")
+    if community_id and parts and parts[0] == community_id:
+        parts[0] = "{community}"
+    for i, part in enumerate(parts):
+        if len(part) >= _ID_SEGMENT_MIN_LENGTH and any(c.isdigit() for c in part):
+            parts[i] = "{id}"
+    return "/" + "/".join(parts)
+
+
+def observe_request(
+    community_id: str | None,
+    path: str,
+    method: str,
+    status_code: int | None,
+    duration_ms: float | None,
+    input_tokens: int | None = None,
+    output_tokens: int | None = None,
+    cache_read_tokens: int | None = None,
+    cache_creation_tokens: int | None = None,
+) -> None:
+    """Record one finished request in the request, latency and token series."""
+    community = (community_id or "") if status_code != 404 else ""
+    endpoint = endpoint_label(path, community_id, status_code)
+    HTTP_REQUESTS.inc(
+        community=community,
+        endpoint=endpoint,
+        method=method,
+        status=str(status_code or 0),
+    )
+    if duration_ms is not None:
+        HTTP_REQUEST_DURATION.observe(duration_ms / 1000, community=community, endpoint=endpoint)
+    for token_type, n in (
+        ("input", input_tokens),
+        ("output", output_tokens),
+        ("cache_read", cache_read_tokens),
+        ("cache_creation", cache_creation_tokens),
+    ):
+        if n:
+            LLM_TOKENS.inc(n, community=community, type=token_type)
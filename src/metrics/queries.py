@@ -2,13 +2,18 @@
 
 Provides summary statistics, usage breakdowns, and overview queries
 for both per-community and cross-community metrics.
+
+Aggregates read the "facts" CTE from src.metrics.rollups (daily rollup rows
+plus the raw request_log tail), so their cost does not grow with history.
 """
 
-import json
 import logging
 import sqlite3
 from typing import Any
 
+from src.metrics.rollups import FACTS_CTE, load_latency_sketches
+from src.metrics.sketch import LatencySketch
+
 logger = logging.getLogger(__name__)
 
 # SQLite strftime patterns for time-bucketed queries
@@ -29,35 +34,39 @@ def _validate_period(period: str) -> str:
     return _PERIOD_FORMAT_MAP[period]
 
 
+def _avg(total: float, count: int) -> float:
+    """Return total / count, or 0.0 when count is zero (matches COALESCE(AVG(...), 0))."""
+    return total / count if count else 0.0
+
+
+def _latency_percentiles(sketch: LatencySketch | None) -> dict[str, float | None]:
+    """Return rounded p50/p95/p99 duration fields from a latency sketch."""
+    result: dict[str, float | None] = {}
+    for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        value = sketch.quantile(q) if sketch else None
+        result[f"{name}_duration_ms"] = round(value, 1) if value is not None else None
+    return result
+
+
 def _count_tools(
     community_id: str, conn: sqlite3.Connection, limit: int = 5
 ) -> list[dict[str, Any]]:
-    """Count tool usage from JSON arrays in the tools_called column.
+    """Count tool usage for a community from the request_tools table.
 
     Returns top tools sorted by count descending.
     """
-    tool_rows = conn.execute(
+    rows = conn.execute(
         """
-        SELECT tools_called
-        FROM request_log
-        WHERE community_id = ? AND tools_called IS NOT NULL
+        SELECT tool, COUNT(*) as count
+        FROM request_tools
+        WHERE community_id = ?
+        GROUP BY tool
+        ORDER BY count DESC
+        LIMIT ?
         """,
-        (community_id,),
+        (community_id, limit),
     ).fetchall()
-    tool_counts: dict[str, int] = {}
-    for tr in tool_rows:
-        try:
-            tools = json.loads(tr["tools_called"])
-            for tool in tools:
-                tool_counts[tool] = tool_counts.get(tool, 0) + 1
-        except (json.JSONDecodeError, TypeError):
-            logger.warning(
-                "Malformed tools_called data in request_log for community %s: %r",
-                community_id,
-                tr["tools_called"],
-            )
-    top = sorted(tool_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-    return [{"tool": name, "count": count} for name, count in top]
+    return [{"tool": r["tool"], "count": r["count"]} for r in rows]
 
 
 def get_community_summary(community_id: str, conn: sqlite3.Connection) -> dict[str, Any]:
@@ -69,20 +78,25 @@ def get_community_summary(community_id: str, conn: sqlite3.Connection) -> dict[s
 
     Returns:
         Dict with total_requests, total_input_tokens, total_output_tokens,
-        total_tokens, avg_duration_ms, total_estimated_cost, error_rate,
+        total_tokens, total_cache_read_tokens, total_cache_creation_tokens,
+        cache_hit_rate, avg_duration_ms, total_estimated_cost, error_rate,
         top_models, top_tools.
     """
     row = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
-            COUNT(*) as total_requests,
+            COALESCE(SUM(requests), 0) as total_requests,
             COALESCE(SUM(input_tokens), 0) as total_input_tokens,
             COALESCE(SUM(output_tokens), 0) as total_output_tokens,
             COALESCE(SUM(total_tokens), 0) as total_tokens,
-            COALESCE(AVG(duration_ms), 0) as avg_duration_ms,
+            COALESCE(SUM(cache_read_tokens), 0) as total_cache_read_tokens,
+            COALESCE(SUM(cache_creation_tokens), 0) as total_cache_creation_tokens,
+            COALESCE(SUM(duration_sum), 0) as duration_sum,
+            COALESCE(SUM(duration_count), 0) as duration_count,
             COALESCE(SUM(estimated_cost), 0) as total_estimated_cost,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_count
-        FROM request_log
+            COALESCE(SUM(errors), 0) as error_count
+        FROM facts
         WHERE community_id = ?
         """,
         (community_id,),
@@ -90,12 +104,16 @@ def get_community_summary(community_id: str, conn: sqlite3.Connection) -> dict[s
 
     total = row["total_requests"]
     error_rate = row["error_count"] / total if total > 0 else 0.0
+    # Share of input tokens served from the prompt cache
+    input_tokens = row["total_input_tokens"]
+    cache_hit_rate = row["total_cache_read_tokens"] / input_tokens if input_tokens > 0 else 0.0
 
     # Top models
     model_rows = conn.execute(
-        """
-        SELECT model, COUNT(*) as count
-        FROM request_log
+        f"""
+        {FACTS_CTE}
+        SELECT model, SUM(requests) as count
+        FROM facts
         WHERE community_id = ? AND model IS NOT NULL
         GROUP BY model
         ORDER BY count DESC
@@ -110,7 +128,10 @@ def get_community_summary(community_id: str, conn: sqlite3.Connection) -> dict[s
         "total_input_tokens": row["total_input_tokens"],
         "total_output_tokens": row["total_output_tokens"],
         "total_tokens": row["total_tokens"],
-        "avg_duration_ms": round(row["avg_duration_ms"], 1),
+        "total_cache_read_tokens": row["total_cache_read_tokens"],
+        "total_cache_creation_tokens": row["total_cache_creation_tokens"],
+        "cache_hit_rate": round(cache_hit_rate, 4),
+        "avg_duration_ms": round(_avg(row["duration_sum"], row["duration_count"]), 1),
         "total_estimated_cost": round(row["total_estimated_cost"], 4),
         "error_rate": round(error_rate, 4),
         "top_models": [{"model": r["model"], "count": r["count"]} for r in model_rows],
@@ -138,14 +159,16 @@ def get_usage_stats(
     # Safe to use f-string: fmt is from _PERIOD_FORMAT_MAP whitelist, not user input
     rows = conn.execute(
         f"""
+        {FACTS_CTE}
         SELECT
-            strftime('{fmt}', timestamp) as bucket,
-            COUNT(*) as requests,
-            COALESCE(SUM(total_tokens), 0) as tokens,
-            COALESCE(AVG(duration_ms), 0) as avg_duration_ms,
-            COALESCE(SUM(estimated_cost), 0) as estimated_cost,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as errors
-        FROM request_log
+            strftime('{fmt}', day) as bucket,
+            SUM(requests) as requests,
+            SUM(total_tokens) as tokens,
+            SUM(duration_sum) as duration_sum,
+            SUM(duration_count) as duration_count,
+            SUM(estimated_cost) as estimated_cost,
+            SUM(errors) as errors
+        FROM facts
         WHERE community_id = ?
         GROUP BY bucket
         ORDER BY bucket
@@ -161,7 +184,7 @@ def get_usage_stats(
                 "bucket": r["bucket"],
                 "requests": r["requests"],
                 "tokens": r["tokens"],
-                "avg_duration_ms": round(r["avg_duration_ms"], 1),
+                "avg_duration_ms": round(_avg(r["duration_sum"], r["duration_count"]), 1),
                 "estimated_cost": round(r["estimated_cost"], 4),
                 "errors": r["errors"],
             }
@@ -181,14 +204,16 @@ def get_overview(conn: sqlite3.Connection) -> dict[str, Any]:
     """
     # Global totals
     totals = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
-            COUNT(*) as total_requests,
+            COALESCE(SUM(requests), 0) as total_requests,
             COALESCE(SUM(total_tokens), 0) as total_tokens,
-            COALESCE(AVG(duration_ms), 0) as avg_duration_ms,
+            COALESCE(SUM(duration_sum), 0) as duration_sum,
+            COALESCE(SUM(duration_count), 0) as duration_count,
             COALESCE(SUM(estimated_cost), 0) as total_estimated_cost,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as total_errors
-        FROM request_log
+            COALESCE(SUM(errors), 0) as total_errors
+        FROM facts
         """
     ).fetchone()
 
@@ -196,14 +221,16 @@ def get_overview(conn: sqlite3.Connection) -> dict[str, Any]:
 
     # Per-community breakdown
     community_rows = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
             community_id,
-            COUNT(*) as requests,
-            COALESCE(SUM(total_tokens), 0) as tokens,
-            COALESCE(AVG(duration_ms), 0) as avg_duration_ms,
-            COALESCE(SUM(estimated_cost), 0) as estimated_cost
-        FROM request_log
+            SUM(requests) as requests,
+            SUM(total_tokens) as tokens,
+            SUM(duration_sum) as duration_sum,
+            SUM(duration_count) as duration_count,
+            SUM(estimated_cost) as estimated_cost
+        FROM facts
         WHERE community_id IS NOT NULL
         GROUP BY community_id
         ORDER BY requests DESC
@@ -213,7 +240,7 @@ def get_overview(conn: sqlite3.Connection) -> dict[str, Any]:
     return {
         "total_requests": total_req,
         "total_tokens": totals["total_tokens"],
-        "avg_duration_ms": round(totals["avg_duration_ms"], 1),
+        "avg_duration_ms": round(_avg(totals["duration_sum"], totals["duration_count"]), 1),
         "total_estimated_cost": round(totals["total_estimated_cost"], 4),
         "error_rate": round(totals["total_errors"] / total_req, 4) if total_req > 0 else 0.0,
         "communities": [
@@ -221,7 +248,7 @@ def get_overview(conn: sqlite3.Connection) -> dict[str, Any]:
                 "community_id": r["community_id"],
                 "requests": r["requests"],
                 "tokens": r["tokens"],
-                "avg_duration_ms": round(r["avg_duration_ms"], 1),
+                "avg_duration_ms": round(_avg(r["duration_sum"], r["duration_count"]), 1),
                 "estimated_cost": round(r["estimated_cost"], 4),
             }
             for r in community_rows
@@ -250,14 +277,15 @@ def get_token_breakdown(
 
     by_model = conn.execute(
         f"""
+        {FACTS_CTE}
         SELECT
             model,
-            COUNT(*) as requests,
-            COALESCE(SUM(input_tokens), 0) as input_tokens,
-            COALESCE(SUM(output_tokens), 0) as output_tokens,
-            COALESCE(SUM(total_tokens), 0) as total_tokens,
-            COALESCE(SUM(estimated_cost), 0) as estimated_cost
-        FROM request_log
+            SUM(requests) as requests,
+            SUM(input_tokens) as input_tokens,
+            SUM(output_tokens) as output_tokens,
+            SUM(total_tokens) as total_tokens,
+            SUM(estimated_cost) as estimated_cost
+        FROM facts
         {where}
         {"AND" if where else "WHERE"} model IS NOT NULL
         GROUP BY model
@@ -268,12 +296,13 @@ def get_token_breakdown(
 
     by_key_source = conn.execute(
         f"""
+        {FACTS_CTE}
         SELECT
             key_source,
-            COUNT(*) as requests,
-            COALESCE(SUM(total_tokens), 0) as total_tokens,
-            COALESCE(SUM(estimated_cost), 0) as estimated_cost
-        FROM request_log
+            SUM(requests) as requests,
+            SUM(total_tokens) as total_tokens,
+            SUM(estimated_cost) as estimated_cost
+        FROM facts
         {where}
         {"AND" if where else "WHERE"} key_source IS NOT NULL
         GROUP BY key_source
@@ -332,11 +361,12 @@ def get_public_overview(
     """
     # Only count community-scoped requests, not infrastructure endpoints
     totals = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
-            COUNT(*) as total_requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as total_errors
-        FROM request_log
+            COALESCE(SUM(requests), 0) as total_requests,
+            COALESCE(SUM(errors), 0) as total_errors
+        FROM facts
         WHERE community_id IS NOT NULL
         """
     ).fetchone()
@@ -344,12 +374,13 @@ def get_public_overview(
     total_req = totals["total_requests"]
 
     community_rows = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
             community_id,
-            COUNT(*) as requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as errors
-        FROM request_log
+            SUM(requests) as requests,
+            SUM(errors) as errors
+        FROM facts
         WHERE community_id IS NOT NULL
         GROUP BY community_id
         ORDER BY requests DESC
@@ -403,11 +434,12 @@ def get_public_community_summary(community_id: str, conn: sqlite3.Connection) ->
         Dict with community_id, total_requests, error_rate, top_tools.
     """
     row = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
-            COUNT(*) as total_requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_count
-        FROM request_log
+            COALESCE(SUM(requests), 0) as total_requests,
+            COALESCE(SUM(errors), 0) as error_count
+        FROM facts
         WHERE community_id = ?
         """,
         (community_id,),
@@ -446,11 +478,12 @@ def get_public_usage_stats(
     # Safe to use f-string: fmt is from _PERIOD_FORMAT_MAP whitelist, not user input
     rows = conn.execute(
         f"""
+        {FACTS_CTE}
         SELECT
-            strftime('{fmt}', timestamp) as bucket,
-            COUNT(*) as requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as errors
-        FROM request_log
+            strftime('{fmt}', day) as bucket,
+            SUM(requests) as requests,
+            SUM(errors) as errors
+        FROM facts
         WHERE community_id = ?
         GROUP BY bucket
         ORDER BY bucket
@@ -485,7 +518,8 @@ def get_quality_metrics(
     """Get quality metrics for a community, bucketed by time period.
 
     Returns error rates, average tool call counts, and latency percentiles
-    (p50, p95) per time bucket.
+    (p50, p95, p99) per time bucket. Percentiles come from mergeable sketches
+    and are accurate to within 1% of a true sample value.
 
     Args:
         community_id: The community identifier.
@@ -499,14 +533,16 @@ def get_quality_metrics(
 
     rows = conn.execute(
         f"""
+        {FACTS_CTE}
         SELECT
-            strftime('{fmt}', timestamp) as bucket,
-            COUNT(*) as requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as errors,
-            COALESCE(AVG(tool_call_count), 0) as avg_tool_calls,
-            COUNT(CASE WHEN error_message IS NOT NULL THEN 1 END) as agent_errors,
-            COUNT(CASE WHEN langfuse_trace_id IS NOT NULL THEN 1 END) as traced_requests
-        FROM request_log
+            strftime('{fmt}', day) as bucket,
+            SUM(requests) as requests,
+            SUM(errors) as errors,
+            SUM(tool_calls) as tool_calls,
+            SUM(tool_call_rows) as tool_call_rows,
+            SUM(agent_errors) as agent_errors,
+            SUM(traced_requests) as traced_requests
+        FROM facts
         WHERE community_id = ?
         GROUP BY bucket
         ORDER BY bucket
@@ -514,31 +550,24 @@ def get_quality_metrics(
         (community_id,),
     ).fetchall()
 
-    # Compute latency percentiles per bucket
+    # Latency sketches for every bucket in one pass
+    sketches = load_latency_sketches(conn, community_id, fmt)
+
     buckets = []
     for r in rows:
         bucket_name = r["bucket"]
         total = r["requests"]
         error_rate = r["errors"] / total if total > 0 else 0.0
 
-        # Latency percentiles for this bucket
-        p50, p95 = _fetch_latency_percentiles(
-            conn,
-            community_id,
-            extra_where=f"AND strftime('{fmt}', timestamp) = ?",
-            extra_params=(bucket_name,),
-        )
-
         buckets.append(
             {
                 "bucket": bucket_name,
                 "requests": total,
                 "error_rate": round(error_rate, 4),
-                "avg_tool_calls": round(r["avg_tool_calls"], 2),
+                "avg_tool_calls": round(_avg(r["tool_calls"], r["tool_call_rows"]), 2),
                 "agent_errors": r["agent_errors"],
                 "traced_requests": r["traced_requests"],
-                "p50_duration_ms": round(p50, 1) if p50 is not None else None,
-                "p95_duration_ms": round(p95, 1) if p95 is not None else None,
+                **_latency_percentiles(sketches.get(bucket_name)),
             }
         )
 
@@ -558,17 +587,19 @@ def get_quality_summary(community_id: str, conn: sqlite3.Connection) -> dict[str
 
     Returns:
         Dict with overall quality stats: error_rate, avg_tool_calls,
-        agent_errors, p50/p95 latency, traced percentage.
+        agent_errors, p50/p95/p99 latency, traced percentage.
     """
     row = conn.execute(
-        """
+        f"""
+        {FACTS_CTE}
         SELECT
-            COUNT(*) as total_requests,
-            COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_count,
-            COALESCE(AVG(tool_call_count), 0) as avg_tool_calls,
-            COUNT(CASE WHEN error_message IS NOT NULL THEN 1 END) as agent_errors,
-            COUNT(CASE WHEN langfuse_trace_id IS NOT NULL THEN 1 END) as traced
-        FROM request_log
+            COALESCE(SUM(requests), 0) as total_requests,
+            COALESCE(SUM(errors), 0) as error_count,
+            COALESCE(SUM(tool_calls), 0) as tool_calls,
+            COALESCE(SUM(tool_call_rows), 0) as tool_call_rows,
+            COALESCE(SUM(agent_errors), 0) as agent_errors,
+            COALESCE(SUM(traced_requests), 0) as traced
+        FROM facts
         WHERE community_id = ?
         """,
         (community_id,),
@@ -579,64 +610,14 @@ def get_quality_summary(community_id: str, conn: sqlite3.Connection) -> dict[str
     traced_pct = row["traced"] / total if total > 0 else 0.0
 
     # Latency percentiles
-    p50, p95 = _fetch_latency_percentiles(conn, community_id)
+    sketch = load_latency_sketches(conn, community_id).get("")
 
     return {
         "community_id": community_id,
         "total_requests": total,
         "error_rate": round(error_rate, 4),
-        "avg_tool_calls": round(row["avg_tool_calls"], 2),
+        "avg_tool_calls": round(_avg(row["tool_calls"], row["tool_call_rows"]), 2),
         "agent_errors": row["agent_errors"],
         "traced_pct": round(traced_pct, 4),
-        "p50_duration_ms": round(p50, 1) if p50 is not None else None,
-        "p95_duration_ms": round(p95, 1) if p95 is not None else None,
+        **_latency_percentiles(sketch),
     }
-
-
-def _percentile(sorted_values: list[float], pct: float) -> float | None:
-    """Compute percentile from a sorted list of values.
-
-    Uses floor-rank method: index = floor(pct * len), clamped to valid range.
-
-    Args:
-        sorted_values: Pre-sorted list of numeric values.
-        pct: Percentile as fraction (e.g., 0.5 for p50, 0.95 for p95).
-
-    Returns:
-        The percentile value, or None if list is empty.
-    """
-    if not sorted_values:
-        return None
-    idx = int(pct * len(sorted_values))
-    idx = min(idx, len(sorted_values) - 1)
-    return sorted_values[idx]
-
-
-def _fetch_latency_percentiles(
-    conn: sqlite3.Connection,
-    community_id: str,
-    extra_where: str = "",
-    extra_params: tuple[str, ...] = (),
-) -> tuple[float | None, float | None]:
-    """Fetch p50 and p95 latency for a community with optional filters.
-
-    Args:
-        conn: SQLite connection with row_factory set.
-        community_id: The community identifier.
-        extra_where: Additional SQL WHERE clause (e.g., "AND strftime(...) = ?").
-        extra_params: Parameters for the extra WHERE clause.
-
-    Returns:
-        Tuple of (p50, p95) duration in ms, or None if no data.
-    """
-    durations = conn.execute(
-        f"""
-        SELECT duration_ms
-        FROM request_log
-        WHERE community_id = ? AND duration_ms IS NOT NULL {extra_where}
-        ORDER BY duration_ms
-        """,
-        (community_id, *extra_params),
-    ).fetchall()
-    values = [d["duration_ms"] for d in durations]
-    return _percentile(values, 0.5), _percentile(values, 0.95)
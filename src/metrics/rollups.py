@@ -0,0 +1,257 @@
+"""Pre-aggregated daily rollups of request_log.
+
+Dashboard queries used to GROUP BY over the whole request_log, so their cost
+grew with history. request_rollup_daily holds one row per
+(day, community_id, model, key_source) with summed measures, and
+metrics_rollup_state records the last request_log id folded into it.
+
+Queries read ``FACTS_CTE``: the rollup rows plus the raw rows past the
+watermark, in the same shape. Results are exact whether or not the latest
+rows have been rolled up yet, and the raw scan is bounded by the tail size.
+
+NULL dimensions are stored as '' so they can be part of the primary key;
+FACTS_CTE maps them back to NULL.
+
+latency_sketch_daily holds one LatencySketch per (community_id, day),
+folded in by the same refresh, so percentiles merge a few sketches instead
+of sorting every duration. Answers replayed from the /ask answer cache
+(key_source ``ANSWER_CACHE_KEY_SOURCE``) are counted in the rollup under
+their own key_source but left out of the latency sketches, so percentiles
+describe real agent runs.
+"""
+
+import logging
+import sqlite3
+
+from src.metrics.sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+# request_log.key_source of requests answered from the /ask answer cache
+ANSWER_CACHE_KEY_SOURCE = "answer_cache"
+
+# Rows whose durations go into latency sketches
+_LATENCY_ROWS_SQL = (
+    f"duration_ms IS NOT NULL AND COALESCE(key_source, '') != '{ANSWER_CACHE_KEY_SOURCE}'"
+)
+
+# (column, per-row SQL expression over request_log). Summed into the rollup.
+_MEASURES: list[tuple[str, str]] = [
+    ("requests", "1"),
+    ("errors", "CASE WHEN status_code >= 400 THEN 1 ELSE 0 END"),
+    ("agent_errors", "CASE WHEN error_message IS NOT NULL THEN 1 ELSE 0 END"),
+    ("traced_requests", "CASE WHEN langfuse_trace_id IS NOT NULL THEN 1 ELSE 0 END"),
+    ("tool_calls", "COALESCE(tool_call_count, 0)"),
+    ("tool_call_rows", "CASE WHEN tool_call_count IS NOT NULL THEN 1 ELSE 0 END"),
+    ("input_tokens", "COALESCE(input_tokens, 0)"),
+    ("output_tokens", "COALESCE(output_tokens, 0)"),
+    ("total_tokens", "COALESCE(total_tokens, 0)"),
+    ("cache_read_tokens", "COALESCE(cache_read_tokens, 0)"),
+    ("cache_creation_tokens", "COALESCE(cache_creation_tokens, 0)"),
+    ("estimated_cost", "COALESCE(estimated_cost, 0)"),
+    ("duration_sum", "COALESCE(duration_ms, 0)"),
+    ("duration_count", "CASE WHEN duration_ms IS NOT NULL THEN 1 ELSE 0 END"),
+]
+
+_MEASURE_COLUMNS = [name for name, _ in _MEASURES]
+_REAL_MEASURES = {"estimated_cost", "duration_sum"}
+
+_COLUMNS_SQL = ", ".join(_MEASURE_COLUMNS)
+_COLUMN_DEFS_SQL = ",\n    ".join(
+    f"{name} {'REAL' if name in _REAL_MEASURES else 'INTEGER'} NOT NULL DEFAULT 0"
+    for name in _MEASURE_COLUMNS
+)
+_ROW_MEASURES_SQL = ",\n        ".join(f"{expr} AS {name}" for name, expr in _MEASURES)
+_SUMS_SQL = ", ".join(f"SUM({name})" for name in _MEASURE_COLUMNS)
+_ACCUMULATE_SQL = ",\n    ".join(f"{name} = {name} + excluded.{name}" for name in _MEASURE_COLUMNS)
+
+ROLLUP_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS request_rollup_daily (
+    day TEXT NOT NULL,
+    community_id TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL DEFAULT '',
+    key_source TEXT NOT NULL DEFAULT '',
+    {_COLUMN_DEFS_SQL},
+    PRIMARY KEY (day, community_id, model, key_source)
+);
+
+CREATE INDEX IF NOT EXISTS idx_request_rollup_daily_community
+    ON request_rollup_daily(community_id, day);
+
+CREATE TABLE IF NOT EXISTS latency_sketch_daily (
+    community_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (community_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS metrics_rollup_state (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+"""
+
+_WATERMARK_SQL = (
+    "SELECT COALESCE(MAX(last_id), 0) FROM metrics_rollup_state WHERE name = 'request_log'"
+)
+
+# Common table expression "facts": rolled-up rows plus the raw tail.
+# Dashboard queries prefix their SELECT with this and read FROM facts.
+FACTS_CTE = f"""
+WITH facts (day, community_id, model, key_source, {_COLUMNS_SQL}) AS (
+    SELECT
+        day,
+        NULLIF(community_id, ''),
+        NULLIF(model, ''),
+        NULLIF(key_source, ''),
+        {_COLUMNS_SQL}
+    FROM request_rollup_daily
+    UNION ALL
+    SELECT
+        strftime('%Y-%m-%d', timestamp),
+        NULLIF(community_id, ''),
+        NULLIF(model, ''),
+        NULLIF(key_source, ''),
+        {_ROW_MEASURES_SQL}
+    FROM request_log
+    WHERE id > ({_WATERMARK_SQL})
+)
+"""
+
+_ROLLUP_UPSERT_SQL = f"""
+INSERT INTO request_rollup_daily (day, community_id, model, key_source, {_COLUMNS_SQL})
+SELECT day, community_id, model, key_source, {_SUMS_SQL}
+FROM (
+    SELECT
+        strftime('%Y-%m-%d', timestamp) AS day,
+        COALESCE(community_id, '') AS community_id,
+        COALESCE(model, '') AS model,
+        COALESCE(key_source, '') AS key_source,
+        {_ROW_MEASURES_SQL}
+    FROM request_log
+    WHERE id > ? AND id <= ?
+)
+WHERE true
+GROUP BY day, community_id, model, key_source
+ON CONFLICT (day, community_id, model, key_source) DO UPDATE SET
+    {_ACCUMULATE_SQL}
+"""
+
+
+def _fold_latency_sketches(conn: sqlite3.Connection, last_id: int, max_id: int) -> None:
+    """Merge durations of request_log rows in (last_id, max_id] into daily sketches."""
+    new: dict[tuple[str, str], LatencySketch] = {}
+    for community_id, day, duration in conn.execute(
+        f"""
+        SELECT community_id, strftime('%Y-%m-%d', timestamp), duration_ms
+        FROM request_log
+        WHERE id > ? AND id <= ? AND community_id IS NOT NULL AND {_LATENCY_ROWS_SQL}
+        """,
+        (last_id, max_id),
+    ):
+        new.setdefault((community_id, day), LatencySketch()).add(duration)
+
+    for (community_id, day), sketch in new.items():
+        row = conn.execute(
+            "SELECT sketch FROM latency_sketch_daily WHERE community_id = ? AND day = ?",
+            (community_id, day),
+        ).fetchone()
+        if row is not None:
+            try:
+                existing = LatencySketch.from_bytes(row[0])
+                existing.merge(sketch)
+                sketch = existing
+            except ValueError:
+                logger.warning("Replacing malformed latency sketch for %s on %s", community_id, day)
+        conn.execute(
+            """
+            INSERT INTO latency_sketch_daily (community_id, day, sketch) VALUES (?, ?, ?)
+            ON CONFLICT (community_id, day) DO UPDATE SET sketch = excluded.sketch
+            """,
+            (community_id, day, sketch.to_bytes()),
+        )
+
+
+def load_latency_sketches(
+    conn: sqlite3.Connection,
+    community_id: str,
+    bucket_format: str | None = None,
+) -> dict[str, LatencySketch]:
+    """Return merged latency sketches for a community, keyed by time bucket.
+
+    Combines the stored daily sketches with the raw tail in one statement,
+    so the result is consistent with a concurrent refresh.
+
+    Args:
+        conn: Metrics database connection.
+        community_id: The community identifier.
+        bucket_format: SQLite strftime format for buckets (must come from a
+            whitelist, it is interpolated into SQL). None merges everything
+            into a single bucket keyed ''.
+    """
+    day_bucket = f"strftime('{bucket_format}', day)" if bucket_format else "''"
+    raw_bucket = f"strftime('{bucket_format}', timestamp)" if bucket_format else "''"
+    rows = conn.execute(
+        f"""
+        SELECT {day_bucket}, sketch, NULL
+        FROM latency_sketch_daily
+        WHERE community_id = ?
+        UNION ALL
+        SELECT {raw_bucket}, NULL, duration_ms
+        FROM request_log
+        WHERE community_id = ? AND {_LATENCY_ROWS_SQL} AND id > ({_WATERMARK_SQL})
+        """,
+        (community_id, community_id),
+    )
+
+    sketches: dict[str, LatencySketch] = {}
+    for bucket, blob, duration in rows:
+        sketch = sketches.setdefault(bucket, LatencySketch())
+        if blob is None:
+            sketch.add(duration)
+            continue
+        try:
+            sketch.merge(LatencySketch.from_bytes(blob))
+        except ValueError:
+            logger.warning("Skipping malformed latency sketch for %s (%s)", community_id, bucket)
+    return sketches
+
+
+def refresh_rollups(conn: sqlite3.Connection) -> int:
+    """Fold request_log rows past the watermark into the daily rollup.
+
+    Runs in a single transaction, so readers see either the old watermark
+    and raw tail or the new rollup rows, never both. Idempotent.
+
+    Args:
+        conn: Metrics database connection.
+
+    Returns:
+        Number of request_log rows rolled up.
+    """
+    # IMMEDIATE takes the write lock up front so the id range read below
+    # cannot move before the upsert commits.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        last_id = conn.execute(_WATERMARK_SQL).fetchone()[0]
+        max_id, rows = conn.execute(
+            "SELECT COALESCE(MAX(id), 0), COUNT(*) FROM request_log WHERE id > ?",
+            (last_id,),
+        ).fetchone()
+        if rows:
+            conn.execute(_ROLLUP_UPSERT_SQL, (last_id, max_id))
+            _fold_latency_sketches(conn, last_id, max_id)
+            conn.execute(
+                """
+                INSERT INTO metrics_rollup_state (name, last_id) VALUES ('request_log', ?)
+                ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id
+                """,
+                (max_id,),
+            )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    if rows:
+        logger.debug("Rolled up %d request_log rows (ids %d..%d)", rows, last_id + 1, max_id)
+    return rows
@@ -0,0 +1,131 @@
+"""Mergeable quantile sketch for request latencies.
+
+A DDSketch-style sketch: values are counted in logarithmic buckets so any
+quantile estimate is within ``relative_accuracy`` of a true sample value.
+Sketches merge by adding bucket counts, so per-day sketches can be combined
+into weekly, monthly or all-time percentiles without revisiting raw rows.
+Size is bounded by the value range (about 800 buckets for 1 ms to 3 hours
+at 1% accuracy), not by the number of samples.
+"""
+
+import math
+import struct
+from collections.abc import Iterable
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Values at or below this are counted as zero (durations are in ms)
+_MIN_POSITIVE = 1e-6
+
+_HEADER = struct.Struct("<BdQQdd")  # version, accuracy, zero_count, count, min, max
+_BUCKET = struct.Struct("<iQ")  # bucket index, count
+_VERSION = 1
+
+
+class LatencySketch:
+    """Log-bucketed quantile sketch with exact count, min and max."""
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "buckets", "zero_count", "count", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one sample."""
+        if value <= _MIN_POSITIVE:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._gamma_log)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Record several samples."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add another sketch's samples into this one.
+
+        Raises:
+            ValueError: If the sketches use different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty.
+
+        Uses the same floor-rank rule as the previous exact implementation:
+        the sample at sorted index floor(q * count), clamped to the last one.
+        The smallest and largest samples are returned exactly.
+        """
+        if self.count == 0:
+            return None
+        rank = min(int(q * self.count), self.count - 1)
+        if rank == 0:
+            return self.min
+        if rank == self.count - 1:
+            return self.max
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of (gamma^(i-1), gamma^i] in relative terms
+                estimate = 2 * math.exp(index * self._gamma_log) / (1 + math.exp(self._gamma_log))
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_bytes(self) -> bytes:
+        """Serialize for storage in a BLOB column."""
+        parts = [
+            _HEADER.pack(
+                _VERSION,
+                self.relative_accuracy,
+                self.zero_count,
+                self.count,
+                self.min,
+                self.max,
+            )
+        ]
+        parts.extend(_BUCKET.pack(index, n) for index, n in sorted(self.buckets.items()))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        """Deserialize a sketch produced by to_bytes().
+
+        Raises:
+            ValueError: If the data is truncated or has an unknown version.
+        """
+        if len(data) < _HEADER.size or (len(data) - _HEADER.size) % _BUCKET.size:
+            raise ValueError("Malformed latency sketch")
+        version, accuracy, zero_count, count, min_value, max_value = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported latency sketch version: {version}")
+        sketch = cls(accuracy)
+        sketch.zero_count = zero_count
+        sketch.count = count
+        sketch.min = min_value
+        sketch.max = max_value
+        for index, n in _BUCKET.iter_unpack(data[_HEADER.size :]):
+            sketch.buckets[index] = n
+        return sketch
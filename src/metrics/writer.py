@@ -0,0 +1,310 @@
+"""Background writer for request metrics.
+
+Request handlers enqueue RequestLogEntry objects; a dedicated thread drains
+the queue and inserts them with one executemany + COMMIT per batch. This keeps
+SQLite connects, inserts and fsyncs off the event loop. After each batch the
+new rows are folded into the daily rollup, so dashboard queries only scan a
+short raw tail.
+
+The queue is bounded. When it is full, new entries are dropped and counted
+rather than blocking the request path.
+"""
+
+import contextlib
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.metrics.budget import get_spend_tracker
+from src.metrics.db import (
+    RequestLogEntry,
+    get_metrics_connection,
+    insert_request_entries,
+    log_request,
+)
+from src.metrics.prometheus import REGISTRY, Sample, observe_request
+from src.metrics.rollups import refresh_rollups
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 200
+# Maximum time an entry waits in a partial batch before it is written
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+_STOP = object()
+
+
+class MetricsWriter:
+    """Batches request log entries into the metrics DB on a background thread.
+
+    Thread-safe: submit() may be called from any thread or from the event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread. No-op if already running."""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, entry: RequestLogEntry) -> bool:
+        """Queue an entry for writing without blocking.
+
+        Returns:
+            True if queued, False if the queue was full and the entry was dropped.
+        """
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # Log the first drop and then every 1000th to avoid log floods
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(
+                    "Metrics writer queue full (%d entries); dropped %d entries so far",
+                    self._queue.maxsize,
+                    dropped,
+                )
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until every entry queued before this call has been written.
+
+        Returns:
+            True if the flush completed, False on timeout or if not running.
+        """
+        if not self.running:
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Metrics writer did not drain its queue before shutdown")
+            return
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.error("Metrics writer thread did not stop within %.1fs", timeout or 0)
+        else:
+            with self._lock:
+                self._thread = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and write/drop counters."""
+        with self._lock:
+            return {
+                "running": self.running,
+                "queue_depth": self._queue.qsize(),
+                "queue_max_size": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list[RequestLogEntry]) -> None:
+        """Insert one batch, counting failures instead of raising."""
+        if not batch:
+            return
+        try:
+            insert_request_entries(conn, batch)
+        except sqlite3.Error:
+            with self._lock:
+                self.failed += len(batch)
+            logger.exception("Failed to write %d metrics entries", len(batch))
+            with contextlib.suppress(sqlite3.Error):
+                conn.rollback()
+        else:
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+            try:
+                refresh_rollups(conn)
+            except sqlite3.Error:
+                # Rows stay in the raw tail and are picked up by the next refresh
+                logger.exception("Failed to refresh metrics rollups")
+
+    def _run(self) -> None:
+        """Writer loop: collect entries into batches and write them."""
+        try:
+            conn = get_metrics_connection(self.db_path)
+        except sqlite3.Error:
+            logger.exception("Metrics writer could not open the metrics database")
+            return
+
+        batch: list[RequestLogEntry] = []
+        deadline = 0.0
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if batch else None
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    # Flush interval elapsed for a partial batch
+                    self._write_batch(conn, batch)
+                    batch = []
+                    continue
+
+                if item is _STOP:
+                    self._write_batch(conn, batch)
+                    return
+                if isinstance(item, threading.Event):
+                    self._write_batch(conn, batch)
+                    batch = []
+                    item.set()
+                    continue
+
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval_seconds
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._write_batch(conn, batch)
+                    batch = []
+        finally:
+            conn.close()
+
+
+_writer: MetricsWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_metrics_writer() -> MetricsWriter | None:
+    """Return the running metrics writer, or None if it was not started."""
+    return _writer
+
+
+def start_metrics_writer(db_path: Path | None = None) -> MetricsWriter:
+    """Start the process-wide metrics writer. Idempotent.
+
+    Args:
+        db_path: Optional path override (for testing).
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = MetricsWriter(db_path=db_path)
+        _writer.start()
+        return _writer
+
+
+def stop_metrics_writer(timeout: float | None = 5.0) -> None:
+    """Flush queued entries and stop the process-wide metrics writer."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop(timeout)
+        stats = writer.stats()
+        logger.info(
+            "Metrics writer stopped (written=%d, dropped=%d, failed=%d)",
+            stats["written"],
+            stats["dropped"],
+            stats["failed"],
+        )
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export the writer's queue depth and counters."""
+    writer = _writer
+    if writer is None:
+        return []
+    stats = writer.stats()
+    return [
+        Sample(
+            "osa_metrics_writer_queue_depth",
+            "gauge",
+            "Request log entries waiting to be written.",
+            stats["queue_depth"],
+        ),
+        Sample(
+            "osa_metrics_writer_dropped_total",
+            "counter",
+            "Request log entries dropped because the queue was full.",
+            stats["dropped"],
+        ),
+        Sample(
+            "osa_metrics_writer_failed_total",
+            "counter",
+            "Request log entries that failed to write.",
+            stats["failed"],
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
+
+
+def record_request(entry: RequestLogEntry) -> None:
+    """Record a request log entry.
+
+    Updates the in-memory spend counters and Prometheus series, then hands
+    the entry to the background writer when it is running. Otherwise
+    (scripts, tests without the app lifespan) writes synchronously.
+    """
+    observe_request(
+        entry.community_id,
+        entry.endpoint,
+        entry.method,
+        entry.status_code,
+        entry.duration_ms,
+        input_tokens=entry.input_tokens,
+        output_tokens=entry.output_tokens,
+        cache_read_tokens=entry.cache_read_tokens,
+        cache_creation_tokens=entry.cache_creation_tokens,
+    )
+    if entry.community_id and entry.estimated_cost:
+        get_spend_tracker().record(entry.community_id, entry.estimated_cost)
+
+    writer = _writer
+    if writer is not None and writer.running:
+        writer.submit(entry)
+    else:
+        log_request(entry)
@@ -1,15 +1,22 @@
 """Document fetching utility with caching for OSA tools."""
 
-import hashlib
+import asyncio
+import importlib.util
 import logging
 import re
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 
+from src.metrics.prometheus import REGISTRY, Sample
 from src.tools.base import DocPage, RetrievedDoc
 from src.tools.markdown_cleaner import clean_markdown
 
@@ -88,21 +95,194 @@ class CacheEntry:
     source_url: str
     """The URL this was fetched from."""
 
+    etag: str | None = None
+    """ETag from the server, used for conditional revalidation."""
+
+    last_modified: str | None = None
+    """Last-Modified from the server, used for conditional revalidation."""
+
+
+# Memory cache budget. Sized for a few dozen large documentation pages;
+# entries are accounted by their UTF-8 size.
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024  # 64 MiB
+
+# Memory cache key: (source URL, whether the content has been cleaned).
+_MemoryKey = tuple[str, bool]
+
+
+class DocumentLRUCache:
+    """Thread-safe, byte-bounded LRU of fetched documents.
+
+    Keys are (source URL, cleaned) pairs so the final output of ``fetch()``
+    can be served without re-running ``clean_markdown()``. Entries larger
+    than the whole budget are not cached.
+
+    Args:
+        max_bytes: Total UTF-8 size of cached content before the least
+            recently used entries are evicted.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES) -> None:
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_MemoryKey, tuple[CacheEntry, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: _MemoryKey) -> CacheEntry | None:
+        """Return the entry for ``key`` and mark it most recently used."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def peek(self, key: _MemoryKey) -> CacheEntry | None:
+        """Return the entry for ``key`` without counting a hit or miss."""
+        with self._lock:
+            item = self._entries.get(key)
+            return None if item is None else item[0]
+
+    def put(self, key: _MemoryKey, entry: CacheEntry) -> None:
+        """Store ``entry``, evicting least recently used entries to fit."""
+        size = len(entry.content.encode("utf-8"))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (entry, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def touch(self, key: _MemoryKey, fetched_at: float) -> None:
+        """Set the fetch time of ``key``'s entry, if present, without counting a hit."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries[key] = (replace(item[0], fetched_at=fetched_at), item[1])
+
+    def discard(self, key: _MemoryKey) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Total UTF-8 size of cached content."""
+        with self._lock:
+            return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Single-file persistent cache, replacing the old per-URL .md/.meta pairs.
+_FILE_CACHE_NAME = "documents.db"
+
+_FILE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    source_url TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+)
+"""
+
+# How long past its TTL an entry may still be served while a background
+# refresh runs. Upstream docs rarely change, so this is generous.
+DEFAULT_STALE_TTL_SECONDS = 7 * 24 * 3600
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool and concurrency limits for documentation hosts. Most docs
+# come from a handful of hosts (raw.githubusercontent.com, readthedocs), so
+# the per-host bound is what keeps us polite.
+FETCH_MAX_CONNECTIONS = 16
+DEFAULT_MAX_CONCURRENCY_PER_HOST = 4
+
+# Workers for concurrent fetches (fetch_many, afetch) and for background
+# revalidation, shared by all fetchers.
+FETCH_MAX_WORKERS = 8
+REFRESH_MAX_WORKERS = 4
+
+_fetch_executor: ThreadPoolExecutor | None = None
+_refresh_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_fetch_executor() -> ThreadPoolExecutor:
+    """Get or create the executor used for concurrent document fetches."""
+    global _fetch_executor
+    with _executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=FETCH_MAX_WORKERS, thread_name_prefix="doc-fetch"
+            )
+        return _fetch_executor
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Get or create the executor used for background revalidation."""
+    global _refresh_executor
+    with _executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=REFRESH_MAX_WORKERS, thread_name_prefix="doc-refresh"
+            )
+        return _refresh_executor
+
 
 @dataclass
 class DocumentFetcher:
     """Fetches and caches documentation content.
 
-    Provides simple file-based caching to avoid repeated fetches
-    of the same documents within a session or across sessions.
+    Fetched documents are kept in a byte-bounded in-memory LRU holding the
+    final (optionally cleaned) output, and, when ``cache_dir`` is set, in a
+    single SQLite file holding the converted but uncleaned content so it
+    survives restarts.
+
+    Entries past their TTL are still served (for up to ``stale_ttl_seconds``)
+    while a background conditional GET revalidates them using the stored
+    ETag/Last-Modified validators.
+
+    All requests go through one long-lived, pooled ``httpx.Client`` (HTTP/2
+    when h2 is installed), with at most ``max_concurrency_per_host`` requests
+    in flight per host. ``fetch_many``/``preload`` fetch cache misses
+    concurrently, and ``afetch``/``afetch_many`` offer the same from async code.
     """
 
     cache_dir: Path | None = None
-    """Directory for file-based cache. None for memory-only."""
+    """Directory for the persistent cache. None for memory-only."""
 
     cache_ttl_seconds: int = 3600
     """Time-to-live for cached entries (default: 1 hour)."""
 
+    stale_ttl_seconds: int = DEFAULT_STALE_TTL_SECONDS
+    """How long an expired entry may be served while it is refreshed."""
+
     timeout_seconds: float = 30.0
     """HTTP request timeout."""
 
@@ -112,156 +292,343 @@ class DocumentFetcher:
     clean_markdown_content: bool = True
     """Whether to clean and normalize markdown content."""
 
-    _memory_cache: dict[str, CacheEntry] = field(default_factory=dict)
-    """In-memory cache for fast access."""
+    max_memory_bytes: int = DEFAULT_MEMORY_CACHE_BYTES
+    """Byte budget for the in-memory LRU."""
+
+    max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST
+    """Maximum concurrent requests to a single host."""
+
+    _memory_cache: DocumentLRUCache = field(init=False, repr=False)
+    """In-memory LRU keyed by (URL, cleaned)."""
+
+    _file_conn: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    """Connection to the persistent cache, if any."""
+
+    _file_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    """Serializes access to the shared SQLite connection."""
+
+    _refreshing: set[str] = field(default_factory=set, init=False, repr=False)
+    """URLs with a background refresh in flight."""
+
+    _refresh_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    """Guards ``_refreshing``."""
+
+    _client: httpx.Client | None = field(default=None, init=False, repr=False)
+    """Shared HTTP client, created on first use."""
+
+    _host_limits: dict[str, threading.BoundedSemaphore] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    """Per-host request semaphores."""
+
+    _client_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    """Guards ``_client`` and ``_host_limits``."""
 
     def __post_init__(self) -> None:
-        """Initialize cache directory if specified."""
+        """Create the memory cache and open the persistent cache if configured."""
+        self._memory_cache = DocumentLRUCache(self.max_memory_bytes)
         if self.cache_dir:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def _cache_key(self, url: str) -> str:
-        """Generate a cache key from URL."""
-        return hashlib.sha256(url.encode()).hexdigest()[:16]
+            try:
+                conn = sqlite3.connect(
+                    str(self.cache_dir / _FILE_CACHE_NAME), check_same_thread=False
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_FILE_CACHE_SCHEMA)
+                conn.commit()
+                self._file_conn = conn
+            except sqlite3.Error as e:
+                logger.warning("Document file cache unavailable in %s: %s", self.cache_dir, e)
 
     def _is_cache_valid(self, entry: CacheEntry) -> bool:
         """Check if a cache entry is still valid."""
         age = time.time() - entry.fetched_at
         return age < self.cache_ttl_seconds
 
-    def _get_from_memory(self, url: str) -> str | None:
-        """Get content from memory cache if valid."""
-        key = self._cache_key(url)
-        if key in self._memory_cache:
-            entry = self._memory_cache[key]
-            if self._is_cache_valid(entry):
-                return entry.content
-            # Expired, remove from cache
-            del self._memory_cache[key]
+    def _is_servable(self, entry: CacheEntry) -> bool:
+        """Check if an entry is fresh or within the stale-while-revalidate window."""
+        age = time.time() - entry.fetched_at
+        return age < self.cache_ttl_seconds + self.stale_ttl_seconds
+
+    def _get_from_memory(
+        self, url: str, cleaned: bool = False, *, count: bool = True
+    ) -> CacheEntry | None:
+        """Get an entry from the memory cache if it can still be served.
+
+        With ``count=False`` the lookup is left out of the hit/miss counters.
+        """
+        key = (url, cleaned)
+        entry = self._memory_cache.get(key) if count else self._memory_cache.peek(key)
+        if entry is None:
+            return None
+        if self._is_servable(entry):
+            return entry
+        # Too old to serve, remove from cache
+        self._memory_cache.discard(key)
         return None
 
-    def _get_from_file(self, url: str) -> str | None:
-        """Get content from file cache if valid."""
-        if not self.cache_dir:
+    def _get_from_file(self, url: str) -> CacheEntry | None:
+        """Get uncleaned content from the persistent cache if it can still be served."""
+        if self._file_conn is None:
             return None
 
-        key = self._cache_key(url)
-        cache_file = self.cache_dir / f"{key}.md"
-        meta_file = self.cache_dir / f"{key}.meta"
+        try:
+            with self._file_lock:
+                row = self._file_conn.execute(
+                    "SELECT content, fetched_at, etag, last_modified "
+                    "FROM documents WHERE source_url = ?",
+                    (url,),
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = CacheEntry(
+                    content=row[0],
+                    fetched_at=row[1],
+                    source_url=url,
+                    etag=row[2],
+                    last_modified=row[3],
+                )
+                if not self._is_servable(entry):
+                    self._file_conn.execute("DELETE FROM documents WHERE source_url = ?", (url,))
+                    self._file_conn.commit()
+                    return None
+        except sqlite3.Error as e:
+            logger.warning("Document file cache read failed for %s: %s", url, e)
+            return None
 
-        if not cache_file.exists() or not meta_file.exists():
+        return entry
+
+    def _get_raw(self, url: str, *, count: bool = True) -> CacheEntry | None:
+        """Get uncleaned content from memory, falling back to the file cache."""
+        entry = self._get_from_memory(url, count=count)
+        if entry is not None:
+            return entry
+        entry = self._get_from_file(url)
+        if entry is not None and not self.clean_markdown_content:
+            # Raw content is the final output; keep it in memory too
+            self._memory_cache.put((url, False), entry)
+        return entry
+
+    def _finalize(self, raw: CacheEntry, cleaned: bool) -> CacheEntry:
+        """Turn uncleaned content into the output form, keeping its validators."""
+        if not cleaned:
+            return raw
+        return replace(raw, content=clean_markdown(raw.content))
+
+    def _lookup(self, url: str, cleaned: bool) -> CacheEntry | None:
+        """Get the servable output-form entry for ``url``, fresh or stale."""
+        entry = self._get_from_memory(url, cleaned)
+        if entry is not None:
+            return entry
+        # The output-form lookup above already counted this hit or miss
+        raw = self._get_raw(url, count=False) if cleaned else self._get_from_file(url)
+        if raw is None:
             return None
+        entry = self._finalize(raw, cleaned)
+        self._memory_cache.put((url, cleaned), entry)
+        return entry
 
-        # Check metadata for expiration
+    def _save_to_cache(self, url: str, content: str) -> None:
+        """Save uncleaned content to the memory and file caches."""
+        entry = CacheEntry(content=content, fetched_at=time.time(), source_url=url)
+        self._memory_cache.put((url, False), entry)
+        self._save_to_file(entry)
+
+    def _save_to_file(self, entry: CacheEntry) -> None:
+        """Persist uncleaned content, if a file cache is configured."""
+        if self._file_conn is None:
+            return
         try:
-            meta = meta_file.read_text().strip().split("\n")
-            fetched_at = float(meta[0])
-            if time.time() - fetched_at >= self.cache_ttl_seconds:
-                # Expired
-                cache_file.unlink(missing_ok=True)
-                meta_file.unlink(missing_ok=True)
-                return None
+            with self._file_lock:
+                self._file_conn.execute(
+                    "INSERT OR REPLACE INTO documents "
+                    "(source_url, content, fetched_at, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        entry.source_url,
+                        entry.content,
+                        entry.fetched_at,
+                        entry.etag,
+                        entry.last_modified,
+                    ),
+                )
+                self._file_conn.commit()
+        except sqlite3.Error as e:
+            # File write failed, memory cache still works
+            logger.warning("Document file cache write failed for %s: %s", entry.source_url, e)
+
+    def _touch_file(self, url: str, fetched_at: float) -> None:
+        """Mark a persisted entry as fresh after a 304 Not Modified."""
+        if self._file_conn is None:
+            return
+        try:
+            with self._file_lock:
+                self._file_conn.execute(
+                    "UPDATE documents SET fetched_at = ? WHERE source_url = ?",
+                    (fetched_at, url),
+                )
+                self._file_conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Document file cache update failed for %s: %s", url, e)
 
-            content = cache_file.read_text()
-            # Also populate memory cache
-            self._memory_cache[key] = CacheEntry(
-                content=content,
-                fetched_at=fetched_at,
-                source_url=url,
-            )
-            return content
-        except (ValueError, IndexError, OSError):
-            # Corrupted cache, clean up
-            cache_file.unlink(missing_ok=True)
-            meta_file.unlink(missing_ok=True)
+    def get_cached(self, url: str) -> str | None:
+        """Get uncleaned content from cache if available and valid.
+
+        Checks memory cache first, then file cache. Stale entries are not
+        returned here; only ``fetch()`` serves them.
+        """
+        entry = self._get_raw(url)
+        if entry is None or not self._is_cache_valid(entry):
             return None
+        return entry.content
+
+    def _get_client(self) -> httpx.Client:
+        """Get the shared HTTP client, creating it on first use."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout_seconds,
+                    http2=_HTTP2_AVAILABLE,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=FETCH_MAX_CONNECTIONS,
+                        max_keepalive_connections=FETCH_MAX_CONNECTIONS,
+                    ),
+                )
+            return self._client
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore bounding concurrent requests to ``url``'s host."""
+        host = urlsplit(url).netloc
+        with self._client_lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.max_concurrency_per_host)
+                self._host_limits[host] = limit
+            return limit
+
+    def _http_get(self, url: str, headers: dict[str, str]) -> httpx.Response:
+        """Issue a GET request for a document on the shared client."""
+        with self._host_limit(url):
+            return self._get_client().get(url, headers=headers)
+
+    def _revalidate(self, url: str, previous: CacheEntry | None) -> CacheEntry:
+        """Fetch ``url``, conditionally when ``previous`` has validators.
+
+        A 304 Not Modified only bumps the timestamp of ``previous`` (and of
+        the raw memory entry and file row behind it); anything else is
+        converted, persisted and cached as a new entry.
 
-    def _save_to_cache(self, url: str, content: str) -> None:
-        """Save content to both memory and file cache."""
-        key = self._cache_key(url)
+        Returns:
+            The output-form entry now in the memory cache.
+
+        Raises:
+            httpx.HTTPStatusError: On an error response.
+            httpx.RequestError: If the request fails.
+        """
+        cleaned = self.clean_markdown_content
+        headers = {"User-Agent": self.user_agent}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        response = self._http_get(url, headers)
         now = time.time()
 
-        # Memory cache
-        self._memory_cache[key] = CacheEntry(
+        if response.status_code == 304 and previous is not None:
+            logger.debug("Document not modified: %s", url)
+            entry = replace(previous, fetched_at=now)
+            self._memory_cache.put((url, cleaned), entry)
+            if cleaned:
+                # get_cached() reads the raw entry; keep it as fresh as the output
+                self._memory_cache.touch((url, False), now)
+            self._touch_file(url, now)
+            return entry
+
+        response.raise_for_status()
+        content = response.text
+
+        # Convert HTML to markdown before caching
+        if _is_html(content):
+            logger.debug("Detected HTML content, converting to markdown: %s", url)
+            content = _html_to_markdown(content)
+
+        # Persist after HTML conversion, before markdown cleaning
+        raw = CacheEntry(
             content=content,
             fetched_at=now,
             source_url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
         )
+        self._save_to_file(raw)
 
-        # File cache
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{key}.md"
-            meta_file = self.cache_dir / f"{key}.meta"
-            try:
-                cache_file.write_text(content)
-                meta_file.write_text(f"{now}\n{url}")
-            except OSError:
-                # File write failed, memory cache still works
-                pass
+        entry = self._finalize(raw, cleaned)
+        self._memory_cache.put((url, cleaned), entry)
+        if cleaned:
+            # A raw copy in memory is now outdated; get_cached() falls back to the file
+            self._memory_cache.discard((url, False))
+        return entry
 
-    def get_cached(self, url: str) -> str | None:
-        """Get content from cache if available and valid.
+    def _schedule_refresh(self, url: str, previous: CacheEntry) -> Future[None] | None:
+        """Revalidate ``url`` in the background unless a refresh is already running.
 
-        Checks memory cache first, then file cache.
+        Returns:
+            The background future, or None if a refresh was already in flight.
         """
-        # Try memory first (fastest)
-        content = self._get_from_memory(url)
-        if content is not None:
-            return content
+        with self._refresh_lock:
+            if url in self._refreshing:
+                return None
+            self._refreshing.add(url)
+        return _get_refresh_executor().submit(self._background_refresh, url, previous)
 
-        # Try file cache
-        return self._get_from_file(url)
+    def _background_refresh(self, url: str, previous: CacheEntry) -> None:
+        """Refresh a stale entry, keeping the stale copy if the request fails."""
+        try:
+            self._revalidate(url, previous)
+        except httpx.HTTPError as e:
+            logger.warning("Background refresh failed for %s, serving stale copy: %s", url, e)
+        except Exception:
+            logger.exception("Background refresh failed for %s", url)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(url)
+
+    def _serve(self, doc: DocPage, entry: CacheEntry) -> RetrievedDoc:
+        """Return a cached entry, refreshing it in the background if stale."""
+        if not self._is_cache_valid(entry):
+            self._schedule_refresh(doc.source_url, entry)
+        return RetrievedDoc(title=doc.title, url=doc.url, content=entry.content)
+
+    def _fetch_cached(self, doc: DocPage) -> RetrievedDoc | None:
+        """Serve ``doc`` from the memory or file cache, or None on a miss."""
+        entry = self._lookup(doc.source_url, self.clean_markdown_content)
+        if entry is None:
+            return None
+        return self._serve(doc, entry)
 
     def fetch(self, doc: DocPage) -> RetrievedDoc:
         """Fetch a document, using cache if available.
 
+        A stale cached copy is returned immediately and refreshed in the
+        background; only a cache miss waits on the network.
+
         Args:
             doc: The document page to fetch.
 
         Returns:
             RetrievedDoc with content or error.
         """
-        # Check cache first
-        cached = self.get_cached(doc.source_url)
+        cached = self._fetch_cached(doc)
         if cached is not None:
-            content = clean_markdown(cached) if self.clean_markdown_content else cached
-            return RetrievedDoc(
-                title=doc.title,
-                url=doc.url,
-                content=content,
-            )
+            return cached
 
         # Fetch from network
+        url = doc.source_url
         try:
-            with httpx.Client(timeout=self.timeout_seconds) as client:
-                response = client.get(
-                    doc.source_url,
-                    headers={"User-Agent": self.user_agent},
-                    follow_redirects=True,
-                )
-                response.raise_for_status()
-                content = response.text
-
-                # Convert HTML to markdown before caching
-                if _is_html(content):
-                    logger.debug(
-                        "Detected HTML content, converting to markdown: %s", doc.source_url
-                    )
-                    content = _html_to_markdown(content)
-
-                # Cache the content (after HTML conversion, before markdown cleaning)
-                self._save_to_cache(doc.source_url, content)
-
-                # Clean markdown if enabled
-                if self.clean_markdown_content:
-                    content = clean_markdown(content)
-
-                return RetrievedDoc(
-                    title=doc.title,
-                    url=doc.url,
-                    content=content,
-                )
-
+            entry = self._revalidate(url, None)
         except httpx.HTTPStatusError as e:
             return RetrievedDoc(
                 title=doc.title,
@@ -277,8 +644,27 @@ class DocumentFetcher:
                 error=f"Request failed: {e!s}",
             )
 
+        return RetrievedDoc(title=doc.title, url=doc.url, content=entry.content)
+
+    def refresh(self, doc: DocPage) -> bool:
+        """Revalidate a document now, regardless of its age.
+
+        Used by the scheduler to keep preloaded documents fresh so user
+        requests never wait on upstream doc hosts.
+
+        Returns:
+            True if the content changed (or was not cached before).
+
+        Raises:
+            httpx.HTTPError: If the request fails; the cached copy is kept.
+        """
+        url = doc.source_url
+        previous = self._lookup(url, self.clean_markdown_content)
+        entry = self._revalidate(url, previous)
+        return previous is None or entry.content != previous.content
+
     def fetch_many(self, docs: list[DocPage]) -> list[RetrievedDoc]:
-        """Fetch multiple documents.
+        """Fetch multiple documents, fetching cache misses concurrently.
 
         Args:
             docs: List of document pages to fetch.
@@ -286,7 +672,35 @@ class DocumentFetcher:
         Returns:
             List of RetrievedDoc results in same order as input.
         """
-        return [self.fetch(doc) for doc in docs]
+        results = [self._fetch_cached(doc) for doc in docs]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if len(misses) == 1:
+            results[misses[0]] = self.fetch(docs[misses[0]])
+        elif misses:
+            # A private pool, so a caller already running on the shared fetch
+            # executor never blocks waiting on that executor's own workers.
+            workers = min(len(misses), FETCH_MAX_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc-fetch") as pool:
+                fetched = pool.map(self.fetch, [docs[i] for i in misses])
+                for i, result in zip(misses, fetched, strict=True):
+                    results[i] = result
+        return [result for result in results if result is not None]
+
+    async def afetch(self, doc: DocPage) -> RetrievedDoc:
+        """Async variant of ``fetch()``.
+
+        Memory cache hits are served on the event loop; anything that needs
+        the file cache or the network runs on the shared fetch executor.
+        """
+        entry = self._get_from_memory(doc.source_url, self.clean_markdown_content)
+        if entry is not None:
+            return self._serve(doc, entry)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_fetch_executor(), self.fetch, doc)
+
+    async def afetch_many(self, docs: list[DocPage]) -> list[RetrievedDoc]:
+        """Async variant of ``fetch_many()``; results keep the input order."""
+        return list(await asyncio.gather(*(self.afetch(doc) for doc in docs)))
 
     def preload(self, docs: list[DocPage]) -> dict[str, str]:
         """Preload documents and return content by URL.
@@ -299,33 +713,62 @@ class DocumentFetcher:
         Returns:
             Dictionary mapping URL to content for successful fetches.
         """
-        results: dict[str, str] = {}
-        for doc in docs:
-            if doc.preload:
-                retrieved = self.fetch(doc)
-                if retrieved.success:
-                    results[doc.url] = retrieved.content
-        return results
+        to_load = [doc for doc in docs if doc.preload]
+        return {
+            doc.url: retrieved.content
+            for doc, retrieved in zip(to_load, self.fetch_many(to_load), strict=True)
+            if retrieved.success
+        }
+
+    async def apreload(self, docs: list[DocPage]) -> dict[str, str]:
+        """Async variant of ``preload()``."""
+        to_load = [doc for doc in docs if doc.preload]
+        fetched = await self.afetch_many(to_load)
+        return {
+            doc.url: retrieved.content
+            for doc, retrieved in zip(to_load, fetched, strict=True)
+            if retrieved.success
+        }
+
+    def close(self) -> None:
+        """Close the shared HTTP client; a new one is created if fetching resumes."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
 
     def clear_cache(self) -> None:
         """Clear all cached content."""
         self._memory_cache.clear()
 
-        if self.cache_dir and self.cache_dir.exists():
-            for f in self.cache_dir.glob("*.md"):
-                f.unlink(missing_ok=True)
-            for f in self.cache_dir.glob("*.meta"):
-                f.unlink(missing_ok=True)
+        if self._file_conn is not None:
+            try:
+                with self._file_lock:
+                    self._file_conn.execute("DELETE FROM documents")
+                    self._file_conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Failed to clear document file cache: %s", e)
 
     def cache_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        memory_count = len(self._memory_cache)
         file_count = 0
-        if self.cache_dir and self.cache_dir.exists():
-            file_count = len(list(self.cache_dir.glob("*.md")))
+        if self._file_conn is not None:
+            try:
+                with self._file_lock:
+                    file_count = self._file_conn.execute(
+                        "SELECT COUNT(*) FROM documents"
+                    ).fetchone()[0]
+            except sqlite3.Error:
+                pass
 
+        memory = self._memory_cache
         return {
-            "memory_entries": memory_count,
+            "memory_entries": len(memory),
+            "memory_bytes": memory.size_bytes,
+            "memory_max_bytes": memory.max_bytes,
+            "hits": memory.hits,
+            "misses": memory.misses,
+            "evictions": memory.evictions,
             "file_entries": file_count,
             "cache_dir": str(self.cache_dir) if self.cache_dir else None,
             "ttl_seconds": self.cache_ttl_seconds,
@@ -350,3 +793,50 @@ def get_fetcher(cache_dir: Path | None = None) -> DocumentFetcher:
     if _default_fetcher is None:
         _default_fetcher = DocumentFetcher(cache_dir=cache_dir)
     return _default_fetcher
+
+
+def shutdown_fetcher() -> None:
+    """Stop the fetch executors and close the default fetcher."""
+    global _fetch_executor, _refresh_executor
+    with _executor_lock:
+        executors = [_fetch_executor, _refresh_executor]
+        _fetch_executor = _refresh_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    if _default_fetcher is not None:
+        _default_fetcher.close()
+
+
+def _collect_prometheus_samples() -> list[Sample]:
+    """Export the default fetcher's memory cache counters (no file cache I/O)."""
+    fetcher = _default_fetcher
+    if fetcher is None:
+        return []
+    memory = fetcher._memory_cache
+    return [
+        Sample(
+            "osa_fetcher_cache_hits_total", "counter", "Document memory cache hits.", memory.hits
+        ),
+        Sample(
+            "osa_fetcher_cache_misses_total",
+            "counter",
+            "Document memory cache misses.",
+            memory.misses,
+        ),
+        Sample(
+            "osa_fetcher_cache_evictions_total",
+            "counter",
+            "Document memory cache LRU evictions.",
+            memory.evictions,
+        ),
+        Sample(
+            "osa_fetcher_cache_bytes",
+            "gauge",
+            "UTF-8 size of documents in the memory cache.",
+            memory.size_bytes,
+        ),
+    ]
+
+
+REGISTRY.add_collector(_collect_prometheus_samples)
@@ -18,10 +18,12 @@ NOT:
 
 import logging
 import sqlite3
+from collections.abc import Callable
+from typing import Any
 
 from langchain_core.tools import BaseTool, StructuredTool
 
-from src.knowledge.db import get_db_path
+from src.knowledge.db import get_db_path, run_in_db_executor
 from src.knowledge.search import (
     get_full_docstring,
     list_recent_github_items,
@@ -39,6 +41,24 @@ def _check_db_exists(community_id: str) -> bool:
     return get_db_path(community_id).exists()
 
 
+def _knowledge_tool(func: Callable[..., str], name: str, description: str) -> BaseTool:
+    """Wrap a sync knowledge search as a tool with a non-blocking async path.
+
+    The coroutine runs the same implementation on the knowledge DB executor,
+    so async agents do not hold event-loop or default-pool threads on SQLite.
+    """
+
+    async def coroutine(**kwargs: Any) -> str:
+        return await run_in_db_executor(func, **kwargs)
+
+    return StructuredTool.from_function(
+        func=func,
+        coroutine=coroutine,
+        name=name,
+        description=description,
+    )
+
+
 def create_search_discussions_tool(
     community_id: str,
     community_name: str,
@@ -111,8 +131,8 @@ def create_search_discussions_tool(
         f"Do NOT use discussion content to formulate answers.{repo_help}"
     )
 
-    return StructuredTool.from_function(
-        func=search_discussions_impl,
+    return _knowledge_tool(
+        search_discussions_impl,
         name=f"search_{community_id}_discussions",
         description=description,
     )
@@ -193,8 +213,8 @@ def create_list_recent_tool(
         f"Unlike search which finds by keywords, this lists items by creation date.{repo_options}"
     )
 
-    return StructuredTool.from_function(
-        func=list_recent_impl,
+    return _knowledge_tool(
+        list_recent_impl,
         name=f"list_{community_id}_recent",
         description=description,
     )
@@ -249,8 +269,8 @@ def create_search_papers_tool(
         "Do NOT use paper content to formulate answers."
     )
 
-    return StructuredTool.from_function(
-        func=search_papers_impl,
+    return _knowledge_tool(
+        search_papers_impl,
         name=f"search_{community_id}_papers",
         description=description,
     )
@@ -334,8 +354,8 @@ def create_search_docstrings_tool(
         f"get_{community_id}_full_docstring."
     )
 
-    return StructuredTool.from_function(
-        func=search_docstrings_impl,
+    return _knowledge_tool(
+        search_docstrings_impl,
         name=f"search_{community_id}_code_docs",
         description=description,
     )
@@ -428,8 +448,8 @@ def create_get_full_docstring_tool(
         "files/repos."
     )
 
-    return StructuredTool.from_function(
-        func=get_full_docstring_impl,
+    return _knowledge_tool(
+        get_full_docstring_impl,
         name=f"get_{community_id}_full_docstring",
         description=description,
     )
@@ -519,8 +539,8 @@ def create_search_faq_tool(
         f"Returns: question, answer summary, category, quality score, link to original thread.{list_help}"
     )
 
-    return StructuredTool.from_function(
-        func=search_faq_impl,
+    return _knowledge_tool(
+        search_faq_impl,
         name=f"search_{community_id}_faq",
         description=description,
     )
@@ -597,8 +617,8 @@ def create_search_discourse_tool(
         "Do NOT use forum content to formulate authoritative answers."
     )
 
-    return StructuredTool.from_function(
-        func=search_discourse_impl,
+    return _knowledge_tool(
+        search_discourse_impl,
         name=f"search_{community_id}_forum",
         description=description,
     )
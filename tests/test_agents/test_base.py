@@ -4,11 +4,14 @@ These tests verify the agent graph structure and logic without making
 actual LLM API calls.
 """
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from langchain_core.language_models import FakeListChatModel
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.messages.utils import count_tokens_approximately
 from langchain_core.tools import tool
+from pydantic import SecretStr
 
 from src.agents.base import (
     DEFAULT_MAX_CONVERSATION_TOKENS,
@@ -116,6 +119,78 @@ class TestToolAgent:
         assert graph is not None
 
 
+class TestGraphReuse:
+    """Tests for compiled graph caching and per-request runnable config."""
+
+    def test_get_graph_compiles_once(self) -> None:
+        """get_graph should return the same compiled graph on every call."""
+        agent = ToolAgent(model=FakeListChatModel(responses=["Done!"]), tools=[dummy_tool])
+        assert agent.get_graph() is agent.get_graph()
+
+    def test_invoke_reuses_compiled_graph(self) -> None:
+        """invoke should not recompile the graph between calls."""
+        agent = SimpleAgent(model=FakeListChatModel(responses=["One", "Two"]))
+        graph = agent.get_graph()
+
+        agent.invoke("First")
+        agent.invoke("Second")
+
+        assert agent.get_graph() is graph
+
+    def test_configurable_values_reach_model_call(self) -> None:
+        """api_key and user_id in the runnable config should be passed to the model."""
+        model = MagicMock()
+        model.invoke.return_value = AIMessage(content="Hi")
+        agent = SimpleAgent(model=model)
+
+        agent.invoke(
+            "Hello",
+            config={"configurable": {"api_key": SecretStr("sk-test"), "user_id": "user-1"}},
+        )
+
+        _, kwargs = model.invoke.call_args
+        assert kwargs == {"api_key": "sk-test", "user": "user-1"}
+
+    def test_no_configurable_values_passes_no_kwargs(self) -> None:
+        """Without per-request values the model should be called with messages only."""
+        model = MagicMock()
+        model.invoke.return_value = AIMessage(content="Hi")
+        agent = SimpleAgent(model=model)
+
+        agent.invoke("Hello")
+
+        _, kwargs = model.invoke.call_args
+        assert kwargs == {}
+
+    async def test_ainvoke_awaits_model(self) -> None:
+        """ainvoke should use the model's async API rather than a sync call in a thread."""
+        model = MagicMock()
+        model.ainvoke = AsyncMock(return_value=AIMessage(content="Async hi"))
+        agent = SimpleAgent(model=model)
+
+        result = await agent.ainvoke(
+            "Hello", config={"configurable": {"api_key": "sk-test", "user_id": "user-1"}}
+        )
+
+        assert result["messages"][-1].content == "Async hi"
+        model.invoke.assert_not_called()
+        _, kwargs = model.ainvoke.call_args
+        assert kwargs == {"api_key": "sk-test", "user": "user-1"}
+
+    async def test_astream_events_streams_tokens(self) -> None:
+        """Streaming through the async node should still emit model stream events."""
+        agent = SimpleAgent(model=FakeListChatModel(responses=["Streamed answer"]))
+        state = {"messages": [HumanMessage(content="Hi")], "retrieved_docs": [], "tool_calls": []}
+
+        chunks = [
+            event["data"]["chunk"].content
+            async for event in agent.get_graph().astream_events(state, version="v2")
+            if event["event"] == "on_chat_model_stream"
+        ]
+
+        assert "".join(chunks) == "Streamed answer"
+
+
 class TestBaseAgentAbstract:
     """Tests for BaseAgent abstract class."""
 
@@ -3,9 +3,12 @@
 from unittest.mock import MagicMock, patch
 
 import httpx
+from langchain_core.messages import HumanMessage, SystemMessage
 
+from src.agents.base import BaseAgentState
 from src.assistants import discover_assistants, registry
-from src.assistants.community import PageContext
+from src.assistants.community import CommunityAssistant, PageContext
+from src.core.services.litellm_llm import NO_CACHE_KWARG
 from src.utils.page_fetcher import (
     MAX_PAGE_CONTENT_LENGTH,
     fetch_page_content,
@@ -550,3 +553,137 @@ class TestCommunityAssistantWithPageContext:
         prompt = assistant.get_system_prompt()
         assert "Widget Page Context" not in prompt
         assert "Page Context" in prompt
+
+
+class TestPerRequestPageContext:
+    """Tests for page context supplied through the runnable config."""
+
+    def _pooled_assistant(self):
+        model = MagicMock()
+        model.bind_tools = MagicMock(return_value=model)
+        return registry.create_assistant("hed", model=model, preload_docs=False, page_tool=True)
+
+    def test_page_tool_registers_fetch_tool_without_page_context(self):
+        """page_tool should register fetch_current_page even with no page context."""
+        assistant = self._pooled_assistant()
+        assert "fetch_current_page" in [t.name for t in assistant.tools]
+        assert "Page Context" not in assistant.system_prompt
+
+    def test_system_prompt_uses_config_page_context(self):
+        """The page context in the runnable config should be rendered into the prompt."""
+        assistant = self._pooled_assistant()
+        config = {
+            "configurable": {
+                "page_context": PageContext(url="https://hedtags.org/a", title="Page A")
+            }
+        }
+
+        prompt = assistant._resolve_system_prompt(config)
+
+        assert "https://hedtags.org/a" in prompt
+        assert "Page A" in prompt
+        # The shared prompt must not be modified by a request
+        assert "https://hedtags.org/a" not in assistant.system_prompt
+
+    def test_config_page_context_matches_constructor_rendering(self):
+        """Per-request rendering should match building with the same page context."""
+        page_context = PageContext(url="https://hedtags.org/docs", title="HED Docs")
+        model = MagicMock()
+        model.bind_tools = MagicMock(return_value=model)
+        built = registry.create_assistant(
+            "hed", model=model, preload_docs=False, page_context=page_context
+        )
+
+        pooled = self._pooled_assistant()
+        config = {"configurable": {"page_context": page_context}}
+
+        assert pooled._resolve_system_prompt(config) == built.system_prompt
+
+    @patch("src.assistants.community.fetch_page_content")
+    def test_fetch_tool_reads_url_from_config(self, mock_fetch):
+        """fetch_current_page should fetch the URL of the current request."""
+        mock_fetch.return_value = "content"
+        assistant = self._pooled_assistant()
+        fetch_tool = next(t for t in assistant.tools if t.name == "fetch_current_page")
+
+        fetch_tool.invoke(
+            {}, config={"configurable": {"page_context": PageContext(url="https://hedtags.org/b")}}
+        )
+
+        mock_fetch.assert_called_once_with("https://hedtags.org/b")
+
+    @patch("src.assistants.community.fetch_page_content")
+    def test_fetch_tool_without_url(self, mock_fetch):
+        """fetch_current_page should not fetch anything when no URL is known."""
+        assistant = self._pooled_assistant()
+        fetch_tool = next(t for t in assistant.tools if t.name == "fetch_current_page")
+
+        result = fetch_tool.invoke({})
+
+        assert "No page URL" in result
+        mock_fetch.assert_not_called()
+
+
+class TestSplitPromptLayout:
+    """Tests for prompt_layout="split", which keeps the system prompt cache-stable."""
+
+    def _split_assistant(self, page_context=None):
+        model = MagicMock()
+        model.bind_tools = MagicMock(return_value=model)
+        config = registry.get("hed").community_config.model_copy(update={"prompt_layout": "split"})
+        return CommunityAssistant(
+            model=model,
+            config=config,
+            preload_docs=False,
+            page_context=page_context,
+            page_tool=True,
+        )
+
+    @staticmethod
+    def _run_config(url):
+        return {"configurable": {"page_context": PageContext(url=url, title="Page")}}
+
+    def test_system_prompt_identical_across_pages(self):
+        """Different pages must produce a byte-identical system prompt."""
+        assistant = self._split_assistant()
+        prompt_a = assistant._resolve_system_prompt(self._run_config("https://hedtags.org/a"))
+        prompt_b = assistant._resolve_system_prompt(self._run_config("https://hedtags.org/b"))
+
+        assert prompt_a == prompt_b == assistant.system_prompt
+        assert "Page Context" not in prompt_a
+
+    def test_constructor_page_context_not_in_system_prompt(self):
+        """A page context given at build time also stays out of the system prompt."""
+        assistant = self._split_assistant(PageContext(url="https://hedtags.org/docs"))
+        assert "https://hedtags.org/docs" not in assistant.system_prompt
+        assert self._split_assistant().system_prompt == assistant.system_prompt
+
+    def test_page_context_sent_as_uncached_message(self):
+        """Page context follows the system prompt as its own, uncached message."""
+        assistant = self._split_assistant()
+        state: BaseAgentState = {"messages": [HumanMessage(content="What is HED?")]}
+
+        messages = assistant._prepare_messages(state, self._run_config("https://hedtags.org/a"))
+
+        assert messages[0].content == assistant.system_prompt
+        assert isinstance(messages[1], SystemMessage)
+        assert "https://hedtags.org/a" in messages[1].content
+        assert messages[1].additional_kwargs[NO_CACHE_KWARG] is True
+        assert messages[2].content == "What is HED?"
+
+    def test_no_context_message_without_page(self):
+        """Without a page context, no extra message is added."""
+        assistant = self._split_assistant()
+        assert assistant._resolve_context_messages(None) == []
+
+    def test_inline_layout_has_no_context_messages(self):
+        """The default inline layout keeps page context in the system prompt."""
+        model = MagicMock()
+        model.bind_tools = MagicMock(return_value=model)
+        assistant = registry.create_assistant(
+            "hed", model=model, preload_docs=False, page_tool=True
+        )
+        config = self._run_config("https://hedtags.org/a")
+
+        assert assistant._resolve_context_messages(config) == []
+        assert "https://hedtags.org/a" in assistant._resolve_system_prompt(config)
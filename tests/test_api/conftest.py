@@ -0,0 +1,13 @@
+"""Shared fixtures for API tests."""
+
+import pytest
+
+from src.api.response_cache import public_response_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_public_response_cache():
+    """Public endpoint responses are cached per process; isolate each test."""
+    public_response_cache.clear()
+    yield
+    public_response_cache.clear()
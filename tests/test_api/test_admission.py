@@ -0,0 +1,181 @@
+"""Tests for agent run admission control."""
+
+import asyncio
+
+import pytest
+
+from src.api.admission import AdmissionController, AdmissionRejected
+from src.metrics.prometheus import ADMISSION_REJECTED, REGISTRY
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = {
+        "max_concurrent": 2,
+        "max_per_community": 1,
+        "max_queue_per_community": 2,
+        "queue_timeout_seconds": 1.0,
+    }
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+async def _settle() -> None:
+    """Let queued waiters run."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def _clear_metrics():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    async def test_admits_under_limits(self):
+        """Should admit immediately while below both limits."""
+        controller = _controller()
+        first = await controller.acquire("a")
+        second = await controller.acquire("b")
+        assert controller.stats()["running"] == {"a": 1, "b": 1}
+        first.release()
+        second.release()
+        assert controller.stats()["running"] == {}
+
+    async def test_waiter_starts_when_slot_frees(self):
+        """Should queue past the community limit and start in FIFO order."""
+        controller = _controller()
+        held = await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("a"))
+        await _settle()
+        assert controller.stats()["queued"] == {"a": 1}
+        assert not waiter.done()
+
+        held.release()
+        permit = await asyncio.wait_for(waiter, 1)
+        assert controller.stats() == {"running": {"a": 1}, "queued": {}}
+        permit.release()
+
+    async def test_saturated_community_does_not_block_others(self):
+        """Should skip a head waiter whose community is at its limit."""
+        controller = _controller(max_concurrent=2, max_per_community=1)
+        a1 = await controller.acquire("a")
+        b1 = await controller.acquire("b")
+        a2 = asyncio.create_task(controller.acquire("a"))
+        c1 = asyncio.create_task(controller.acquire("c"))
+        await _settle()
+        assert controller.stats()["queued"] == {"a": 1, "c": 1}
+
+        # The freed global slot goes to "c"; "a" is still at its limit
+        b1.release()
+        c1_permit = await asyncio.wait_for(c1, 1)
+        assert not a2.done()
+
+        a1.release()
+        a2_permit = await asyncio.wait_for(a2, 1)
+        a2_permit.release()
+        c1_permit.release()
+
+    async def test_rejects_when_queue_full(self):
+        """Should reject with retry_after once the community queue is full."""
+        controller = _controller(max_queue_per_community=1, queue_timeout_seconds=2.5)
+        held = await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("a"))
+        await _settle()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("a")
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after == 3
+        assert ADMISSION_REJECTED.value(community="a", reason="queue_full") == 1
+
+        held.release()
+        (await waiter).release()
+
+    async def test_rejects_after_timeout(self):
+        """Should reject a waiter whose wait times out and drop it from the queue."""
+        controller = _controller(queue_timeout_seconds=0.01)
+        held = await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("a")
+        assert exc_info.value.reason == "timeout"
+        assert controller.stats()["queued"] == {}
+
+        held.release()
+        assert controller.stats()["running"] == {}
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Should remove a cancelled waiter without leaking a slot."""
+        controller = _controller()
+        held = await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("a"))
+        await _settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        held.release()
+        assert controller.stats() == {"running": {}, "queued": {}}
+
+    async def test_release_is_idempotent(self):
+        """Should count a permit once even if released twice."""
+        controller = _controller()
+        permit = await controller.acquire("a")
+        other = await controller.acquire("b")
+        permit.release()
+        permit.release()
+        assert controller.stats()["running"] == {"b": 1}
+        other.release()
+
+    async def test_zero_means_unlimited(self):
+        """Should not limit concurrency when limits are 0."""
+        controller = _controller(max_concurrent=0, max_per_community=0)
+        permits = [await controller.acquire("a") for _ in range(10)]
+        assert controller.stats()["running"] == {"a": 10}
+        for permit in permits:
+            permit.release()
+
+    async def test_zero_queue_bound_means_unbounded(self):
+        """Should queue any number of waiters when the queue bound is 0."""
+        controller = _controller(max_queue_per_community=0)
+        held = await controller.acquire("a")
+        waiters = [asyncio.create_task(controller.acquire("a")) for _ in range(5)]
+        await _settle()
+        assert controller.stats()["queued"] == {"a": 5}
+
+        held.release()
+        for waiter in waiters:
+            (await asyncio.wait_for(waiter, 1)).release()
+
+    async def test_zero_timeout_waits_indefinitely(self):
+        """Should keep a waiter queued past any timeout when the timeout is 0."""
+        controller = _controller(queue_timeout_seconds=0)
+        assert controller.retry_after == 1
+        held = await controller.acquire("a")
+        waiter = asyncio.create_task(controller.acquire("a"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        held.release()
+        (await asyncio.wait_for(waiter, 1)).release()
+
+    async def test_exports_queue_gauges(self):
+        """Should export running and queued gauges through the registry."""
+        from src.api import admission
+
+        controller = _controller()
+        admission.set_admission_controller(controller)
+        try:
+            held = await controller.acquire("a")
+            waiter = asyncio.create_task(controller.acquire("a"))
+            await _settle()
+            text = REGISTRY.render()
+            assert 'osa_agent_runs_in_progress{community="a"} 1' in text
+            assert 'osa_admission_queue_depth{community="a"} 1' in text
+            held.release()
+            (await waiter).release()
+        finally:
+            admission.set_admission_controller(None)
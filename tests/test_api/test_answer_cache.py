@@ -0,0 +1,77 @@
+"""Tests for the /ask answer cache."""
+
+from src.api import answer_cache as answer_cache_module
+from src.api.answer_cache import AnswerCache
+
+
+class TestAnswerCache:
+    """Tests for AnswerCache."""
+
+    def test_put_and_get(self):
+        """Should return a stored answer under the same key."""
+        cache = AnswerCache()
+        key = cache.key_for("hed", 0, "what is hed?", None)
+        assert cache.get(key) is None
+        assert cache.put("hed", 0, key, "answer", ttl_seconds=60)
+        assert cache.get(key) == "answer"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_keys_differ_by_parts_and_generation(self):
+        """Should key on community, generation and request parts."""
+        key = AnswerCache.key_for("hed", 0, "q", "model-a")
+        assert key != AnswerCache.key_for("bids", 0, "q", "model-a")
+        assert key != AnswerCache.key_for("hed", 1, "q", "model-a")
+        assert key != AnswerCache.key_for("hed", 0, "q", "model-b")
+
+    def test_expired_entries_are_misses(self, monkeypatch):
+        """Should drop entries once their TTL has passed."""
+        now = [100.0]
+        monkeypatch.setattr(answer_cache_module.time, "monotonic", lambda: now[0])
+        cache = AnswerCache()
+        key = cache.key_for("hed", 0, "q")
+        cache.put("hed", 0, key, "answer", ttl_seconds=10)
+        now[0] = 110.0
+        assert cache.get(key) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_zero_ttl_is_not_stored(self):
+        """Should not store anything when the TTL is 0."""
+        cache = AnswerCache()
+        key = cache.key_for("hed", 0, "q")
+        assert not cache.put("hed", 0, key, "answer", ttl_seconds=0)
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self):
+        """Should evict the least recently used entry past max_entries."""
+        cache = AnswerCache(max_entries=2)
+        keys = [cache.key_for("hed", 0, str(i)) for i in range(3)]
+        cache.put("hed", 0, keys[0], "0", 60)
+        cache.put("hed", 0, keys[1], "1", 60)
+        cache.get(keys[0])
+        cache.put("hed", 0, keys[2], "2", 60)
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == "0"
+        assert cache.get(keys[2]) == "2"
+
+    def test_invalidate_drops_community_and_bumps_generation(self):
+        """Should drop only that community's answers and start a new generation."""
+        cache = AnswerCache()
+        hed_key = cache.key_for("hed", 0, "q")
+        bids_key = cache.key_for("bids", 0, "q")
+        cache.put("hed", 0, hed_key, "hed answer", 60)
+        cache.put("bids", 0, bids_key, "bids answer", 60)
+
+        assert cache.invalidate("hed") == 1
+        assert cache.generation("hed") == 1
+        assert cache.get(hed_key) is None
+        assert cache.get(bids_key) == "bids answer"
+
+    def test_stale_generation_is_not_stored(self):
+        """Should not store an answer computed before an invalidation."""
+        cache = AnswerCache()
+        generation = cache.generation("hed")
+        key = cache.key_for("hed", generation, "q")
+        cache.invalidate("hed")
+        assert not cache.put("hed", generation, key, "stale", 60)
+        assert cache.get(key) is None
@@ -288,6 +288,69 @@ class TestCreateCommunityAssistant:
         with pytest.raises(ValueError, match="Unknown community: fake_community"):
             create_community_assistant("fake_community")
 
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from src.assistants.pool import AssistantPool
+
+        pool = AssistantPool()
+        monkeypatch.setattr("src.api.routers.community.get_assistant_pool", lambda: pool)
+
+        def fake_llm(**_kwargs):
+            model = MagicMock()
+            model.bind_tools = MagicMock(return_value=model)
+            return model
+
+        monkeypatch.setattr("src.api.routers.community.create_openrouter_llm", fake_llm)
+        return pool
+
+    def test_reuses_pooled_assistant_across_requests(self, pool) -> None:
+        """Requests sharing community, model and key source should share one assistant."""
+        from src.api.routers.community import create_community_assistant
+
+        first = create_community_assistant("hed", byok="sk-user-1", preload_docs=False)
+        second = create_community_assistant("hed", byok="sk-user-2", preload_docs=False)
+
+        assert first.assistant is second.assistant
+        assert first.assistant.get_graph() is second.assistant.get_graph()
+        assert pool.stats()["misses"] == 1
+
+    def test_per_request_values_in_run_config(self, pool) -> None:  # noqa: ARG002
+        """API key, cache user id and page context should travel in the run config."""
+        from src.api.routers.community import PageContext, create_community_assistant
+
+        awm = create_community_assistant(
+            "hed",
+            byok="sk-user-1",
+            user_id="user-1",
+            preload_docs=False,
+            page_context=PageContext(url="https://hedtags.org", title="HED"),
+        )
+
+        configurable = awm.run_config["configurable"]
+        assert configurable["api_key"].get_secret_value() == "sk-user-1"
+        assert configurable["user_id"] == "user-1"
+        assert configurable["page_context"].url == "https://hedtags.org"
+        # The secret must not leak into the repr used by logs and traces
+        assert "sk-user-1" not in repr(awm.run_config)
+
+    def test_page_url_selects_page_tool_variant(self, pool) -> None:
+        """Requests with a page URL should use an assistant that has the page tool."""
+        from src.api.routers.community import PageContext, create_community_assistant
+
+        plain = create_community_assistant("hed", byok="sk", preload_docs=False)
+        with_page = create_community_assistant(
+            "hed",
+            byok="sk",
+            preload_docs=False,
+            page_context=PageContext(url="https://hedtags.org"),
+        )
+
+        assert plain.assistant is not with_page.assistant
+        assert "fetch_current_page" in [t.name for t in with_page.assistant.tools]
+        assert len(pool) == 2
+
 
 class TestSessionEndpointBehavior:
     """Tests for session endpoint behavior using unit-level functions."""
@@ -438,3 +501,40 @@ class TestCommunityConfigHealthStatus:
                 return
 
         pytest.skip("No community with openrouter_api_key_env_var configured")
+
+
+class TestAdmissionPermitRelease:
+    """Admission slots are given back when a request fails before its run starts."""
+
+    @pytest.fixture
+    def controller(self, monkeypatch):
+        import sqlite3
+
+        from src.api import admission
+        from src.api.security import verify_api_key
+
+        controller = admission.AdmissionController(
+            max_concurrent=1,
+            max_per_community=1,
+            max_queue_per_community=1,
+            queue_timeout_seconds=0.1,
+        )
+        admission.set_admission_controller(controller)
+
+        def locked(*_args, **_kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr("src.api.routers.community.start_turn", locked)
+        app = FastAPI()
+        app.include_router(create_community_router("hed"))
+        app.dependency_overrides[verify_api_key] = lambda: None
+        self.client = TestClient(app, raise_server_exceptions=False)
+        yield controller
+        admission.set_admission_controller(None)
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_session_store_error_releases_slot(self, controller, stream: bool) -> None:
+        for _ in range(2):
+            response = self.client.post("/hed/chat", json={"message": "hi", "stream": stream})
+            assert response.status_code == 500
+        assert controller.stats()["running"] == {}
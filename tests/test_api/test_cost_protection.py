@@ -7,7 +7,8 @@ but allowed when users provide their own API key (BYOK).
 import pytest
 from fastapi import HTTPException
 
-from src.api.routers.community import _check_model_cost
+from src.api.routers.community import _check_budget_limit, _check_model_cost
+from src.metrics.budget import get_spend_tracker
 from src.metrics.cost import COST_BLOCK_THRESHOLD, COST_WARN_THRESHOLD, MODEL_PRICING
 
 
@@ -90,3 +91,50 @@ class TestCheckModelCost:
         assert COST_WARN_THRESHOLD < COST_BLOCK_THRESHOLD
         assert COST_WARN_THRESHOLD > 0
         assert COST_BLOCK_THRESHOLD > 0
+
+
+class TestCheckBudgetLimit:
+    """Tests for _check_budget_limit() request-time budget enforcement."""
+
+    @pytest.fixture
+    def community_info(self):
+        from src.assistants.registry import AssistantInfo
+        from src.core.config.community import BudgetConfig, CommunityConfig
+
+        config = CommunityConfig(
+            id="budgeted",
+            name="Budgeted",
+            description="Community with a budget",
+            budget=BudgetConfig(daily_limit_usd=1.0, monthly_limit_usd=10.0),
+        )
+        info = AssistantInfo(
+            id="budgeted",
+            name="Budgeted",
+            description="Community with a budget",
+            community_config=config,
+        )
+        tracker = get_spend_tracker()
+        tracker.clear()
+        yield info
+        tracker.clear()
+
+    def test_allows_under_budget(self, community_info) -> None:
+        get_spend_tracker().record("budgeted", 0.5)
+        _check_budget_limit(community_info, "platform")
+
+    def test_blocks_when_daily_budget_reached(self, community_info) -> None:
+        get_spend_tracker().record("budgeted", 1.0)
+        with pytest.raises(HTTPException) as exc_info:
+            _check_budget_limit(community_info, "community")
+        assert exc_info.value.status_code == 429
+        assert "daily budget" in exc_info.value.detail
+
+    def test_byok_never_blocked(self, community_info) -> None:
+        get_spend_tracker().record("budgeted", 100.0)
+        _check_budget_limit(community_info, "byok")
+
+    def test_no_budget_configured(self) -> None:
+        from src.assistants.registry import AssistantInfo
+
+        info = AssistantInfo(id="free", name="Free", description="No budget")
+        _check_budget_limit(info, "platform")
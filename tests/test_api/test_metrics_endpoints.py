@@ -418,3 +418,42 @@ class TestScopedKeyOnGlobalEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "communities" in data
+
+
+class TestWriterStatus:
+    """Tests for GET /metrics/writer."""
+
+    @pytest.mark.usefixtures("isolated_metrics", "scoped_auth_env")
+    def test_admin_sees_writer_status(self, client):
+        response = client.get("/metrics/writer", headers={"X-API-Key": ADMIN_KEY})
+        assert response.status_code == 200
+        assert "running" in response.json()
+
+    @pytest.mark.usefixtures("isolated_metrics", "scoped_auth_env")
+    def test_community_key_forbidden(self, client):
+        response = client.get("/metrics/writer", headers={"X-API-Key": COMMUNITY_KEY})
+        assert response.status_code == 403
+
+
+class TestPrometheusEndpoint:
+    """Tests for GET /metrics/prometheus."""
+
+    @pytest.mark.usefixtures("scoped_auth_env")
+    def test_admin_gets_text_exposition(self, client):
+        response = client.get("/metrics/prometheus", headers={"X-API-Key": ADMIN_KEY})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE osa_http_requests_total counter" in response.text
+        assert "# TYPE osa_http_request_duration_seconds histogram" in response.text
+
+    @pytest.mark.usefixtures("scoped_auth_env")
+    def test_community_key_forbidden(self, client):
+        response = client.get("/metrics/prometheus", headers={"X-API-Key": COMMUNITY_KEY})
+        assert response.status_code == 403
+
+    @pytest.mark.usefixtures("scoped_auth_env")
+    def test_does_not_touch_metrics_db(self, client):
+        with patch("src.metrics.db.get_metrics_connection") as mock_conn:
+            response = client.get("/metrics/prometheus", headers={"X-API-Key": ADMIN_KEY})
+        assert response.status_code == 200
+        mock_conn.assert_not_called()
@@ -396,3 +396,28 @@ class TestCommunityMetricsValues:
                 assert tool_entry["count"] > 0
             checked += 1
         assert checked > 0, "Expected at least one community with a registered route"
+
+
+class TestPublicResponseCaching:
+    """Public endpoints are cached briefly and support conditional requests."""
+
+    @pytest.mark.usefixtures("isolated_metrics", "noauth_env")
+    def test_sets_etag_and_cache_control(self, client):
+        response = client.get("/hed/metrics/public")
+        assert response.headers["etag"]
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+    @pytest.mark.usefixtures("isolated_metrics", "noauth_env")
+    def test_if_none_match_returns_304(self, client):
+        etag = client.get("/metrics/public/overview").headers["etag"]
+        response = client.get("/metrics/public/overview", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    @pytest.mark.usefixtures("isolated_metrics", "noauth_env")
+    def test_repeat_request_does_not_query_db(self, client):
+        client.get("/hed/metrics/public/usage?period=daily")
+        with patch("src.api.routers.community.get_public_usage_stats") as mock_stats:
+            response = client.get("/hed/metrics/public/usage?period=daily")
+        assert response.status_code == 200
+        mock_stats.assert_not_called()
@@ -0,0 +1,121 @@
+"""Tests for the public endpoint response cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.api.response_cache import ResponseCache, _etag_matches
+
+
+def _request(path: str = "/hed/metrics/public", query: str = "", headers=None) -> Request:
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": raw_headers,
+        }
+    )
+
+
+@pytest.fixture
+def ttl_settings():
+    settings = MagicMock(public_cache_ttl_seconds=60)
+    with patch("src.api.response_cache.get_settings", return_value=settings):
+        yield settings
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_key_sorts_query_params(self):
+        a = ResponseCache.key_for(_request(query="period=daily&x=1"))
+        b = ResponseCache.key_for(_request(query="x=1&period=daily"))
+        assert a == b
+        assert a != ResponseCache.key_for(_request(query="period=weekly&x=1"))
+
+    @pytest.mark.usefixtures("ttl_settings")
+    def test_second_request_served_from_cache(self):
+        cache = ResponseCache()
+        build = MagicMock(return_value={"total_requests": 3})
+
+        first = cache.respond(_request(), build)
+        second = cache.respond(_request(), build)
+
+        assert build.call_count == 1
+        assert first.body == second.body == b'{"total_requests":3}'
+        assert first.headers["etag"] == second.headers["etag"]
+        assert first.headers["cache-control"] == "public, max-age=60"
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.usefixtures("ttl_settings")
+    def test_if_none_match_returns_304(self):
+        cache = ResponseCache()
+        etag = cache.respond(_request(), lambda: {"a": 1}).headers["etag"]
+
+        response = cache.respond(_request(headers={"If-None-Match": etag}), lambda: {"a": 1})
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+        assert cache.stats()["not_modified"] == 1
+
+    @pytest.mark.usefixtures("ttl_settings")
+    def test_expired_entry_is_rebuilt(self):
+        cache = ResponseCache()
+        build = MagicMock(return_value={"a": 1})
+        with patch("src.api.response_cache.time.monotonic", return_value=1000.0):
+            cache.respond(_request(), build)
+        with patch("src.api.response_cache.time.monotonic", return_value=1061.0):
+            cache.respond(_request(), build)
+        assert build.call_count == 2
+
+    def test_zero_ttl_disables_caching(self, ttl_settings):
+        ttl_settings.public_cache_ttl_seconds = 0
+        cache = ResponseCache()
+        build = MagicMock(return_value={"a": 1})
+
+        response = cache.respond(_request(), build)
+        cache.respond(_request(), build)
+
+        assert build.call_count == 2
+        assert response.headers["cache-control"] == "public, max-age=0"
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.usefixtures("ttl_settings")
+    def test_errors_are_not_cached(self):
+        cache = ResponseCache()
+
+        def failing():
+            raise HTTPException(status_code=503, detail="unavailable")
+
+        with pytest.raises(HTTPException):
+            cache.respond(_request(), failing)
+        assert cache.stats()["entries"] == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", b"1", 60)
+        cache.put("b", b"2", 60)
+        cache.get("a")
+        cache.put("c", b"3", 60)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match comparison."""
+
+    def test_matches(self):
+        assert _etag_matches('"abc"', '"abc"')
+        assert _etag_matches('W/"abc"', '"abc"')
+        assert _etag_matches('"x", "abc"', '"abc"')
+        assert _etag_matches("*", '"abc"')
+
+    def test_no_match(self):
+        assert not _etag_matches(None, '"abc"')
+        assert not _etag_matches('"other"', '"abc"')
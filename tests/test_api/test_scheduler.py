@@ -5,15 +5,23 @@ Tests ensure the scheduler correctly:
 - Registers per-community jobs with correct cron triggers
 - Handles communities without sync config
 - Seeds empty databases on startup
+- Refreshes preloaded docs and drops pooled assistants when they change
+- Invalidates cached /ask answers after syncs and doc changes
 """
 
+import httpx
 import pytest
 
+import src.api.scheduler as scheduler_module
+from src.api.answer_cache import answer_cache
 from src.api.scheduler import (
     _SYNC_TYPE_MAP,
     _failure_key,
+    _refresh_preloaded_docs,
     _reset_failure,
+    _run_github_sync_for_communities,
     _sync_failures,
+    _timed_sync,
     _track_failure,
 )
 from src.assistants import discover_assistants, registry
@@ -212,3 +220,120 @@ class TestFailureTracking:
     def test_reset_failure_noop_if_not_tracked(self):
         """reset_failure should not error if no failure was tracked."""
         _reset_failure("nonexistent", "nonexistent")
+
+
+class TestPreloadedDocRefresh:
+    """Tests for the scheduled preloaded documentation refresh."""
+
+    class _FakeFetcher:
+        def __init__(self, result):
+            self.result = result
+            self.refreshed: list[str] = []
+
+        def refresh(self, doc):
+            self.refreshed.append(doc.source_url)
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+
+    class _FakePool:
+        def __init__(self):
+            self.invalidated: list[str] = []
+
+        def invalidate(self, community_id=None):
+            self.invalidated.append(community_id)
+            return 1
+
+    def _run(self, monkeypatch, result):
+        fetcher = self._FakeFetcher(result)
+        pool = self._FakePool()
+        monkeypatch.setattr(scheduler_module, "get_fetcher", lambda: fetcher)
+        monkeypatch.setattr(scheduler_module, "get_assistant_pool", lambda: pool)
+        _refresh_preloaded_docs()
+        return fetcher, pool
+
+    def test_changed_docs_invalidate_pool(self, monkeypatch):
+        """Communities whose preloaded docs changed get their pooled assistants dropped."""
+        fetcher, pool = self._run(monkeypatch, True)
+        assert fetcher.refreshed
+        assert "hed" in pool.invalidated
+
+    def test_changed_docs_invalidate_cached_answers(self, monkeypatch):
+        """Communities whose preloaded docs changed get a new answer cache generation."""
+        before = answer_cache.generation("hed")
+        self._run(monkeypatch, True)
+        assert answer_cache.generation("hed") == before + 1
+
+    def test_unchanged_docs_keep_pool(self, monkeypatch):
+        """A 304 for every doc leaves pooled assistants alone."""
+        fetcher, pool = self._run(monkeypatch, False)
+        assert fetcher.refreshed
+        assert pool.invalidated == []
+
+    def test_refresh_errors_are_logged_not_raised(self, monkeypatch):
+        """Upstream failures do not abort the refresh job."""
+        _, pool = self._run(monkeypatch, httpx.ConnectError("down"))
+        assert pool.invalidated == []
+
+
+class TestTimedSync:
+    """Tests for the _timed_sync job wrapper."""
+
+    def test_success_invalidates_cached_answers(self):
+        """A successful sync bumps the community's answer cache generation."""
+        job = _timed_sync("github")(lambda _community_id: True)
+        before = answer_cache.generation("hed")
+        assert job("hed") is True
+        assert answer_cache.generation("hed") == before + 1
+
+    def test_failure_keeps_cached_answers(self):
+        """A failed sync leaves cached answers alone."""
+        job = _timed_sync("github")(lambda _community_id: False)
+        before = answer_cache.generation("hed")
+        assert job("hed") is False
+        assert answer_cache.generation("hed") == before
+
+
+class TestGitHubSync:
+    """Tests for the cross-community GitHub sync job."""
+
+    @pytest.fixture
+    def communities(self) -> list[str]:
+        ids = [
+            info.id
+            for info in registry.list_all()
+            if info.community_config
+            and info.community_config.github
+            and info.community_config.github.repos
+        ]
+        if len(ids) < 2:
+            pytest.skip("Need two communities with GitHub repos")
+        return ids[:2]
+
+    def test_one_run_for_all_communities(self, monkeypatch, communities):
+        """Every community's repos go through a single sync_all_repos call."""
+        calls = []
+
+        def fake_sync_all_repos(repos_by_project, **_kwargs):
+            calls.append(dict(repos_by_project))
+            return {project: dict.fromkeys(repos, 1) for project, repos in repos_by_project.items()}
+
+        monkeypatch.setattr(scheduler_module, "init_db", lambda _community_id: None)
+        monkeypatch.setattr(scheduler_module, "sync_all_repos", fake_sync_all_repos)
+
+        assert _run_github_sync_for_communities(communities) == communities
+        assert len(calls) == 1
+        assert set(calls[0]) == set(communities)
+
+    def test_failed_run_fails_every_community(self, monkeypatch, communities):
+        """A run that raises is tracked as a failure for each community."""
+
+        def failing_sync_all_repos(_repos_by_project, **_kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(scheduler_module, "init_db", lambda _community_id: None)
+        monkeypatch.setattr(scheduler_module, "sync_all_repos", failing_sync_all_repos)
+
+        assert _run_github_sync_for_communities(communities) == []
+        for community_id in communities:
+            assert _sync_failures.pop(_failure_key("github", community_id)) == 1
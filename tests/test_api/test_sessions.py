@@ -0,0 +1,186 @@
+"""Tests for chat session stores."""
+
+import asyncio
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.api.sessions import (
+    SESSION_TTL_HOURS,
+    ChatSession,
+    MemorySessionStore,
+    SQLiteSessionStore,
+    close_session_store,
+    get_or_create_session,
+    get_session,
+    run_session_io,
+    set_session_store,
+    start_turn,
+)
+
+
+def _expire(session: ChatSession) -> None:
+    session.last_active = datetime.now(UTC) - timedelta(hours=SESSION_TTL_HOURS + 1)
+
+
+class TestMemorySessionStore:
+    """Tests for MemorySessionStore."""
+
+    def test_evicts_least_recently_active(self):
+        store = MemorySessionStore(max_sessions=2)
+        a = store.create("hed", "a")
+        store.create("hed", "b")
+        a.add_user_message("still here")  # a is now the most recently active
+        store.create("hed", "c")
+
+        assert store.get("hed", "b") is None
+        assert store.get("hed", "a") is a
+        assert [s.session_id for s in store.list_sessions("hed")] == ["a", "c"]
+
+    def test_prunes_expired_sessions_from_the_front(self):
+        store = MemorySessionStore()
+        old = store.create("hed", "old")
+        store.create("hed", "new")
+        _expire(old)
+
+        assert [s.session_id for s in store.list_sessions("hed")] == ["new"]
+        assert store.counts() == {"hed": 1}
+
+    def test_expired_session_not_returned(self):
+        store = MemorySessionStore()
+        _expire(store.create("hed", "s1"))
+        assert store.get("hed", "s1") is None
+
+    def test_communities_are_isolated(self):
+        store = MemorySessionStore(max_sessions=1)
+        store.create("hed", "s1")
+        store.create("bids", "s1")
+        assert store.get("hed", "s1") is not store.get("bids", "s1")
+
+
+class TestSQLiteSessionStore:
+    """Tests for SQLiteSessionStore."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        return tmp_path / "sessions.db"
+
+    def test_history_persists_across_stores(self, db_path):
+        store = SQLiteSessionStore(db_path)
+        session = store.create("hed", "s1")
+        session.add_user_message("What is HED?")
+        session.add_assistant_message("A tagging system.")
+        store.close()
+
+        reopened = SQLiteSessionStore(db_path)
+        try:
+            loaded = reopened.get("hed", "s1")
+            assert loaded is not None
+            assert loaded.message_count == 2
+            assert [m.content for m in loaded.messages] == ["What is HED?", "A tagging system."]
+            assert type(loaded.messages[1]).__name__ == "AIMessage"
+        finally:
+            reopened.close()
+
+    def test_history_loaded_lazily(self, db_path):
+        store = SQLiteSessionStore(db_path)
+        try:
+            store.create("hed", "s1").add_user_message("hi")
+            loaded = store.get("hed", "s1")
+            assert loaded._messages is None
+            assert loaded.to_info().message_count == 1
+            loaded.add_assistant_message("hello")
+            assert loaded._messages is None
+            assert [m.content for m in loaded.messages] == ["hi", "hello"]
+        finally:
+            store.close()
+
+    def test_shared_between_workers(self, db_path):
+        worker_a = SQLiteSessionStore(db_path)
+        worker_b = SQLiteSessionStore(db_path)
+        try:
+            worker_a.create("hed", "s1").add_user_message("from a")
+            session = worker_b.get("hed", "s1")
+            session.add_assistant_message("from b")
+            assert [m.content for m in worker_a.get("hed", "s1").messages] == ["from a", "from b"]
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    def test_evicts_least_recently_active(self, db_path):
+        store = SQLiteSessionStore(db_path, max_sessions=2)
+        try:
+            store.create("hed", "a")
+            store.create("hed", "b")
+            store.get("hed", "a").add_user_message("still here")
+            store.create("hed", "c")
+            assert [s.session_id for s in store.list_sessions("hed")] == ["a", "c"]
+        finally:
+            store.close()
+
+    def test_delete_removes_messages(self, db_path):
+        store = SQLiteSessionStore(db_path)
+        try:
+            store.create("hed", "s1").add_user_message("hi")
+            assert store.delete("hed", "s1") is True
+            assert store.delete("hed", "s1") is False
+            store.create("hed", "s1")
+            assert store.get("hed", "s1").messages == []
+        finally:
+            store.close()
+
+    def test_expired_session_removed(self, db_path):
+        store = SQLiteSessionStore(db_path)
+        try:
+            store.create("hed", "s1")
+            stale = (datetime.now(UTC) - timedelta(hours=SESSION_TTL_HOURS + 1)).timestamp()
+            store._conn.execute("UPDATE chat_sessions SET last_active = ?", (stale,))
+            assert store.get("hed", "s1") is None
+            assert store.list_sessions("hed") == []
+        finally:
+            store.close()
+
+
+class TestModuleFunctions:
+    """get_or_create_session() and friends use the configured store."""
+
+    def test_uses_configured_store(self, tmp_path):
+        store = SQLiteSessionStore(tmp_path / "sessions.db")
+        set_session_store(store)
+        try:
+            created = get_or_create_session("hed", None)
+            created.add_user_message("hi")
+            assert get_session("hed", created.session_id).message_count == 1
+            assert get_or_create_session("hed", created.session_id).message_count == 1
+        finally:
+            set_session_store(None)
+            store.close()
+
+
+class TestRunSessionIO:
+    """run_session_io keeps store calls off the event loop."""
+
+    async def test_loop_stays_responsive_while_db_locked(self, tmp_path):
+        db_path = tmp_path / "sessions.db"
+        set_session_store(SQLiteSessionStore(db_path, busy_timeout=2.0))
+        other_worker = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            other_worker.execute("BEGIN IMMEDIATE")
+            turn = asyncio.create_task(run_session_io(start_turn, "hed", None, "hi"))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 0.3
+            ticks = 0
+            while loop.time() < deadline:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert ticks >= 10
+            assert not turn.done()
+
+            other_worker.execute("COMMIT")
+            session = await asyncio.wait_for(turn, 2)
+            assert [m.content for m in session.messages] == ["hi"]
+        finally:
+            other_worker.close()
+            close_session_store()
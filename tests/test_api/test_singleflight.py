@@ -0,0 +1,150 @@
+"""Tests for singleflight coalescing of identical streaming requests."""
+
+import asyncio
+
+from src.api.singleflight import SingleFlight, flight_key, normalize_question
+
+
+class _Source:
+    """Controllable source stream that records whether it was closed."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self.closed = False
+
+    async def stream(self):
+        try:
+            while (chunk := await self.queue.get()) is not None:
+                yield chunk
+        finally:
+            self.closed = True
+
+
+async def _collect(chunks) -> list[str]:
+    return [chunk async for chunk in chunks]
+
+
+class TestKeys:
+    """Tests for normalize_question and flight_key."""
+
+    def test_normalize_question(self):
+        """Should ignore case and whitespace differences."""
+        assert normalize_question("  What is  HED?\n") == normalize_question("what is hed?")
+        assert normalize_question("What is HED?") != normalize_question("What is BIDS?")
+
+    def test_flight_key_distinguishes_parts(self):
+        """Should give different keys for different parts, equal keys for equal parts."""
+        assert flight_key("hed", "q", None) == flight_key("hed", "q", None)
+        assert flight_key("hed", "q", None) != flight_key("bids", "q", None)
+        assert flight_key("hed", "q", {"url": "a"}) != flight_key("hed", "q", {"url": "b"})
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight and SharedStream."""
+
+    async def test_join_without_flight(self):
+        """Should return None when nothing is in flight."""
+        assert SingleFlight().join("k") is None
+
+    async def test_followers_get_full_stream(self):
+        """Should replay earlier chunks to late joiners and fan out new ones."""
+        flights = SingleFlight()
+        source = _Source()
+        done = []
+        leader = flights.start("k", source.stream(), on_done=lambda: done.append(True))
+        leader_task = asyncio.create_task(_collect(leader.subscribe()))
+
+        await source.queue.put("a")
+        await asyncio.sleep(0.01)
+        follower = flights.join("k")
+        assert follower is leader
+        follower_task = asyncio.create_task(_collect(follower.subscribe()))
+
+        await source.queue.put("b")
+        await source.queue.put(None)
+        assert await asyncio.wait_for(leader_task, 1) == ["a", "b"]
+        assert await asyncio.wait_for(follower_task, 1) == ["a", "b"]
+        assert done == [True]
+        assert flights.join("k") is None
+        assert (flights.started, flights.joined) == (1, 1)
+
+    async def test_run_survives_leader_leaving(self):
+        """Should keep the run going while another subscriber is connected."""
+        flights = SingleFlight()
+        source = _Source()
+        shared = flights.start("k", source.stream())
+        leader = shared.subscribe()
+        follower_task = asyncio.create_task(_collect(flights.join("k").subscribe()))
+
+        await source.queue.put("a")
+        assert await anext(leader) == "a"
+        await leader.aclose()
+
+        await source.queue.put("b")
+        await source.queue.put(None)
+        assert await asyncio.wait_for(follower_task, 1) == ["a", "b"]
+
+    async def test_last_subscriber_leaving_cancels_run(self):
+        """Should cancel and close the source when nobody is listening."""
+        flights = SingleFlight()
+        source = _Source()
+        done = []
+        shared = flights.start("k", source.stream(), on_done=lambda: done.append(True))
+        subscriber = shared.subscribe()
+
+        await source.queue.put("a")
+        assert await anext(subscriber) == "a"
+        await subscriber.aclose()
+        assert flights.join("k") is None
+
+        await asyncio.sleep(0.01)
+        assert source.closed
+        assert done == [True]
+
+    async def test_unstarted_subscription_closed_cancels_run(self):
+        """Should cancel the run when the only subscription is closed before it starts."""
+        flights = SingleFlight()
+        source = _Source()
+        shared = flights.start("k", source.stream())
+        subscription = shared.subscribe()
+        await asyncio.sleep(0.01)
+        assert (shared.subscribers, source.closed) == (0, False)
+
+        subscription.close()
+        subscription.close()
+        await asyncio.sleep(0.01)
+        assert source.closed
+        assert flights.join("k") is None
+
+    async def test_pending_subscription_keeps_run_alive(self):
+        """Should not cancel while a joined subscription has yet to start reading."""
+        flights = SingleFlight()
+        source = _Source()
+        shared = flights.start("k", source.stream())
+        leader = shared.subscribe()
+        follower = flights.join("k").subscribe()
+
+        await source.queue.put("a")
+        assert await anext(leader) == "a"
+        await leader.aclose()
+        await asyncio.sleep(0.01)
+        assert not source.closed
+
+        await source.queue.put(None)
+        assert await asyncio.wait_for(_collect(follower), 1) == ["a"]
+
+    async def test_failing_source_is_logged(self, caplog):
+        """Should log a failed run and end every subscriber's stream."""
+
+        async def failing():
+            yield "a"
+            raise RuntimeError("boom")
+
+        flights = SingleFlight()
+        done = []
+        shared = flights.start("k", failing(), on_done=lambda: done.append(True))
+        assert await asyncio.wait_for(_collect(shared.subscribe()), 1) == ["a"]
+        await asyncio.sleep(0)
+        assert done == [True]
+        assert "Shared stream run failed" in caplog.text
+        assert not flights._tasks
@@ -0,0 +1,158 @@
+"""Tests for SSE encoding (content coalescing, keep-alives, tool output modes)."""
+
+import json
+
+from src.api.sse import KEEPALIVE_FRAME, TOOL_OUTPUT_PREVIEW_CHARS, SSEEncoder, dumps, frame
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _parse(data: str) -> list[dict]:
+    """Parse the data frames in a chunk of SSE output."""
+    return [
+        json.loads(line[len("data: ") :]) for line in data.split("\n") if line.startswith("data: ")
+    ]
+
+
+class TestFrame:
+    """Tests for dumps and frame."""
+
+    def test_frame_format(self):
+        """Should produce a compact data frame terminated by a blank line."""
+        assert frame({"event": "done"}) == 'data: {"event":"done"}\n\n'
+
+    def test_non_ascii_round_trips(self):
+        """Should keep non-ASCII text intact."""
+        assert json.loads(dumps({"content": "naïve – ✓"})) == {"content": "naïve – ✓"}
+
+
+class TestContentCoalescing:
+    """Tests for SSEEncoder.content and flush."""
+
+    def test_first_chunk_sent_immediately(self):
+        """Should not delay the first token."""
+        sse = SSEEncoder(clock=FakeClock())
+        assert _parse(sse.content("Hel")) == [{"event": "content", "content": "Hel"}]
+
+    def test_chunks_within_window_are_coalesced(self):
+        """Should buffer later chunks until the time window passes."""
+        clock = FakeClock()
+        sse = SSEEncoder(coalesce_seconds=0.05, clock=clock)
+        sse.content("a")
+        assert sse.content("b") == ""
+        clock.now = 0.01
+        assert sse.content("c") == ""
+        clock.now = 0.06
+        assert _parse(sse.content("d")) == [{"event": "content", "content": "bcd"}]
+
+    def test_size_limit_flushes(self):
+        """Should flush once the buffer reaches the size limit."""
+        sse = SSEEncoder(coalesce_chars=4, clock=FakeClock())
+        sse.content("x")
+        assert sse.content("ab") == ""
+        assert _parse(sse.content("cd")) == [{"event": "content", "content": "abcd"}]
+
+    def test_event_flushes_buffered_content_first(self):
+        """Should keep content ahead of the event that follows it."""
+        sse = SSEEncoder(clock=FakeClock())
+        sse.content("a")
+        sse.content("b")
+        assert _parse(sse.event({"event": "done"})) == [
+            {"event": "content", "content": "b"},
+            {"event": "done"},
+        ]
+
+    def test_content_is_preserved(self):
+        """Should emit exactly the streamed text, in order."""
+        clock = FakeClock()
+        sse = SSEEncoder(coalesce_chars=10, clock=clock)
+        chunks = [f"tok{i} " for i in range(50)]
+        out = ""
+        for i, chunk in enumerate(chunks):
+            clock.now = i * 0.01
+            out += sse.content(chunk)
+        out += sse.flush()
+        frames = _parse(out)
+        assert "".join(f["content"] for f in frames) == "".join(chunks)
+        assert len(frames) < len(chunks)
+
+
+class TestIdle:
+    """Tests for SSEEncoder.idle."""
+
+    def test_idle_flushes_stalled_content(self):
+        """Should send buffered content when the stream goes quiet."""
+        sse = SSEEncoder(clock=FakeClock())
+        sse.content("a")
+        sse.content("b")
+        assert _parse(sse.idle()) == [{"event": "content", "content": "b"}]
+
+    def test_keepalive_after_quiet_period(self):
+        """Should send a comment only after keepalive_seconds without writes."""
+        clock = FakeClock()
+        sse = SSEEncoder(keepalive_seconds=15, clock=clock)
+        sse.event({"event": "tool_start", "name": "search"})
+        clock.now = 10
+        assert sse.idle() == ""
+        clock.now = 15
+        assert sse.idle() == KEEPALIVE_FRAME
+        clock.now = 20
+        assert sse.idle() == ""
+
+
+class TestToolOutput:
+    """Tests for SSEEncoder.tool_end."""
+
+    def test_full(self):
+        """Should send the whole output by default."""
+        sse = SSEEncoder()
+        output = "x" * (TOOL_OUTPUT_PREVIEW_CHARS + 10)
+        assert _parse(sse.tool_end("search", output)) == [
+            {"event": "tool_end", "name": "search", "output": output}
+        ]
+
+    def test_truncated(self):
+        """Should cut long output and flag it."""
+        sse = SSEEncoder(tool_output="truncated")
+        (event,) = _parse(sse.tool_end("search", "x" * (TOOL_OUTPUT_PREVIEW_CHARS + 10)))
+        assert len(event["output"]) == TOOL_OUTPUT_PREVIEW_CHARS
+        assert event["truncated"] is True
+
+    def test_truncated_short_output_unchanged(self):
+        """Should leave short output as-is."""
+        sse = SSEEncoder(tool_output="truncated")
+        assert _parse(sse.tool_end("search", "ok")) == [
+            {"event": "tool_end", "name": "search", "output": "ok"}
+        ]
+
+    def test_none(self):
+        """Should send only the tool name."""
+        sse = SSEEncoder(tool_output="none")
+        assert _parse(sse.tool_end("search", "lots of docs")) == [
+            {"event": "tool_end", "name": "search"}
+        ]
+
+
+class TestOutcome:
+    """Tests for the completed/errored flags."""
+
+    def test_done_marks_completed(self):
+        sse = SSEEncoder()
+        sse.content("hi")
+        assert (sse.completed, sse.errored) == (False, False)
+        sse.event({"event": "done"})
+        assert (sse.completed, sse.errored) == (True, False)
+
+    def test_error_marks_errored(self):
+        sse = SSEEncoder()
+        sse.event({"event": "error", "message": "boom"})
+        sse.event({"event": "done"})
+        assert (sse.completed, sse.errored) == (True, True)
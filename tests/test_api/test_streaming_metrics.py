@@ -1,12 +1,26 @@
 """Tests for streaming metrics helpers.
 
-Tests the _extract_token_usage function which extracts token counts
-from LangGraph on_chat_model_end events during streaming.
+Tests the _extract_token_usage and _extract_cache_usage functions which
+extract token counts from LangGraph on_chat_model_end events during streaming.
 """
 
+import asyncio
 from types import SimpleNamespace
 
-from src.api.routers.community import _extract_token_usage
+import pytest
+
+from src.api.answer_cache import AnswerCache
+from src.api.routers import community
+from src.api.routers.community import (
+    IDLE_EVENT,
+    ClientDisconnected,
+    _approx_tokens,
+    _cache_ask_frames,
+    _extract_cache_usage,
+    _extract_token_usage,
+    _stream_graph_events,
+)
+from src.api.sse import SSEEncoder
 
 
 class TestExtractTokenUsage:
@@ -94,3 +108,179 @@ class TestExtractTokenUsage:
 
         msg = AIMessage(content="hello")
         assert _extract_token_usage({"output": msg}) == (0, 0)
+
+
+class TestExtractCacheUsage:
+    """Tests for _extract_cache_usage."""
+
+    def test_cache_details(self):
+        """Should extract cache read and creation counts."""
+        ai_msg = SimpleNamespace(
+            usage_metadata={
+                "input_tokens": 2000,
+                "output_tokens": 50,
+                "input_token_details": {"cache_read": 1500, "cache_creation": 200},
+            }
+        )
+        assert _extract_cache_usage({"output": ai_msg}) == (1500, 200)
+
+    def test_no_details(self):
+        """Should return (0, 0) when usage has no cache details."""
+        ai_msg = SimpleNamespace(usage_metadata={"input_tokens": 100, "output_tokens": 50})
+        assert _extract_cache_usage({"output": ai_msg}) == (0, 0)
+
+    def test_malformed_event(self):
+        """Should return (0, 0) for missing or malformed usage."""
+        assert _extract_cache_usage({}) == (0, 0)
+        assert _extract_cache_usage({"output": SimpleNamespace(usage_metadata="x")}) == (0, 0)
+
+
+class _FakeGraph:
+    """Graph whose event stream records whether it was closed."""
+
+    def __init__(self, events: list[dict], hang: bool = False) -> None:
+        self.events = events
+        self.hang = hang
+        self.closed = False
+
+    async def astream_events(self, state, version, config):  # noqa: ARG002
+        try:
+            for event in self.events:
+                yield event
+            if self.hang:
+                # Simulates a long tool call that produces no events
+                await asyncio.Event().wait()
+        finally:
+            self.closed = True
+
+
+class _FakeRequest:
+    """Request that reports a disconnect after a number of checks."""
+
+    def __init__(self, disconnect_after: int | None = None) -> None:
+        self.disconnect_after = disconnect_after
+        self.checks = 0
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.disconnect_after is not None and self.checks > self.disconnect_after
+
+
+class TestStreamGraphEvents:
+    """Tests for _stream_graph_events."""
+
+    @pytest.fixture(autouse=True)
+    def _fast_poll(self, monkeypatch):
+        monkeypatch.setattr(community, "DISCONNECT_POLL_SECONDS", 0.01)
+
+    async def test_yields_all_events_while_connected(self):
+        """Should pass every event through and close the stream at the end."""
+        graph = _FakeGraph([{"event": "a"}, {"event": "b"}])
+        events = [e async for e in _stream_graph_events(graph, {}, {}, _FakeRequest())]
+        assert [e["event"] for e in events] == ["a", "b"]
+        assert graph.closed
+
+    async def test_works_without_request(self):
+        """Should stream normally when there is no request to watch."""
+        graph = _FakeGraph([{"event": "a"}])
+        events = [e async for e in _stream_graph_events(graph, {}, {}, None)]
+        assert len(events) == 1
+
+    async def test_disconnect_during_silent_run_cancels_it(self):
+        """Should stop a run that is busy (no events) once the client leaves."""
+        graph = _FakeGraph([{"event": "tool_start"}], hang=True)
+        received = []
+        with pytest.raises(ClientDisconnected):
+            async with asyncio.timeout(2):
+                async for event in _stream_graph_events(graph, {}, {}, _FakeRequest(1)):
+                    received.append(event)
+        assert received == [{"event": "tool_start"}]
+        assert graph.closed
+
+    async def test_closing_consumer_closes_graph_stream(self):
+        """Should close the graph's event stream when the consumer stops early."""
+        graph = _FakeGraph([{"event": "a"}], hang=True)
+        stream = _stream_graph_events(graph, {}, {}, None)
+        assert await anext(stream) == {"event": "a"}
+        await stream.aclose()
+        assert graph.closed
+
+    async def test_cancelled_consumer_closes_graph_stream(self):
+        """Should close the graph's event stream when the consuming task is cancelled."""
+        graph = _FakeGraph([], hang=True)
+
+        async def consume():
+            async for _ in _stream_graph_events(graph, {}, {}, _FakeRequest()):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert graph.closed
+
+    async def test_idle_events_while_run_is_silent(self):
+        """Should yield IDLE_EVENT while waiting for a slow event."""
+        graph = _FakeGraph([{"event": "a"}], hang=True)
+        stream = _stream_graph_events(graph, {}, {}, None, idle_seconds=0.01)
+        assert await anext(stream) == {"event": "a"}
+        assert await anext(stream) is IDLE_EVENT
+        assert await anext(stream) is IDLE_EVENT
+        await stream.aclose()
+        assert graph.closed
+
+
+class TestCacheAskFrames:
+    """Tests for _cache_ask_frames."""
+
+    @staticmethod
+    async def _frames(sse, *events):
+        for event in events:
+            yield sse.content(event["content"]) if event["event"] == "content" else sse.event(event)
+
+    async def _run(self, monkeypatch, *events) -> tuple[AnswerCache, str, list[str]]:
+        cache = AnswerCache()
+        monkeypatch.setattr(community, "answer_cache", cache)
+        key = cache.key_for("hed", 0, "q")
+        sse = SSEEncoder()
+        stream = _cache_ask_frames(self._frames(sse, *events), sse, "hed", 0, key, 60)
+        return cache, key, [chunk async for chunk in stream]
+
+    async def test_complete_stream_is_cached(self, monkeypatch):
+        """Should pass frames through and cache them when the stream ends with done."""
+        cache, key, chunks = await self._run(
+            monkeypatch, {"event": "content", "content": "hi"}, {"event": "done"}
+        )
+        assert cache.get(key) == "".join(chunks)
+
+    async def test_error_stream_is_not_cached(self, monkeypatch):
+        """Should not cache a stream that reported an error."""
+        cache, key, _ = await self._run(
+            monkeypatch, {"event": "error", "message": "boom"}, {"event": "done"}
+        )
+        assert cache.get(key) is None
+
+    async def test_truncated_stream_is_not_cached(self, monkeypatch):
+        """Should not cache a stream without a done event."""
+        cache, key, _ = await self._run(monkeypatch, {"event": "content", "content": "hi"})
+        assert cache.get(key) is None
+
+    async def test_error_text_in_answer_is_cached(self, monkeypatch):
+        """Should cache an answer whose text merely looks like an error frame."""
+        cache, key, chunks = await self._run(
+            monkeypatch,
+            {"event": "content", "content": 'data: {"event":"error"'},
+            {"event": "done"},
+        )
+        assert cache.get(key) == "".join(chunks)
+
+
+class TestApproxTokens:
+    """Tests for _approx_tokens."""
+
+    def test_rounds_up(self):
+        assert _approx_tokens(0) == 0
+        assert _approx_tokens(1) == 1
+        assert _approx_tokens(8) == 2
+        assert _approx_tokens(9) == 3
@@ -251,3 +251,76 @@ class TestSyncTrigger:
             assert "success" in data
             assert "message" in data
             assert "items_synced" in data
+
+
+class TestSyncTriggerRuns:
+    """POST /sync/trigger runs the sync jobs off the event loop."""
+
+    @pytest.fixture
+    def admin_client(self, monkeypatch):
+        from fastapi import FastAPI
+
+        from src.api.routers.sync import router
+        from src.api.security import verify_admin_api_key
+
+        monkeypatch.setattr("src.api.scheduler.init_db", lambda _community_id: None)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[verify_admin_api_key] = lambda: None
+        return TestClient(app)
+
+    def test_github_trigger_fetches_repos(self, admin_client: TestClient, monkeypatch):
+        """A manual GitHub sync reaches the async engine for every configured community."""
+        from src.assistants import registry
+
+        fetched: list[tuple[str, str]] = []
+
+        async def fake_sync_repo(_client, _semaphore, _writer, repo, project, _incremental):
+            fetched.append((project, repo))
+            return 1
+
+        monkeypatch.setattr("src.knowledge.github_sync._sync_repo_async", fake_sync_repo)
+        response = admin_client.post("/sync/trigger", json={"sync_type": "github"})
+
+        assert response.status_code == 200
+        expected = {
+            (info.id, repo)
+            for info in registry.list_all()
+            if info.community_config and info.community_config.github
+            for repo in info.community_config.github.repos
+        }
+        if not expected:
+            pytest.skip("No communities with GitHub repos registered")
+        assert set(fetched) == expected
+        assert response.json()["items_synced"]["github"] >= 1
+
+    def test_faq_trigger_can_run_event_loop(self, admin_client: TestClient, monkeypatch):
+        """FAQ generation runs its own event loop, which must work from the endpoint."""
+        import asyncio
+
+        from src.assistants import registry
+
+        summarized: list[tuple[str, str]] = []
+
+        def fake_summarize_threads(list_name, project, **_kwargs):
+            # Like the real pipeline, which drives its LLM calls with asyncio.run()
+            asyncio.run(asyncio.sleep(0))
+            summarized.append((project, list_name))
+            return {"summarized": 0, "skipped": 0, "failed": 0, "total_cost": 0.0}
+
+        monkeypatch.setattr(
+            "src.knowledge.faq_summarizer.summarize_threads", fake_summarize_threads
+        )
+        response = admin_client.post("/sync/trigger", json={"sync_type": "faq"})
+
+        assert response.status_code == 200
+        expected = {
+            (info.id, mailman.list_name)
+            for info in registry.list_all()
+            if info.community_config and info.community_config.faq_generation
+            for mailman in info.community_config.mailman or []
+        }
+        if not expected:
+            pytest.skip("No communities with FAQ generation registered")
+        assert set(summarized) == expected
+        assert response.json()["items_synced"]["faq"] >= 1
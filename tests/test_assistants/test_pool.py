@@ -0,0 +1,133 @@
+"""Tests for the prebuilt assistant pool."""
+
+import threading
+
+import pytest
+
+from src.assistants.pool import AssistantPool, AssistantPoolKey
+
+
+def _key(community_id: str = "hed", **overrides) -> AssistantPoolKey:
+    values = {
+        "community_id": community_id,
+        "model": "openai/gpt-oss-120b",
+        "provider": "Cerebras",
+        "key_source": "platform",
+    }
+    values.update(overrides)
+    return AssistantPoolKey(**values)
+
+
+class TestAssistantPool:
+    """Tests for AssistantPool."""
+
+    def test_builds_once_per_key(self):
+        """A second lookup for the same key should reuse the built assistant."""
+        pool = AssistantPool()
+        builds = []
+
+        def factory():
+            builds.append(1)
+            return object()
+
+        first = pool.get_or_create(_key(), factory)
+        second = pool.get_or_create(_key(), factory)
+
+        assert first is second
+        assert len(builds) == 1
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+
+    def test_distinct_keys_build_separately(self):
+        """Model, provider and key source should each select a different assistant."""
+        pool = AssistantPool()
+        keys = [
+            _key(),
+            _key(model="anthropic/claude-haiku-4.5"),
+            _key(provider=None),
+            _key(key_source="byok"),
+            _key(page_tool=True),
+        ]
+
+        assistants = [pool.get_or_create(k, object) for k in keys]
+
+        assert len({id(a) for a in assistants}) == len(keys)
+        assert len(pool) == len(keys)
+
+    def test_evicts_least_recently_used(self):
+        """The least recently used assistant should be dropped when full."""
+        pool = AssistantPool(max_size=2)
+        a = pool.get_or_create(_key("a"), object)
+        pool.get_or_create(_key("b"), object)
+        pool.get_or_create(_key("a"), object)  # touch a
+        pool.get_or_create(_key("c"), object)
+
+        assert pool.get_or_create(_key("a"), object) is a
+        assert pool.stats()["evictions"] == 1
+        assert pool.invalidate("b") == 0
+
+    def test_invalidate_by_community(self):
+        """invalidate should remove only the given community's assistants."""
+        pool = AssistantPool()
+        pool.get_or_create(_key("hed"), object)
+        pool.get_or_create(_key("hed", key_source="byok"), object)
+        pool.get_or_create(_key("bids"), object)
+
+        assert pool.invalidate("hed") == 2
+        assert len(pool) == 1
+        assert pool.invalidate() == 1
+        assert len(pool) == 0
+
+    def test_concurrent_misses_share_first_result(self):
+        """Racing builders for one key should all receive the same assistant."""
+        pool = AssistantPool()
+        barrier = threading.Barrier(4)
+        results = []
+
+        def factory():
+            barrier.wait()
+            return object()
+
+        def worker():
+            results.append(pool.get_or_create(_key(), factory))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(r) for r in results}) == 1
+        assert len(pool) == 1
+
+    @pytest.mark.parametrize("invalidated", ["hed", None])
+    def test_build_invalidated_midway_is_not_pooled(self, invalidated):
+        """A build that overlaps invalidate() should be returned but not stored."""
+        pool = AssistantPool()
+
+        def factory():
+            pool.invalidate(invalidated)
+            return object()
+
+        stale = pool.get_or_create(_key(), factory)
+        assert len(pool) == 0
+
+        fresh = pool.get_or_create(_key(), object)
+        assert fresh is not stale
+        assert pool.get_or_create(_key(), object) is fresh
+
+    def test_invalidating_other_community_keeps_build(self):
+        """Invalidating another community should not block pooling."""
+        pool = AssistantPool()
+
+        def factory():
+            pool.invalidate("bids")
+            return object()
+
+        built = pool.get_or_create(_key("hed"), factory)
+        assert pool.get_or_create(_key("hed"), object) is built
+
+    def test_rejects_invalid_size(self):
+        """max_size must be positive."""
+        with pytest.raises(ValueError):
+            AssistantPool(max_size=0)
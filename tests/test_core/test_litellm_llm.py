@@ -37,7 +37,7 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, Tool
 from langchain_core.tools import tool
 from langchain_litellm import ChatLiteLLM
 
-from src.core.services.litellm_llm import CachingLLMWrapper, create_openrouter_llm
+from src.core.services.litellm_llm import NO_CACHE_KWARG, CachingLLMWrapper, create_openrouter_llm
 
 # ============================================================================
 # Provider Selection Tests
@@ -375,6 +375,24 @@ class TestCachingLLMWrapperMessageTransformation:
         assert result[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
         assert result[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
 
+    def test_add_cache_control_skips_no_cache_system_messages(self):
+        """Verify system messages flagged with NO_CACHE_KWARG are sent without cache_control."""
+        from langchain_community.chat_models import FakeListChatModel
+
+        fake_llm = FakeListChatModel(responses=["Test"])
+        wrapper = CachingLLMWrapper(llm=fake_llm)
+
+        messages = [
+            SystemMessage(content="Stable prompt"),
+            SystemMessage(content="Page context", additional_kwargs={NO_CACHE_KWARG: True}),
+            HumanMessage(content="Query"),
+        ]
+
+        result = wrapper._add_cache_control(messages)
+
+        assert result[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert result[1] == {"role": "system", "content": "Page context"}
+
     def test_add_cache_control_rejects_none_input(self):
         """Verify None input raises ValueError."""
         from langchain_community.chat_models import FakeListChatModel
@@ -5,7 +5,7 @@ Uses real database operations with test data.
 """
 
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -157,7 +157,7 @@ class TestMailmanEndToEnd:
         mock_scoring_model = MagicMock()
         mock_scoring_response = MagicMock()
         mock_scoring_response.content = "0.85"
-        mock_scoring_model.invoke.return_value = mock_scoring_response
+        mock_scoring_model.ainvoke = AsyncMock(return_value=mock_scoring_response)
 
         mock_summary_model = MagicMock()
         mock_summary_response = MagicMock()
@@ -169,7 +169,7 @@ class TestMailmanEndToEnd:
           "category": "how-to"
         }
         """
-        mock_summary_model.invoke.return_value = mock_summary_response
+        mock_summary_model.ainvoke = AsyncMock(return_value=mock_summary_response)
 
         with (
             patch("src.knowledge.db.get_db_path", return_value=e2e_test_db),
@@ -293,7 +293,7 @@ class TestMailmanEndToEnd:
         mock_scoring_model = MagicMock()
         mock_scoring_response = MagicMock()
         mock_scoring_response.content = "0.9"
-        mock_scoring_model.invoke.return_value = mock_scoring_response
+        mock_scoring_model.ainvoke = AsyncMock(return_value=mock_scoring_response)
 
         mock_summary_model = MagicMock()
         mock_summary_response = MagicMock()
@@ -305,7 +305,7 @@ class TestMailmanEndToEnd:
           "category": "how-to"
         }
         """
-        mock_summary_model.invoke.return_value = mock_summary_response
+        mock_summary_model.ainvoke = AsyncMock(return_value=mock_summary_response)
 
         with (
             patch("src.knowledge.db.get_db_path", return_value=e2e_test_db),
@@ -4,17 +4,28 @@ These tests use a temporary database to avoid affecting the real knowledge datab
 """
 
 import sqlite3
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from src.knowledge.db import (
+    SCHEMA_SQL,
+    ReadConnectionPool,
+    UpsertCounts,
+    get_active_mirror,
     get_connection,
+    get_read_connection,
+    get_read_pool,
     get_stats,
     init_db,
     is_db_populated,
+    reset_active_mirror,
+    run_in_db_executor,
+    set_active_mirror,
     update_sync_metadata,
+    upsert_discourse_topic,
     upsert_github_item,
     upsert_paper,
 )
@@ -392,3 +403,287 @@ class TestIsDbPopulated:
             assert result["github"] is True
             assert result["papers"] is False
             assert result["docstrings"] is False
+
+
+class TestReadConnectionPool:
+    """Tests for pooled read-only connections."""
+
+    def test_connection_is_reused(self, temp_db: Path):
+        """Consecutive borrows should return the same underlying connection."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            with get_read_connection() as conn1:
+                first_id = id(conn1)
+            with get_read_connection() as conn2:
+                assert id(conn2) == first_id
+            assert get_read_pool().idle_count(temp_db) == 1
+
+    def test_pragmas_applied(self, temp_db: Path):
+        """Pooled connections should be tuned and run in WAL mode."""
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=temp_db),
+            get_read_connection() as conn,
+        ):
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+
+    def test_writes_rejected(self, temp_db: Path):
+        """query_only should reject writes through a read connection."""
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=temp_db),
+            get_read_connection() as conn,
+            pytest.raises(sqlite3.OperationalError, match="readonly"),
+        ):
+            conn.execute("DELETE FROM github_items")
+
+    def test_sees_later_writes(self, temp_db: Path):
+        """A pooled connection should see rows committed after it was opened."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            with get_read_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM github_items").fetchone()[0] == 0
+
+            with get_connection() as conn:
+                upsert_github_item(
+                    conn,
+                    repo="test/repo",
+                    item_type="issue",
+                    number=1,
+                    title="Later write",
+                    first_message=None,
+                    status="open",
+                    url="https://github.com/test/repo/issues/1",
+                    created_at="2024-01-01T00:00:00Z",
+                )
+                conn.commit()
+
+            with get_read_connection() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM github_items").fetchone()[0] == 1
+
+    def test_replaced_file_not_reused(self, tmp_path: Path):
+        """Connections to a deleted/replaced database file should be discarded."""
+        pool = ReadConnectionPool()
+        db_path = tmp_path / "replaced.db"
+        sqlite3.connect(str(db_path)).close()
+
+        pooled = pool.acquire(db_path)
+        old_conn = pooled.conn
+        pool.release(db_path, pooled)
+
+        db_path.unlink()
+        sqlite3.connect(str(db_path)).close()
+
+        pooled = pool.acquire(db_path)
+        assert pooled.conn is not old_conn
+        pool.release(db_path, pooled)
+        pool.close_all()
+        assert pool.idle_count() == 0
+
+    def test_separate_pools_per_path(self, tmp_path: Path):
+        """Each database path (e.g. production vs mirror) gets its own connections."""
+        pool = ReadConnectionPool()
+        db_a = tmp_path / "a.db"
+        db_b = tmp_path / "b.db"
+
+        conn_a = pool.acquire(db_a)
+        conn_b = pool.acquire(db_b)
+        assert conn_a.conn is not conn_b.conn
+        pool.release(db_a, conn_a)
+        pool.release(db_b, conn_b)
+
+        assert pool.idle_count(db_a) == 1
+        assert pool.idle_count(db_b) == 1
+        pool.close_all(db_a)
+        assert pool.idle_count(db_a) == 0
+        assert pool.idle_count(db_b) == 1
+        pool.close_all()
+
+    def test_idle_connections_bounded(self, tmp_path: Path):
+        """The pool should not keep more idle connections than max_idle."""
+        pool = ReadConnectionPool(max_idle=2)
+        db_path = tmp_path / "bounded.db"
+
+        borrowed = [pool.acquire(db_path) for _ in range(4)]
+        for pooled in borrowed:
+            pool.release(db_path, pooled)
+
+        assert pool.idle_count(db_path) == 2
+        pool.close_all()
+
+
+class TestDbExecutor:
+    """Tests for the dedicated knowledge DB executor."""
+
+    async def test_runs_on_db_executor_thread(self):
+        """Blocking calls should run on the knowledge-db worker threads."""
+        name = await run_in_db_executor(lambda: threading.current_thread().name)
+        assert name.startswith("knowledge-db")
+
+    async def test_passes_arguments(self):
+        """Positional and keyword arguments should reach the function."""
+        result = await run_in_db_executor(lambda a, b=0: a + b, 2, b=3)
+        assert result == 5
+
+    async def test_propagates_mirror_context(self):
+        """The active mirror should apply to queries run on the executor."""
+        token = set_active_mirror("exec-mirror")
+        try:
+            assert await run_in_db_executor(get_active_mirror) == "exec-mirror"
+        finally:
+            reset_active_mirror(token)
+        assert await run_in_db_executor(get_active_mirror) is None
+
+
+def _fts_segment_writes(conn: sqlite3.Connection) -> int:
+    """Count FTS5 data rows for github_items (grows on every re-index)."""
+    return conn.execute("SELECT COUNT(*) FROM github_items_fts_data").fetchone()[0]
+
+
+class TestContentHashChangeDetection:
+    """Tests for skipping writes when upserted content is unchanged."""
+
+    ISSUE = {
+        "repo": "test/repo",
+        "item_type": "issue",
+        "number": 7,
+        "title": "Schema loading fails",
+        "first_message": "Loading HED 8.3.0 raises an error.",
+        "status": "open",
+        "url": "https://github.com/test/repo/issues/7",
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+    def test_outcomes(self, temp_db: Path):
+        """Upserts should report inserted, unchanged, then updated."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db), get_connection() as conn:
+            assert upsert_github_item(conn, **self.ISSUE) == "inserted"
+            assert upsert_github_item(conn, **self.ISSUE) == "unchanged"
+            assert upsert_github_item(conn, **{**self.ISSUE, "status": "closed"}) == "updated"
+            assert upsert_github_item(conn, **{**self.ISSUE, "status": "closed"}) == "unchanged"
+
+    def test_unchanged_row_not_rewritten(self, temp_db: Path):
+        """An unchanged upsert should not touch synced_at or the FTS index."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db), get_connection() as conn:
+            upsert_github_item(conn, **self.ISSUE)
+            conn.commit()
+            synced_at = conn.execute("SELECT synced_at FROM github_items").fetchone()[0]
+            fts_rows = _fts_segment_writes(conn)
+            changes_before = conn.total_changes
+
+            upsert_github_item(conn, **self.ISSUE)
+            conn.commit()
+
+            assert conn.total_changes == changes_before
+            assert conn.execute("SELECT synced_at FROM github_items").fetchone()[0] == synced_at
+            assert _fts_segment_writes(conn) == fts_rows
+
+    def test_changed_row_reindexed(self, temp_db: Path):
+        """A changed title should be searchable under the new text only."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db), get_connection() as conn:
+            upsert_github_item(conn, **self.ISSUE)
+            upsert_github_item(conn, **{**self.ISSUE, "title": "Tokenizer crash on groups"})
+            conn.commit()
+
+            def matches(term: str) -> int:
+                return conn.execute(
+                    "SELECT COUNT(*) FROM github_items_fts WHERE github_items_fts MATCH ?",
+                    (term,),
+                ).fetchone()[0]
+
+            assert matches("tokenizer") == 1
+            assert matches("loading") == 1  # still in first_message
+            assert matches("fails") == 0
+
+    def test_metadata_only_update_skips_fts(self, temp_db: Path):
+        """Updating a non-indexed column should not fire the FTS trigger."""
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db), get_connection() as conn:
+            upsert_github_item(conn, **self.ISSUE)
+            conn.commit()
+            fts_rows = _fts_segment_writes(conn)
+
+            conn.execute("UPDATE github_items SET synced_at = 'later'")
+            conn.commit()
+
+            assert _fts_segment_writes(conn) == fts_rows
+
+    def test_discourse_view_count_counts_as_update(self, temp_db: Path):
+        """Non-text fields are part of the hash, so metric changes still persist."""
+        topic = {
+            "forum_url": "https://mne.discourse.group",
+            "topic_id": 1,
+            "title": "Epoching question",
+            "first_post": "How do I epoch?",
+            "accepted_answer": None,
+            "category_name": "Questions",
+            "tags": ["epochs"],
+            "reply_count": 1,
+            "like_count": 0,
+            "views": 10,
+            "url": "https://mne.discourse.group/t/epoching/1",
+            "created_at": "2024-01-01T00:00:00Z",
+            "last_posted_at": None,
+        }
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db), get_connection() as conn:
+            assert upsert_discourse_topic(conn, **topic) == "inserted"
+            assert upsert_discourse_topic(conn, **{**topic, "views": 11}) == "updated"
+            assert conn.execute("SELECT views FROM discourse_topics").fetchone()[0] == 11
+
+    def test_sync_metadata_records_counts(self, temp_db: Path):
+        """update_sync_metadata should persist the change breakdown."""
+        counts = UpsertCounts()
+        for outcome in ("inserted", "inserted", "updated", "unchanged"):
+            counts.record(outcome)
+
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            update_sync_metadata("github", "test/repo", counts.total, changes=counts)
+            with get_connection() as conn:
+                row = conn.execute("SELECT * FROM sync_metadata").fetchone()
+
+        assert row["items_synced"] == 4
+        assert row["items_inserted"] == 2
+        assert row["items_updated"] == 1
+        assert row["items_unchanged"] == 1
+
+
+class TestContentHashMigration:
+    """Tests for migrating databases created before content hashing."""
+
+    def test_legacy_database_migrated(self, tmp_path: Path):
+        """Old tables gain content_hash and old triggers are narrowed."""
+        db_path = tmp_path / "knowledge" / "legacy.db"
+        db_path.parent.mkdir(parents=True)
+
+        # Build a legacy schema: no content_hash columns, broad update triggers
+        legacy_sql = SCHEMA_SQL.replace("    content_hash TEXT,\n", "")
+        legacy_sql = legacy_sql.replace(
+            "    synced_at TEXT NOT NULL,\n    content_hash TEXT\n", "    synced_at TEXT NOT NULL\n"
+        )
+        legacy_sql = legacy_sql.replace(
+            "    items_inserted INTEGER DEFAULT 0,\n"
+            "    items_updated INTEGER DEFAULT 0,\n"
+            "    items_unchanged INTEGER DEFAULT 0,\n",
+            "",
+        )
+        legacy_sql = legacy_sql.replace(
+            "github_items_au AFTER UPDATE OF title, first_message ON",
+            "github_items_au AFTER UPDATE ON",
+        )
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript(legacy_sql)
+        conn.close()
+
+        with patch("src.knowledge.db.get_db_path", return_value=db_path):
+            init_db()
+
+        conn = sqlite3.connect(str(db_path))
+        github_cols = {row[1] for row in conn.execute("PRAGMA table_info(github_items)")}
+        bep_cols = {row[1] for row in conn.execute("PRAGMA table_info(bep_items)")}
+        meta_cols = {row[1] for row in conn.execute("PRAGMA table_info(sync_metadata)")}
+        trigger_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'github_items_au'"
+        ).fetchone()[0]
+        conn.close()
+
+        assert "content_hash" in github_cols
+        assert "content_hash" in bep_cols
+        assert {"items_inserted", "items_updated", "items_unchanged"} <= meta_cols
+        assert "UPDATE OF" in trigger_sql
@@ -4,17 +4,33 @@ Tests are tool-centered, not community-specific. They validate the
 faq_summarizer module works correctly for any mailing list data.
 """
 
+import asyncio
+import json
+from datetime import timedelta
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from langchain_core.messages import AIMessage
 
-from src.knowledge.db import get_connection, init_db, upsert_mailing_list_message
+from src.knowledge.db import (
+    get_connection,
+    init_db,
+    update_summarization_status,
+    upsert_mailing_list_message,
+)
 from src.knowledge.faq_summarizer import (
+    FAQSummary,
+    LLMUsage,
+    RetryPolicy,
+    _ascore_threads,
+    _asummarize_thread,
     _build_thread_context,
-    _score_thread_quality,
-    _summarize_thread,
+    _FAQPipeline,
+    _load_thread_messages,
+    _parse_batch_scores,
     estimate_summarization_cost,
+    select_candidate_threads,
 )
 
 
@@ -128,69 +144,81 @@ class TestBuildThreadContext:
         assert "--- Message 1 ---" in context
 
 
+def _score(thread_context: str, model) -> float | None:
+    """Score a single thread through the async scoring call."""
+    scores, _, _ = asyncio.run(_ascore_threads([thread_context], model, LLMUsage()))
+    return scores[0]
+
+
+def _summarize(thread_context: str, model) -> FAQSummary | None:
+    """Summarize a thread through the async summarization call."""
+    summary, _, _ = asyncio.run(_asummarize_thread(thread_context, model, LLMUsage()))
+    return summary
+
+
 class TestScoreThreadQuality:
     """Tests for thread quality scoring."""
 
     def test_score_returns_valid_range(self):
         """Test that scoring returns a value between 0.0 and 1.0."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = "0.75"
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
 
         assert 0.0 <= score <= 1.0
         assert score == 0.75
 
     def test_score_extracts_float_from_text(self):
         """Test that scoring extracts float even from verbose responses."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = "The quality score for this thread is 0.82 out of 1.0"
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
 
         assert score == 0.82
 
     def test_score_clamps_to_valid_range(self):
         """Test that scores outside 0-1 are clamped."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
 
         # Test upper bound
         mock_response.content = "1.5"
-        mock_model.invoke.return_value = mock_response
-        score = _score_thread_quality("Test thread context", mock_model)
+        mock_model.ainvoke.return_value = mock_response
+        score = _score("Test thread context", mock_model)
         assert score == 1.0
 
         # Test lower bound (regex extracts "5" from "1.5" on second call)
         # Note: The regex doesn't capture negative signs, so "-0.5" would extract as "0.5"
         # We test that very high values are clamped
         mock_response.content = "2.5"
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
         assert score == 1.0
 
     def test_score_handles_non_numeric_response(self):
         """Test that non-numeric responses return None."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = "I cannot determine a score"
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
 
         assert score is None
 
     def test_score_handles_llm_errors(self):
         """Test that unexpected LLM errors are raised."""
-        mock_model = MagicMock()
-        mock_model.invoke.side_effect = Exception("API timeout")
+        mock_model = AsyncMock()
+        mock_model.ainvoke.side_effect = Exception("API timeout")
 
         # Unexpected errors should be raised
         with pytest.raises(Exception, match="API timeout"):
-            _score_thread_quality("Test thread context", mock_model)
+            _score("Test thread context", mock_model)
 
 
 class TestSummarizeThread:
@@ -198,7 +226,7 @@ class TestSummarizeThread:
 
     def test_summarize_parses_json_response(self):
         """Test that summarization parses JSON correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -208,9 +236,9 @@ class TestSummarizeThread:
           "category": "how-to"
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert summary.question == "How do I import data?"
@@ -220,7 +248,7 @@ class TestSummarizeThread:
 
     def test_summarize_handles_markdown_code_blocks(self):
         """Test that markdown code blocks are stripped."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """```json
         {
@@ -230,16 +258,16 @@ class TestSummarizeThread:
           "category": "discussion"
         }
         ```"""
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert summary.question == "Test question?"
 
     def test_summarize_handles_missing_optional_fields(self):
         """Test that missing tags/category use defaults."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -247,9 +275,9 @@ class TestSummarizeThread:
           "answer": "Answer."
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert summary.tags == []
@@ -257,23 +285,23 @@ class TestSummarizeThread:
 
     def test_summarize_handles_invalid_json(self):
         """Test that invalid JSON returns None."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = "This is not JSON at all!"
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is None
 
     def test_summarize_handles_llm_errors(self):
         """Test that unexpected LLM errors are raised."""
-        mock_model = MagicMock()
-        mock_model.invoke.side_effect = Exception("API error")
+        mock_model = AsyncMock()
+        mock_model.ainvoke.side_effect = Exception("API error")
 
         # Unexpected errors should be raised
         with pytest.raises(Exception, match="API error"):
-            _summarize_thread("Test thread context", mock_model)
+            _summarize("Test thread context", mock_model)
 
 
 class TestEstimateSummarizationCost:
@@ -338,7 +366,7 @@ class TestLLMResponseVariations:
 
     def test_summarize_handles_trailing_comma(self):
         """Test that trailing commas in JSON are handled gracefully."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         # Invalid JSON with trailing comma
         mock_response.content = """
@@ -349,16 +377,16 @@ class TestLLMResponseVariations:
           "category": "how-to",
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         # Should return None for invalid JSON
         assert summary is None
 
     def test_summarize_handles_extra_text_before_json(self):
         """Test that extra text before JSON is stripped."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         # Extra text before JSON
         mock_response.content = """Here's the summary:
@@ -368,16 +396,16 @@ class TestLLMResponseVariations:
           "tags": ["installation"],
           "category": "how-to"
         }"""
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         # Should return None (no markdown code block to strip)
         assert summary is None
 
     def test_summarize_handles_extra_text_after_json(self):
         """Test that extra text after JSON is stripped."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         # Extra text after JSON
         mock_response.content = """{
@@ -388,16 +416,16 @@ class TestLLMResponseVariations:
         }
 
         I hope this helps!"""
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         # Should return None (JSON is valid but has trailing text)
         assert summary is None
 
     def test_summarize_handles_nested_json_quotes(self):
         """Test that nested quotes in JSON are parsed correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -407,16 +435,16 @@ class TestLLMResponseVariations:
           "category": "how-to"
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert "double quotes" in summary.answer
 
     def test_summarize_handles_newlines_in_json(self):
         """Test that newlines in JSON strings are handled correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -426,9 +454,9 @@ class TestLLMResponseVariations:
           "category": "how-to"
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert "First line" in summary.answer
@@ -436,7 +464,7 @@ class TestLLMResponseVariations:
 
     def test_summarize_handles_empty_tags_array(self):
         """Test that empty tags array is handled correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -446,16 +474,16 @@ class TestLLMResponseVariations:
           "category": "discussion"
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert summary.tags == []
 
     def test_summarize_handles_unicode_characters(self):
         """Test that unicode characters in JSON are handled correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
         mock_response.content = """
         {
@@ -465,9 +493,9 @@ class TestLLMResponseVariations:
           "category": "how-to"
         }
         """
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        summary = _summarize_thread("Test thread context", mock_model)
+        summary = _summarize("Test thread context", mock_model)
 
         assert summary is not None
         assert "émojis" in summary.question
@@ -475,46 +503,337 @@ class TestLLMResponseVariations:
 
     def test_score_handles_decimal_variations(self):
         """Test that various decimal formats are handled correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
 
         # Test integer score
         mock_response = MagicMock()
         mock_response.content = "1"
-        mock_model.invoke.return_value = mock_response
-        score = _score_thread_quality("Test thread context", mock_model)
+        mock_model.ainvoke.return_value = mock_response
+        score = _score("Test thread context", mock_model)
         assert score == 1.0
 
         # Test leading zero
         mock_response.content = "0.75"
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
         assert score == 0.75
 
         # Test no leading zero (will be parsed as 85, then clamped to 1.0)
         mock_response.content = ".85"
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
         assert score == 1.0  # "85" extracted, clamped to max
 
     def test_score_handles_verbose_responses(self):
         """Test that verbose LLM responses are parsed correctly."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
 
         # Verbose response with explanation
         mock_response.content = """I would rate this thread at 0.72 out of 1.0 because
         it has a clear question and helpful responses, though the solution could be more detailed."""
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
         assert score == 0.72
 
     def test_score_handles_multiple_numbers(self):
         """Test that first number is extracted when multiple numbers present."""
-        mock_model = MagicMock()
+        mock_model = AsyncMock()
         mock_response = MagicMock()
 
         # Multiple numbers - should take first
         mock_response.content = "The thread scores 0.85 on a scale from 0.0 to 1.0"
-        mock_model.invoke.return_value = mock_response
+        mock_model.ainvoke.return_value = mock_response
 
-        score = _score_thread_quality("Test thread context", mock_model)
+        score = _score("Test thread context", mock_model)
         assert score == 0.85
+
+
+def _add_reply(conn, message_id: str, thread_id: str = "thread001") -> None:
+    upsert_mailing_list_message(
+        conn,
+        list_name="test-list",
+        message_id=message_id,
+        thread_id=thread_id,
+        subject="Re: Test subject",
+        author="Late Author",
+        author_email="late@example.com",
+        date="2026-02-01T10:00:00Z",
+        body="A late reply.",
+        in_reply_to="msg002",
+        url=f"https://example.com/list/2026/{message_id}.html",
+        year=2026,
+    )
+
+
+def _mark(conn, candidate, status: str) -> None:
+    update_summarization_status(
+        conn,
+        list_name="test-list",
+        thread_id=candidate.thread_id,
+        status=status,
+        thread_fingerprint=candidate.fingerprint,
+    )
+    conn.commit()
+
+
+class TestSelectCandidateThreads:
+    """Tests for status- and fingerprint-driven candidate selection."""
+
+    def test_new_thread_selected_with_stats(self, populated_mailman_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            candidates = select_candidate_threads(conn, "test-list")
+
+        # Single-message thread002 is filtered out
+        assert [c.thread_id for c in candidates] == ["thread001"]
+        assert candidates[0].reason == "new"
+        assert candidates[0].msg_count == 3
+        assert candidates[0].participant_count == 3
+        assert candidates[0].first_date == "2026-01-01T10:00:00Z"
+
+    def test_skipped_thread_not_rescored_until_it_changes(self, populated_mailman_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            (candidate,) = select_candidate_threads(conn, "test-list")
+            _mark(conn, candidate, "skipped")
+            assert select_candidate_threads(conn, "test-list") == []
+
+            _add_reply(conn, "msg003")
+            conn.commit()
+            (changed,) = select_candidate_threads(conn, "test-list")
+
+        assert changed.reason == "changed"
+        assert changed.msg_count == 4
+        assert changed.fingerprint != candidate.fingerprint
+
+    def test_failed_thread_follows_retry_policy(self, populated_mailman_db: Path):
+        immediate = RetryPolicy(max_attempts=2, backoff=timedelta(0))
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            (candidate,) = select_candidate_threads(conn, "test-list")
+            _mark(conn, candidate, "failed")
+
+            # Backoff not yet elapsed
+            assert select_candidate_threads(conn, "test-list") == []
+            (retry,) = select_candidate_threads(conn, "test-list", retry_policy=immediate)
+            assert retry.reason == "retry"
+
+            # Second failure exhausts the attempts
+            _mark(conn, candidate, "failed")
+            assert select_candidate_threads(conn, "test-list", retry_policy=immediate) == []
+            assert len(select_candidate_threads(conn, "test-list", retry_failed=True)) == 1
+
+            attempts = conn.execute(
+                "SELECT attempts FROM summarization_status WHERE thread_id = 'thread001'"
+            ).fetchone()[0]
+            assert attempts == 2
+
+    def test_success_resets_attempts(self, populated_mailman_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            (candidate,) = select_candidate_threads(conn, "test-list")
+            _mark(conn, candidate, "failed")
+            _mark(conn, candidate, "summarized")
+
+            row = conn.execute(
+                "SELECT status, attempts FROM summarization_status WHERE thread_id = 'thread001'"
+            ).fetchone()
+            assert (row["status"], row["attempts"]) == ("summarized", 0)
+            assert select_candidate_threads(conn, "test-list") == []
+
+    def test_legacy_status_rows_adopt_fingerprint(self, populated_mailman_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            # Row written before fingerprints existed
+            update_summarization_status(
+                conn, list_name="test-list", thread_id="thread001", status="skipped"
+            )
+            conn.commit()
+
+            assert select_candidate_threads(conn, "test-list") == []
+            fingerprint = conn.execute(
+                "SELECT thread_fingerprint FROM summarization_status WHERE thread_id = 'thread001'"
+            ).fetchone()[0]
+            assert fingerprint is not None
+
+            _add_reply(conn, "msg003")
+            conn.commit()
+            assert [c.reason for c in select_candidate_threads(conn, "test-list")] == ["changed"]
+
+    def test_max_threads_keeps_largest(self, populated_mailman_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=populated_mailman_db),
+            get_connection("test-faq") as conn,
+        ):
+            _add_reply(conn, "single002", thread_id="thread002")
+            conn.commit()
+
+            assert len(select_candidate_threads(conn, "test-list")) == 2
+            candidates = select_candidate_threads(conn, "test-list", max_threads=1)
+
+        assert [c.thread_id for c in candidates] == ["thread001"]
+
+
+class _FakeChatModel:
+    """Async chat model double that records calls and reports token usage."""
+
+    def __init__(self, reply, delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[-1].content)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        content = self.reply(messages[-1].content) if callable(self.reply) else self.reply
+        return AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": 1000, "output_tokens": 100, "total_tokens": 1100},
+        )
+
+
+_SUMMARY_JSON = json.dumps(
+    {"question": "How?", "answer": "Like this.", "tags": ["how"], "category": "how-to"}
+)
+
+
+@pytest.fixture
+def many_threads_db(tmp_path: Path):
+    """Database with six two-message threads."""
+    db_path = tmp_path / "many.db"
+    with patch("src.knowledge.db.get_db_path", return_value=db_path):
+        init_db("many")
+        with get_connection("many") as conn:
+            for t in range(6):
+                for i in range(2):
+                    upsert_mailing_list_message(
+                        conn,
+                        list_name="test-list",
+                        message_id=f"t{t}m{i}",
+                        thread_id=f"thread{t}",
+                        subject=f"Thread {t}",
+                        author=f"Author {i}",
+                        author_email=f"a{i}@example.com",
+                        date=f"2026-01-0{i + 1}T10:00:00Z",
+                        body=f"Message {i} of thread {t}",
+                        in_reply_to=None,
+                        url=f"https://example.com/list/2026/t{t}m{i}.html",
+                        year=2026,
+                    )
+            conn.commit()
+        yield db_path
+
+
+def _run_pipeline(eval_agent, summary_agent, **kwargs) -> dict:
+    with get_connection("many") as conn:
+        candidates = select_candidate_threads(conn, "test-list")
+        pipeline = _FAQPipeline(
+            conn,
+            "test-list",
+            eval_agent=eval_agent,
+            summary_agent=summary_agent,
+            eval_model_name="qwen/qwen3-235b-a22b-2507",
+            summary_model_name="anthropic/claude-haiku-4.5",
+            quality_threshold=0.5,
+            **kwargs,
+        )
+        return asyncio.run(pipeline.run(candidates))
+
+
+class TestFAQPipeline:
+    """Tests for the concurrent scoring/summarization pipeline."""
+
+    def test_parse_batch_scores(self):
+        assert _parse_batch_scores("Scores: [0.9, 1.7, 0]", 3) == [0.9, 1.0, 0.0]
+        assert _parse_batch_scores("[0.9, 0.1]", 3) is None
+        assert _parse_batch_scores("no scores", 1) is None
+
+    def test_load_thread_messages_groups_by_thread(self, many_threads_db: Path):
+        with (
+            patch("src.knowledge.db.get_db_path", return_value=many_threads_db),
+            get_connection("many") as conn,
+        ):
+            messages = _load_thread_messages(conn, "test-list", ["thread1", "thread4", "none"])
+
+        assert [m["message_id"] for m in messages["thread1"]] == ["t1m0", "t1m1"]
+        assert len(messages["thread4"]) == 2
+        assert messages["none"] == []
+
+    def test_bounded_concurrency_and_usage_based_cost(self, many_threads_db: Path):
+        eval_agent = _FakeChatModel("0.9", delay=0.02)
+        summary_agent = _FakeChatModel(_SUMMARY_JSON, delay=0.02)
+
+        with patch("src.knowledge.db.get_db_path", return_value=many_threads_db):
+            stats = _run_pipeline(eval_agent, summary_agent, max_concurrency=3)
+
+            with get_connection("many") as conn:
+                assert conn.execute("SELECT COUNT(*) FROM faq_entries").fetchone()[0] == 6
+                row = conn.execute(
+                    "SELECT token_count, cost_estimate FROM summarization_status LIMIT 1"
+                ).fetchone()
+
+        assert stats["summarized"] == stats["processed"] == 6
+        assert 1 < eval_agent.peak_in_flight <= 3
+        assert summary_agent.peak_in_flight <= 3
+        # 12 calls x 1100 tokens, priced from the reported usage
+        assert stats["total_tokens"] == 12 * 1100
+        assert stats["total_cost"] == pytest.approx(
+            6 * (1000 * 0.07 + 100 * 0.10) / 1e6 + 6 * (1000 * 1.00 + 100 * 5.00) / 1e6
+        )
+        assert row["token_count"] == 2200
+
+    def test_multi_thread_scoring_prompt(self, many_threads_db: Path):
+        eval_agent = _FakeChatModel("[0.9, 0.1, 0.8]")
+        summary_agent = _FakeChatModel(_SUMMARY_JSON)
+
+        with patch("src.knowledge.db.get_db_path", return_value=many_threads_db):
+            stats = _run_pipeline(eval_agent, summary_agent, scoring_batch_size=3)
+
+        assert len(eval_agent.prompts) == 2
+        assert "=== Thread 3 ===" in eval_agent.prompts[0]
+        assert (stats["summarized"], stats["skipped"]) == (4, 2)
+
+    def test_unparseable_batch_reply_falls_back_to_single_scores(self, many_threads_db: Path):
+        def reply(prompt: str) -> str:
+            return "I like them all" if "=== Thread" in prompt else "0.2"
+
+        eval_agent = _FakeChatModel(reply)
+
+        with patch("src.knowledge.db.get_db_path", return_value=many_threads_db):
+            stats = _run_pipeline(eval_agent, _FakeChatModel(_SUMMARY_JSON), scoring_batch_size=6)
+
+        assert len(eval_agent.prompts) == 7
+        assert stats["skipped"] == 6
+
+    def test_llm_errors_mark_threads_failed(self, many_threads_db: Path):
+        class Failing(_FakeChatModel):
+            async def ainvoke(self, _messages):
+                raise RuntimeError("provider down")
+
+        with patch("src.knowledge.db.get_db_path", return_value=many_threads_db):
+            stats = _run_pipeline(Failing(None), _FakeChatModel(_SUMMARY_JSON))
+
+            with get_connection("many") as conn:
+                statuses = conn.execute(
+                    "SELECT DISTINCT status, failure_reason FROM summarization_status"
+                ).fetchall()
+
+        assert stats["failed"] == 6
+        assert [tuple(r) for r in statuses] == [("failed", "Unexpected error: RuntimeError")]
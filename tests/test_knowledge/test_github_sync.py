@@ -3,14 +3,29 @@
 Note: These are real API tests, not mocks, per project guidelines.
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import patch
+from urllib.parse import parse_qsl, urlsplit
 
 import pytest
 
 from src.knowledge.db import get_connection, init_db
-from src.knowledge.github_sync import sync_repo, sync_repo_issues, sync_repos
+from src.knowledge.github_sync import (
+    GitHubRateLimiter,
+    GitHubRateLimitError,
+    get_rate_limiter,
+    sync_all_repos,
+    sync_repo,
+    sync_repo_issues,
+    sync_repo_prs,
+    sync_repos,
+)
 
 
 @pytest.fixture
@@ -111,3 +126,314 @@ class TestSyncReposTypeGuard:
         with patch("src.knowledge.db.get_db_path", return_value=temp_db):
             result = sync_repos(["nonexistent/repo"], project="test")
             assert isinstance(result, dict)
+
+
+class _FakeGitHub:
+    """Minimal in-process GitHub REST server for issues and pulls listings.
+
+    Serves items sorted by updated_at (descending), honours since= on the
+    issues endpoint, paginates with page/per_page, and implements ETag /
+    If-None-Match on every page.
+    """
+
+    def __init__(self) -> None:
+        self.issues: list[dict] = []
+        self.pulls: list[dict] = []
+        self.requests: list[tuple[str, dict[str, str], str | None]] = []
+        self.delay = 0.0
+        self.rate_limit: tuple[int, int] | None = None  # (remaining, reset epoch)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, path: str, query: dict[str, str], if_none_match: str | None):
+        with self._lock:
+            self.requests.append((path, query, if_none_match))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            status, headers, body = self._respond(path, query, if_none_match)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if self.rate_limit:
+            remaining, reset = self.rate_limit
+            headers = {
+                **headers,
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(reset),
+            }
+        return status, headers, body
+
+    def _respond(self, path: str, query: dict[str, str], if_none_match: str | None):
+        if path.endswith("/issues"):
+            items = self.issues
+            if "since" in query:
+                items = [i for i in items if i["updated_at"] >= query["since"]]
+        elif path.endswith("/pulls"):
+            items = self.pulls
+        else:
+            return 404, {}, b"{}"
+
+        items = sorted(items, key=lambda i: i["updated_at"], reverse=True)
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        body = json.dumps(items[(page - 1) * per_page : page * per_page]).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if if_none_match == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag, "Content-Type": "application/json"}, body
+
+    def paths(self) -> list[str]:
+        return [path for path, _, _ in self.requests]
+
+
+def _gh_item(number: int, updated_at: str, *, pr: bool = False, title: str | None = None):
+    return {
+        "number": number,
+        "title": title or f"Item {number}",
+        "body": f"Body of item {number}",
+        "state": "open",
+        "html_url": f"https://github.com/test/repo/{'pull' if pr else 'issues'}/{number}",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+def fake_github():
+    """Run a _FakeGitHub on localhost and point github_sync at it."""
+    fake = _FakeGitHub()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            parsed = urlsplit(self.path)
+            query = dict(parse_qsl(parsed.query))
+            status, headers, body = fake.handle(
+                parsed.path, query, self.headers.get("If-None-Match")
+            )
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with (
+            patch("src.knowledge.github_sync.GITHUB_API_URL", base_url),
+            patch("src.knowledge.github_sync._rate_limiter", GitHubRateLimiter()),
+        ):
+            yield fake
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestIncrementalGitHubSync:
+    """Incremental sync against a local GitHub-compatible server."""
+
+    def test_unchanged_repo_costs_one_304_per_endpoint(self, temp_db: Path, fake_github):
+        """A second incremental run with no upstream changes should be two 304s."""
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+        fake_github.pulls = [_gh_item(2, "2024-03-02T00:00:00Z", pr=True)]
+
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            assert sync_repo("test/repo", project="test") == 2
+            fake_github.requests.clear()
+
+            assert sync_repo("test/repo", project="test") == 0
+
+        assert len(fake_github.requests) == 2
+        assert all(etag is not None for _, _, etag in fake_github.requests)
+
+    def test_issues_request_uses_since_and_sort(self, temp_db: Path, fake_github):
+        """Incremental issue fetches push the watermark to the API."""
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            sync_repo("test/repo", project="test")
+            fake_github.issues.append(_gh_item(3, "2024-04-01T00:00:00Z"))
+            fake_github.requests.clear()
+            sync_repo("test/repo", project="test")
+
+        issue_queries = [q for path, q, _ in fake_github.requests if path.endswith("/issues")]
+        assert issue_queries[0]["since"] == "2024-03-01T00:00:00Z"
+        assert issue_queries[0]["sort"] == "updated"
+        assert issue_queries[0]["direction"] == "desc"
+
+    def test_pr_pagination_stops_at_watermark(self, temp_db: Path, fake_github):
+        """PR pages older than the watermark are never requested."""
+        # 250 PRs -> 3 pages of 100
+        fake_github.pulls = [
+            _gh_item(n, f"2024-01-01T00:{n // 60:02d}:{n % 60:02d}Z", pr=True)
+            for n in range(1, 251)
+        ]
+
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            assert sync_repo_prs("test/repo", project="test") == 250
+            assert len([p for p in fake_github.paths() if p.endswith("/pulls")]) == 3
+
+            fake_github.requests.clear()
+            count = sync_repo_prs("test/repo", project="test", since="2024-01-01T00:04:00Z")
+
+        # Only PRs updated at/after 00:04:00 (n >= 240) are stored; one page fetched
+        assert count == 11
+        assert fake_github.paths() == ["/repos/test/repo/pulls"]
+
+    def test_changed_item_picked_up(self, temp_db: Path, fake_github):
+        """An item updated after the watermark (e.g. closed) is re-synced."""
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+
+        with patch("src.knowledge.db.get_db_path", return_value=temp_db):
+            sync_repo("test/repo", project="test")
+
+            closed = _gh_item(1, "2024-05-01T00:00:00Z")
+            closed["state"] = "closed"
+            fake_github.issues = [closed]
+            sync_repo("test/repo", project="test")
+
+            with get_connection("test") as conn:
+                row = conn.execute(
+                    "SELECT status FROM github_items WHERE number = 1 AND item_type = 'issue'"
+                ).fetchone()
+                cursor = conn.execute(
+                    "SELECT watermark FROM sync_metadata WHERE source_type = 'github_issues'"
+                ).fetchone()
+
+        assert row["status"] == "closed"
+        assert cursor["watermark"] == "2024-05-01T00:00:00Z"
+
+
+@pytest.fixture
+def project_dbs(tmp_path: Path):
+    """Give every project its own temporary database."""
+
+    def db_path(project: str = "hed") -> Path:
+        return tmp_path / f"{project}.db"
+
+    with patch("src.knowledge.db.get_db_path", side_effect=db_path):
+        for project in ("alpha", "beta"):
+            init_db(project)
+        yield db_path
+
+
+@pytest.mark.usefixtures("project_dbs")
+class TestAsyncMultiRepoSync:
+    """Concurrent multi-repo sync engine against a local GitHub-compatible server."""
+
+    def test_syncs_repos_of_several_projects_concurrently(self, fake_github):
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+        fake_github.pulls = [_gh_item(2, "2024-03-02T00:00:00Z", pr=True)]
+        fake_github.delay = 0.05
+
+        results = sync_all_repos({"alpha": ["a/one", "a/two", "a/three"], "beta": ["b/one"]})
+
+        assert results == {
+            "alpha": {"a/one": 2, "a/two": 2, "a/three": 2},
+            "beta": {"b/one": 2},
+        }
+        # 4 repos x 2 endpoints requested in parallel rather than one by one
+        assert fake_github.peak_in_flight > 1
+        with get_connection("alpha") as conn:
+            rows = conn.execute(
+                "SELECT source_name, items_synced FROM sync_metadata WHERE source_type = 'github'"
+            ).fetchall()
+            assert {r["source_name"]: r["items_synced"] for r in rows} == {
+                "a/one": 2,
+                "a/two": 2,
+                "a/three": 2,
+            }
+        with get_connection("beta") as conn:
+            count = conn.execute("SELECT COUNT(*) FROM github_items").fetchone()[0]
+            assert count == 2
+
+    def test_second_run_uses_stored_cursors(self, fake_github):
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+
+        sync_all_repos({"alpha": ["a/one"], "beta": ["b/one"]})
+        fake_github.requests.clear()
+        results = sync_all_repos({"alpha": ["a/one"], "beta": ["b/one"]})
+
+        assert results == {"alpha": {"a/one": 0}, "beta": {"b/one": 0}}
+        assert len(fake_github.requests) == 4
+        assert all(etag is not None for _, _, etag in fake_github.requests)
+
+    def test_sync_repos_uses_engine(self, fake_github):
+        fake_github.pulls = [_gh_item(5, "2024-03-02T00:00:00Z", pr=True)]
+
+        assert sync_repos(["a/one", "invalid"], project="alpha") == {"a/one": 1, "invalid": 0}
+
+    def test_rate_limit_headers_shared_globally(self, fake_github):
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+        fake_github.rate_limit = (4200, int(time.time()) + 3600)
+
+        sync_all_repos({"alpha": ["a/one"]})
+
+        assert get_rate_limiter().remaining is not None
+        assert get_rate_limiter().remaining <= 4200
+
+    def test_exhausted_rate_limit_skips_instead_of_hanging(self, fake_github):
+        fake_github.issues = [_gh_item(1, "2024-03-01T00:00:00Z")]
+        fake_github.rate_limit = (0, int(time.time()) + 3600)
+
+        sync_all_repos({"alpha": ["a/one"]})
+        fake_github.requests.clear()
+
+        # The budget is spent until the reset an hour away: give up, don't hang
+        results = sync_all_repos({"alpha": ["a/one", "a/two"]})
+
+        assert results == {"alpha": {"a/one": 0, "a/two": 0}}
+        assert fake_github.requests == []
+
+
+class TestGitHubRateLimiter:
+    """Budget accounting of the shared rate limiter."""
+
+    def test_unknown_budget_never_waits(self):
+        assert GitHubRateLimiter().reserve_delay() == 0.0
+
+    def test_claims_requests_until_reserve(self):
+        now = 1000.0
+        limiter = GitHubRateLimiter(reserve=2, clock=lambda: now)
+        limiter.update({"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": "1060"})
+
+        assert limiter.reserve_delay() == 0.0
+        assert limiter.reserve_delay() == 0.0
+        assert limiter.reserve_delay() == pytest.approx(61.0)
+        assert limiter.waits == 1
+
+    def test_out_of_order_responses_keep_lowest_count(self):
+        limiter = GitHubRateLimiter(clock=lambda: 1000.0)
+        limiter.update({"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "1060"})
+        limiter.update({"X-RateLimit-Remaining": "80", "X-RateLimit-Reset": "1060"})
+        assert limiter.remaining == 50
+
+        # A later reset is a new window
+        limiter.update({"X-RateLimit-Remaining": "5000", "X-RateLimit-Reset": "4600"})
+        assert limiter.remaining == 5000
+
+    def test_window_rollover_resets_budget(self):
+        clock = {"now": 1000.0}
+        limiter = GitHubRateLimiter(reserve=5, clock=lambda: clock["now"])
+        limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1060"})
+
+        clock["now"] = 1061.0
+        assert limiter.reserve_delay() == 0.0
+        assert limiter.remaining is None
+
+    def test_wait_refuses_long_pauses(self):
+        limiter = GitHubRateLimiter(clock=lambda: 1000.0)
+        limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4600"})
+
+        with pytest.raises(GitHubRateLimitError):
+            limiter.wait(max_wait=10)
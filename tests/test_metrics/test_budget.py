@@ -1,9 +1,17 @@
 """Tests for budget checking."""
 
+from datetime import UTC, datetime, timedelta
+
 import pytest
 
 from src.core.config.community import BudgetConfig
-from src.metrics.budget import BudgetStatus, check_budget
+from src.metrics.budget import (
+    BudgetStatus,
+    SpendTracker,
+    check_budget,
+    get_spend_tracker,
+    rehydrate_spend_tracker,
+)
 from src.metrics.db import (
     RequestLogEntry,
     get_metrics_connection,
@@ -319,3 +327,58 @@ class TestCheckBudget:
             assert status.needs_alert is True
         finally:
             conn.close()
+
+
+class TestSpendTracker:
+    """Tests for the in-memory SpendTracker."""
+
+    NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+    def test_records_daily_and_monthly(self):
+        tracker = SpendTracker()
+        tracker.record("hed", 0.25, self.NOW)
+        tracker.record("hed", 0.50, self.NOW)
+        assert tracker.spend("hed", self.NOW) == pytest.approx((0.75, 0.75))
+        assert tracker.spend("bids", self.NOW) == (0.0, 0.0)
+
+    def test_daily_rolls_over(self):
+        tracker = SpendTracker()
+        tracker.record("hed", 1.0, self.NOW)
+        next_day = self.NOW + timedelta(days=1)
+        tracker.record("hed", 0.5, next_day)
+        assert tracker.spend("hed", next_day) == pytest.approx((0.5, 1.5))
+
+    def test_monthly_rolls_over(self):
+        tracker = SpendTracker()
+        tracker.record("hed", 1.0, self.NOW)
+        next_month = datetime(2025, 2, 1, tzinfo=UTC)
+        assert tracker.spend("hed", next_month) == (0.0, 0.0)
+
+    def test_reconcile_never_lowers(self):
+        tracker = SpendTracker()
+        tracker.record("hed", 2.0, self.NOW)
+        tracker.reconcile("hed", daily=1.0, monthly=5.0, now=self.NOW)
+        assert tracker.spend("hed", self.NOW) == pytest.approx((2.0, 5.0))
+
+    def test_status_flags_exceeded(self):
+        tracker = SpendTracker()
+        tracker.record("hed", 5.0, self.NOW)
+        status = tracker.status("hed", _make_config(daily=5.0, monthly=50.0), self.NOW)
+        assert status.daily_exceeded is True
+        assert status.monthly_exceeded is False
+
+    def test_rehydrate_from_db(self, budget_db):
+        tracker = get_spend_tracker()
+        tracker.clear()
+        conn = get_metrics_connection(budget_db)
+        try:
+            loaded = rehydrate_spend_tracker(conn, now=self.NOW)
+        finally:
+            conn.close()
+        try:
+            assert loaded == 2
+            # hed: 0.50 + 0.30 on Jan 15, plus 2.00 on Jan 14
+            assert tracker.spend("hed", self.NOW) == pytest.approx((0.8, 2.8))
+            assert tracker.spend("eeglab", self.NOW) == pytest.approx((0.1, 0.1))
+        finally:
+            tracker.clear()
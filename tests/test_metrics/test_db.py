@@ -7,6 +7,7 @@ from langchain_core.messages import AIMessage, HumanMessage
 
 from src.metrics.db import (
     RequestLogEntry,
+    extract_cache_token_usage,
     extract_token_usage,
     extract_tool_names,
     get_metrics_connection,
@@ -179,6 +180,70 @@ class TestLogRequest:
         finally:
             conn.close()
 
+    def test_writes_request_tools(self, metrics_db):
+        """Each tool call gets a row in request_tools."""
+        entry = RequestLogEntry(
+            request_id="tools-req",
+            timestamp=now_iso(),
+            endpoint="/hed/ask",
+            method="POST",
+            community_id="hed",
+            tools_called=["search_docs", "validate_hed", "search_docs"],
+        )
+        log_request(entry, db_path=metrics_db)
+
+        conn = get_metrics_connection(metrics_db)
+        try:
+            rows = conn.execute(
+                "SELECT community_id, tool FROM request_tools WHERE request_id = ? ORDER BY tool",
+                ("tools-req",),
+            ).fetchall()
+            assert [tuple(r) for r in rows] == [
+                ("hed", "search_docs"),
+                ("hed", "search_docs"),
+                ("hed", "validate_hed"),
+            ]
+        finally:
+            conn.close()
+
+
+class TestRequestToolsBackfill:
+    """Tests for backfilling request_tools on existing databases."""
+
+    def test_backfills_when_table_is_new(self, metrics_db):
+        conn = get_metrics_connection(metrics_db)
+        try:
+            # Simulate a database created before request_tools existed
+            conn.execute("DROP TABLE request_tools")
+            rows = [
+                ("ok", '["search_docs", "validate_hed"]'),
+                ("bad", "not-valid-json{{{"),
+                ("scalar", '"search_docs"'),
+                ("none", None),
+            ]
+            for request_id, tools in rows:
+                conn.execute(
+                    "INSERT INTO request_log (request_id, timestamp, endpoint, method, "
+                    "community_id, tools_called) VALUES (?, ?, '/hed/ask', 'POST', 'hed', ?)",
+                    (request_id, "2025-01-15T10:00:00+00:00", tools),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+        init_metrics_db(metrics_db)
+        # A second init must not duplicate rows
+        init_metrics_db(metrics_db)
+
+        conn = get_metrics_connection(metrics_db)
+        try:
+            rows = conn.execute(
+                "SELECT request_id, tool FROM request_tools ORDER BY tool"
+            ).fetchall()
+            assert [tuple(r) for r in rows] == [("ok", "search_docs"), ("ok", "validate_hed")]
+        finally:
+            conn.close()
+
 
 class TestExtractTokenUsage:
     """Tests for extract_token_usage()."""
@@ -219,6 +284,62 @@ class TestExtractTokenUsage:
         assert extract_token_usage({"messages": []}) == (0, 0, 0)
 
 
+class TestExtractCacheTokenUsage:
+    """Tests for extract_cache_token_usage()."""
+
+    def test_sums_cache_details(self):
+        """Sums cache_read and cache_creation across AIMessages."""
+        msg1 = AIMessage(content="first")
+        msg1.usage_metadata = {
+            "input_tokens": 2000,
+            "output_tokens": 10,
+            "total_tokens": 2010,
+            "input_token_details": {"cache_creation": 1800},
+        }
+        msg2 = AIMessage(content="second")
+        msg2.usage_metadata = {
+            "input_tokens": 2100,
+            "output_tokens": 20,
+            "total_tokens": 2120,
+            "input_token_details": {"cache_read": 1800, "cache_creation": 0},
+        }
+        result = {"messages": [HumanMessage(content="hi"), msg1, msg2]}
+
+        assert extract_cache_token_usage(result) == (1800, 1800)
+
+    def test_returns_zeros_without_details(self):
+        """Returns (0, 0) when usage has no input_token_details."""
+        msg = AIMessage(content="hello")
+        msg.usage_metadata = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+        assert extract_cache_token_usage({"messages": [msg]}) == (0, 0)
+        assert extract_cache_token_usage({}) == (0, 0)
+
+    def test_logged_with_request(self, metrics_db):
+        """Cache token counts are stored with the request log entry."""
+        entry = RequestLogEntry(
+            request_id="cache-req",
+            timestamp=now_iso(),
+            endpoint="/hed/ask",
+            method="POST",
+            input_tokens=2100,
+            cache_read_tokens=1800,
+            cache_creation_tokens=0,
+        )
+        log_request(entry, db_path=metrics_db)
+
+        conn = get_metrics_connection(metrics_db)
+        try:
+            row = conn.execute(
+                "SELECT cache_read_tokens, cache_creation_tokens FROM request_log "
+                "WHERE request_id = ?",
+                ("cache-req",),
+            ).fetchone()
+            assert row["cache_read_tokens"] == 1800
+            assert row["cache_creation_tokens"] == 0
+        finally:
+            conn.close()
+
+
 class TestExtractToolNames:
     """Tests for extract_tool_names()."""
 
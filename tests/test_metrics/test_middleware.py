@@ -66,13 +66,17 @@ class TestMetricsMiddleware:
             }
             return {"answer": "test"}
 
+        @app.get("/metrics/prometheus")
+        async def prometheus():
+            return {}
+
         @app.post("/hed/streaming")
         async def streaming(request: Request):
             # Simulate handler that logs its own metrics
             request.state.metrics_logged = True
             return {"answer": "streamed"}
 
-        with patch("src.metrics.middleware.log_request") as mock_log:
+        with patch("src.metrics.middleware.record_request") as mock_log:
             yield app, mock_log
 
     def test_logs_basic_request(self, test_app):
@@ -112,3 +116,11 @@ class TestMetricsMiddleware:
         response = client.post("/hed/streaming", json={})
         assert response.status_code == 200
         assert not mock_log.called
+
+    def test_skips_prometheus_scrapes(self, test_app):
+        """Scrapes of /metrics/prometheus are not logged as requests."""
+        app, mock_log = test_app
+        client = TestClient(app)
+        response = client.get("/metrics/prometheus")
+        assert response.status_code == 200
+        assert not mock_log.called
@@ -0,0 +1,181 @@
+"""Tests for in-process Prometheus metrics."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.metrics.db import RequestLogEntry
+from src.metrics.prometheus import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    KNOWLEDGE_SEARCH_DURATION,
+    LLM_TOKENS,
+    REGISTRY,
+    Counter,
+    Histogram,
+    Registry,
+    Sample,
+    endpoint_label,
+    observe_request,
+    timed_search,
+)
+from src.metrics.writer import record_request
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+class TestCounter:
+    """Tests for Counter."""
+
+    def test_inc_per_label_set(self):
+        c = Counter("test_total", "Test.", ("a",))
+        c.inc(a="x")
+        c.inc(2, a="x")
+        c.inc(a="y")
+        assert c.value(a="x") == 3
+        assert c.value(a="y") == 1
+        assert c.value(a="z") == 0
+
+    def test_rejects_negative_and_wrong_labels(self):
+        c = Counter("test_total", "Test.", ("a",))
+        with pytest.raises(ValueError):
+            c.inc(-1, a="x")
+        with pytest.raises(ValueError):
+            c.inc(b="x")
+        with pytest.raises(ValueError):
+            c.inc(a="x", b="y")
+
+    def test_render_escapes_labels(self):
+        c = Counter("test_total", "Test.", ("a",))
+        c.inc(a='say "hi"\n')
+        lines = list(c.render())
+        assert lines[:2] == ["# HELP test_total Test.", "# TYPE test_total counter"]
+        assert lines[2] == 'test_total{a="say \\"hi\\"\\n"} 1'
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_render_cumulative_buckets(self):
+        h = Histogram("test_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+        h.observe(0.05, op="a")
+        h.observe(0.1, op="a")
+        h.observe(0.5, op="a")
+        h.observe(5.0, op="a")
+        lines = list(h.render())[2:]
+        assert lines == [
+            'test_seconds_bucket{op="a",le="0.1"} 2',
+            'test_seconds_bucket{op="a",le="1"} 3',
+            'test_seconds_bucket{op="a",le="+Inf"} 4',
+            'test_seconds_sum{op="a"} 5.65',
+            'test_seconds_count{op="a"} 4',
+        ]
+
+    def test_rejects_unsorted_buckets(self):
+        with pytest.raises(ValueError):
+            Histogram("test_seconds", "Test.", buckets=(1.0, 0.1))
+
+    def test_time_context_manager(self):
+        h = Histogram("test_seconds", "Test.")
+        with h.time():
+            pass
+        assert h.count() == 1
+
+
+class TestRegistry:
+    """Tests for Registry rendering and collectors."""
+
+    def test_duplicate_name_rejected(self):
+        registry = Registry()
+        registry.counter("dup_total", "Test.")
+        with pytest.raises(ValueError):
+            registry.counter("dup_total", "Test.")
+
+    def test_collectors_rendered_at_scrape_time(self):
+        registry = Registry()
+        state = {"n": 1}
+        registry.add_collector(
+            lambda: [Sample("live_items", "gauge", "Items.", state["n"], {"kind": "a"})]
+        )
+        assert 'live_items{kind="a"} 1' in registry.render()
+        state["n"] = 7
+        assert 'live_items{kind="a"} 7' in registry.render()
+
+    def test_failing_collector_does_not_break_scrape(self):
+        registry = Registry()
+        registry.counter("ok_total", "Test.").inc()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.add_collector(broken)
+        assert "ok_total 1" in registry.render()
+
+
+class TestEndpointLabel:
+    """Tests for endpoint_label()."""
+
+    def test_replaces_community_and_ids(self):
+        label = endpoint_label("/hed/sessions/0b9e2c1a-1234-4d2b-9a7e-5f6a7b8c9d0e", "hed", 200)
+        assert label == "/{community}/sessions/{id}"
+
+    def test_keeps_static_paths(self):
+        assert endpoint_label("/metrics/public/overview", None, 200) == "/metrics/public/overview"
+        assert endpoint_label("/hed/ask", "hed", 200) == "/{community}/ask"
+
+    def test_unmatched_routes_share_one_label(self):
+        assert endpoint_label("/wp-admin/setup.php", None, 404) == "unmatched"
+
+
+class TestObserveRequest:
+    """Tests for observe_request()."""
+
+    def test_records_request_latency_and_tokens(self):
+        observe_request("hed", "/hed/ask", "POST", 200, 1500.0, input_tokens=100, output_tokens=20)
+        assert (
+            HTTP_REQUESTS.value(
+                community="hed", endpoint="/{community}/ask", method="POST", status="200"
+            )
+            == 1
+        )
+        assert HTTP_REQUEST_DURATION.count(community="hed", endpoint="/{community}/ask") == 1
+        assert LLM_TOKENS.value(community="hed", type="input") == 100
+        assert LLM_TOKENS.value(community="hed", type="output") == 20
+        assert LLM_TOKENS.value(community="hed", type="cache_read") == 0
+
+    def test_record_request_feeds_prometheus(self):
+        entry = RequestLogEntry(
+            request_id="r1",
+            timestamp="2025-01-15T10:00:00+00:00",
+            endpoint="/health",
+            method="GET",
+            status_code=200,
+            duration_ms=3.0,
+        )
+        with patch("src.metrics.writer.log_request"):
+            record_request(entry)
+        assert (
+            HTTP_REQUESTS.value(community="", endpoint="/health", method="GET", status="200") == 1
+        )
+
+
+class TestTimedSearch:
+    """Tests for timed_search()."""
+
+    def test_records_latency_even_on_error(self):
+        @timed_search("papers")
+        def search(fail: bool) -> list:
+            if fail:
+                raise RuntimeError("db gone")
+            return []
+
+        assert search(False) == []
+        with pytest.raises(RuntimeError):
+            search(True)
+        assert KNOWLEDGE_SEARCH_DURATION.count(table="papers") == 2
+        assert search.__name__ == "search"
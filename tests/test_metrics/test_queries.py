@@ -24,6 +24,7 @@ def populated_db(tmp_path):
             input_tokens=100,
             output_tokens=50,
             total_tokens=150,
+            cache_creation_tokens=80,
             estimated_cost=0.001,
             tools_called=["search_docs"],
             key_source="platform",
@@ -40,6 +41,7 @@ def populated_db(tmp_path):
             input_tokens=200,
             output_tokens=100,
             total_tokens=300,
+            cache_read_tokens=150,
             estimated_cost=0.002,
             tools_called=["search_docs", "validate_hed"],
             key_source="byok",
@@ -106,6 +108,19 @@ class TestGetCommunitySummary:
         finally:
             conn.close()
 
+    def test_cache_token_totals(self, populated_db):
+        from src.metrics.queries import get_community_summary
+
+        conn = get_metrics_connection(populated_db)
+        try:
+            result = get_community_summary("hed", conn)
+            assert result["total_cache_read_tokens"] == 150
+            assert result["total_cache_creation_tokens"] == 80
+            # 150 of 350 input tokens were cache reads
+            assert abs(result["cache_hit_rate"] - 0.4286) < 0.001
+        finally:
+            conn.close()
+
     def test_error_rate(self, populated_db):
         from src.metrics.queries import get_community_summary
 
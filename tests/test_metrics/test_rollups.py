@@ -0,0 +1,195 @@
+"""Tests for daily metrics rollups."""
+
+import pytest
+
+from src.metrics.db import RequestLogEntry, get_metrics_connection, init_metrics_db, log_request
+from src.metrics.queries import (
+    get_community_summary,
+    get_overview,
+    get_public_overview,
+    get_quality_summary,
+    get_token_breakdown,
+    get_usage_stats,
+)
+from src.metrics.rollups import ANSWER_CACHE_KEY_SOURCE, load_latency_sketches, refresh_rollups
+
+
+def _entries() -> list[RequestLogEntry]:
+    return [
+        RequestLogEntry(
+            request_id="r1",
+            timestamp="2025-01-15T10:00:00+00:00",
+            endpoint="/hed/ask",
+            method="POST",
+            community_id="hed",
+            duration_ms=200.0,
+            status_code=200,
+            model="qwen/qwen3-235b",
+            input_tokens=100,
+            output_tokens=50,
+            total_tokens=150,
+            cache_read_tokens=40,
+            estimated_cost=0.001,
+            key_source="platform",
+            tool_call_count=1,
+            langfuse_trace_id="t1",
+        ),
+        RequestLogEntry(
+            request_id="r2",
+            timestamp="2025-01-15T11:00:00+00:00",
+            endpoint="/hed/chat",
+            method="POST",
+            community_id="hed",
+            duration_ms=300.0,
+            status_code=500,
+            model="qwen/qwen3-235b",
+            input_tokens=200,
+            output_tokens=100,
+            total_tokens=300,
+            key_source="byok",
+            error_message="boom",
+        ),
+        RequestLogEntry(
+            request_id="r3",
+            timestamp="2025-02-01T10:00:00+00:00",
+            endpoint="/bids/ask",
+            method="POST",
+            community_id="bids",
+            duration_ms=250.0,
+            status_code=200,
+            tool_call_count=3,
+        ),
+        RequestLogEntry(
+            request_id="r4",
+            timestamp="2025-01-15T09:00:00+00:00",
+            endpoint="/health",
+            method="GET",
+            status_code=200,
+        ),
+    ]
+
+
+def _snapshot(conn) -> dict:
+    return {
+        "summary": get_community_summary("hed", conn),
+        "usage": get_usage_stats("hed", "monthly", conn),
+        "overview": get_overview(conn),
+        "tokens": get_token_breakdown(conn),
+        "public": get_public_overview(conn),
+        "quality": get_quality_summary("bids", conn),
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "metrics.db"
+    init_metrics_db(path)
+    return path
+
+
+class TestRefreshRollups:
+    """Tests for refresh_rollups()."""
+
+    def test_rolls_up_new_rows_once(self, db_path):
+        for e in _entries():
+            log_request(e, db_path=db_path)
+        conn = get_metrics_connection(db_path)
+        try:
+            assert refresh_rollups(conn) == 4
+            assert refresh_rollups(conn) == 0
+            row = conn.execute(
+                "SELECT requests, errors, agent_errors, total_tokens FROM request_rollup_daily "
+                "WHERE day = '2025-01-15' AND community_id = 'hed' AND key_source = 'byok'"
+            ).fetchone()
+            assert tuple(row) == (1, 1, 1, 300)
+        finally:
+            conn.close()
+
+    def test_accumulates_into_existing_rows(self, db_path):
+        entries = _entries()
+        conn = get_metrics_connection(db_path)
+        try:
+            log_request(entries[0], db_path=db_path)
+            refresh_rollups(conn)
+            log_request(entries[0], db_path=db_path)
+            refresh_rollups(conn)
+            row = conn.execute(
+                "SELECT requests, input_tokens FROM request_rollup_daily WHERE community_id = 'hed'"
+            ).fetchone()
+            assert tuple(row) == (2, 200)
+        finally:
+            conn.close()
+
+    def test_init_backfills_existing_rows(self, db_path):
+        for e in _entries():
+            log_request(e, db_path=db_path)
+        init_metrics_db(db_path)
+        conn = get_metrics_connection(db_path)
+        try:
+            assert refresh_rollups(conn) == 0
+            total = conn.execute("SELECT SUM(requests) FROM request_rollup_daily").fetchone()[0]
+            assert total == 4
+        finally:
+            conn.close()
+
+
+class TestQueriesOverRollups:
+    """Queries return the same results from rollups, raw tail, or a mix."""
+
+    def test_results_match_raw_tail(self, db_path):
+        entries = _entries()
+        conn = get_metrics_connection(db_path)
+        try:
+            for e in entries:
+                log_request(e, db_path=db_path)
+            raw = _snapshot(conn)
+
+            refresh_rollups(conn)
+            assert _snapshot(conn) == raw
+        finally:
+            conn.close()
+
+    def test_results_match_partial_rollup(self, db_path):
+        entries = _entries()
+        conn = get_metrics_connection(db_path)
+        try:
+            for e in entries[:2]:
+                log_request(e, db_path=db_path)
+            refresh_rollups(conn)
+            for e in entries[2:]:
+                log_request(e, db_path=db_path)
+            mixed = _snapshot(conn)
+
+            refresh_rollups(conn)
+            assert _snapshot(conn) == mixed
+            assert mixed["summary"]["total_requests"] == 2
+            assert mixed["summary"]["avg_duration_ms"] == 250.0
+            assert mixed["overview"]["total_requests"] == 4
+            assert mixed["quality"]["avg_tool_calls"] == 3.0
+        finally:
+            conn.close()
+
+
+class TestAnswerCacheReplays:
+    """Answer-cache replays are tallied apart and kept out of latency sketches."""
+
+    def test_replays_excluded_from_latency(self, db_path):
+        run, replay = _entries()[0], _entries()[0]
+        replay.request_id = "r1-cached"
+        replay.duration_ms = 1.0
+        replay.key_source = ANSWER_CACHE_KEY_SOURCE
+        conn = get_metrics_connection(db_path)
+        try:
+            log_request(run, db_path=db_path)
+            log_request(replay, db_path=db_path)
+            for _ in range(2):  # raw tail, then rolled up
+                sketch = load_latency_sketches(conn, "hed")[""]
+                assert sketch.count == 1
+                refresh_rollups(conn)
+            row = conn.execute(
+                "SELECT requests FROM request_rollup_daily WHERE key_source = ?",
+                (ANSWER_CACHE_KEY_SOURCE,),
+            ).fetchone()
+            assert row[0] == 1
+        finally:
+            conn.close()
@@ -0,0 +1,75 @@
+"""Tests for the latency quantile sketch."""
+
+import random
+
+import pytest
+
+from src.metrics.sketch import LatencySketch
+
+
+class TestLatencySketch:
+    """Tests for LatencySketch."""
+
+    def test_empty_returns_none(self):
+        assert LatencySketch().quantile(0.5) is None
+
+    def test_single_element(self):
+        sketch = LatencySketch()
+        sketch.add(100.0)
+        assert sketch.quantile(0.5) == 100.0
+        assert sketch.quantile(0.95) == 100.0
+
+    def test_two_elements(self):
+        sketch = LatencySketch()
+        sketch.extend([100.0, 200.0])
+        # Floor rank: idx=int(0.5*2)=1 -> the max, returned exactly
+        assert sketch.quantile(0.5) == 200.0
+        assert sketch.quantile(0.95) == 200.0
+
+    def test_zero_durations(self):
+        sketch = LatencySketch()
+        sketch.extend([0.0, 0.0, 0.0, 10.0])
+        assert sketch.quantile(0.5) == 0.0
+
+    def test_relative_accuracy(self):
+        rng = random.Random(42)
+        values = sorted(rng.lognormvariate(6, 1.5) for _ in range(5000))
+        sketch = LatencySketch()
+        sketch.extend(values)
+        for q in (0.5, 0.9, 0.95, 0.99):
+            expected = values[int(q * len(values))]
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.01)
+
+    def test_size_is_bounded(self):
+        sketch = LatencySketch()
+        sketch.extend(float(v) for v in range(1, 100_000))
+        # Log buckets: ~580 for 1..1e5 at 1% accuracy, regardless of sample count
+        assert len(sketch.buckets) < 600
+
+    def test_merge_matches_single_sketch(self):
+        values = [float(v) for v in range(1, 1001)]
+        whole = LatencySketch()
+        whole.extend(values)
+        left, right = LatencySketch(), LatencySketch()
+        left.extend(values[:300])
+        right.extend(values[300:])
+        left.merge(right)
+        assert left.count == whole.count
+        assert left.buckets == whole.buckets
+        assert left.quantile(0.95) == whole.quantile(0.95)
+
+    def test_merge_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+
+    def test_round_trip(self):
+        sketch = LatencySketch()
+        sketch.extend([0.0, 12.5, 300.0, 4200.0])
+        restored = LatencySketch.from_bytes(sketch.to_bytes())
+        assert restored.buckets == sketch.buckets
+        assert (restored.count, restored.zero_count) == (4, 1)
+        assert (restored.min, restored.max) == (0.0, 4200.0)
+
+    def test_from_bytes_rejects_truncated(self):
+        with pytest.raises(ValueError, match="Malformed"):
+            LatencySketch.from_bytes(b"\x01\x02")
@@ -0,0 +1,131 @@
+"""Tests for the background metrics writer."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.metrics import writer as writer_module
+from src.metrics.db import RequestLogEntry, init_metrics_db, metrics_connection
+from src.metrics.writer import MetricsWriter, record_request
+
+
+def _entry(request_id: str) -> RequestLogEntry:
+    return RequestLogEntry(
+        request_id=request_id,
+        timestamp="2025-01-15T10:00:00+00:00",
+        endpoint="/hed/ask",
+        method="POST",
+        community_id="hed",
+        tools_called=["search_docs"],
+    )
+
+
+def _count_rows(db_path) -> int:
+    with metrics_connection(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM request_log").fetchone()[0]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "metrics.db"
+    init_metrics_db(path)
+    return path
+
+
+class TestMetricsWriter:
+    """Tests for MetricsWriter batching, flushing and dropping."""
+
+    def test_flush_writes_queued_entries(self, db_path):
+        writer = MetricsWriter(db_path=db_path, flush_interval_seconds=60)
+        writer.start()
+        try:
+            for i in range(5):
+                assert writer.submit(_entry(f"r{i}"))
+            assert writer.flush()
+            assert _count_rows(db_path) == 5
+            stats = writer.stats()
+            assert stats["written"] == 5
+            assert stats["queue_depth"] == 0
+            # One flush-triggered batch, not five single-row commits
+            assert stats["batches"] == 1
+        finally:
+            writer.stop()
+
+    def test_full_batch_is_written_without_flush(self, db_path):
+        writer = MetricsWriter(db_path=db_path, batch_size=3, flush_interval_seconds=60)
+        writer.start()
+        try:
+            for i in range(3):
+                writer.submit(_entry(f"r{i}"))
+            writer.flush()
+            assert writer.stats()["batches"] == 1
+        finally:
+            writer.stop()
+
+    def test_partial_batch_written_after_interval(self, db_path):
+        writer = MetricsWriter(db_path=db_path, flush_interval_seconds=0.05)
+        writer.start()
+        try:
+            writer.submit(_entry("r1"))
+            for _ in range(100):
+                if writer.stats()["written"] == 1:
+                    break
+                time.sleep(0.01)
+            assert _count_rows(db_path) == 1
+        finally:
+            writer.stop()
+
+    def test_stop_drains_queue(self, db_path):
+        writer = MetricsWriter(db_path=db_path, flush_interval_seconds=60)
+        writer.start()
+        for i in range(10):
+            writer.submit(_entry(f"r{i}"))
+        writer.stop()
+        assert not writer.running
+        assert _count_rows(db_path) == 10
+
+    def test_drops_when_queue_full(self, db_path):
+        # Not started, so nothing drains the queue
+        writer = MetricsWriter(db_path=db_path, max_queue_size=2)
+        assert writer.submit(_entry("r1"))
+        assert writer.submit(_entry("r2"))
+        assert not writer.submit(_entry("r3"))
+        stats = writer.stats()
+        assert stats["dropped"] == 1
+        assert stats["queue_depth"] == 2
+
+    def test_failed_batch_is_counted(self, tmp_path):
+        # Schema never initialized, so the INSERT fails
+        writer = MetricsWriter(db_path=tmp_path / "empty.db", flush_interval_seconds=60)
+        writer.start()
+        try:
+            writer.submit(_entry("r1"))
+            assert writer.flush()
+            stats = writer.stats()
+            assert stats["failed"] == 1
+            assert stats["written"] == 0
+        finally:
+            writer.stop()
+
+
+class TestRecordRequest:
+    """Tests for the record_request entry point."""
+
+    def test_writes_synchronously_without_writer(self, db_path):
+        with (
+            patch.object(writer_module, "_writer", None),
+            patch("src.metrics.db.get_metrics_db_path", return_value=db_path),
+        ):
+            record_request(_entry("r1"))
+        assert _count_rows(db_path) == 1
+
+    def test_enqueues_when_writer_running(self, db_path):
+        writer = writer_module.start_metrics_writer(db_path=db_path)
+        try:
+            record_request(_entry("r1"))
+            assert writer.stats()["enqueued"] == 1
+        finally:
+            writer_module.stop_metrics_writer()
+        assert writer_module.get_metrics_writer() is None
+        assert _count_rows(db_path) == 1
@@ -4,12 +4,14 @@ These tests use real HTTP requests to verify the fetching and caching
 functionality. They require network access but test actual behavior.
 """
 
+import threading
 import time
 
+import httpx
 import pytest
 
 from src.tools.base import DocPage
-from src.tools.fetcher import CacheEntry, DocumentFetcher, get_fetcher
+from src.tools.fetcher import CacheEntry, DocumentFetcher, DocumentLRUCache, get_fetcher
 
 
 class TestCacheEntry:
@@ -26,6 +28,58 @@ class TestCacheEntry:
         assert entry.source_url == "https://example.com/test.md"
 
 
+class TestDocumentLRUCache:
+    """Tests for the byte-bounded document LRU."""
+
+    @staticmethod
+    def _entry(content: str) -> CacheEntry:
+        return CacheEntry(content=content, fetched_at=time.time(), source_url="u")
+
+    def test_evicts_least_recently_used_by_size(self) -> None:
+        """Test that entries are evicted oldest-first once the byte budget is exceeded."""
+        cache = DocumentLRUCache(max_bytes=10)
+        cache.put(("a", True), self._entry("aaaa"))
+        cache.put(("b", True), self._entry("bbbb"))
+        assert cache.get(("a", True)) is not None  # a is now most recent
+
+        cache.put(("c", True), self._entry("cccc"))
+
+        assert cache.get(("b", True)) is None
+        assert cache.get(("a", True)) is not None
+        assert cache.get(("c", True)) is not None
+        assert cache.evictions == 1
+        assert cache.size_bytes == 8
+
+    def test_counts_hits_and_misses(self) -> None:
+        """Test hit/miss counters."""
+        cache = DocumentLRUCache(max_bytes=100)
+        cache.put(("a", False), self._entry("x"))
+        cache.get(("a", False))
+        cache.get(("a", True))
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_oversized_entry_not_cached(self) -> None:
+        """Test that a single entry larger than the budget is skipped."""
+        cache = DocumentLRUCache(max_bytes=4)
+        cache.put(("a", True), self._entry("too large"))
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_replace_updates_size(self) -> None:
+        """Test that replacing a key does not double-count its size."""
+        cache = DocumentLRUCache(max_bytes=100)
+        cache.put(("a", True), self._entry("12345"))
+        cache.put(("a", True), self._entry("12"))
+        assert len(cache) == 1
+        assert cache.size_bytes == 2
+
+    def test_rejects_non_positive_budget(self) -> None:
+        """Test that a zero budget is rejected."""
+        with pytest.raises(ValueError):
+            DocumentLRUCache(max_bytes=0)
+
+
 class TestDocumentFetcher:
     """Tests for DocumentFetcher class."""
 
@@ -54,21 +108,6 @@ class TestDocumentFetcher:
         fetcher = DocumentFetcher()
         assert fetcher.cache_dir is None
 
-    def test_cache_key_generation(self, fetcher: DocumentFetcher) -> None:
-        """Test that cache keys are consistent and short."""
-        url = "https://example.com/some/long/path/document.md"
-        key = fetcher._cache_key(url)
-
-        # Key should be 16 characters (SHA256 truncated)
-        assert len(key) == 16
-
-        # Same URL should produce same key
-        assert fetcher._cache_key(url) == key
-
-        # Different URLs should produce different keys
-        other_key = fetcher._cache_key("https://example.com/other.md")
-        assert other_key != key
-
     def test_cache_validity_check(self, fetcher: DocumentFetcher) -> None:
         """Test cache entry validity checking."""
         # Recent entry should be valid
@@ -176,6 +215,238 @@ class TestDocumentFetcher:
         assert result.success is True
         assert result.content == cached_content
 
+    def test_fetch_caches_cleaned_output(
+        self, fetcher: DocumentFetcher, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that repeat fetches reuse the cleaned output instead of re-cleaning."""
+        import src.tools.fetcher as fetcher_module
+
+        calls: list[str] = []
+
+        def counting_clean(content: str) -> str:
+            calls.append(content)
+            return content.upper()
+
+        monkeypatch.setattr(fetcher_module, "clean_markdown", counting_clean)
+
+        url = "https://example.com/clean-once.md"
+        fetcher._save_to_cache(url, "# raw")
+        doc = DocPage(title="Clean", url="https://example.com/clean-once.html", source_url=url)
+
+        assert fetcher.fetch(doc).content == "# RAW"
+        assert fetcher.fetch(doc).content == "# RAW"
+        assert len(calls) == 1
+        # Uncleaned content is still available
+        assert fetcher.get_cached(url) == "# raw"
+
+    def test_file_cache_is_single_database(self, fetcher: DocumentFetcher) -> None:
+        """Test that the persistent cache is one SQLite file, not per-URL files."""
+        fetcher._save_to_cache("https://example.com/1.md", "content 1")
+        fetcher._save_to_cache("https://example.com/2.md", "content 2")
+
+        assert fetcher.cache_dir is not None
+        assert [p.name for p in fetcher.cache_dir.glob("*.md")] == []
+        assert (fetcher.cache_dir / "documents.db").exists()
+
+    def test_file_cache_survives_new_fetcher(self, tmp_path) -> None:
+        """Test that another fetcher on the same directory sees persisted content."""
+        cache_dir = tmp_path / "shared"
+        DocumentFetcher(cache_dir=cache_dir)._save_to_cache("https://example.com/p.md", "# P")
+        assert DocumentFetcher(cache_dir=cache_dir).get_cached("https://example.com/p.md") == "# P"
+
+    def test_expired_file_entry_is_dropped(self, tmp_path) -> None:
+        """Test that expired persistent entries are not returned."""
+        fetcher = DocumentFetcher(
+            cache_dir=tmp_path / "ttl", cache_ttl_seconds=0, stale_ttl_seconds=0
+        )
+        fetcher._save_to_cache("https://example.com/old.md", "# Old")
+        fetcher._memory_cache.clear()
+        assert fetcher.get_cached("https://example.com/old.md") is None
+        assert fetcher.cache_stats()["file_entries"] == 0
+
+    @staticmethod
+    def _fake_get(responses: list[httpx.Response], sent: list[dict[str, str]]):
+        """Build a stand-in for DocumentFetcher._http_get that replays responses."""
+
+        def fake_get(url: str, headers: dict[str, str]) -> httpx.Response:
+            sent.append(headers)
+            response = responses.pop(0)
+            response.request = httpx.Request("GET", url)
+            return response
+
+        return fake_get
+
+    def test_fetch_stores_validators(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that ETag and Last-Modified are persisted with the content."""
+        fetcher = DocumentFetcher(cache_dir=tmp_path / "v", clean_markdown_content=False)
+        sent: list[dict[str, str]] = []
+        response = httpx.Response(
+            200,
+            text="# Doc",
+            headers={"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+        monkeypatch.setattr(fetcher, "_http_get", self._fake_get([response], sent))
+
+        url = "https://example.com/validators.md"
+        fetcher.fetch(DocPage(title="V", url=url, source_url=url))
+
+        entry = fetcher._get_from_file(url)
+        assert entry is not None
+        assert entry.etag == '"abc"'
+        assert entry.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert "If-None-Match" not in sent[0]
+
+    def test_stale_entry_served_while_revalidating(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an expired entry is served at once and revalidated in the background."""
+        fetcher = DocumentFetcher(cache_ttl_seconds=60, clean_markdown_content=False)
+        url = "https://example.com/stale.md"
+        fetcher._memory_cache.put(
+            (url, False),
+            CacheEntry(content="# Old", fetched_at=time.time() - 120, source_url=url, etag='"v1"'),
+        )
+        sent: list[dict[str, str]] = []
+        monkeypatch.setattr(fetcher, "_http_get", self._fake_get([httpx.Response(304)], sent))
+        scheduled = []
+        original = fetcher._schedule_refresh
+
+        def record(u: str, previous: CacheEntry):
+            future = original(u, previous)
+            scheduled.append(future)
+            return future
+
+        monkeypatch.setattr(fetcher, "_schedule_refresh", record)
+
+        result = fetcher.fetch(DocPage(title="S", url=url, source_url=url))
+        assert result.content == "# Old"
+
+        scheduled[0].result(timeout=5)
+        assert sent[0]["If-None-Match"] == '"v1"'
+        refreshed = fetcher._get_from_memory(url)
+        assert refreshed is not None
+        assert refreshed.content == "# Old"
+        assert fetcher._is_cache_valid(refreshed)
+
+    def test_not_modified_refreshes_raw_entry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a 304 also freshens the raw entry get_cached() reads when cleaning."""
+        fetcher = DocumentFetcher(cache_ttl_seconds=60, clean_markdown_content=True)
+        url = "https://example.com/cleaned.md"
+        stale = time.time() - 120
+        fetcher._memory_cache.put(
+            (url, False), CacheEntry(content="# Doc", fetched_at=stale, source_url=url)
+        )
+        fetcher._memory_cache.put(
+            (url, True), CacheEntry(content="# Doc", fetched_at=stale, source_url=url, etag='"1"')
+        )
+        assert fetcher.get_cached(url) is None
+
+        sent: list[dict[str, str]] = []
+        monkeypatch.setattr(fetcher, "_http_get", self._fake_get([httpx.Response(304)], sent))
+        assert fetcher.refresh(DocPage(title="C", url=url, source_url=url)) is False
+        assert sent[0]["If-None-Match"] == '"1"'
+        assert fetcher.get_cached(url) == "# Doc"
+
+    def test_cold_fetch_counts_one_miss(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a cold fetch with cleaning on counts a single memory cache miss."""
+        fetcher = DocumentFetcher(clean_markdown_content=True)
+        url = "https://example.com/cold.md"
+        monkeypatch.setattr(
+            fetcher, "_http_get", self._fake_get([httpx.Response(200, text="# Cold")], [])
+        )
+
+        assert fetcher.fetch(DocPage(title="C", url=url, source_url=url)).content
+        assert fetcher._memory_cache.misses == 1
+        assert fetcher._memory_cache.hits == 0
+
+    def test_refresh_reports_changes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that refresh() returns whether the content changed."""
+        fetcher = DocumentFetcher(clean_markdown_content=False)
+        url = "https://example.com/changing.md"
+        doc = DocPage(title="C", url=url, source_url=url)
+        responses = [
+            httpx.Response(200, text="# One", headers={"ETag": '"1"'}),
+            httpx.Response(304),
+            httpx.Response(200, text="# Two", headers={"ETag": '"2"'}),
+        ]
+        sent: list[dict[str, str]] = []
+        monkeypatch.setattr(fetcher, "_http_get", self._fake_get(responses, sent))
+
+        assert fetcher.refresh(doc) is True
+        assert fetcher.refresh(doc) is False
+        assert sent[1]["If-None-Match"] == '"1"'
+        assert fetcher.refresh(doc) is True
+        assert fetcher.fetch(doc).content == "# Two"
+
+    def test_fetch_many_fetches_misses_concurrently(
+        self, memory_fetcher: DocumentFetcher, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cache misses in fetch_many overlap instead of running serially."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_get(url: str, _headers: dict[str, str]) -> httpx.Response:
+            barrier.wait()  # Only passes once all three requests are in flight
+            return httpx.Response(200, text=f"# {url}", request=httpx.Request("GET", url))
+
+        monkeypatch.setattr(memory_fetcher, "_http_get", fake_get)
+        memory_fetcher._save_to_cache("https://example.com/hit.md", "# Hit")
+
+        urls = [f"https://host{i}.example.com/doc.md" for i in range(3)]
+        docs = [DocPage(title=u, url=u, source_url=u) for u in urls]
+        docs.insert(1, DocPage(title="Hit", url="hit", source_url="https://example.com/hit.md"))
+
+        results = memory_fetcher.fetch_many(docs)
+
+        assert [r.title for r in results] == [d.title for d in docs]
+        assert results[1].content == "# Hit"
+        assert all(r.success for r in results)
+
+    def test_per_host_concurrency_is_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that requests to one host never exceed max_concurrency_per_host."""
+        fetcher = DocumentFetcher(max_concurrency_per_host=2)
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        class FakeClient:
+            def get(self, url: str, **_kwargs) -> httpx.Response:
+                nonlocal in_flight, peak
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.05)
+                with lock:
+                    in_flight -= 1
+                return httpx.Response(200, text="# Doc", request=httpx.Request("GET", url))
+
+        monkeypatch.setattr(fetcher, "_get_client", lambda: FakeClient())
+        docs = [
+            DocPage(title=str(i), url=str(i), source_url=f"https://one.example.com/{i}.md")
+            for i in range(6)
+        ]
+
+        assert all(r.success for r in fetcher.fetch_many(docs))
+        assert peak == 2
+
+    async def test_afetch_many(
+        self, memory_fetcher: DocumentFetcher, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the async fetch path serves cache hits and fetches misses."""
+        calls: list[str] = []
+
+        def fake_get(url: str, _headers: dict[str, str]) -> httpx.Response:
+            calls.append(url)
+            return httpx.Response(200, text="# Remote", request=httpx.Request("GET", url))
+
+        monkeypatch.setattr(memory_fetcher, "_http_get", fake_get)
+        url = "https://example.com/async.md"
+        doc = DocPage(title="A", url=url, source_url=url)
+
+        first = await memory_fetcher.afetch(doc)
+        results = await memory_fetcher.afetch_many([doc, doc])
+
+        assert first.content == "# Remote"
+        assert [r.content for r in results] == ["# Remote", "# Remote"]
+        assert calls == [url]  # Later calls are memory cache hits
+
     def test_fetch_invalid_url(self, fetcher: DocumentFetcher) -> None:
         """Test fetching from an invalid URL."""
         doc = DocPage(
@@ -271,6 +542,7 @@ class TestDocumentFetcher:
         stats = fetcher.cache_stats()
         assert stats["memory_entries"] == 2
         assert stats["file_entries"] == 2
+        assert stats["memory_bytes"] == len("content 1") + len("content 2")
         assert stats["ttl_seconds"] == 60
 
 
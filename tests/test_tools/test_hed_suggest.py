@@ -0,0 +1,99 @@
+"""Tests for the hed-suggest tool wrapper.
+
+A small stand-in CLI is written to a temp directory so both the sync and
+async subprocess paths run for real without the hed-lsp install.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.assistants.hed import tools as hed_tools
+from src.assistants.hed.tools import suggest_hed_tags
+
+
+def _write_cli(tmp_path: Path, body: str) -> str:
+    script = tmp_path / "hed-suggest"
+    script.write_text(f"#!{sys.executable}\nimport json, sys\n{body}\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest.fixture
+def fake_cli(tmp_path: Path, monkeypatch) -> str:
+    """A CLI that echoes each search term back as a single suggestion."""
+    cli = _write_cli(
+        tmp_path,
+        "terms = sys.argv[4:]\nprint(json.dumps({t: [t.title().replace(' ', '-')] for t in terms}))",
+    )
+    monkeypatch.setattr(hed_tools, "_find_hed_suggest_cli", lambda: cli)
+    return cli
+
+
+class TestSuggestHedTags:
+    """Tests for suggest_hed_tags sync and async paths."""
+
+    @pytest.mark.usefixtures("fake_cli")
+    def test_sync_parses_cli_output(self):
+        """The sync path should return the CLI's JSON mapping."""
+        result = suggest_hed_tags.invoke({"search_terms": ["button press"]})
+        assert result == {"button press": ["Button-Press"]}
+
+    @pytest.mark.usefixtures("fake_cli")
+    async def test_async_matches_sync(self):
+        """The async subprocess path should return the same result as the sync one."""
+        args = {"search_terms": ["button press", "visual flash"], "top_n": 3}
+        assert await suggest_hed_tags.ainvoke(args) == suggest_hed_tags.invoke(args)
+
+    async def test_async_reports_cli_failure(self, tmp_path: Path, monkeypatch):
+        """A non-zero exit should produce the fallback error result."""
+        cli = _write_cli(tmp_path, "sys.exit(2)")
+        monkeypatch.setattr(hed_tools, "_find_hed_suggest_cli", lambda: cli)
+
+        result = await suggest_hed_tags.ainvoke({"search_terms": ["flash"]})
+
+        assert "failed" in result["error"]
+        assert result["flash"] == []
+
+    async def test_async_reports_invalid_json(self, tmp_path: Path, monkeypatch):
+        """Non-JSON output should produce the invalid data error."""
+        cli = _write_cli(tmp_path, "print('not json')")
+        monkeypatch.setattr(hed_tools, "_find_hed_suggest_cli", lambda: cli)
+
+        result = await suggest_hed_tags.ainvoke({"search_terms": ["flash"]})
+
+        assert "invalid data" in result["error"]
+
+    async def test_async_cancel_kills_cli(self, tmp_path: Path, monkeypatch):
+        """Cancelling the call should kill the CLI instead of leaving it running."""
+        pid_file = tmp_path / "pid"
+        cli = _write_cli(
+            tmp_path,
+            f"import os, time\nopen({str(pid_file)!r}, 'w').write(str(os.getpid()))\ntime.sleep(60)",
+        )
+        monkeypatch.setattr(hed_tools, "_find_hed_suggest_cli", lambda: cli)
+
+        task = asyncio.create_task(hed_tools._asuggest_hed_tags(["flash"]))
+        while not pid_file.exists() or not pid_file.read_text():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid_file.read_text()), 0)
+
+    async def test_async_without_cli(self, monkeypatch):
+        """A missing CLI should tell the agent to validate instead."""
+        monkeypatch.setattr(hed_tools, "_find_hed_suggest_cli", lambda: None)
+
+        result = await suggest_hed_tags.ainvoke({"search_terms": ["flash"]})
+
+        assert "not available" in result["error"]
+        assert "validate_hed_string" in result["error"]
+        assert json.dumps(result)  # stays serializable for the agent
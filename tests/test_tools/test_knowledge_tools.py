@@ -7,6 +7,7 @@ Tests cover:
 - Tool creation with different configurations
 """
 
+import threading
 from pathlib import Path
 from unittest.mock import patch
 
@@ -95,6 +96,58 @@ class TestSearchDiscussionsTool:
         assert "repo2" in tool.description
 
 
+class TestAsyncKnowledgeTools:
+    """Tests for the async path of knowledge tools."""
+
+    async def test_ainvoke_matches_invoke(self, tmp_path: Path) -> None:
+        """ainvoke should return the same result as invoke."""
+        tool = create_search_papers_tool("test", "Test Community")
+
+        db_path = tmp_path / "knowledge" / "test.db"
+        with patch("src.knowledge.db.get_db_path", return_value=db_path):
+            init_db("test")
+            with get_connection("test") as conn:
+                upsert_paper(
+                    conn,
+                    source="openalex",
+                    external_id="W1",
+                    title="Event annotation in neuroimaging",
+                    first_message="Annotating events.",
+                    url="https://doi.org/10.1/test",
+                    created_at="2024-01-01",
+                )
+                conn.commit()
+
+            with patch("src.tools.knowledge.get_db_path", return_value=db_path):
+                sync_result = tool.invoke({"query": "annotation"})
+                async_result = await tool.ainvoke({"query": "annotation"})
+
+        assert "Event annotation" in async_result
+        assert async_result == sync_result
+
+    async def test_ainvoke_runs_on_db_executor(self, tmp_path: Path) -> None:
+        """The async path should run the search on the knowledge DB executor."""
+        tool = create_search_discussions_tool("test", "Test Community")
+        threads: list[str] = []
+
+        def record_thread(*_args, **_kwargs):
+            threads.append(threading.current_thread().name)
+            return []
+
+        db_path = tmp_path / "knowledge" / "test.db"
+        with patch("src.knowledge.db.get_db_path", return_value=db_path):
+            init_db("test")
+            with (
+                patch("src.tools.knowledge.get_db_path", return_value=db_path),
+                patch("src.tools.knowledge.search_github_items", side_effect=record_thread),
+            ):
+                result = await tool.ainvoke({"query": "validation"})
+
+        assert "No related discussions found" in result
+        assert threads
+        assert all(name.startswith("knowledge-db") for name in threads)
+
+
 class TestSearchPapersTool:
     """Tests for search papers tool."""
 
@@ -4,6 +4,8 @@ These tests call the real NEMAR API to ensure tools work correctly.
 NO MOCKS - we test against the actual service.
 """
 
+import time
+
 import pytest
 
 from src.assistants.nemar import tools as nemar_tools_module
@@ -288,3 +290,36 @@ class TestCaching:
         nemar_tools_module._cache_timestamp = 0.0
         result = _fetch_all_datasets()
         assert len(result) > 0
+
+
+class TestAsyncNemarTools:
+    """Tests for the async NEMAR tool paths that need no network."""
+
+    @pytest.fixture
+    def cached_datasets(self, monkeypatch):
+        """Prime the dataset cache so no API request is made."""
+        datasets = [
+            {"id": "ds000001", "name": "Face perception", "modalities": "EEG", "tasks": "faces"},
+            {"id": "ds000002", "name": "Motor imagery", "modalities": "MEG", "tasks": "motor"},
+        ]
+        monkeypatch.setattr(nemar_tools_module, "_datasets_cache", datasets)
+        monkeypatch.setattr(nemar_tools_module, "_cache_timestamp", time.monotonic())
+        return datasets
+
+    @pytest.mark.usefixtures("cached_datasets")
+    async def test_async_search_uses_cache(self):
+        """Async search should filter the cached dataset list."""
+        result = await search_nemar_datasets.ainvoke({"modality_filter": "MEG"})
+        assert "ds000002" in result
+        assert "ds000001" not in result
+
+    @pytest.mark.usefixtures("cached_datasets")
+    async def test_async_search_matches_sync(self):
+        """Async and sync search should format results identically."""
+        args = {"query": "face"}
+        assert await search_nemar_datasets.ainvoke(args) == search_nemar_datasets.invoke(args)
+
+    async def test_async_details_rejects_invalid_id(self):
+        """Invalid dataset IDs should be rejected before any request."""
+        result = await get_nemar_dataset_details.ainvoke({"dataset_id": "bad-id"})
+        assert "Invalid dataset ID" in result